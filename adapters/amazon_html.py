@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import html as html_lib
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urljoin, urlparse
+
+from .base import ParseResult, ProductInfo
+
+# Compiled once at import. Card-level patterns run with ``pattern.search(text, pos, endpos)``
+# over the card's span of the page, so multi-MB pages are never sliced, copied or DOM-parsed.
+_CARD_MARKER = re.compile(r'data-component-type="s-search-result"')
+_ASIN_ATTR = re.compile(r'data-asin="([A-Z0-9]{10})"')
+_CARD_H2 = re.compile(r"<h2\b([^>]*)>(.*?)</h2>", re.S)
+_ARIA_LABEL = re.compile(r'aria-label="([^"]+)"')
+_TAGS = re.compile(r"<[^>]+>")
+_OFFSCREEN_PRICE = re.compile(
+    r'class="a-price[^"]*"[^>]*>\s*<span class="a-offscreen">([^<]+)</span>'
+)
+# Numeric fields are located by a literal suffix (str.find) and read backwards from a short
+# window; a leading-digit regex over the whole card would start a match at every digit.
+_RATING_SUFFIX = " out of 5 stars"
+_BOUGHT_SUFFIX = " bought in past month"
+_TRAILING_NUMBER = re.compile(r"([0-9][0-9,.]*[KkMm]?\+?)$")
+_REVIEWS = re.compile(
+    r'aria-label="([0-9][0-9,.]*[KkMm]?)(?: ratings?)?"'
+    r'|s-underline-text">\(?([0-9][0-9,.]*[KkMm]?)\)?<'
+)
+_REVIEWS_WINDOW = 1000
+_NEXT_PAGE_TAG = re.compile(r'<a\b[^>]*\bs-pagination-next\b[^>]*>')
+_HREF = re.compile(r'href="([^"]+)"')
+
+_DETAIL_TITLE = re.compile(r'id="productTitle"[^>]*>\s*([^<]+?)\s*<')
+_DETAIL_PRICE = re.compile(
+    r'id="(?:corePrice_feature_div|corePriceDisplay_desktop_feature_div|apex_desktop)".*?'
+    r'<span class="a-offscreen">([^<]+)</span>',
+    re.S,
+)
+_DETAIL_LEGACY_PRICE = re.compile(
+    r'id="priceblock_(?:ourprice|dealprice|saleprice)"[^>]*>\s*([^<]+?)\s*<'
+)
+_DETAIL_RATING = re.compile(r'id="acrPopover"[^>]*title="([0-9.,]+) out of 5 stars"')
+_DETAIL_REVIEWS = re.compile(r'id="acrCustomerReviewText"[^>]*>\s*([0-9][0-9,.]*)')
+_DETAIL_SELLER = re.compile(r'id="sellerProfileTriggerId"[^>]*>\s*([^<]+?)\s*<')
+_DETAIL_BYLINE = re.compile(
+    r'id="bylineInfo"[^>]*>\s*(?:Visit the |Brand: )?([^<]+?)(?: Store)?\s*<'
+)
+_DETAIL_AVAILABILITY = re.compile(r'id="availability"[^>]*>\s*(?:<span[^>]*>)?\s*([^<]+?)\s*<')
+_DETAIL_ASIN_INPUT = re.compile(r'<input[^>]*\bid="ASIN"[^>]*\bvalue="([A-Z0-9]{10})"')
+_URL_ASIN = re.compile(r"/(?:dp|gp/product|gp/aw/d)/([A-Z0-9]{10})(?:[/?]|$)")
+
+_CURRENCY_SYMBOLS: Dict[str, str] = {
+    "$": "USD", "£": "GBP", "€": "EUR", "¥": "JPY", "₹": "INR", "R$": "BRL",
+    "US$": "USD", "CDN$": "CAD", "CA$": "CAD", "C$": "CAD", "A$": "AUD", "AU$": "AUD",
+    "MX$": "MXN", "￥": "JPY",
+}
+# A bare "$" or "¥" is shared by several currencies; the marketplace's own one wins.
+_SHARED_SYMBOLS: Dict[str, Tuple[str, ...]] = {
+    "$": ("USD", "CAD", "AUD", "MXN"),
+    "¥": ("JPY", "CNY"),
+    "￥": ("JPY", "CNY"),
+}
+# Search pages are /s?k=... (or legacy /s/ref=...?field-keywords=...); other /s* paths
+# (/stores, /sp, /ssl) are not listings.
+_SEARCH_QUERY_KEYS = ("k", "rh", "i", "field-keywords", "node", "page")
+_SPONSORED_TITLE = "Sponsored Ad - "
+_TLD_CURRENCY: Dict[str, str] = {
+    "com": "USD", "co.uk": "GBP", "de": "EUR", "fr": "EUR", "it": "EUR", "es": "EUR", "nl": "EUR",
+    "co.jp": "JPY", "in": "INR", "ca": "CAD", "com.au": "AUD", "com.mx": "MXN", "com.br": "BRL",
+    "cn": "CNY",
+}
+
+
+def _clean(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return None
+    value = html_lib.unescape(text).strip()
+    return value or None
+
+
+def _digits(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return None
+    text = text.strip()
+    return text.replace(",", "").replace(".", "") if text[-1:].isdigit() else text
+
+
+def _number_before(html: str, pos: int) -> Optional[str]:
+    if pos <= 0:
+        return None
+    match = _TRAILING_NUMBER.search(html, max(0, pos - 16), pos)
+    return match.group(1) if match else None
+
+
+class AmazonHtmlAdapter:
+    """
+    Amazon search/listing and detail pages via targeted regex extraction.
+
+    Search pages are scanned card by card (``data-component-type="s-search-result"``);
+    each card is only searched between its own start and the next card's start. Only
+    pagination links are followed, product cards are emitted directly as products.
+    """
+
+    name = "amazon"
+    domains = ["amazon.com", "www.amazon.com"]
+
+    def matches(self, url: str) -> bool:
+        netloc = urlparse(url).netloc.lower()
+        return netloc.startswith("amazon.") or ".amazon." in netloc
+
+    def is_product_url(self, url: str) -> bool:
+        return _URL_ASIN.search(url) is not None
+
+    def should_follow(self, url: str) -> bool:
+        parts = urlparse(url)
+        if parts.path == "/s" or parts.path.startswith("/s/"):
+            query = parse_qs(parts.query)
+            return any(key in query for key in _SEARCH_QUERY_KEYS)
+        return self.is_product_url(url)
+
+    def parse(self, url: str, html: str) -> ParseResult:
+        if self.is_product_url(url) or 'id="productTitle"' in html:
+            product = self._parse_detail(url, html)
+            products = [product] if product else []
+            return ParseResult(
+                product_urls=[p.url for p in products], next_links=[], products=products
+            )
+
+        products = self._parse_search(url, html)
+        next_links: List[str] = []
+        tag = _NEXT_PAGE_TAG.search(html)
+        if tag:
+            href = _HREF.search(tag.group(0))
+            if href:
+                next_links.append(urljoin(url, html_lib.unescape(href.group(1))))
+        return ParseResult(
+            product_urls=[p.url for p in products], next_links=next_links, products=products
+        )
+
+    # ---- Search results -----------------------------------------------------
+
+    def _parse_search(self, url: str, html: str) -> List[ProductInfo]:
+        starts: List[int] = []
+        for marker in _CARD_MARKER.finditer(html):
+            tag_start = html.rfind("<", 0, marker.start())
+            if not starts or tag_start > starts[-1]:
+                starts.append(tag_start)
+        if not starts:
+            return []
+        starts.append(len(html))
+
+        origin = self._origin(url)
+        default_currency = self._currency_for(url)
+        products: List[ProductInfo] = []
+        for start, end in zip(starts, starts[1:]):
+            tag_end = html.find(">", start, end)
+            asin_match = _ASIN_ATTR.search(html, start, tag_end if tag_end != -1 else end)
+            if not asin_match:
+                continue  # sponsored placeholders and widgets carry an empty data-asin
+            asin = asin_match.group(1)
+
+            title = None
+            h2 = _CARD_H2.search(html, start, end)
+            if h2:
+                label = _ARIA_LABEL.search(h2.group(1))
+                title = _clean(label.group(1) if label else _TAGS.sub("", h2.group(2)))
+                if title and title.startswith(_SPONSORED_TITLE):
+                    title = title[len(_SPONSORED_TITLE):] or None
+            price_match = _OFFSCREEN_PRICE.search(html, start, end)
+            raw_price = price_match.group(1) if price_match else None
+            price, currency = self._split_price(raw_price, default_currency)
+            rating_pos = html.find(_RATING_SUFFIX, start, end)
+            rating = _number_before(html, rating_pos)
+            reviews_from = rating_pos if rating_pos != -1 else start
+            reviews_end = min(end, reviews_from + _REVIEWS_WINDOW)
+            reviews_match = _REVIEWS.search(html, reviews_from, reviews_end)
+            reviews = (reviews_match.group(1) or reviews_match.group(2)) if reviews_match else None
+            bought = _number_before(html, html.find(_BOUGHT_SUFFIX, start, end))
+
+            extra = {
+                key: value
+                for key, value in {
+                    "asin": asin,
+                    "rating": rating,
+                    "reviews": _digits(reviews),
+                    "sponsored": True if html.find("Sponsored", start, end) != -1 else None,
+                }.items()
+                if value
+            }
+            products.append(
+                ProductInfo(
+                    url=f"{origin}/dp/{asin}",
+                    title=title,
+                    price=price,
+                    currency=currency if price else None,
+                    sales=bought,
+                    item_type="product",
+                    extra=extra,
+                )
+            )
+        return products
+
+    # ---- Detail pages -------------------------------------------------------
+
+    def _parse_detail(self, url: str, html: str) -> Optional[ProductInfo]:
+        asin_match = _URL_ASIN.search(url) or _DETAIL_ASIN_INPUT.search(html)
+        title = _clean(self._first(_DETAIL_TITLE, html))
+        if not asin_match and not title:
+            return None
+        asin = asin_match.group(1) if asin_match else None
+
+        raw_price = self._first(_DETAIL_PRICE, html) or self._first(_DETAIL_LEGACY_PRICE, html)
+        price, currency = self._split_price(raw_price, self._currency_for(url))
+        seller = _clean(self._first(_DETAIL_SELLER, html))
+        seller = seller or _clean(self._first(_DETAIL_BYLINE, html))
+        bought = _number_before(html, html.find(_BOUGHT_SUFFIX))
+
+        extra = {
+            key: value
+            for key, value in {
+                "asin": asin,
+                "rating": self._first(_DETAIL_RATING, html),
+                "reviews": _digits(self._first(_DETAIL_REVIEWS, html)),
+            }.items()
+            if value
+        }
+        return ProductInfo(
+            url=f"{self._origin(url)}/dp/{asin}" if asin else url,
+            title=title,
+            price=price,
+            currency=currency if price else None,
+            availability=_clean(self._first(_DETAIL_AVAILABILITY, html)),
+            seller=seller,
+            sales=bought,
+            item_type="product",
+            extra=extra or None,
+        )
+
+    # ---- Helpers ------------------------------------------------------------
+
+    @staticmethod
+    def _first(pattern: "re.Pattern[str]", html: str) -> Optional[str]:
+        match = pattern.search(html)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme or 'https'}://{parsed.netloc}"
+
+    @staticmethod
+    def _currency_for(url: str) -> Optional[str]:
+        netloc = urlparse(url).netloc.lower()
+        _, _, tld = netloc.partition("amazon.")
+        return _TLD_CURRENCY.get(tld)
+
+    @staticmethod
+    def _split_price(
+        raw: Optional[str], default_currency: Optional[str]
+    ) -> tuple[Optional[str], Optional[str]]:
+        text = _clean(raw)
+        if not text:
+            return None, None
+        for symbol in sorted(_CURRENCY_SYMBOLS, key=len, reverse=True):
+            if symbol in text:
+                currency = _CURRENCY_SYMBOLS[symbol]
+                if default_currency in _SHARED_SYMBOLS.get(symbol, ()):
+                    currency = default_currency
+                return text.replace(symbol, "").strip(), currency
+        return text, default_currency
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Optional, Protocol, Sequence
 from urllib.parse import urlparse
 
 
@@ -16,6 +16,10 @@ class SiteAdapter(Protocol):
     """
     Interface for site-specific parsing logic.
     Keep this small and stable so adapters rarely break across upgrades.
+
+    Optional hooks (looked up with ``getattr``; omit them to get the engine defaults):
+    - ``is_product_url(url) -> bool``: classify sitemap URLs (default: ``is_product_like``).
+    - ``should_follow(url) -> bool``: prune this page's next links before they are queued.
     """
 
     name: str
@@ -51,6 +55,11 @@ class ProductInfo:
     item_type: Optional[str] = None
     sales: Optional[str] = None
     extra: Optional[Dict[str, Any]] = None
+    # Typed values parsed from ``price`` / ``sales`` by utils.normalize (the engine fills them).
+    price_value: Optional[float] = None
+    sales_value: Optional[int] = None
+    # Search keywords this product was found for / matched (keyword fan-out mode).
+    matched_keywords: Optional[List[str]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         data: Dict[str, Any] = {
@@ -63,16 +72,46 @@ class ProductInfo:
             "category": self.category,
             "type": self.item_type,
             "sales": self.sales,
+            "price_value": self.price_value,
+            "sales_value": self.sales_value,
         }
         # Drop unset keys for a cleaner export while retaining extras for future-proofing.
         clean = {k: v for k, v in data.items() if v is not None}
+        if self.matched_keywords:
+            clean["keywords"] = self.matched_keywords
         if self.extra:
             clean["extra"] = self.extra
         return clean
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProductInfo":
+        """Inverse of :meth:`to_dict` (used when restoring persisted crawl state)."""
+        return cls(
+            url=data["url"],
+            title=data.get("title"),
+            price=data.get("price"),
+            currency=data.get("currency"),
+            availability=data.get("availability"),
+            seller=data.get("seller"),
+            category=data.get("category"),
+            item_type=data.get("type"),
+            sales=data.get("sales"),
+            extra=data.get("extra"),
+            price_value=data.get("price_value"),
+            sales_value=data.get("sales_value"),
+            matched_keywords=data.get("keywords"),
+        )
+
     def matches_keywords(self, keywords: List[str]) -> bool:
         if not keywords:
             return True
-        haystack = " ".join(filter(None, [self.title, self.category, self.item_type, self.url]))
-        haystack_lower = haystack.lower()
+        haystack_lower = self._keyword_haystack()
         return any(kw.lower() in haystack_lower for kw in keywords)
+
+    def matching_keywords(self, keywords: Sequence[str]) -> List[str]:
+        """The subset of ``keywords`` found in this product's title, category, type or URL."""
+        haystack_lower = self._keyword_haystack()
+        return [kw for kw in keywords if kw.lower() in haystack_lower]
+
+    def _keyword_haystack(self) -> str:
+        return " ".join(filter(None, [self.title, self.category, self.item_type, self.url])).lower()
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from .base import ParseResult, ProductInfo
+
+_DECODER = json.JSONDecoder()
+# Relaxations for JS object literals that are "almost JSON" (unquoted keys, undefined, !0/!1).
+_JS_BARE_KEY = re.compile(r'([{,]\s*)([A-Za-z_$][\w$]*)\s*:')
+_JS_LITERAL = re.compile(r":\s*(undefined|!0|!1)(?=\s*[,}\]])")
+_JS_LITERALS = {"undefined": ":null", "!0": ":true", "!1": ":false"}
+# String literals are copied through the relaxations untouched (and re-quoted as JSON).
+_JS_STRING = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'', re.S)
+_JS_ESCAPE = re.compile(r"\\(x[0-9a-fA-F]{2}|u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|\r\n|[\s\S])")
+_JS_SIMPLE_ESCAPES = {
+    "n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0",
+    "\n": "", "\r": "", "\r\n": "",
+}
+# ``marker = JSON.parse('...')``: the state is a JSON document inside a JS string literal.
+_JSON_PARSE_CALL = re.compile(r"[\s=:(]{0,64}?JSON\.parse\(\s*[\"']")
+_MAX_WALK_DEPTH = 10
+
+
+def find_embedded_json(html: str, marker: str) -> Optional[Any]:
+    """
+    Decode the JSON value assigned after ``marker`` (e.g. ``window.__INITIAL_STATE__``)
+    straight from the raw HTML; no DOM is built and only the payload itself is scanned.
+    """
+    pos = html.find(marker)
+    while pos != -1:
+        value = _decode_after(html, pos + len(marker))
+        if value is not None:
+            return value
+        pos = html.find(marker, pos + len(marker))
+    return None
+
+
+def _decode_after(html: str, pos: int) -> Optional[Any]:
+    start = _value_start(html, pos)
+    if start != -1:
+        try:
+            value, _ = _DECODER.raw_decode(html, start)
+            return value
+        except ValueError:
+            return _relaxed_decode(html, start)
+    call = _JSON_PARSE_CALL.match(html, pos)
+    if call is None:
+        return None
+    text = _js_string(html, call.end() - 1)
+    if text is None:
+        return None
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return _relaxed_decode(text, 0) if text[:1] in "{[" else None
+
+
+def _value_start(html: str, pos: int) -> int:
+    # Accept ``marker = {...}``, ``marker: {...}`` and ``marker = ({...})``.
+    limit = min(len(html), pos + 64)
+    while pos < limit and html[pos] in " \t\r\n=:(":
+        pos += 1
+    if pos < limit and html[pos] in "{[":
+        return pos
+    return -1
+
+
+def _relaxed_decode(html: str, start: int) -> Optional[Any]:
+    end = _balanced_end(html, start)
+    if end == -1:
+        return None
+    segment = html[start:end]
+    parts: List[str] = []
+    last = 0
+    for literal in _JS_STRING.finditer(segment):
+        parts.append(_relax_code(segment[last:literal.start()]))
+        parts.append(json.dumps(_js_unescape(literal.group()[1:-1]), ensure_ascii=False))
+        last = literal.end()
+    parts.append(_relax_code(segment[last:]))
+    try:
+        return json.loads("".join(parts))
+    except ValueError:
+        return None
+
+
+def _relax_code(code: str) -> str:
+    code = _JS_BARE_KEY.sub(r'\1"\2":', code)
+    return _JS_LITERAL.sub(lambda m: _JS_LITERALS[m.group(1)], code)
+
+
+def _js_string(html: str, start: int) -> Optional[str]:
+    """Value of the JS string literal whose opening quote is at ``html[start]``."""
+    quote = html[start]
+    i = start + 1
+    n = len(html)
+    while i < n:
+        ch = html[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == quote:
+            return _js_unescape(html[start + 1:i])
+        i += 1
+    return None
+
+
+def _js_unescape(body: str) -> str:
+    def replace(match: "re.Match[str]") -> str:
+        escape = match.group(1)
+        if len(escape) > 1 and escape[0] in "xu":
+            return chr(int(escape[2:-1] if escape[1] == "{" else escape[1:], 16))
+        return _JS_SIMPLE_ESCAPES.get(escape, escape)
+
+    text = _JS_ESCAPE.sub(replace, body)
+    try:
+        # \uD83D\uDE00-style pairs decode to two surrogates; join them into one character.
+        return text.encode("utf-16", "surrogatepass").decode("utf-16")
+    except UnicodeDecodeError:
+        return text
+
+
+def _balanced_end(html: str, start: int) -> int:
+    """Index just past the bracket that closes ``html[start]``, honouring string literals."""
+    depth = 0
+    quote = ""
+    i = start
+    n = len(html)
+    while i < n:
+        ch = html[i]
+        if quote:
+            if ch == "\\":
+                i += 2
+                continue
+            if ch == quote:
+                quote = ""
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return -1
+
+
+def _first_key(item: Dict[str, Any], keys: Sequence[str]) -> Any:
+    for key in keys:
+        value = item.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+class EmbeddedStateAdapter:
+    """
+    Base for marketplaces that ship product data as inline ``<script>`` JSON.
+
+    Subclasses declare the assignment markers to look for and field aliases; every dict
+    in the decoded payload that carries both an id and a title alias becomes a product.
+    Only pagination links derived from the payload are followed.
+    """
+
+    name = "embedded-state"
+    domains: List[str] = []
+    markers: Sequence[str] = ("window.__INITIAL_STATE__",)
+    id_keys: Sequence[str] = ()
+    title_keys: Sequence[str] = ()
+    price_keys: Sequence[str] = ()
+    cent_price_keys: Sequence[str] = ()  # integer prices in fen
+    seller_keys: Sequence[str] = ()
+    sales_keys: Sequence[str] = ()
+    category_keys: Sequence[str] = ()
+    url_keys: Sequence[str] = ()
+    product_url_template = ""
+    page_param = "page"
+    currency = "CNY"
+
+    def matches(self, url: str) -> bool:
+        netloc = urlparse(url).netloc.lower()
+        return any(netloc == d or netloc.endswith("." + d) for d in self.domains)
+
+    def parse(self, url: str, html: str) -> ParseResult:
+        state = self.extract_state(html)
+        if state is None:
+            return ParseResult(product_urls=[], next_links=[], products=[])
+        products = self.products_from_state(url, state)
+        next_page = self.next_page_url(url, state)
+        return ParseResult(
+            product_urls=[p.url for p in products],
+            next_links=[next_page] if next_page else [],
+            products=products,
+        )
+
+    # ---- Payload handling ---------------------------------------------------
+
+    def extract_state(self, html: str) -> Optional[Any]:
+        for marker in self.markers:
+            state = find_embedded_json(html, marker)
+            if state is not None:
+                return state
+        return None
+
+    def products_from_state(self, url: str, state: Any) -> List[ProductInfo]:
+        products: List[ProductInfo] = []
+        seen = set()
+        for item in self._iter_dicts(state):
+            product = self.product_from_item(url, item)
+            if product and product.url not in seen:
+                seen.add(product.url)
+                products.append(product)
+        return products
+
+    def product_from_item(self, url: str, item: Dict[str, Any]) -> Optional[ProductInfo]:
+        item_id = _first_key(item, self.id_keys)
+        title = _first_key(item, self.title_keys)
+        if item_id is None or not isinstance(title, str):
+            return None
+        product_url = _first_key(item, self.url_keys)
+        if isinstance(product_url, str) and product_url:
+            product_url = urljoin(url, product_url)
+        else:
+            product_url = self.product_url_template.format(id=item_id)
+        extra = {"id": str(item_id)}
+        return ProductInfo(
+            url=product_url,
+            title=title.strip(),
+            price=self._price(item),
+            currency=self.currency,
+            seller=self._str(_first_key(item, self.seller_keys)),
+            category=self._str(_first_key(item, self.category_keys)),
+            item_type="product",
+            sales=self._str(_first_key(item, self.sales_keys)),
+            extra=extra,
+        )
+
+    def next_page_url(self, url: str, state: Any) -> Optional[str]:
+        pager = self._find_pager(state)
+        if pager is None:
+            return None
+        current, total = pager
+        if current >= total:
+            return None
+        parts = urlparse(url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        query[self.page_param] = str(current + 1)
+        return urlunparse(parts._replace(query=urlencode(query)))
+
+    # ---- Helpers ------------------------------------------------------------
+
+    def _price(self, item: Dict[str, Any]) -> Optional[str]:
+        for key in self.cent_price_keys:
+            value = item.get(key)
+            if isinstance(value, int) and not isinstance(value, bool):
+                return f"{value / 100:.2f}"
+        return self._str(_first_key(item, self.price_keys))
+
+    @staticmethod
+    def _str(value: Any) -> Optional[str]:
+        if value is None or isinstance(value, (dict, list)):
+            return None
+        text = str(value).strip()
+        return text or None
+
+    def _iter_dicts(self, node: Any, depth: int = 0) -> Iterator[Dict[str, Any]]:
+        if depth > _MAX_WALK_DEPTH:
+            return
+        if isinstance(node, dict):
+            yield node
+            for value in node.values():
+                if isinstance(value, (dict, list)):
+                    yield from self._iter_dicts(value, depth + 1)
+        elif isinstance(node, list):
+            for value in node:
+                if isinstance(value, (dict, list)):
+                    yield from self._iter_dicts(value, depth + 1)
+
+    def _find_pager(self, state: Any) -> Optional[Tuple[int, int]]:
+        current_keys = ("currentPage", "current_page", "pageNum", "page")
+        total_keys = ("totalPage", "total_page", "pageCount", "totalPages")
+        # Pagers sit near the top of the payload; only walk the first few levels.
+        for item in self._iter_dicts(state, depth=_MAX_WALK_DEPTH - 3):
+            current = _first_key(item, current_keys)
+            total = _first_key(item, total_keys)
+            try:
+                return int(current), int(total)
+            except (TypeError, ValueError):
+                continue
+        return None
+
+
+class JDHtmlAdapter(EmbeddedStateAdapter):
+    """JD.com item and search pages (``_itemInfo`` / ``__INITIAL_STATE__`` / ``pageConfig``)."""
+
+    name = "jd"
+    domains = ["jd.com", "jd.hk"]
+    markers = ("window.__INITIAL_STATE__", "window._itemInfo", "window._itemOnly", "var pageConfig")
+    id_keys = ("skuId", "skuid", "wareId", "sku")
+    title_keys = ("skuName", "wname", "wareName", "name")
+    price_keys = ("jdPrice", "realPrice", "price", "p")
+    seller_keys = ("shopName", "venderName", "vendorName")
+    # Only real sales counts: JD's commentCount/comments are review counts, not sales.
+    sales_keys = ("totalSales", "saleCount")
+    category_keys = ("catName", "cat3Name", "categoryName")
+    product_url_template = "https://item.jd.com/{id}.html"
+
+
+class TaobaoHtmlAdapter(EmbeddedStateAdapter):
+    """
+    Taobao/Tmall search and item pages (``g_page_config`` / ``__INITIAL_STATE__`` /
+    ``__ICE_APP_CONTEXT__``).
+    """
+
+    name = "taobao"
+    domains = ["taobao.com", "tmall.com"]
+    markers = ("g_page_config", "window.__INITIAL_STATE__", "window.__ICE_APP_CONTEXT__")
+    id_keys = ("nid", "itemId", "item_id", "num_iid")
+    title_keys = ("raw_title", "title", "itemTitle")
+    price_keys = ("view_price", "zkFinalPrice", "price", "reservePrice")
+    seller_keys = ("nick", "shopName", "sellerNick")
+    sales_keys = ("view_sales", "realSales", "sold", "soldCount")
+    category_keys = ("category", "categoryName")
+    url_keys = ("detail_url", "auctionURL", "itemUrl")
+    product_url_template = "https://item.taobao.com/item.htm?id={id}"
+
+    def next_page_url(self, url: str, state: Any) -> Optional[str]:
+        # Search pager lives under mods.pager.data and paginates with an item offset ``s``.
+        pager = (
+            (((state.get("mods") or {}).get("pager") or {}).get("data") or {})
+            if isinstance(state, dict)
+            else {}
+        )
+        try:
+            current, total, size = (
+                int(pager["currentPage"]),
+                int(pager["totalPage"]),
+                int(pager["pageSize"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return super().next_page_url(url, state)
+        if current >= total:
+            return None
+        parts = urlparse(url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        query["s"] = str(current * size)
+        return urlunparse(parts._replace(query=urlencode(query)))
+
+
+class PddHtmlAdapter(EmbeddedStateAdapter):
+    """Pinduoduo mobile pages (``window.rawData``); group prices are integers in fen."""
+
+    name = "pdd"
+    domains = ["yangkeduo.com", "pinduoduo.com"]
+    markers = ("window.rawData", "window.__INITIAL_STATE__")
+    id_keys = ("goods_id", "goodsID", "goodsId")
+    title_keys = ("goods_name", "goodsName")
+    cent_price_keys = ("min_group_price", "minGroupPrice", "groupPrice", "min_normal_price")
+    price_keys = ("price", "priceInfo")
+    seller_keys = ("mall_name", "mallName")
+    sales_keys = ("sales_tip", "salesTip", "sold_quantity", "sideSalesTip")
+    product_url_template = "https://mobile.yangkeduo.com/goods.html?goods_id={id}"
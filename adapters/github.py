@@ -6,6 +6,7 @@ from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 
 from .base import ParseResult, ProductInfo
+from ..utils.normalize import parse_count
 from ..utils.parsing import extract_links
 
 
@@ -14,6 +15,7 @@ class GitHubRepoAdapter:
 
     name = "github"
     domains = ["github.com", "www.github.com"]
+    _LISTING_PREFIXES = ("/topics", "/collections", "/search", "/trending", "/explore")
 
     def matches(self, url: str) -> bool:
         netloc = urlparse(url).netloc.lower()
@@ -158,6 +160,20 @@ class GitHubRepoAdapter:
     def _is_repo_url(self, url: str) -> bool:
         return self._split_repo(url) is not None
 
+    def is_product_url(self, url: str) -> bool:
+        """Optional adapter hook used by sitemap seeding: repositories are the products."""
+        return self._is_repo_url(url)
+
+    def should_follow(self, url: str) -> bool:
+        """Follow repository roots and listing pages, not issues/commits/blob views."""
+        parsed = urlparse(url)
+        if not parsed.netloc.endswith("github.com"):
+            return True
+        parts = [p for p in parsed.path.split("/") if p]
+        if len(parts) == 2 and self._is_repo_url(url):
+            return True
+        return any(parsed.path.startswith(prefix) for prefix in self._LISTING_PREFIXES)
+
     def _product_from_url(self, url: str) -> Optional[ProductInfo]:
         owner_repo = self._split_repo(url)
         if not owner_repo:
@@ -171,7 +187,7 @@ class GitHubRepoAdapter:
         )
 
     def _listing_links(self, links: Iterable[str]) -> List[str]:
-        prefixes = ("/topics", "/collections", "/search", "/trending", "/explore")
+        prefixes = self._LISTING_PREFIXES
         out: List[str] = []
         for link in links:
             parsed = urlparse(link)
@@ -200,13 +216,6 @@ class GitHubRepoAdapter:
     def _normalize_count(self, text: str) -> Optional[str]:
         if not text:
             return None
-        value = text.strip().lower().replace(",", "")
-        try:
-            if value.endswith("k"):
-                return str(int(float(value[:-1]) * 1000))
-            if value.endswith("m"):
-                return str(int(float(value[:-1]) * 1_000_000))
-            return str(int(float(value)))
-        except ValueError:
-            return text.strip()
+        value = parse_count(text)
+        return str(value) if value is not None else text.strip()
 
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import List, Optional, Iterable
+from typing import List, Optional, Iterable, Set
 from importlib import metadata
 
 from .base import SiteAdapter
+from .amazon_html import AmazonHtmlAdapter
+from .cn_sites_html import JDHtmlAdapter, PddHtmlAdapter, TaobaoHtmlAdapter
 from .generic import GenericAdapter
 from .github import GitHubRepoAdapter
 
@@ -14,7 +16,15 @@ class AdapterRegistry:
     Supports built-ins, config-defined dotted classes, and entry-point plugins.
     """
     def __init__(self) -> None:
-        self._adapters: List[SiteAdapter] = [GenericAdapter(), GitHubRepoAdapter()]
+        self._adapters: List[SiteAdapter] = [
+            GenericAdapter(),
+            GitHubRepoAdapter(),
+            AmazonHtmlAdapter(),
+            JDHtmlAdapter(),
+            TaobaoHtmlAdapter(),
+            PddHtmlAdapter(),
+        ]
+        self._discovered: Set[str] = set()
 
     # ---- Introspection / Management ----
 
@@ -37,9 +47,13 @@ class AdapterRegistry:
     def discover_entry_points(self, group: str = "ecom_crawler.adapters") -> int:
         """
         Discover third-party adapters installed as entry points.
-        Returns count of newly registered adapters.
+        Returns count of newly registered adapters; a group is only scanned once per registry,
+        so engines sharing one registry don't register plugins twice.
         """
         added = 0
+        if group in self._discovered:
+            return added
+        self._discovered.add(group)
         try:
             eps = metadata.entry_points()
             # Modern syntax (Py3.10+)
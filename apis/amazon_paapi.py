@@ -1,22 +1,277 @@
-# apis/amazon_paapi.py
-from typing import List, Dict
-from amazon_paapi5 import AmazonApi  # or any wrapper you choose
-
-class AmazonPaapiAdapter:
-    def __init__(self, access_key, secret_key, partner_tag, marketplace="www.amazon.com"):
-        self.client = AmazonApi(access_key, secret_key, partner_tag, marketplace=marketplace)
-
-    def search(self, keyword: str, page: int=1) -> List[Dict]:
-        # ask only for the fields you need to reduce payload (per best practices)
-        items = self.client.search_items(keywords=keyword, item_page=page, resources=[
-            "ItemInfo.Title","Offers.Listings.Price","Images.Primary.Small","BrowseNodeInfo.BrowseNodes"
-        ])
-        out = []
-        for it in items:
-            out.append({
-                "Title": it.title,
-                "Price": it.prices and it.prices.current_price and it.prices.current_price,
-                "Rating": "", "Sold": "", "Seller": "",
-                "SKU": it.asin, "ImageURL": it.image and it.image.url, "URL": it.detail_page_url
-            })
-        return out
+# apis/amazon_paapi.py
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence
+
+from .base import ApiError, chunked
+from ..adapters.base import ProductInfo
+from ..utils.cache import TTLCache
+from ..utils.throttling import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Ask only for the fields we map (smaller responses, per PA-API best practices).
+SEARCH_RESOURCES = [
+    "ItemInfo.Title",
+    "Offers.Listings.Price",
+    "Offers.Listings.MerchantInfo",
+    "Offers.Listings.Availability.Message",
+    "CustomerReviews.StarRating",
+    "CustomerReviews.Count",
+    "Images.Primary.Small",
+    "BrowseNodeInfo.BrowseNodes",
+]
+ITEM_RESOURCES = SEARCH_RESOURCES
+
+MAX_SEARCH_PAGES = 10  # SearchItems serves ItemPage 1..10
+GET_ITEMS_BATCH = 10  # ItemIds per GetItems request
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+class PaapiClient(Protocol):
+    """The two blocking calls we need from a PA-API 5 wrapper (e.g. python-amazon-paapi)."""
+
+    def search_items(self, *, keywords: str, item_page: int, resources: List[str]) -> Any:
+        ...
+
+    def get_items(self, items: List[str], *, resources: List[str]) -> Any:
+        ...
+
+
+class StaticPaapiClient:
+    """
+    Offline PaapiClient backed by in-memory item dicts (PA-API JSON shape); for local
+    runs and tests. ``search_items`` serves ``page_size`` items per page from ``items``.
+    """
+
+    def __init__(self, items: Sequence[Dict[str, Any]], page_size: int = 10) -> None:
+        self.items = list(items)
+        self.page_size = page_size
+        self.calls: List[tuple] = []
+
+    def search_items(
+        self, *, keywords: str, item_page: int, resources: List[str]
+    ) -> List[Dict[str, Any]]:
+        self.calls.append(("search_items", keywords, item_page))
+        start = (item_page - 1) * self.page_size
+        return self.items[start : start + self.page_size]
+
+    def get_items(self, items: List[str], *, resources: List[str]) -> List[Dict[str, Any]]:
+        self.calls.append(("get_items", tuple(items)))
+        wanted = set(items)
+        return [it for it in self.items if _field(it, "ASIN") in wanted]
+
+
+def _field(obj: Any, *path: Any) -> Any:
+    """
+    Walk ``path`` through PA-API objects or dicts. Each step is an attribute/key; string steps
+    are tried snake_case first and then as given (SDK objects vs raw JSON), ints index lists.
+    """
+    for step in path:
+        if obj is None:
+            return None
+        if isinstance(step, int):
+            obj = obj[step] if isinstance(obj, (list, tuple)) and len(obj) > step else None
+            continue
+        snake = _CAMEL_BOUNDARY.sub("_", step).lower()
+        if isinstance(obj, dict):
+            obj = obj.get(step, obj.get(snake))
+        else:
+            obj = getattr(obj, snake, getattr(obj, step, None))
+    return obj
+
+
+class AmazonPaapiAdapter:
+    """
+    Async Product Advertising API 5 source.
+
+    The wrapper's calls are blocking, so they run in worker threads; every call first takes a
+    token from a TPS limiter shared by the instance. ``search`` requests result pages 1..N
+    concurrently, ``get_items`` batches ASINs 10 per GetItems call, and every mapped item is
+    cached by ASIN so repeated lookups (or a search followed by enrichment) cost nothing.
+    """
+
+    name = "amazon_paapi"
+
+    def __init__(
+        self,
+        access_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        partner_tag: Optional[str] = None,
+        marketplace: str = "www.amazon.com",
+        *,
+        client: Optional[PaapiClient] = None,
+        tps: float = 1.0,
+        cache_ttl: float = 3600.0,
+    ) -> None:
+        if client is None:
+            try:
+                from amazon_paapi5 import AmazonApi  # or any wrapper you choose
+            except Exception as exc:  # pragma: no cover - optional dependency
+                raise RuntimeError(
+                    "A PA-API 5 wrapper is required for AmazonPaapiAdapter (or pass client=...)."
+                ) from exc
+            client = AmazonApi(access_key, secret_key, partner_tag, marketplace=marketplace)
+        self.client = client
+        self.marketplace = marketplace
+        self.domain = marketplace[4:] if marketplace.startswith("www.") else marketplace
+        self.limiter = RateLimiter(tps, burst=1)
+        self.cache: TTLCache[ProductInfo] = TTLCache(ttl=cache_ttl)
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "AmazonPaapiAdapter":
+        access_key = os.getenv("AMAZON_PAAPI_ACCESS_KEY", "")
+        secret_key = os.getenv("AMAZON_PAAPI_SECRET_KEY", "")
+        partner_tag = os.getenv("AMAZON_PAAPI_PARTNER_TAG", "")
+        if not (access_key and secret_key and partner_tag):
+            raise ApiError(
+                "AMAZON_PAAPI_ACCESS_KEY, AMAZON_PAAPI_SECRET_KEY and AMAZON_PAAPI_PARTNER_TAG "
+                "must be set"
+            )
+        kwargs: Dict[str, Any] = {
+            "marketplace": os.getenv("AMAZON_PAAPI_MARKETPLACE", "www.amazon.com")
+        }
+        if os.getenv("AMAZON_PAAPI_TPS"):
+            kwargs["tps"] = float(os.environ["AMAZON_PAAPI_TPS"])
+        kwargs.update(overrides)
+        return cls(access_key, secret_key, partner_tag, **kwargs)
+
+    async def _call(self, fn: Any, *args: Any, **kwargs: Any) -> Any:
+        await self.limiter.acquire()
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def search(self, keyword: str, *, pages: int = 1) -> List[ProductInfo]:
+        """Fetch result pages 1..``pages`` (at most 10) concurrently under the TPS limit."""
+
+        async def one_page(page: int) -> List[ProductInfo]:
+            try:
+                result = await self._call(
+                    self.client.search_items,
+                    keywords=keyword,
+                    item_page=page,
+                    resources=SEARCH_RESOURCES,
+                )
+            except Exception as exc:
+                # PA-API answers past the last page with an error, so this is often benign.
+                logger.debug("PA-API search %r page %s failed: %r", keyword, page, exc)
+                return []
+            return self._map(_items_of(result))
+
+        results = await asyncio.gather(
+            *(one_page(p) for p in range(1, min(pages, MAX_SEARCH_PAGES) + 1))
+        )
+        seen: Dict[str, ProductInfo] = {}
+        for product in (p for page in results for p in page):
+            seen.setdefault(product.url, product)
+        return list(seen.values())
+
+    async def get_items(self, asins: Iterable[str]) -> List[ProductInfo]:
+        """Look up ASINs (e.g. found by HTML crawling), 10 per GetItems call; cached are free."""
+        wanted = list(dict.fromkeys(a for a in asins if a))
+        missing = [a for a in wanted if self.cache.get(a) is None]
+
+        async def one_batch(batch: List[str]) -> None:
+            try:
+                result = await self._call(self.client.get_items, batch, resources=ITEM_RESOURCES)
+            except Exception as exc:
+                logger.warning("PA-API GetItems (%s ASINs) failed: %r", len(batch), exc)
+                return
+            self._map(_items_of(result))
+
+        await asyncio.gather(*(one_batch(b) for b in chunked(missing, GET_ITEMS_BATCH)))
+        return [p for p in (self.cache.get(a) for a in wanted) if p is not None]
+
+    async def enrich(self, products: List[ProductInfo]) -> List[ProductInfo]:
+        """
+        Fill products carrying ``extra["asin"]`` from their PA-API record where one exists: the
+        API's offer fields win, while the crawled URL, sales, matched keywords and any ``extra``
+        keys the API lacks are kept. Cached records are not modified.
+        """
+        asins = [(p.extra or {}).get("asin") for p in products]
+        found = {
+            (p.extra or {}).get("asin"): p for p in await self.get_items([a for a in asins if a])
+        }
+        return [
+            _merge(product, found[asin]) if asin in found else product
+            for asin, product in zip(asins, products)
+        ]
+
+    async def close(self) -> None:
+        return None
+
+    def _map(self, items: Iterable[Any]) -> List[ProductInfo]:
+        products: List[ProductInfo] = []
+        for item in items:
+            product = self.to_product(item)
+            if product is not None:
+                self.cache.set(product.extra["asin"], product)
+                products.append(product)
+        return products
+
+    def to_product(self, item: Any) -> Optional[ProductInfo]:
+        asin = _field(item, "ASIN")
+        if not asin:
+            return None
+        listing = _field(item, "Offers", "Listings", 0)
+        price = _field(listing, "Price", "Amount")
+        extra = {
+            key: value
+            for key, value in {
+                "asin": asin,
+                "rating": _field(item, "CustomerReviews", "StarRating", "Value"),
+                "reviews": _field(item, "CustomerReviews", "Count"),
+                "image": _field(item, "Images", "Primary", "Small", "URL"),
+            }.items()
+            if value is not None
+        }
+        return ProductInfo(
+            url=_field(item, "DetailPageURL") or f"https://{self.marketplace}/dp/{asin}",
+            title=_field(item, "ItemInfo", "Title", "DisplayValue"),
+            price=str(price) if price is not None else None,
+            price_value=float(price) if isinstance(price, (int, float)) else None,
+            currency=_field(listing, "Price", "Currency"),
+            availability=_field(listing, "Availability", "Message"),
+            seller=_field(listing, "MerchantInfo", "Name"),
+            category=_field(item, "BrowseNodeInfo", "BrowseNodes", 0, "DisplayName"),
+            item_type="product",
+            extra=extra,
+        )
+
+
+# PA-API fields that replace the crawled ones in ``enrich`` when the API has a value.
+_ENRICHED_FIELDS = (
+    "title", "price", "price_value", "currency", "availability", "seller", "category"
+)
+
+
+def _merge(product: ProductInfo, record: ProductInfo) -> ProductInfo:
+    updates: Dict[str, Any] = {
+        name: getattr(record, name)
+        for name in _ENRICHED_FIELDS
+        if getattr(record, name) is not None
+    }
+    if "price" in updates and "price_value" not in updates:
+        updates["price_value"] = None  # stale: parsed from the crawled price
+    return dataclasses.replace(
+        product, extra={**(product.extra or {}), **(record.extra or {})}, **updates
+    )
+
+
+def _items_of(result: Any) -> List[Any]:
+    # Wrappers return either the item list itself or a response object/dict with ``items``.
+    if result is None:
+        return []
+    if isinstance(result, list):
+        return result
+    items = (
+        _field(result, "Items")
+        or _field(result, "SearchResult", "Items")
+        or _field(result, "ItemsResult", "Items")
+    )
+    return list(items or [])
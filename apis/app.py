@@ -24,13 +24,23 @@ app = FastAPI(title="ecom_crawler API", version="0.1.0")
 
 
 class CrawlRequest(BaseModel):
-    start_urls: List[str]
+    start_urls: List[str] = []
     max_depth: Optional[int] = None
     max_concurrency: Optional[int] = None
     allowed_domains: Optional[List[str]] = None
     engine: Optional[str] = None
     exporter: Optional[str] = None  # ignored by API; returning JSON
     extra_adapters: Optional[List[str]] = None
+    keywords: Optional[List[str]] = None
+    # Keyword fan-out: search URLs with a {keyword} placeholder, crawled once per keyword.
+    search_url_templates: Optional[List[str]] = None
+    # "sample", "cprofile" or "timers": profile the crawl and return the tables under "profile".
+    profile: Optional[str] = None
+    # Budgets for interactive lookups: the response is partial and "stop_reason" says which one
+    # ended it.
+    deadline_seconds: Optional[float] = None
+    max_pages: Optional[int] = None
+    max_products: Optional[int] = None
 
 
 @app.get("/health")
@@ -52,7 +62,21 @@ async def crawl(req: CrawlRequest) -> Dict[str, Any]:
         cfg.engine = req.engine
     if req.extra_adapters:
         cfg.extra_adapters = req.extra_adapters
+    if req.keywords:
+        cfg.keywords = req.keywords
+    if req.search_url_templates:
+        cfg.search_url_templates = req.search_url_templates
+    if req.profile:
+        cfg.profile = True
+        cfg.profile_mode = req.profile
+    if req.deadline_seconds is not None:
+        cfg.deadline_seconds = req.deadline_seconds
+    if req.max_pages is not None:
+        cfg.max_pages = req.max_pages
+    if req.max_products is not None:
+        cfg.max_products = req.max_products
 
+    cfg.load_keywords_file()
     cfg.validate()
 
     # Load engine dynamically
@@ -68,4 +92,12 @@ async def crawl(req: CrawlRequest) -> Dict[str, Any]:
 
     engine = engine_cls(cfg, registry=registry)
     report: CrawlReport = await engine.crawl()
-    return {"visited": report.visited_count, "discovered": report.discovered}
+    response: Dict[str, Any] = {
+        "visited": report.visited_count,
+        "discovered": {domain: list(products) for domain, products in report.discovered.items()},
+        "partial": report.stop_reason is not None,
+        "stop_reason": report.stop_reason,
+    }
+    if "profile" in report.stats:
+        response["profile"] = report.stats["profile"]
+    return response
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+import aiohttp
+from aiohttp import ClientSession, ClientTimeout
+
+from ..adapters.base import ProductInfo
+from ..utils.cache import TTLCache
+from ..utils.throttling import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+_CN_TZ = timezone(timedelta(hours=8))
+
+
+class ApiError(RuntimeError):
+    """Raised when a marketplace gateway returns an error payload or a non-2xx status."""
+
+
+class ProductSource(Protocol):
+    """Anything that can turn a keyword into products, next to the HTML engine."""
+
+    name: str
+    domain: str  # key under which results appear in CrawlReport.discovered
+
+    async def search(self, keyword: str, *, pages: int = 1) -> List[ProductInfo]:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+def md5_sign(params: Dict[str, str], secret: str) -> str:
+    """``MD5(secret + k1v1k2v2... + secret)`` over sorted keys, upper-case hex (TOP/JD/PDD)."""
+    payload = secret + "".join(f"{k}{params[k]}" for k in sorted(params)) + secret
+    return hashlib.md5(payload.encode("utf-8")).hexdigest().upper()
+
+
+def hmac_sign(params: Dict[str, str], secret: str, digestmod: str = "md5") -> str:
+    """``HMAC(secret, k1v1k2v2...)`` over sorted keys, upper-case hex."""
+    payload = "".join(f"{k}{params[k]}" for k in sorted(params))
+    return hmac.new(secret.encode("utf-8"), payload.encode("utf-8"), digestmod).hexdigest().upper()
+
+
+def cn_timestamp() -> str:
+    """Gateway timestamps in GMT+8, ``YYYY-MM-DD HH:MM:SS``."""
+    return datetime.now(_CN_TZ).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def chunked(values: Sequence[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(values), size):
+        yield list(values[i : i + size])
+
+
+class MarketplaceApiClient(ABC):
+    """
+    Async base for signed marketplace gateways (JD Union, Taobao TOP, PDD, Temu).
+
+    Subclasses only describe their wire format: how to build and sign a call, how to pull
+    item dicts out of a response and how to map one item to :class:`ProductInfo`.
+    The base adds:
+    - a token-bucket quota per ``(client, app_key)`` shared by every instance in the process
+      (at the lowest ``qps`` requested);
+    - bounded concurrency for multi-page searches;
+    - batched ID lookups of at most ``max_batch_size`` IDs per call;
+    - a TTL response cache keyed by method and parameters (timestamps/signatures excluded).
+    """
+
+    name: ClassVar[str] = "api"
+    domain: ClassVar[str] = ""
+    default_gateway: ClassVar[str] = ""
+    max_batch_size: ClassVar[int] = 20
+    max_page_size: ClassVar[int] = 50
+    # Per-request parameters that must not take part in the cache key.
+    volatile_params: ClassVar[Tuple[str, ...]] = ("timestamp", "sign")
+    # from_env(): credentials come from {env_prefix}_APP_KEY / _APP_SECRET (+ _GATEWAY, _QPS);
+    # each name in env_options is read from {env_prefix}_{NAME} into the matching kwarg.
+    env_prefix: ClassVar[str] = ""
+    env_options: ClassVar[Tuple[str, ...]] = ()
+
+    _quotas: ClassVar[Dict[Tuple[str, str], RateLimiter]] = {}
+
+    def __init__(
+        self,
+        app_key: str,
+        app_secret: str,
+        *,
+        gateway_url: Optional[str] = None,
+        qps: float = 5.0,
+        max_concurrency: int = 4,
+        cache_ttl: float = 300.0,
+        timeout: float = 15.0,
+        session: Optional[ClientSession] = None,
+    ) -> None:
+        self.app_key = app_key
+        self.app_secret = app_secret
+        self.gateway_url = gateway_url or self.default_gateway
+        self.timeout = timeout
+        self.cache: TTLCache[Dict[str, Any]] = TTLCache(ttl=cache_ttl)
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self.quota = self._shared_quota(app_key, qps)
+        self._session = session
+        self._owns_session = session is None
+
+    @classmethod
+    def _shared_quota(cls, app_key: str, qps: float) -> RateLimiter:
+        # The gateway meters the app key, not the instance: every instance shares one bucket,
+        # running at the lowest qps any of them was configured with.
+        quota = cls._quotas.get((cls.name, app_key))
+        if quota is None:
+            quota = cls._quotas[(cls.name, app_key)] = RateLimiter(qps)
+        elif qps < quota.rate:
+            quota.rate = qps
+            quota.burst = max(1.0, qps)
+        return quota
+
+    @classmethod
+    def from_env(cls, **overrides: Any) -> "MarketplaceApiClient":
+        prefix = cls.env_prefix
+        app_key = os.getenv(f"{prefix}_APP_KEY", "")
+        app_secret = os.getenv(f"{prefix}_APP_SECRET", "")
+        if not app_key or not app_secret:
+            raise ApiError(
+                f"{prefix}_APP_KEY and {prefix}_APP_SECRET must be set to use {cls.name}"
+            )
+        kwargs: Dict[str, Any] = {}
+        for option in cls.env_options:
+            value = os.getenv(f"{prefix}_{option.upper()}")
+            if value:
+                kwargs[option] = value
+        if os.getenv(f"{prefix}_GATEWAY"):
+            kwargs["gateway_url"] = os.getenv(f"{prefix}_GATEWAY")
+        if os.getenv(f"{prefix}_QPS"):
+            kwargs["qps"] = float(os.environ[f"{prefix}_QPS"])
+        kwargs.update(overrides)
+        return cls(app_key, app_secret, **kwargs)
+
+    # ---- Wire format (subclass hooks) ----
+
+    @abstractmethod
+    def build_params(self, method: str, business: Dict[str, Any]) -> Dict[str, str]:
+        """Return the complete, signed form parameters for one gateway call."""
+
+    @abstractmethod
+    def search_call(self, keyword: str, page: int, page_size: int) -> Tuple[str, Dict[str, Any]]:
+        """Return ``(method, business params)`` for one page of keyword search."""
+
+    @abstractmethod
+    def items_call(self, ids: List[str]) -> Tuple[str, Dict[str, Any]]:
+        """Return ``(method, business params)`` for one batch of ID lookups."""
+
+    @abstractmethod
+    def extract_items(self, method: str, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Pull item dicts out of a decoded response (raise ApiError on error payloads)."""
+
+    @abstractmethod
+    def to_product(self, item: Dict[str, Any]) -> Optional[ProductInfo]:
+        ...
+
+    def request_kwargs(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """How the signed parameters travel; form-encoded by default."""
+        return {"data": params}
+
+    # ---- Transport ----
+
+    async def _get_session(self) -> ClientSession:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def call(self, method: str, business: Dict[str, Any]) -> Dict[str, Any]:
+        params = self.build_params(method, business)
+        # Keyed on the serialized parameters: values may be lists or dicts (e.g. Temu ID lists).
+        stable = {k: v for k, v in params.items() if k not in self.volatile_params}
+        cache_key = (method, json.dumps(stable, sort_keys=True, ensure_ascii=False, default=str))
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        session = await self._get_session()
+        async with self._sem:
+            await self.quota.acquire()
+            async with session.post(
+                self.gateway_url,
+                timeout=ClientTimeout(total=self.timeout),
+                **self.request_kwargs(params),
+            ) as resp:
+                if resp.status >= 400:
+                    raise ApiError(f"{self.name} {method}: HTTP {resp.status}")
+                body = await resp.text()
+        try:
+            payload = json.loads(body)
+        except ValueError as exc:
+            raise ApiError(f"{self.name} {method}: invalid JSON response") from exc
+        self.cache.set(cache_key, payload)
+        return payload
+
+    async def close(self) -> None:
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # ---- Product source API ----
+
+    async def search(
+        self, keyword: str, *, pages: int = 1, page_size: Optional[int] = None
+    ) -> List[ProductInfo]:
+        """Fetch ``pages`` result pages concurrently (within quota) and map them to products."""
+        size = min(page_size or self.max_page_size, self.max_page_size)
+
+        async def one_page(page: int) -> List[Dict[str, Any]]:
+            method, business = self.search_call(keyword, page, size)
+            try:
+                return self.extract_items(method, await self.call(method, business))
+            except Exception as exc:
+                logger.warning("%s search %r page %s failed: %r", self.name, keyword, page, exc)
+                return []
+
+        results = await asyncio.gather(*(one_page(p) for p in range(1, pages + 1)))
+        return self._products([item for page in results for item in page])
+
+    async def get_items(self, ids: Sequence[str]) -> List[ProductInfo]:
+        """Look up items by ID in batches of ``max_batch_size``; batches run concurrently."""
+        unique = list(dict.fromkeys(str(i) for i in ids))
+
+        async def one_batch(batch: List[str]) -> List[Dict[str, Any]]:
+            method, business = self.items_call(batch)
+            try:
+                return self.extract_items(method, await self.call(method, business))
+            except Exception as exc:
+                logger.warning("%s item lookup (%s ids) failed: %r", self.name, len(batch), exc)
+                return []
+
+        results = await asyncio.gather(
+            *(one_batch(b) for b in chunked(unique, self.max_batch_size))
+        )
+        return self._products([item for batch in results for item in batch])
+
+    def _products(self, items: List[Dict[str, Any]]) -> List[ProductInfo]:
+        seen: Dict[str, ProductInfo] = {}
+        for item in items:
+            product = self.to_product(item)
+            if product is not None and product.url not in seen:
+                seen[product.url] = product
+        return list(seen.values())
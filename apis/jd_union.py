@@ -1,2 +1,86 @@
-# apis/jd_union.py
-# Call jd.union.open.goods.query (签名 + JSON payload), map results to your unified schema.
+# apis/jd_union.py
+# Call jd.union.open.goods.query (签名 + JSON payload), map results to your unified schema.
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..adapters.base import ProductInfo
+from .base import ApiError, MarketplaceApiClient, cn_timestamp, md5_sign
+
+
+class JdUnionClient(MarketplaceApiClient):
+    """JD Union open APIs: keyword goods query and batched promotion-goods lookups."""
+
+    name = "jd_union"
+    domain = "jd.com"
+    default_gateway = "https://api.jd.com/routerjson"
+    max_batch_size = 100  # skuIds per promotiongoodsinfo.query
+    max_page_size = 50
+    env_prefix = "JD_UNION"
+
+    search_method = "jd.union.open.goods.query"
+    items_method = "jd.union.open.goods.promotiongoodsinfo.query"
+
+    def build_params(self, method: str, business: Dict[str, Any]) -> Dict[str, str]:
+        params = {
+            "method": method,
+            "app_key": self.app_key,
+            "timestamp": cn_timestamp(),
+            "format": "json",
+            "v": "1.0",
+            "sign_method": "md5",
+            "360buy_param_json": json.dumps(business, ensure_ascii=False, separators=(",", ":")),
+        }
+        params["sign"] = md5_sign(params, self.app_secret)
+        return params
+
+    def search_call(self, keyword: str, page: int, page_size: int) -> Tuple[str, Dict[str, Any]]:
+        return self.search_method, {
+            "goodsReqDTO": {"keyword": keyword, "pageIndex": page, "pageSize": page_size}
+        }
+
+    def items_call(self, ids: List[str]) -> Tuple[str, Dict[str, Any]]:
+        return self.items_method, {"skuIds": ",".join(ids)}
+
+    def extract_items(self, method: str, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if "error_response" in response:
+            err = response["error_response"]
+            raise ApiError(
+                f"{method}: {err.get('zh_desc') or err.get('en_desc')} ({err.get('code')})"
+            )
+        key = method.replace(".", "_")
+        # JD spells the envelope "_responce"; accept both.
+        body = response.get(key + "_responce") or response.get(key + "_response") or {}
+        raw = body.get("queryResult") or body.get("getResult") or body.get("result")
+        result = json.loads(raw) if isinstance(raw, str) else (raw or {})
+        if result.get("code") not in (None, 200, "200"):
+            raise ApiError(f"{method}: {result.get('message')} ({result.get('code')})")
+        data = result.get("data") or []
+        return data if isinstance(data, list) else [data]
+
+    def to_product(self, item: Dict[str, Any]) -> Optional[ProductInfo]:
+        sku = item.get("skuId")
+        if not sku:
+            return None
+        url = item.get("materialUrl") or f"item.jd.com/{sku}.html"
+        if not url.startswith("http"):
+            url = "https://" + url.lstrip("/")
+        price = (
+            (item.get("priceInfo") or {}).get("price")
+            or item.get("unitPrice")
+            or item.get("wlUnitPrice")
+        )
+        # ``comments`` is the review count, not sales, so it is not used here.
+        sales = item.get("inOrderCount30Days") or item.get("inOrderCount")
+        return ProductInfo(
+            url=url,
+            title=item.get("skuName") or item.get("goodsName"),
+            price=str(price) if price is not None else None,
+            currency="CNY",
+            seller=(item.get("shopInfo") or {}).get("shopName") or item.get("shopName"),
+            category=(item.get("categoryInfo") or {}).get("cid3Name") or item.get("cid3Name"),
+            item_type="product",
+            sales=str(sales) if sales is not None else None,
+            extra={"source": self.name, "id": str(sku)},
+        )
@@ -0,0 +1,86 @@
+# apis/pdd_union.py
+# Pinduoduo DDK (多多进宝) open APIs: https://gw-api.pinduoduo.com/api/router
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..adapters.base import ProductInfo
+from .base import ApiError, MarketplaceApiClient, md5_sign
+
+
+class PddUnionClient(MarketplaceApiClient):
+    """Pinduoduo DDK: ``pdd.ddk.goods.search`` and batched ``pdd.ddk.goods.basic.info.get``."""
+
+    name = "pdd_union"
+    domain = "yangkeduo.com"
+    default_gateway = "https://gw-api.pinduoduo.com/api/router"
+    max_batch_size = 100  # goods_id_list per basic.info.get
+    max_page_size = 100
+    env_prefix = "PDD_UNION"
+    env_options = ("pid",)
+
+    search_method = "pdd.ddk.goods.search"
+    items_method = "pdd.ddk.goods.basic.info.get"
+
+    def __init__(self, app_key: str, app_secret: str, *, pid: str = "", **kwargs: Any) -> None:
+        super().__init__(app_key, app_secret, **kwargs)
+        self.pid = pid
+
+    def build_params(self, method: str, business: Dict[str, Any]) -> Dict[str, str]:
+        params = {
+            "type": method,
+            "client_id": self.app_key,
+            "timestamp": str(int(time.time())),
+            "data_type": "JSON",
+        }
+        for key, value in business.items():
+            if value in (None, ""):
+                continue
+            params[key] = (
+                json.dumps(value, separators=(",", ":"))
+                if isinstance(value, (list, dict))
+                else str(value)
+            )
+        params["sign"] = md5_sign(params, self.app_secret)
+        return params
+
+    def search_call(self, keyword: str, page: int, page_size: int) -> Tuple[str, Dict[str, Any]]:
+        return self.search_method, {
+            "keyword": keyword,
+            "page": page,
+            "page_size": page_size,
+            "pid": self.pid,
+        }
+
+    def items_call(self, ids: List[str]) -> Tuple[str, Dict[str, Any]]:
+        return self.items_method, {"goods_id_list": [int(i) if i.isdigit() else i for i in ids]}
+
+    def extract_items(self, method: str, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if "error_response" in response:
+            err = response["error_response"]
+            raise ApiError(
+                f"{method}: {err.get('error_msg') or err.get('sub_msg')} ({err.get('error_code')})"
+            )
+        for key, body in response.items():
+            if key.endswith("_response") and isinstance(body, dict):
+                return list(body.get("goods_list") or body.get("list") or [])
+        return []
+
+    def to_product(self, item: Dict[str, Any]) -> Optional[ProductInfo]:
+        goods_id = item.get("goods_id")
+        if not goods_id:
+            return None
+        price = item.get("min_group_price")
+        return ProductInfo(
+            url=f"https://mobile.yangkeduo.com/goods.html?goods_id={goods_id}",
+            title=item.get("goods_name"),
+            price=f"{price / 100:.2f}" if isinstance(price, (int, float)) else None,  # fen -> yuan
+            currency="CNY",
+            seller=item.get("mall_name"),
+            category=item.get("category_name"),
+            item_type="product",
+            sales=item.get("sales_tip"),
+            extra={"source": self.name, "id": str(goods_id), "goods_sign": item.get("goods_sign")},
+        )
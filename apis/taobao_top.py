@@ -1,3 +1,96 @@
-# apis/taobao_top.py
-# Build signed requests to TOP gateway: https://eco.taobao.com/router/rest
-# Params include method, app_key, timestamp (GMT+8), sign_method, sign, v=2.0, format=json
+# apis/taobao_top.py
+# Build signed requests to TOP gateway: https://eco.taobao.com/router/rest
+# Params include method, app_key, timestamp (GMT+8), sign_method, sign, v=2.0, format=json
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..adapters.base import ProductInfo
+from .base import ApiError, MarketplaceApiClient, cn_timestamp, hmac_sign, md5_sign
+
+
+class TaobaoTopClient(MarketplaceApiClient):
+    """Taobao Open Platform (TOP) affiliate APIs: material search and ``tbk.item.info.get``."""
+
+    name = "taobao_top"
+    domain = "taobao.com"
+    default_gateway = "https://eco.taobao.com/router/rest"
+    max_batch_size = 40  # num_iids per taobao.tbk.item.info.get
+    max_page_size = 100
+    env_prefix = "TAOBAO_TOP"
+    env_options = ("adzone_id", "sign_method")
+
+    search_method = "taobao.tbk.dg.material.optional"
+    items_method = "taobao.tbk.item.info.get"
+
+    def __init__(
+        self,
+        app_key: str,
+        app_secret: str,
+        *,
+        adzone_id: str = "",
+        sign_method: str = "md5",
+        **kwargs: Any,
+    ):
+        super().__init__(app_key, app_secret, **kwargs)
+        if sign_method not in ("md5", "hmac"):
+            raise ValueError("sign_method must be 'md5' or 'hmac'")
+        self.adzone_id = adzone_id
+        self.sign_method = sign_method
+
+    def build_params(self, method: str, business: Dict[str, Any]) -> Dict[str, str]:
+        params = {
+            "method": method,
+            "app_key": self.app_key,
+            "timestamp": cn_timestamp(),
+            "format": "json",
+            "v": "2.0",
+            "sign_method": self.sign_method,
+            **{k: str(v) for k, v in business.items() if v not in (None, "")},
+        }
+        if self.sign_method == "hmac":
+            params["sign"] = hmac_sign(params, self.app_secret, "md5")
+        else:
+            params["sign"] = md5_sign(params, self.app_secret)
+        return params
+
+    def search_call(self, keyword: str, page: int, page_size: int) -> Tuple[str, Dict[str, Any]]:
+        return self.search_method, {
+            "q": keyword,
+            "page_no": page,
+            "page_size": page_size,
+            "adzone_id": self.adzone_id,
+        }
+
+    def items_call(self, ids: List[str]) -> Tuple[str, Dict[str, Any]]:
+        return self.items_method, {"num_iids": ",".join(ids)}
+
+    def extract_items(self, method: str, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if "error_response" in response:
+            err = response["error_response"]
+            raise ApiError(f"{method}: {err.get('sub_msg') or err.get('msg')} ({err.get('code')})")
+        body = response.get(method.replace("taobao.", "", 1).replace(".", "_") + "_response") or {}
+        if method == self.items_method:
+            return list(((body.get("results") or {}).get("n_tbk_item")) or [])
+        return list(((body.get("result_list") or {}).get("map_data")) or [])
+
+    def to_product(self, item: Dict[str, Any]) -> Optional[ProductInfo]:
+        item_id = item.get("num_iid") or item.get("item_id")
+        if not item_id:
+            return None
+        url = item.get("item_url") or f"https://item.taobao.com/item.htm?id={item_id}"
+        if url.startswith("//"):
+            url = "https:" + url
+        price = item.get("zk_final_price") or item.get("reserve_price")
+        sales = item.get("volume")
+        return ProductInfo(
+            url=url,
+            title=item.get("title"),
+            price=str(price) if price is not None else None,
+            currency="CNY",
+            seller=item.get("nick") or item.get("shop_title"),
+            category=item.get("category_name") or item.get("level_one_category_name"),
+            item_type="product",
+            sales=str(sales) if sales is not None else None,
+            extra={"source": self.name, "id": str(item_id)},
+        )
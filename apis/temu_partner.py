@@ -0,0 +1,84 @@
+# apis/temu_partner.py
+# Temu open platform: PDD-style signed JSON requests (type, app_key, access_token, timestamp, sign).
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..adapters.base import ProductInfo
+from .base import ApiError, MarketplaceApiClient, md5_sign
+
+
+class TemuPartnerClient(MarketplaceApiClient):
+    """
+    Temu partner gateway. Method names depend on the API scopes granted to the app, so they
+    are class attributes; override them (or subclass) to match your partner agreement.
+    """
+
+    name = "temu_partner"
+    domain = "temu.com"
+    default_gateway = "https://openapi-b-us.temu.com/openapi/router"
+    max_batch_size = 20
+    max_page_size = 50
+    env_prefix = "TEMU_PARTNER"
+    env_options = ("access_token",)
+
+    search_method = "temu.goods.search"
+    items_method = "temu.goods.detail.list.get"
+
+    def __init__(
+        self, app_key: str, app_secret: str, *, access_token: str = "", **kwargs: Any
+    ) -> None:
+        super().__init__(app_key, app_secret, **kwargs)
+        self.access_token = access_token
+
+    def build_params(self, method: str, business: Dict[str, Any]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "type": method,
+            "app_key": self.app_key,
+            "access_token": self.access_token,
+            "timestamp": str(int(time.time())),
+            "data_type": "JSON",
+            **{k: v for k, v in business.items() if v not in (None, "")},
+        }
+        # Nested values are signed in their compact JSON form, as the gateway serialises them.
+        signable = {k: v if isinstance(v, str) else _compact(v) for k, v in params.items()}
+        params["sign"] = md5_sign(signable, self.app_secret)
+        return params
+
+    def request_kwargs(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"json": params}
+
+    def search_call(self, keyword: str, page: int, page_size: int) -> Tuple[str, Dict[str, Any]]:
+        return self.search_method, {"keyword": keyword, "pageNo": page, "pageSize": page_size}
+
+    def items_call(self, ids: List[str]) -> Tuple[str, Dict[str, Any]]:
+        return self.items_method, {"goodsIdList": ids}
+
+    def extract_items(self, method: str, response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if response.get("success") is False:
+            raise ApiError(f"{method}: {response.get('errorMsg')} ({response.get('errorCode')})")
+        result = response.get("result") or {}
+        return list(result.get("goodsList") or result.get("list") or [])
+
+    def to_product(self, item: Dict[str, Any]) -> Optional[ProductInfo]:
+        goods_id = item.get("goodsId")
+        if not goods_id:
+            return None
+        price = item.get("price") or item.get("minPrice")
+        return ProductInfo(
+            url=item.get("goodsUrl") or f"https://www.temu.com/goods.html?goods_id={goods_id}",
+            title=item.get("goodsName"),
+            price=str(price) if price is not None else None,
+            currency=item.get("currency"),
+            seller=item.get("mallName"),
+            category=item.get("catName"),
+            item_type="product",
+            sales=str(item["salesNum"]) if item.get("salesNum") is not None else None,
+            extra={"source": self.name, "id": str(goods_id)},
+        )
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
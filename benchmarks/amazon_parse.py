@@ -0,0 +1,69 @@
+"""
+Parse throughput of AmazonHtmlAdapter on saved pages, next to the generic adapter it replaces.
+
+    python -m ecom_crawler.benchmarks.amazon_parse [--repeat 5] [--seconds 1.0] [PAGE.html ...]
+
+Without arguments the bundled fixtures are used (benchmarks/fixtures: a 55-card search page
+and a detail page, each padded with the inline scripts and styles real pages carry). Pass
+saved pages to measure those instead; detail pages need "detail" in their file name so they
+are parsed with a product URL.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..adapters.amazon_html import AmazonHtmlAdapter
+from ..adapters.generic import GenericAdapter
+
+FIXTURES = Path(__file__).with_name("fixtures")
+SEARCH_URL = "https://www.amazon.com/s?k=headphones"
+DETAIL_URL = "https://www.amazon.com/dp/B0ACME0001"
+
+
+def load_pages(paths: List[str]) -> List[Tuple[str, str, str]]:
+    """(name, url, html) for each page; detail pages are told apart by their file name."""
+    files = [Path(p) for p in paths] or sorted(FIXTURES.glob("amazon_*.html"))
+    pages = []
+    for path in files:
+        url = DETAIL_URL if "detail" in path.name else SEARCH_URL
+        pages.append((path.name, url, path.read_text(encoding="utf-8")))
+    return pages
+
+
+def _pages_per_second(adapter: Any, url: str, html: str, seconds: float) -> float:
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        adapter.parse(url, html)
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds:
+            return runs / elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("pages", nargs="*", help="saved Amazon pages (default: bundled fixtures)")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--seconds", type=float, default=1.0, help="time per measurement")
+    args = p.parse_args(argv)
+
+    adapters = {"amazon": AmazonHtmlAdapter(), "generic": GenericAdapter()}
+    for name, url, html in load_pages(args.pages):
+        products = len(adapters["amazon"].parse(url, html).products)
+        # Rounds interleave the adapters so machine noise hits them alike; the best run counts.
+        best: Dict[str, float] = {}
+        for _ in range(args.repeat):
+            for label, adapter in adapters.items():
+                rate = _pages_per_second(adapter, url, html, args.seconds)
+                best[label] = max(best.get(label, rate), rate)
+        print(f"{name} ({len(html) / 1024:.0f} KiB, {products} products)")
+        for label, rate in best.items():
+            print(f"  {label:<8} {rate:8.1f} pages/s  {1000 / rate:7.2f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
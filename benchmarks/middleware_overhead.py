@@ -0,0 +1,102 @@
+"""
+Engine overhead of the middleware pipeline, with the network replaced by an in-memory shop
+so only crawl-loop work is timed.
+
+    python -m ecom_crawler.benchmarks.middleware_overhead [--pages 5000] [--repeat 7]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..adapters.base import ProductInfo
+from ..config import CrawlConfig
+from ..engines import simple_engine
+from ..engines.middleware import Middleware, PageRequest
+from ..utils.http import FetchResult
+
+HOST = "http://shop.invalid"
+
+
+class NoHooks(Middleware):
+    """Installed but overrides nothing: every hook list stays empty."""
+
+
+class PassThrough(Middleware):
+    """Overrides all four hooks and returns its input unchanged."""
+
+    async def process_request(self, request: PageRequest) -> PageRequest:
+        return request
+
+    async def process_response(self, request: PageRequest, response: FetchResult) -> FetchResult:
+        return response
+
+    async def process_parse(self, request: PageRequest, parsed: Any) -> Any:
+        return parsed
+
+    async def process_product(
+        self, request: Optional[PageRequest], product: ProductInfo
+    ) -> ProductInfo:
+        return product
+
+
+def _site(pages: int) -> Dict[str, str]:
+    site = {f"{HOST}/": "".join(f'<a href="/p/{i}">item</a>' for i in range(pages))}
+    for i in range(pages):
+        site[f"{HOST}/p/{i}"] = (
+            '<script type="application/ld+json">'
+            f'{{"@type":"Product","name":"Item {i}",'
+            f'"offers":{{"price":"{i}.99","priceCurrency":"USD"}}}}'
+            "</script>"
+        )
+    return site
+
+
+def _in_memory_fetch(site: Dict[str, str]) -> Callable[..., Any]:
+    async def fetch(session: Any, url: str, **kwargs: Any) -> Optional[FetchResult]:
+        body = site.get(url)
+        return FetchResult(url=url, status=200, text=body) if body is not None else None
+
+    return fetch
+
+
+async def _crawl(pages: int, middlewares: List[Any]) -> float:
+    cfg = CrawlConfig(
+        start_urls=[f"{HOST}/"], max_depth=1, max_concurrency=16, respect_robots=False
+    )
+    engine = simple_engine.SimpleCrawlEngine(cfg, middlewares=middlewares)
+    started = time.perf_counter()
+    report = await engine.crawl()
+    elapsed = time.perf_counter() - started
+    assert sum(len(v) for v in report.discovered.values()) == pages
+    return elapsed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--pages", type=int, default=5000)
+    p.add_argument("--repeat", type=int, default=7)
+    args = p.parse_args(argv)
+
+    simple_engine.fetch_page = _in_memory_fetch(_site(args.pages))
+    variants = {
+        "none": list,
+        "installed, no hooks": lambda: [NoHooks()],
+        "pass-through x1": lambda: [PassThrough()],
+        "pass-through x5": lambda: [PassThrough() for _ in range(5)],
+    }
+    # Rounds interleave the variants so machine noise hits them alike; the best run counts.
+    best: Dict[str, float] = {}
+    for _ in range(args.repeat):
+        for name, make in variants.items():
+            elapsed = asyncio.run(_crawl(args.pages, make()))
+            best[name] = min(best.get(name, elapsed), elapsed)
+    baseline = best["none"] / (args.pages + 1) * 1e6
+    for name, elapsed in best.items():
+        per_page = elapsed / (args.pages + 1) * 1e6
+        print(f"{name:<20} {per_page:8.1f} us/page  ({per_page - baseline:+.1f} vs none)")
+
+if __name__ == "__main__":
+    main()
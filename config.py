@@ -5,6 +5,7 @@ from typing import List, Optional, Dict, Any
 from pathlib import Path
 import os
 import json
+import re
 
 from version import __version__, CONFIG_SCHEMA_VERSION
 
@@ -28,10 +29,103 @@ class CrawlConfig:
     exporter: str = "export.json_exporter:JSONExporter"
     # Extra adapters (dotted class paths) to register at startup
     extra_adapters: List[str] = field(default_factory=list)
+    # Engine middleware (dotted paths, see engines.middleware) run in order around fetch, parse
+    # and product stages; plugins in the "ecom_crawler.middlewares" entry-point group are added.
+    middlewares: List[str] = field(default_factory=list)
     # Where to write results
     output_path: str = "output/product_urls.json"
     # Optional keyword filters used to keep products matching user intent (e.g. "headphone")
     keywords: Optional[List[str]] = None
+    # Extra keywords, one per line ("#" starts a comment); merged into ``keywords`` by
+    # load_keywords_file(), which from_env/from_file, the CLI and the API call after overrides.
+    keywords_file: Optional[str] = None
+    # Adaptive concurrency (AIMD): max_concurrency is the starting global limit, which then moves
+    # within [min_concurrency, adaptive_max_concurrency]; each host starts at per_host_concurrency.
+    adaptive_concurrency: bool = False
+    min_concurrency: int = 1
+    adaptive_max_concurrency: int = 64
+    per_host_concurrency: int = 4
+    max_per_host_concurrency: int = 16
+    # Near-duplicate detection: skip listing pages within near_duplicate_distance bits (64-bit
+    # SimHash) of an earlier page on the host and learn query params that only create mirrors.
+    skip_near_duplicates: bool = False
+    near_duplicate_distance: int = 3
+    # Checkpointing: frontier, seen set and products are written here every checkpoint_interval
+    # seconds and on shutdown; an existing checkpoint is resumed. shutdown_grace bounds the drain.
+    checkpoint_path: Optional[str] = None
+    checkpoint_interval: float = 60.0
+    shutdown_grace: float = 10.0
+    # Crawl budgets (0 = unlimited): stop after deadline_seconds of wall time, max_pages fetched
+    # pages or max_products unique products and return what was found, with the reason in the
+    # report.
+    deadline_seconds: float = 0.0
+    max_pages: int = 0
+    max_products: int = 0
+    # Keyword fan-out: search-result URL templates with a ``{keyword}`` placeholder; every
+    # template x keyword pair becomes a start page and its products are tagged with the keyword.
+    search_url_templates: List[str] = field(default_factory=list)
+    # Incremental recrawl: per-URL fingerprints persisted here (JSON, gzipped if it ends in .gz).
+    recrawl_state_path: Optional[str] = None
+    recrawl_min_interval: float = 3600.0
+    recrawl_max_interval: float = 7 * 86400.0
+    # Sitemap discovery: explicit sitemap URLs, else robots.txt ``Sitemap:`` lines / /sitemap.xml.
+    use_sitemaps: bool = False
+    sitemap_urls: List[str] = field(default_factory=list)
+    sitemap_max_urls: int = 100_000
+    # Link pruning before enqueue: regexes matched against the full URL (one per line in the
+    # CRAWLER_INCLUDE_PATTERNS / CRAWLER_EXCLUDE_PATTERNS env vars). ``None`` keeps the built-in
+    # defaults (skip login/cart/checkout pages and static assets); ``[]`` disables them.
+    include_patterns: List[str] = field(default_factory=list)
+    exclude_patterns: Optional[List[str]] = None
+    blocked_extensions: Optional[List[str]] = None
+    # Browser engine (engines.browser_engine:BrowserCrawlEngine): "hybrid" renders only pages
+    # where the HTTP path found no products, "always" renders every page.
+    browser_mode: str = "hybrid"
+    browser_pool_size: int = 4
+    browser_contexts: int = 2
+    browser_block_resources: List[str] = field(default_factory=lambda: ["image", "font", "media"])
+    # robots.txt compliance (rules cached per host for robots_cache_ttl seconds).
+    respect_robots: bool = True
+    robots_cache_ttl: float = 3600.0
+    max_crawl_delay: float = 30.0
+    # Marketplace API sources (dotted paths, e.g. "apis.jd_union:JdUnionClient") queried for
+    # ``keywords`` alongside the crawl; credentials come from each client's from_env().
+    api_sources: List[str] = field(default_factory=list)
+    api_pages: int = 1
+    # Shared frontier for multi-process crawls ("redis://host:6379/0"); None keeps it in-process.
+    # Processes with the same namespace share one queue and seen set ("set" or "bloom" dedup);
+    # pages leased by a process that dies are re-queued after frontier_lease_seconds. None derives
+    # the namespace from the seeds (same config = same crawl); a finished crawl deletes its keys.
+    frontier_url: Optional[str] = None
+    frontier_namespace: Optional[str] = None
+    frontier_dedup: str = "set"
+    frontier_lease_seconds: float = 300.0
+    frontier_batch_size: int = 32
+    # Memory budgets (0 = unbounded). Past max_queue_size the lowest-priority half of the local
+    # frontier spills to sorted runs on disk; fetches wait while fetched-but-unparsed HTML exceeds
+    # max_pending_html_bytes; past max_buffered_products products are moved to a spill file that
+    # checkpoints and exporters read back one product at a time. Spill files go to spill_dir
+    # (default: the system temp dir) and are removed once the report is dropped.
+    max_queue_size: int = 0
+    max_pending_html_bytes: int = 0
+    max_buffered_products: int = 0
+    spill_dir: Optional[str] = None
+    # Profiling: time adapter parse calls per host and parsing helpers (plus profile_functions,
+    # "module:func" or "module:Class.method"), sample event-loop lag, and either sample stacks
+    # ("sample", collapsed stacks for flamegraphs) or run cProfile ("cprofile"); "timers" does
+    # neither. Reports go to profile_output + ".txt" / ".folded" / ".pstats".
+    profile: bool = False
+    profile_mode: str = "sample"
+    profile_output: str = "output/profile"
+    profile_functions: List[str] = field(default_factory=list)
+    # Page archive: every fetched page is appended to WARC segments in archive_dir ("gzip" or
+    # "zstd", rotated at archive_segment_mb) with an offset index. engines.replay:ReplayEngine
+    # re-parses replay_archive with the current adapters on replay_workers processes (0 = cores).
+    archive_dir: Optional[str] = None
+    archive_compression: str = "gzip"
+    archive_segment_mb: int = 256
+    replay_archive: Optional[str] = None
+    replay_workers: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -52,7 +146,14 @@ class CrawlConfig:
         def _get(name: str, default: str) -> str:
             return os.getenv(name, default)
 
-        return cls(
+        def _flag(name: str) -> bool:
+            return _get(name, "").lower() in ("1", "true", "yes")
+
+        def _patterns(name: str) -> List[str]:
+            # One regex per line: commas are common inside patterns ("\d{1,3}").
+            return [p.strip() for p in _get(name, "").splitlines() if p.strip()]
+
+        config = cls(
             start_urls=start_urls,
             allowed_domains=allowed_domains,
             max_depth=int(_get("CRAWLER_MAX_DEPTH", "2")),
@@ -62,10 +163,88 @@ class CrawlConfig:
             user_agent=_get("CRAWLER_USER_AGENT", f"ecom_crawler/{__version__}"),
             engine=_get("CRAWLER_ENGINE", "engines.simple_engine:SimpleCrawlEngine"),
             exporter=_get("CRAWLER_EXPORTER", "export.json_exporter:JSONExporter"),
-            extra_adapters=[a.strip() for a in _get("CRAWLER_EXTRA_ADAPTERS", "").split(",") if a.strip()],
+            extra_adapters=[
+                a.strip() for a in _get("CRAWLER_EXTRA_ADAPTERS", "").split(",") if a.strip()
+            ],
+            middlewares=[
+                m.strip() for m in _get("CRAWLER_MIDDLEWARES", "").split(",") if m.strip()
+            ],
             output_path=_get("CRAWLER_OUTPUT_PATH", "output/product_urls.json"),
-            keywords=[k.strip() for k in _get("CRAWLER_KEYWORDS", "").split(",") if k.strip()] or None,
+            adaptive_concurrency=_flag("CRAWLER_ADAPTIVE_CONCURRENCY"),
+            min_concurrency=int(_get("CRAWLER_MIN_CONCURRENCY", "1")),
+            adaptive_max_concurrency=int(_get("CRAWLER_ADAPTIVE_MAX_CONCURRENCY", "64")),
+            per_host_concurrency=int(_get("CRAWLER_PER_HOST_CONCURRENCY", "4")),
+            max_per_host_concurrency=int(_get("CRAWLER_MAX_PER_HOST_CONCURRENCY", "16")),
+            skip_near_duplicates=_flag("CRAWLER_SKIP_NEAR_DUPLICATES"),
+            near_duplicate_distance=int(_get("CRAWLER_NEAR_DUPLICATE_DISTANCE", "3")),
+            checkpoint_path=_get("CRAWLER_CHECKPOINT", "") or None,
+            checkpoint_interval=float(_get("CRAWLER_CHECKPOINT_INTERVAL", "60")),
+            shutdown_grace=float(_get("CRAWLER_SHUTDOWN_GRACE", "10")),
+            deadline_seconds=float(_get("CRAWLER_DEADLINE_SECONDS", "0")),
+            max_pages=int(_get("CRAWLER_MAX_PAGES", "0")),
+            max_products=int(_get("CRAWLER_MAX_PRODUCTS", "0")),
+            keywords=[
+                k.strip() for k in _get("CRAWLER_KEYWORDS", "").split(",") if k.strip()
+            ]
+            or None,
+            keywords_file=_get("CRAWLER_KEYWORDS_FILE", "") or None,
+            search_url_templates=[
+                t.strip() for t in _get("CRAWLER_SEARCH_URL_TEMPLATES", "").split(",") if t.strip()
+            ],
+            recrawl_state_path=_get("CRAWLER_RECRAWL_STATE", "") or None,
+            recrawl_min_interval=float(_get("CRAWLER_RECRAWL_MIN_INTERVAL", "3600")),
+            recrawl_max_interval=float(_get("CRAWLER_RECRAWL_MAX_INTERVAL", str(7 * 86400))),
+            use_sitemaps=_flag("CRAWLER_USE_SITEMAPS"),
+            sitemap_urls=[
+                u.strip() for u in _get("CRAWLER_SITEMAP_URLS", "").split(",") if u.strip()
+            ],
+            sitemap_max_urls=int(_get("CRAWLER_SITEMAP_MAX_URLS", "100000")),
+            include_patterns=_patterns("CRAWLER_INCLUDE_PATTERNS"),
+            exclude_patterns=_patterns("CRAWLER_EXCLUDE_PATTERNS") or None,
+            blocked_extensions=[
+                e.strip() for e in _get("CRAWLER_BLOCKED_EXTENSIONS", "").split(",") if e.strip()
+            ]
+            or None,
+            browser_mode=_get("CRAWLER_BROWSER_MODE", "hybrid"),
+            browser_pool_size=int(_get("CRAWLER_BROWSER_POOL_SIZE", "4")),
+            browser_contexts=int(_get("CRAWLER_BROWSER_CONTEXTS", "2")),
+            browser_block_resources=[
+                r.strip()
+                for r in _get("CRAWLER_BROWSER_BLOCK_RESOURCES", "image,font,media").split(",")
+                if r.strip()
+            ],
+            respect_robots=(
+                _get("CRAWLER_RESPECT_ROBOTS", "true").lower() not in ("0", "false", "no")
+            ),
+            robots_cache_ttl=float(_get("CRAWLER_ROBOTS_CACHE_TTL", "3600")),
+            max_crawl_delay=float(_get("CRAWLER_MAX_CRAWL_DELAY", "30")),
+            api_sources=[
+                a.strip() for a in _get("CRAWLER_API_SOURCES", "").split(",") if a.strip()
+            ],
+            api_pages=int(_get("CRAWLER_API_PAGES", "1")),
+            frontier_url=_get("CRAWLER_FRONTIER_URL", "") or None,
+            frontier_namespace=_get("CRAWLER_FRONTIER_NAMESPACE", "") or None,
+            frontier_dedup=_get("CRAWLER_FRONTIER_DEDUP", "set"),
+            frontier_lease_seconds=float(_get("CRAWLER_FRONTIER_LEASE_SECONDS", "300")),
+            frontier_batch_size=int(_get("CRAWLER_FRONTIER_BATCH_SIZE", "32")),
+            max_queue_size=int(_get("CRAWLER_MAX_QUEUE_SIZE", "0")),
+            max_pending_html_bytes=int(_get("CRAWLER_MAX_PENDING_HTML_BYTES", "0")),
+            max_buffered_products=int(_get("CRAWLER_MAX_BUFFERED_PRODUCTS", "0")),
+            spill_dir=_get("CRAWLER_SPILL_DIR", "") or None,
+            profile=_flag("CRAWLER_PROFILE"),
+            profile_mode=_get("CRAWLER_PROFILE_MODE", "sample"),
+            profile_output=_get("CRAWLER_PROFILE_OUTPUT", "output/profile"),
+            profile_functions=[
+                f.strip() for f in _get("CRAWLER_PROFILE_FUNCTIONS", "").split(",") if f.strip()
+            ],
+            archive_dir=_get("CRAWLER_ARCHIVE_DIR", "") or None,
+            archive_compression=_get("CRAWLER_ARCHIVE_COMPRESSION", "gzip"),
+            archive_segment_mb=int(_get("CRAWLER_ARCHIVE_SEGMENT_MB", "256")),
+            replay_archive=_get("CRAWLER_REPLAY_ARCHIVE", "") or None,
+            replay_workers=int(_get("CRAWLER_REPLAY_WORKERS", "0")),
         )
+        config.load_keywords_file()
+        return config
 
     @classmethod
     def from_file(cls, path: str | os.PathLike[str]) -> "CrawlConfig":
@@ -75,17 +254,92 @@ class CrawlConfig:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
         data = migrate_config(data)
-        return cls(**data)
+        config = cls(**data)
+        config.load_keywords_file()
+        return config
 
     # ---------- Validation ----------
 
+    def load_keywords_file(self) -> None:
+        """Merge ``keywords_file`` into ``keywords`` (idempotent; call again after overrides)."""
+        if not self.keywords_file:
+            return
+        with open(self.keywords_file, "r", encoding="utf-8") as f:
+            lines = [line.split("#", 1)[0].strip() for line in f]
+        self.keywords = list(dict.fromkeys([*(self.keywords or []), *filter(None, lines)])) or None
+
     def validate(self) -> None:
-        if not self.start_urls:
+        if not (
+            self.start_urls or self.search_url_templates or self.api_sources or self.replay_archive
+        ):
             raise ValueError("start_urls cannot be empty; provide at least one URL.")
+        if (self.api_sources or self.search_url_templates) and not self.keywords:
+            raise ValueError("api_sources and search_url_templates need keywords to search for")
+        for template in self.search_url_templates:
+            if "{keyword}" not in template:
+                raise ValueError(f"search URL template {template!r} has no {{keyword}} placeholder")
+        if self.api_pages <= 0:
+            raise ValueError("api_pages must be > 0")
         if self.max_depth < 0:
             raise ValueError("max_depth must be >= 0")
         if self.max_concurrency <= 0:
             raise ValueError("max_concurrency must be > 0")
+        if self.adaptive_concurrency and not (
+            0 < self.min_concurrency <= self.max_concurrency <= self.adaptive_max_concurrency
+        ):
+            raise ValueError(
+                "adaptive concurrency needs "
+                "0 < min_concurrency <= max_concurrency <= adaptive_max_concurrency"
+            )
+        if (
+            self.adaptive_concurrency
+            and not 0 < self.per_host_concurrency <= self.max_per_host_concurrency
+        ):
+            raise ValueError(
+                "adaptive concurrency needs 0 < per_host_concurrency <= max_per_host_concurrency"
+            )
+        if self.recrawl_min_interval <= 0 or self.recrawl_max_interval < self.recrawl_min_interval:
+            raise ValueError(
+                "recrawl intervals must satisfy 0 < recrawl_min_interval <= recrawl_max_interval"
+            )
+        for pattern in [*self.include_patterns, *(self.exclude_patterns or [])]:
+            try:
+                re.compile(pattern)
+            except re.error as exc:
+                raise ValueError(f"invalid link pattern {pattern!r}: {exc}") from exc
+        if self.browser_mode not in ("hybrid", "always"):
+            raise ValueError("browser_mode must be 'hybrid' or 'always'")
+        if self.browser_pool_size <= 0:
+            raise ValueError("browser_pool_size must be > 0")
+        if not 0 <= self.near_duplicate_distance < 32:
+            raise ValueError("near_duplicate_distance must be between 0 and 31 bits")
+        if self.shutdown_grace < 0:
+            raise ValueError("shutdown_grace must be >= 0")
+        if min(self.deadline_seconds, self.max_pages, self.max_products) < 0:
+            raise ValueError(
+                "deadline_seconds, max_pages and max_products must be >= 0 (0 = unlimited)"
+            )
+        if self.frontier_dedup not in ("set", "bloom"):
+            raise ValueError("frontier_dedup must be 'set' or 'bloom'")
+        if self.frontier_lease_seconds <= 0 or self.frontier_batch_size <= 0:
+            raise ValueError("frontier_lease_seconds and frontier_batch_size must be > 0")
+        if self.frontier_url and self.checkpoint_path:
+            raise ValueError(
+                "checkpoint_path is for the local frontier; "
+                "a shared frontier keeps its state itself"
+            )
+        if min(self.max_queue_size, self.max_pending_html_bytes, self.max_buffered_products) < 0:
+            raise ValueError("memory budgets must be >= 0 (0 = unbounded)")
+        if 0 < self.max_queue_size < 4:
+            raise ValueError("max_queue_size must be 0 (unbounded) or at least 4")
+        if self.profile_mode not in ("sample", "cprofile", "timers"):
+            raise ValueError("profile_mode must be 'sample', 'cprofile' or 'timers'")
+        if self.archive_compression not in ("gzip", "zstd"):
+            raise ValueError("archive_compression must be 'gzip' or 'zstd'")
+        if self.archive_segment_mb <= 0 or self.replay_workers < 0:
+            raise ValueError("archive_segment_mb must be > 0 and replay_workers >= 0")
+        if self.sitemap_max_urls < 0:
+            raise ValueError("sitemap_max_urls must be >= 0")
         # Validate output path parent exists or is creatable
         parent = Path(self.output_path).parent
         parent.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import glob
+import http
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {"gzip": ".warc.gz", "zstd": ".warc.zst"}
+# Headers describing the wire encoding; archived bodies are the decoded text, re-encoded as UTF-8.
+_DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+_CHARSET = re.compile(r";\s*charset=[^;]*", re.I)
+
+
+def _zstd() -> Any:
+    try:
+        import zstandard
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "zstandard not installed. Install with `pip install zstandard` or use gzip archives."
+        ) from exc
+    return zstandard
+
+
+@dataclass
+class ArchivedPage:
+    url: str
+    status: int
+    headers: Dict[str, str]
+    text: str
+    fetched_at: str = ""
+    depth: int = 0
+    keywords: Tuple[str, ...] = ()
+
+
+@dataclass
+class IndexEntry:
+    """Where one record lives: byte range of its compressed member in a segment file."""
+
+    segment: str
+    offset: int
+    length: int
+    status: int
+    fetched_at: str
+    url: str
+
+
+def _warc_record(page: ArchivedPage) -> bytes:
+    try:
+        reason = http.HTTPStatus(page.status).phrase
+    except ValueError:
+        reason = ""
+    lines = [f"HTTP/1.1 {page.status} {reason}".rstrip()]
+    content_type = "text/html"
+    for name, value in page.headers.items():
+        if name in _DROPPED_HEADERS:
+            continue
+        if name == "content-type":
+            content_type = value
+            continue
+        lines.append(f"{name}: {value}")
+    lines.append(f"content-type: {_CHARSET.sub('', content_type)}; charset=utf-8")
+    block = ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + page.text.encode("utf-8")
+    head = [
+        "WARC/1.1",
+        "WARC-Type: response",
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+        f"WARC-Date: {page.fetched_at}",
+        f"WARC-Target-URI: {page.url}",
+        "Content-Type: application/http; msgtype=response",
+        f"Content-Length: {len(block)}",
+        f"X-Crawl-Depth: {page.depth}",
+    ]
+    if page.keywords:
+        head.append(f"X-Crawl-Keywords: {','.join(page.keywords)}")
+    return ("\r\n".join(head) + "\r\n\r\n").encode("utf-8") + block + b"\r\n\r\n"
+
+
+def _parse_record(raw: bytes) -> ArchivedPage:
+    warc_head, _, rest = raw.partition(b"\r\n\r\n")
+    warc = dict(
+        line.split(": ", 1) for line in warc_head.decode("utf-8").split("\r\n")[1:] if ": " in line
+    )
+    block = rest[: int(warc["Content-Length"])]
+    http_head, _, body = block.partition(b"\r\n\r\n")
+    status_line, *header_lines = http_head.decode("utf-8").split("\r\n")
+    headers = {}
+    for line in header_lines:
+        name, _, value = line.partition(": ")
+        headers[name.lower()] = value
+    keywords = warc.get("X-Crawl-Keywords", "")
+    return ArchivedPage(
+        url=warc["WARC-Target-URI"],
+        status=int(status_line.split(" ", 2)[1]),
+        headers=headers,
+        text=body.decode("utf-8", errors="replace"),
+        fetched_at=warc.get("WARC-Date", ""),
+        depth=int(warc.get("X-Crawl-Depth", "0")),
+        keywords=tuple(k for k in keywords.split(",") if k),
+    )
+
+
+class ArchiveWriter:
+    """
+    Appends fetched pages to rotating WARC segment files in ``directory``.
+
+    Every record is its own gzip member (or zstd frame), so segments stay valid ``.warc.gz`` /
+    ``.warc.zst`` files for standard WARC tools, while ``<segment>.idx`` lines
+    (``offset<TAB>length<TAB>date<TAB>status<TAB>url``) let readers seek straight to one
+    record. Compression and disk I/O run on a background thread; :meth:`write` only blocks
+    when ``max_pending`` records are already queued. Segments rotate once they reach
+    ``segment_bytes`` and are named by run start time and pid, so runs can share a directory.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        compression: str = "gzip",
+        segment_bytes: int = 256 << 20,
+        level: Optional[int] = None,
+        max_pending: int = 256,
+    ) -> None:
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"unknown archive compression {compression!r}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.compression = compression
+        self.segment_bytes = segment_bytes
+        if compression == "zstd":
+            self._compress = (
+                _zstd().ZstdCompressor(level=level if level is not None else 3).compress
+            )
+        else:
+            gzip_level = level if level is not None else 6
+            self._compress = lambda data: _gzip_member(data, gzip_level)
+        # Run start (to the microsecond) plus pid: names sort by run and never collide.
+        self._prefix = os.path.join(directory, f"pages-{_timestamp('%Y%m%dT%H%M%S')}-{os.getpid()}")
+        self._queue: "queue.Queue[Optional[ArchivedPage]]" = queue.Queue(maxsize=max_pending)
+        self._segment: Optional[Any] = None
+        self._index: Optional[Any] = None
+        self._segment_no = -1
+        self._segment_size = 0
+        self.stats: Dict[str, int] = {
+            "records": 0,
+            "raw_bytes": 0,
+            "written_bytes": 0,
+            "segments": 0,
+            "queue_full": 0,  # write(block=False) calls that found the queue full
+        }
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="archive-writer", daemon=True)
+        self._thread.start()
+
+    def write(
+        self,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        text: str,
+        depth: int = 0,
+        keywords: Sequence[str] = (),
+        *,
+        block: bool = True,
+    ) -> bool:
+        """
+        Queue one page. With ``block=False`` this never waits: it returns False when
+        ``max_pending`` records are already queued, and the caller decides how to wait.
+        """
+        if self.error is not None:
+            return True
+        fetched_at = _timestamp("%Y-%m-%dT%H:%M:%S") + "Z"
+        page = ArchivedPage(url, status, headers, text, fetched_at, depth, tuple(keywords))
+        if block:
+            self._queue.put(page)
+            return True
+        try:
+            self._queue.put_nowait(page)
+        except queue.Full:
+            self.stats["queue_full"] += 1
+            return False
+        return True
+
+    def close(self) -> None:
+        """Flush queued records and close the files (blocking; call via ``asyncio.to_thread``)."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            page = self._queue.get()
+            if page is None:
+                break
+            if self.error is not None:
+                continue
+            try:
+                self._append(page)
+            except Exception as exc:
+                logger.error("Archive writer stopped: %r", exc)
+                self.error = exc
+        for f in (self._segment, self._index):
+            if f is not None:
+                f.close()
+
+    def _append(self, page: ArchivedPage) -> None:
+        raw = _warc_record(page)
+        member = self._compress(raw)
+        if self._segment is None or self._segment_size >= self.segment_bytes:
+            self._rotate()
+        assert self._segment is not None and self._index is not None
+        self._segment.write(member)
+        self._index.write(f"{self._segment_size}\t{len(member)}\t{page.fetched_at}\t{page.status}\t{page.url}\n")
+        self._segment_size += len(member)
+        self.stats["records"] += 1
+        self.stats["raw_bytes"] += len(raw)
+        self.stats["written_bytes"] += len(member)
+        if self._queue.empty():
+            # Idle: make what we have durable, so a crash loses at most the queued records.
+            self._segment.flush()
+            self._index.flush()
+
+    def _rotate(self) -> None:
+        for f in (self._segment, self._index):
+            if f is not None:
+                f.close()
+        self._segment_no += 1
+        path = f"{self._prefix}-{self._segment_no:05d}{_EXTENSIONS[self.compression]}"
+        self._segment = open(path, "wb")
+        self._index = open(path + ".idx", "w", encoding="utf-8")
+        self._segment_size = 0
+        self.stats["segments"] += 1
+
+
+def _timestamp(fmt: str) -> str:
+    now = time.time()
+    return f"{time.strftime(fmt, time.gmtime(now))}.{int(now % 1 * 1e6):06d}"
+
+
+def _gzip_member(data: bytes, level: int) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _newer(entry: IndexEntry, current: Optional[IndexEntry]) -> bool:
+    # ISO timestamps compare as strings; on a tie the later record in index order wins.
+    return current is None or entry.fetched_at >= current.fetched_at
+
+
+class ArchiveReader:
+    """Reads an archive directory (or single segment) written by :class:`ArchiveWriter`."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._handles: Dict[str, Any] = {}
+        self._zstd: Any = None
+
+    def segments(self) -> List[str]:
+        if os.path.isfile(self.path):
+            return [self.path]
+        found = [
+            p for ext in _EXTENSIONS.values() for p in glob.glob(os.path.join(self.path, f"*{ext}"))
+        ]
+        return sorted(found)
+
+    def iter_index(self) -> Iterator[IndexEntry]:
+        for segment in self.segments():
+            try:
+                f = open(segment + ".idx", "r", encoding="utf-8")
+            except FileNotFoundError:
+                logger.warning("Archive segment %s has no index; skipped", segment)
+                continue
+            with f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t", 4)
+                    if len(parts) == 5:
+                        yield IndexEntry(
+                            segment, int(parts[0]), int(parts[1]), int(parts[3]), parts[2], parts[4]
+                        )
+
+    def read(self, entry: IndexEntry) -> ArchivedPage:
+        f = self._handles.get(entry.segment)
+        if f is None:
+            f = self._handles[entry.segment] = open(entry.segment, "rb")
+        f.seek(entry.offset)
+        member = f.read(entry.length)
+        if entry.segment.endswith(_EXTENSIONS["zstd"]):
+            if self._zstd is None:
+                self._zstd = _zstd().ZstdDecompressor()
+            raw = self._zstd.decompress(member)
+        else:
+            raw = zlib.decompress(member, 16 + zlib.MAX_WBITS)
+        return _parse_record(raw)
+
+    def latest_entries(self) -> List[IndexEntry]:
+        """
+        One entry per URL, its most recent copy (runs may share a directory), in fetch order.
+        Holds one index entry per distinct URL in memory.
+        """
+        latest: Dict[str, IndexEntry] = {}
+        for entry in self.iter_index():
+            if _newer(entry, latest.get(entry.url)):
+                latest[entry.url] = entry
+        return sorted(latest.values(), key=lambda e: e.fetched_at)
+
+    def get(self, url: str) -> Optional[ArchivedPage]:
+        """Latest archived copy of ``url`` (scans the indexes)."""
+        latest: Optional[IndexEntry] = None
+        for entry in self.iter_index():
+            if entry.url == url and _newer(entry, latest):
+                latest = entry
+        return self.read(latest) if latest is not None else None
+
+    def __iter__(self) -> Iterator[ArchivedPage]:
+        for entry in self.iter_index():
+            yield self.read(entry)
+
+    def close(self) -> None:
+        for f in self._handles.values():
+            f.close()
+        self._handles.clear()
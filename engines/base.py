@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Set
+from typing import Any, Dict, Mapping, Optional, Sequence, Set
 from abc import ABC, abstractmethod
 
 from ..adapters.base import ProductInfo
@@ -9,8 +9,14 @@ from ..adapters.base import ProductInfo
 
 @dataclass
 class CrawlReport:
-    discovered: Dict[str, List[ProductInfo]] = field(default_factory=dict)  # domain -> product metadata
+    # domain -> product metadata; a read-only view streaming from disk when products were spilled.
+    discovered: Mapping[str, Sequence[ProductInfo]] = field(default_factory=dict)
     visited_count: int = 0
+    # Free-form per-feature counters (e.g. recrawl skips); safe to ignore.
+    stats: Dict[str, Any] = field(default_factory=dict)
+    # Why the crawl ended early ("deadline", "max_pages", "max_products", "stopped"); None if it
+    # ran out of URLs.
+    stop_reason: Optional[str] = None
 
 
 class CrawlEngine(ABC):
@@ -20,3 +26,6 @@ class CrawlEngine(ABC):
     @abstractmethod
     async def crawl(self) -> CrawlReport:  # pragma: no cover - interface
         ...
+
+    def request_stop(self) -> None:
+        """Ask a running crawl to wind down and return partial results; ignored by default."""
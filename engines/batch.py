@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from aiohttp import ClientSession
+
+from ..adapters.registry import AdapterRegistry
+from ..config import CrawlConfig
+from ..utils.http import create_session
+from ..utils.loader import load_symbol
+from ..utils.robots import RobotsManager
+from ..utils.signals import install_stop_handlers
+from ..utils.throttling import FairShareBudget, HostThrottle
+from .base import CrawlReport
+
+logger = logging.getLogger(__name__)
+
+
+class SharedResources:
+    """
+    What crawls in one batch share: the HTTP session (connection pool and DNS cache), the
+    adapter registry, one host throttle (so Crawl-delay holds across crawls hitting the same
+    host), robots.txt caches and the global concurrency budget.
+
+    Engines that accept ``shared=`` take these instead of building their own and leave
+    closing them to the owner (:meth:`close`).
+    """
+
+    def __init__(
+        self,
+        *,
+        global_concurrency: int = 100,
+        dns_cache_ttl: int = 300,
+        max_crawl_delay: float = 30.0,
+        registry: Optional[AdapterRegistry] = None,
+    ) -> None:
+        self.budget = FairShareBudget(global_concurrency)
+        self.registry = registry or AdapterRegistry()
+        self.throttle = HostThrottle(max_delay=max_crawl_delay)
+        self.dns_cache_ttl = dns_cache_ttl
+        self._session: Optional[ClientSession] = None
+        self._robots: Dict[Tuple[str, bool, float, float], RobotsManager] = {}
+        self._adapters: Set[str] = set()
+
+    @property
+    def session(self) -> ClientSession:
+        # Created lazily: aiohttp sessions must be made on the loop that uses them.
+        if self._session is None:
+            self._session = create_session(dns_cache_ttl=self.dns_cache_ttl)
+        return self._session
+
+    def robots_for(self, cfg: CrawlConfig) -> RobotsManager:
+        """One robots.txt cache per user agent and cache settings, shared by the crawls using it."""
+        key = (cfg.user_agent, cfg.respect_robots, cfg.robots_cache_ttl, cfg.request_timeout)
+        robots = self._robots.get(key)
+        if robots is None:
+            robots = self._robots[key] = RobotsManager(
+                self.session,
+                user_agent=cfg.user_agent,
+                ttl=cfg.robots_cache_ttl,
+                timeout=cfg.request_timeout,
+                throttle=self.throttle if cfg.respect_robots else None,
+            )
+        return robots
+
+    def register_adapters(self, dotted_paths: Iterable[str]) -> None:
+        """
+        Register ``extra_adapters`` once per dotted path; adapters match by URL, so all crawls
+        see them.
+        """
+        for dotted in dotted_paths:
+            if dotted in self._adapters:
+                continue
+            self._adapters.add(dotted)
+            try:
+                self.registry.register(load_symbol(dotted)())
+            except Exception as exc:
+                logger.warning("Failed to load adapter %s: %r", dotted, exc)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one crawl in a batch; ``error`` is set (and ``report`` None) if it failed."""
+
+    name: str
+    output_path: str
+    report: Optional[CrawlReport] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def product_count(self) -> int:
+        return (
+            sum(len(v) for v in self.report.discovered.values()) if self.report is not None else 0
+        )
+
+
+def config_paths(paths: Sequence[str]) -> List[Path]:
+    """Expand directories to their ``*.json`` files (sorted); files are kept as given."""
+    found: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        found.extend(sorted(path.glob("*.json")) if path.is_dir() else [path])
+    return found
+
+
+class BatchRunner:
+    """
+    Runs many crawl configs concurrently in one process over :class:`SharedResources`.
+
+    Each crawl joins the global budget with its ``max_concurrency`` as demand and gets a
+    max-min fair share, recomputed as crawls start and finish. A failing crawl is logged and
+    reported without stopping the others; each finished crawl is exported right away (off the
+    event loop) to its own ``output_path``. Outputs that collide get the config name added.
+    """
+
+    def __init__(
+        self,
+        configs: List[Tuple[str, CrawlConfig]],
+        *,
+        global_concurrency: int = 100,
+        max_parallel: Optional[int] = None,
+    ) -> None:
+        self.configs = configs
+        self.global_concurrency = global_concurrency
+        # Cap on crawls running at once (None = all); the rest wait for a free slot.
+        self.max_parallel = max_parallel
+        self.results: List[BatchResult] = []
+        self._engines: List[Any] = []
+        self._stopping = False
+
+    @classmethod
+    def from_paths(cls, paths: Sequence[str], **kwargs: Any) -> "BatchRunner":
+        configs = []
+        for path in config_paths(paths):
+            cfg = CrawlConfig.from_file(path)
+            cfg.validate()
+            configs.append((path.stem, cfg))
+        if not configs:
+            raise ValueError(f"no crawl configs found in {', '.join(paths)}")
+        return cls(configs, **kwargs)
+
+    def _assign_outputs(self) -> None:
+        counts: Dict[str, int] = {}
+        profiles: Dict[str, int] = {}
+        for _, cfg in self.configs:
+            counts[cfg.output_path] = counts.get(cfg.output_path, 0) + 1
+            if cfg.profile:
+                profiles[cfg.profile_output] = profiles.get(cfg.profile_output, 0) + 1
+        for name, cfg in self.configs:
+            if counts[cfg.output_path] > 1:
+                root, ext = os.path.splitext(cfg.output_path)
+                cfg.output_path = f"{root}.{name}{ext}"
+            if cfg.profile and profiles[cfg.profile_output] > 1:
+                cfg.profile_output = f"{cfg.profile_output}.{name}"
+
+    def request_stop(self) -> None:
+        """
+        Stop every running crawl (each drains and exports partial results); queued ones don't
+        start.
+        """
+        self._stopping = True
+        for engine in self._engines:
+            engine.request_stop()
+
+    async def run(self) -> List[BatchResult]:
+        self._assign_outputs()
+        shared = SharedResources(
+            global_concurrency=self.global_concurrency,
+            max_crawl_delay=max(cfg.max_crawl_delay for _, cfg in self.configs),
+        )
+        gate = asyncio.Semaphore(self.max_parallel or len(self.configs))
+        install_stop_handlers(self.request_stop)
+        try:
+            self.results = list(
+                await asyncio.gather(
+                    *(self._run_one(name, cfg, shared, gate) for name, cfg in self.configs)
+                )
+            )
+        finally:
+            await shared.close()
+        return self.results
+
+    async def _run_one(
+        self, name: str, cfg: CrawlConfig, shared: SharedResources, gate: asyncio.Semaphore
+    ) -> BatchResult:
+        result = BatchResult(name=name, output_path=cfg.output_path)
+        async with gate:
+            if self._stopping:
+                result.error = "not started (batch stopped)"
+                return result
+            started = time.monotonic()
+            try:
+                engine_cls = load_symbol(cfg.engine)
+                shared.register_adapters(cfg.extra_adapters)
+                kwargs: Dict[str, Any] = {"registry": shared.registry}
+                if "shared" in inspect.signature(engine_cls).parameters:
+                    kwargs["shared"] = shared
+                else:
+                    logger.info("Engine %s runs with its own session and limits", cfg.engine)
+                engine = engine_cls(cfg, **kwargs)
+                self._engines.append(engine)
+                try:
+                    result.report = await engine.crawl()
+                finally:
+                    self._engines.remove(engine)
+                exporter = load_symbol(cfg.exporter)()
+                await asyncio.to_thread(exporter.export, result.report.discovered, cfg.output_path)
+            except Exception as exc:
+                logger.exception("Crawl %s failed", name)
+                result.error = repr(exc)
+            result.elapsed = time.monotonic() - started
+        logger.info("Crawl %s: %s products, %.1fs%s", name, result.product_count, result.elapsed,
+                    f" (failed: {result.error})" if result.error else f" -> {result.output_path}")
+        return result
@@ -1,12 +1,254 @@
-# engines/browser_engine.py
-from pathlib import Path
-import os, sys
-
-def app_data_dir() -> Path:
-    base = os.getenv("LOCALAPPDATA") or str(Path.home() / ".ecom-crawler")
-    p = Path(base) / "ecom-crawler"
-    p.mkdir(parents=True, exist_ok=True)
-    return p
-
-BROWSERS_DIR = app_data_dir() / "ms-playwright"
-os.environ.setdefault("PLAYWRIGHT_BROWSERS_PATH", str(BROWSERS_DIR))
+# engines/browser_engine.py
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+from aiohttp import ClientSession
+
+from .base import CrawlReport
+from .middleware import PageRequest
+from .recrawl import PageFingerprint
+from .simple_engine import SimpleCrawlEngine, _QueueItem
+from ..adapters.base import ParseResult, SiteAdapter
+from ..adapters.registry import AdapterRegistry
+from ..config import CrawlConfig
+from ..utils.http import FetchResult
+from ..utils.throttling import ResizableSemaphore
+
+if TYPE_CHECKING:
+    from .batch import SharedResources
+
+logger = logging.getLogger(__name__)
+
+
+def app_data_dir() -> Path:
+    base = os.getenv("LOCALAPPDATA") or str(Path.home() / ".ecom-crawler")
+    p = Path(base) / "ecom-crawler"
+    p.mkdir(parents=True, exist_ok=True)
+    return p
+
+BROWSERS_DIR = app_data_dir() / "ms-playwright"
+os.environ.setdefault("PLAYWRIGHT_BROWSERS_PATH", str(BROWSERS_DIR))
+
+
+class BrowserPool:
+    """
+    Bounded pool of reusable Playwright pages spread over a few browser contexts.
+
+    Pages are created once and handed out through a queue, so concurrency is capped by
+    ``size`` and navigation never pays context/page start-up. Requests for blocked
+    resource types (images, fonts, media by default) are aborted at the context level.
+    A page that errors is closed and replaced so one bad site can't poison the pool.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int = 4,
+        contexts: int = 2,
+        block_resources: Optional[List[str]] = None,
+        user_agent: Optional[str] = None,
+        headless: bool = True,
+    ) -> None:
+        self.size = max(1, size)
+        self.context_count = max(1, min(contexts, self.size))
+        self.block_resources = set(block_resources or [])
+        self.user_agent = user_agent
+        self.headless = headless
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._contexts: List[Any] = []
+        self._pages: "asyncio.Queue[Any]" = asyncio.Queue()
+        self._page_context: Dict[int, Any] = {}
+        self.blocked_requests = 0
+
+    async def start(self) -> "BrowserPool":
+        try:
+            from playwright.async_api import async_playwright
+        except Exception as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "Playwright not installed. Install with "
+                "`pip install playwright && playwright install chromium` "
+                "or use the default HTTP engine."
+            ) from exc
+
+        self._playwright = await async_playwright().start()
+        try:
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            for _ in range(self.context_count):
+                context = await self._browser.new_context(user_agent=self.user_agent)
+                if self.block_resources:
+                    await context.route("**/*", self._route)
+                self._contexts.append(context)
+            for i in range(self.size):
+                await self._add_page(self._contexts[i % self.context_count])
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def close(self) -> None:
+        for context in self._contexts:
+            with contextlib.suppress(Exception):
+                await context.close()
+        if self._browser is not None:
+            with contextlib.suppress(Exception):
+                await self._browser.close()
+        if self._playwright is not None:
+            with contextlib.suppress(Exception):
+                await self._playwright.stop()
+        self._contexts.clear()
+
+    async def _route(self, route: Any) -> None:
+        if route.request.resource_type in self.block_resources:
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _add_page(self, context: Any) -> None:
+        page = await context.new_page()
+        self._page_context[id(page)] = context
+        self._pages.put_nowait(page)
+
+    @contextlib.asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        page = await self._pages.get()
+        healthy = True
+        try:
+            yield page
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                self._pages.put_nowait(page)
+            else:
+                context = self._page_context.pop(id(page))
+                with contextlib.suppress(Exception):
+                    await page.close()
+                await self._add_page(context)
+
+    async def render(
+        self, url: str, *, timeout: float = 15.0, wait_until: str = "domcontentloaded"
+    ) -> Optional[str]:
+        """Navigate a pooled page to ``url`` and return the rendered HTML (None on failure)."""
+        try:
+            async with self.page() as page:
+                response = await page.goto(url, timeout=timeout * 1000, wait_until=wait_until)
+                if response is not None and response.status >= 400:
+                    return None
+                return await page.content()
+        except Exception as exc:
+            logger.debug("Browser render failed for %s: %r", url, exc)
+            return None
+
+
+class BrowserCrawlEngine(SimpleCrawlEngine):
+    """
+    SimpleCrawlEngine that renders pages in a headless browser.
+
+    ``browser_mode="hybrid"`` (default) keeps the cheap HTTP path and only re-renders a page
+    in the browser when the HTTP fetch fails or its adapter finds no products; ``"always"``
+    renders every page. Pages the recrawl store reuses are never rendered. Renders wait for
+    the host's Crawl-delay, go to the archive and count against ``max_pending_html_bytes``;
+    queueing, link pruning, robots.txt and exports are unchanged.
+    """
+
+    def __init__(
+        self,
+        config: CrawlConfig,
+        registry: AdapterRegistry | None = None,
+        middlewares: Optional[List[Any]] = None,
+        shared: Optional["SharedResources"] = None,
+    ) -> None:
+        super().__init__(config, registry=registry, middlewares=middlewares, shared=shared)
+        self.pool: Optional[BrowserPool] = None
+        self._browser_stats: Dict[str, int] = {"rendered": 0, "escalated": 0, "render_failed": 0}
+
+    async def crawl(self) -> CrawlReport:
+        cfg = self.config
+        self.pool = await BrowserPool(
+            size=cfg.browser_pool_size,
+            contexts=cfg.browser_contexts,
+            block_resources=cfg.browser_block_resources,
+            user_agent=cfg.user_agent,
+        ).start()
+        try:
+            report = await super().crawl()
+        finally:
+            await self.pool.close()
+        report.stats["browser"] = dict(
+            self._browser_stats, blocked_requests=self.pool.blocked_requests
+        )
+        return report
+
+    async def _fetch_and_parse(
+        self,
+        session: ClientSession,
+        sem: Union[asyncio.Semaphore, ResizableSemaphore],
+        item: _QueueItem,
+        adapter: SiteAdapter,
+        request: Optional[PageRequest] = None,
+    ) -> Optional[ParseResult]:
+        # Middleware request/response hooks wrap the HTTP fetch only; parse and product hooks
+        # also see rendered pages.
+        if self.config.browser_mode != "always":
+            return await super()._fetch_and_parse(session, sem, item, adapter, request)
+        await self.html_budget.wait_for_room()
+        return await self._render_and_parse(item, adapter)
+
+    async def _parse_fetched(
+        self,
+        item: _QueueItem,
+        adapter: SiteAdapter,
+        request: Optional[PageRequest],
+        result: Optional[FetchResult],
+        fp: Optional[PageFingerprint],
+        host: str,
+    ) -> Optional[ParseResult]:
+        parsed = await super()._parse_fetched(item, adapter, request, result, fp, host)
+        if result is not None:
+            return parsed
+        # The HTTP fetch failed outright; the browser may still get through.
+        self._browser_stats["escalated"] += 1
+        return await self._render_and_parse(item, adapter)
+
+    async def _parse_page(
+        self, item: _QueueItem, adapter: SiteAdapter, html: str, host: str
+    ) -> Optional[ParseResult]:
+        # Only reached for pages that were fetched and changed, so recrawl reuse (not due,
+        # 304, same hash) never escalates; the recrawl store keeps the rendered result.
+        parsed = await super()._parse_page(item, adapter, html, host)
+        if parsed is not None and (parsed.products or parsed.product_urls):
+            return parsed
+        self._browser_stats["escalated"] += 1
+        rendered = await self._render_and_parse(item, adapter)
+        # Keep the HTTP result's links if rendering fails.
+        return rendered if rendered is not None else parsed
+
+    async def _render_and_parse(
+        self, item: _QueueItem, adapter: SiteAdapter
+    ) -> Optional[ParseResult]:
+        assert self.pool is not None
+        host = urlparse(item.url).netloc
+        if self.config.respect_robots:
+            await self.throttle.wait(host)
+        html = await self.pool.render(item.url, timeout=self.config.request_timeout)
+        if not html:
+            self._browser_stats["render_failed"] += 1
+            return None
+        self._browser_stats["rendered"] += 1
+        await self._archive_page(item, 200, {"content-type": "text/html"}, html)
+        # Counted but not waited for: a hybrid render already holds its HTTP page's bytes.
+        self.html_budget.add(len(html))
+        try:
+            return await super()._parse_page(item, adapter, html, host)
+        finally:
+            self.html_budget.remove(len(html))
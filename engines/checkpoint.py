@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Version 2 stores products as a flat list of [domain, record] pairs (version 1 grouped them
+# per domain) so they can be written straight from the product spool.
+CHECKPOINT_VERSION = 2
+
+# One pending URL: (priority, url, depth, keywords).
+FrontierEntry = Tuple[float, str, int, List[str]]
+
+
+@dataclass
+class CrawlCheckpoint:
+    """
+    Everything needed to resume a crawl: the pending frontier, the seen set, products
+    discovered so far (``(domain, ProductInfo.to_dict())`` pairs in discovery order) and the
+    engine's counters. Stored as one compact JSON document (gzipped when the path ends in
+    ``.gz``); ``products`` may be a one-shot iterator, which :meth:`save` streams.
+    """
+
+    frontier: List[FrontierEntry] = field(default_factory=list)
+    visited: List[str] = field(default_factory=list)
+    products: Iterable[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+    counters: Dict[str, Any] = field(default_factory=dict)
+    saved_at: float = 0.0
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        opener = gzip.open if target.suffix == ".gz" else open
+        self.saved_at = time.time()
+        header = {
+            "version": CHECKPOINT_VERSION,
+            "saved_at": self.saved_at,
+            "frontier": self.frontier,
+            "visited": self.visited,
+            "counters": self.counters,
+        }
+        with opener(tmp, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False, separators=(",", ":"))[:-1])
+            f.write(',"products":[')
+            for i, pair in enumerate(self.products):
+                record = json.dumps(pair, ensure_ascii=False, separators=(",", ":"))
+                f.write(("," if i else "") + record)
+            f.write("]}")
+        os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> Optional["CrawlCheckpoint"]:
+        source = Path(path)
+        if not source.exists():
+            return None
+        opener = gzip.open if source.suffix == ".gz" else open
+        try:
+            with opener(source, "rt", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable checkpoint %s: %r", source, exc)
+            return None
+        if raw.get("version") == 1:
+            grouped = raw.get("discovered", {})
+            raw["products"] = [(domain, r) for domain, records in grouped.items() for r in records]
+        elif raw.get("version") != CHECKPOINT_VERSION:
+            logger.warning(
+                "Ignoring checkpoint %s with unsupported version %r", source, raw.get("version")
+            )
+            return None
+        return cls(
+            frontier=[(float(p), u, int(d), list(k)) for p, u, d, k in raw.get("frontier", [])],
+            visited=list(raw.get("visited", [])),
+            products=[(d, r) for d, r in raw.get("products", [])],
+            counters=dict(raw.get("counters", {})),
+            saved_at=float(raw.get("saved_at", 0.0)),
+        )
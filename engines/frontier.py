@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+
+class Frontier(Protocol[T]):
+    """What the engine needs from a frontier (in-process or shared between processes)."""
+
+    async def put(self, item: T) -> None:
+        ...
+
+    def put_nowait(self, item: T) -> None:
+        ...
+
+    async def get(self) -> T:
+        ...
+
+    def ack(self, item: T) -> None:
+        """``item`` was processed (or skipped); it will not be handed out again."""
+
+    def release(self, item: T) -> None:
+        """``item`` was taken but not processed (e.g. cut off by shutdown)."""
+
+    def empty(self) -> bool:
+        ...
+
+    def qsize(self) -> int:
+        ...
+
+    def snapshot(self) -> List[T]:
+        ...
+
+    async def close(self) -> None:
+        ...
+
+
+class LocalFrontier(asyncio.PriorityQueue, Generic[T]):  # type: ignore[type-arg]
+    """
+    In-process crawl frontier: a priority queue that can also list its pending items,
+    so a checkpoint can capture what is left to crawl without draining the queue.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.peak = 0  # most items held at once
+
+    def _put(self, item: Any) -> None:
+        super()._put(item)  # type: ignore[misc]
+        if len(self._queue) > self.peak:  # type: ignore[attr-defined]
+            self.peak = len(self._queue)  # type: ignore[attr-defined]
+
+    def snapshot(self) -> List[T]:
+        return sorted(self._queue)  # type: ignore[attr-defined]
+
+    def ack(self, item: Any) -> None:
+        self.task_done()
+
+    def release(self, item: Any) -> None:
+        # Unfinished items are kept by the engine's in-flight map (and its checkpoint).
+        self.task_done()
+
+    async def close(self) -> None:
+        return None
+
+
+class SpillingFrontier(LocalFrontier[T]):
+    """
+    In-process frontier that keeps at most ``max_memory`` items in memory.
+
+    When a put goes over the limit, the lowest-priority half is written to disk as a sorted
+    run (JSON lines via ``encode``/``decode``); the best remaining head of all runs is merged
+    back whenever memory drops below a quarter of the limit or a run holds a better item than
+    memory, so items still come out in priority order. Puts never block on the limit.
+    Once more than ``max_open_runs`` runs exist, the smaller half is merged into one run, so
+    open file handles stay bounded however much is spilled.
+    """
+
+    max_open_runs = 32
+
+    def __init__(
+        self,
+        max_memory: int,
+        encode: Callable[[T], List[Any]],
+        decode: Callable[[List[Any]], T],
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        super().__init__()
+        self.max_memory = max(2, max_memory)
+        self._low_water = max(1, self.max_memory // 4)
+        self._encode = encode
+        self._decode = decode
+        self._spill_parent = spill_dir
+        self._dir: Optional[str] = None
+        self._runs: Dict[int, Tuple[IO[str], str]] = {}
+        self._run_left: Dict[int, int] = {}  # items per run not yet moved to memory
+        # Heap of (best unread item, run id), one entry per run that still has items.
+        self._heads: List[Tuple[T, int]] = []
+        self._on_disk = 0
+        self.spilled = 0
+        self.run_count = 0
+
+    def _put(self, item: Any) -> None:
+        super()._put(item)
+        if len(self._queue) > self.max_memory:  # type: ignore[attr-defined]
+            self._spill()
+
+    def _get(self) -> Any:
+        self._refill()
+        return super()._get()  # type: ignore[misc]
+
+    def qsize(self) -> int:
+        return super().qsize() + self._on_disk
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def _spill(self) -> None:
+        queue: List[T] = self._queue  # type: ignore[attr-defined]
+        queue.sort()  # a sorted list is a valid heap, so the kept half needs no heapify
+        keep = self.max_memory // 2
+        spilled = queue[keep:]
+        del queue[keep:]
+        self._write_run(iter(spilled), len(spilled))
+        self._on_disk += len(spilled)
+        self.spilled += len(spilled)
+        if len(self._runs) > self.max_open_runs:
+            self._merge_runs()
+
+    def _write_run(self, items: Iterator[T], count: int) -> None:
+        """Store ``count`` sorted items as a new run: the first in ``_heads``, the rest on disk."""
+        if self._dir is None:
+            if self._spill_parent:
+                os.makedirs(self._spill_parent, exist_ok=True)
+            self._dir = tempfile.mkdtemp(prefix="frontier-", dir=self._spill_parent)
+        run_id = self.run_count
+        self.run_count += 1
+        path = os.path.join(self._dir, f"run-{run_id:06d}.jsonl")
+        head = next(items)
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(self._encode(i), ensure_ascii=False) + "\n" for i in items)
+        self._runs[run_id] = (open(path, "r", encoding="utf-8"), path)
+        self._run_left[run_id] = count
+        heapq.heappush(self._heads, (head, run_id))
+
+    def _merge_runs(self) -> None:
+        # Merging the smallest runs keeps the rewrite cost close to that of a size-tiered merge.
+        by_size = sorted(self._runs, key=self._run_left.__getitem__)
+        chosen = set(by_size[: len(by_size) // 2 + 1])
+        heads = {run_id: item for item, run_id in self._heads if run_id in chosen}
+        self._heads = [(item, run_id) for item, run_id in self._heads if run_id not in chosen]
+        heapq.heapify(self._heads)
+        streams = []
+        for run_id in sorted(chosen):
+            f, _ = self._runs[run_id]
+            rest = (self._decode(json.loads(line)) for line in f)
+            streams.append(itertools.chain([heads[run_id]], rest))
+        self._write_run(heapq.merge(*streams), sum(self._run_left[run_id] for run_id in chosen))
+        for run_id in chosen:
+            f, path = self._runs.pop(run_id)
+            f.close()
+            os.remove(path)
+            del self._run_left[run_id]
+
+    def _advance(self, run_id: int) -> None:
+        f, path = self._runs[run_id]
+        line = f.readline()
+        if line:
+            heapq.heappush(self._heads, (self._decode(json.loads(line)), run_id))
+            return
+        f.close()
+        os.remove(path)
+        del self._runs[run_id]
+        del self._run_left[run_id]
+
+    def _refill(self) -> None:
+        queue: List[T] = self._queue  # type: ignore[attr-defined]
+        heads = self._heads
+        while heads and (len(queue) < self._low_water or heads[0][0] < queue[0]):  # type: ignore[operator]
+            item, run_id = heapq.heappop(heads)
+            heapq.heappush(queue, item)
+            self._on_disk -= 1
+            self._run_left[run_id] -= 1
+            self._advance(run_id)
+
+    def snapshot(self) -> List[T]:
+        items = super().snapshot() + [item for item, _ in self._heads]
+        for f, path in self._runs.values():
+            with open(path, "r", encoding="utf-8") as rest:
+                rest.seek(f.tell())
+                items.extend(self._decode(json.loads(line)) for line in rest)
+        return sorted(items)
+
+    async def close(self) -> None:
+        for f, _ in self._runs.values():
+            f.close()
+        self._runs.clear()
+        self._run_left.clear()
+        self._heads.clear()
+        self._on_disk = 0
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
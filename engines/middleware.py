@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from importlib import metadata
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..adapters.base import ParseResult, ProductInfo
+from ..utils.http import FetchResult
+from ..utils.loader import load_symbol
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "ecom_crawler.middlewares"
+
+
+@dataclass
+class PageRequest:
+    """One page fetch as seen by middleware; hooks may change ``url`` and ``headers``."""
+
+    url: str
+    depth: int
+    keywords: Tuple[str, ...] = ()
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Free-form per-request state shared between a middleware's hooks.
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class Middleware:
+    """
+    Base class for engine middleware. Override only the hooks you need; each returns the
+    (possibly replaced) value to pass on, or None to drop it:
+
+    - ``process_request``: before the fetch. Returning a :class:`FetchResult` answers the
+      request without touching the network (e.g. a cache); None skips the page.
+    - ``process_response``: after a successful fetch (2xx/304). None treats it as failed.
+    - ``process_parse``: after the adapter ran. None discards the page (no products, no links).
+    - ``process_product``: per product, from pages and API sources (``request`` is None for
+      the latter). None drops the product.
+
+    ``open`` and ``close`` bracket the crawl. Duck-typed objects work too; only the hooks
+    they define are called.
+    """
+
+    async def open(self, engine: Any) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    async def process_request(self, request: PageRequest) -> Union[PageRequest, FetchResult, None]:
+        return request
+
+    async def process_response(
+        self, request: PageRequest, response: FetchResult
+    ) -> Optional[FetchResult]:
+        return response
+
+    async def process_parse(
+        self, request: PageRequest, parsed: ParseResult
+    ) -> Optional[ParseResult]:
+        return parsed
+
+    async def process_product(
+        self, request: Optional[PageRequest], product: ProductInfo
+    ) -> Optional[ProductInfo]:
+        return product
+
+
+def _hooks(middlewares: Iterable[Any], name: str) -> List[Any]:
+    # Only hooks that are actually overridden take part, so pass-through stages cost nothing.
+    default = getattr(Middleware, name)
+    out = []
+    for mw in middlewares:
+        hook = getattr(type(mw), name, None)
+        if hook is not None and hook is not default:
+            out.append(getattr(mw, name))
+    return out
+
+
+class MiddlewareChain:
+    """
+    Runs installed middleware in order. Request hooks run first-to-last, response, parse and
+    product hooks last-to-first (the outermost middleware sees the final result), and a None
+    stops the chain. The engine keeps no chain at all when nothing is installed.
+    """
+
+    def __init__(self, middlewares: Iterable[Any]) -> None:
+        self.middlewares = list(middlewares)
+        reverse = self.middlewares[::-1]
+        self._request = _hooks(self.middlewares, "process_request")
+        self._response = _hooks(reverse, "process_response")
+        self._parse = _hooks(reverse, "process_parse")
+        self._product = _hooks(reverse, "process_product")
+
+    def __len__(self) -> int:
+        return len(self.middlewares)
+
+    @property
+    def has_product_hooks(self) -> bool:
+        return bool(self._product)
+
+    async def open(self, engine: Any) -> None:
+        for mw in self.middlewares:
+            opener = getattr(mw, "open", None)
+            if opener is not None:
+                await opener(engine)
+
+    async def close(self) -> None:
+        for mw in reversed(self.middlewares):
+            closer = getattr(mw, "close", None)
+            if closer is None:
+                continue
+            try:
+                await closer()
+            except Exception as exc:
+                logger.warning("Middleware %r failed to close: %r", mw, exc)
+
+    async def request(self, request: PageRequest) -> Union[PageRequest, FetchResult, None]:
+        for hook in self._request:
+            result = await hook(request)
+            if not isinstance(result, PageRequest):
+                return result  # None (skip) or a FetchResult (answered without a fetch)
+            request = result
+        return request
+
+    async def response(self, request: PageRequest, response: FetchResult) -> Optional[FetchResult]:
+        for hook in self._response:
+            response = await hook(request, response)
+            if response is None:
+                return None
+        return response
+
+    async def parse(self, request: PageRequest, parsed: ParseResult) -> Optional[ParseResult]:
+        for hook in self._parse:
+            parsed = await hook(request, parsed)
+            if parsed is None:
+                return None
+        return parsed
+
+    async def products(
+        self, request: Optional[PageRequest], products: Iterable[ProductInfo]
+    ) -> List[ProductInfo]:
+        out: List[ProductInfo] = []
+        for product in products:
+            current: Optional[ProductInfo] = product
+            for hook in self._product:
+                current = await hook(request, current)
+                if current is None:
+                    break
+            if current is not None:
+                out.append(current)
+        return out
+
+
+def load_middlewares(
+    dotted_paths: Iterable[str], *, entry_point_group: Optional[str] = ENTRY_POINT_GROUP
+) -> List[Any]:
+    """
+    Instantiate middleware from dotted paths (classes or factories), then from installed entry
+    points in ``entry_point_group``. Broken plugins are logged and skipped, like adapters.
+    """
+    middlewares: List[Any] = []
+    for dotted in dotted_paths:
+        try:
+            middlewares.append(load_symbol(dotted)())
+        except Exception as exc:
+            logger.warning("Failed to load middleware %s: %r", dotted, exc)
+    if entry_point_group:
+        try:
+            for ep in metadata.entry_points().select(group=entry_point_group):
+                try:
+                    middlewares.append(ep.load()())
+                except Exception as exc:
+                    logger.warning("Failed to load middleware entry point %s: %r", ep.name, exc)
+        except Exception:
+            # Be permissive—plugins are optional
+            pass
+    return middlewares
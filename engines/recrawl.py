@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..adapters.base import ParseResult, ProductInfo
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+
+
+def content_hash(text: str) -> str:
+    """Cheap, stable fingerprint of a page body."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+@dataclass
+class PageFingerprint:
+    """What we remember about a URL between crawls."""
+
+    url: str
+    content_hash: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    products: List[ProductInfo] = field(default_factory=list)
+    next_links: List[str] = field(default_factory=list)
+    checks: int = 0
+    changes: int = 0
+    interval: float = 86400.0  # seconds until the next revisit
+    last_checked: float = 0.0
+    last_changed: float = 0.0
+
+    @property
+    def change_rate(self) -> float:
+        """Observed fraction of visits on which the page had changed."""
+        return self.changes / self.checks if self.checks else 1.0
+
+    @property
+    def next_due(self) -> float:
+        return self.last_checked + self.interval
+
+    def as_parse_result(self) -> ParseResult:
+        return ParseResult(
+            product_urls=[], next_links=list(self.next_links), products=list(self.products)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "hash": self.content_hash,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "products": [p.to_dict() for p in self.products],
+            "next_links": self.next_links,
+            "checks": self.checks,
+            "changes": self.changes,
+            "interval": self.interval,
+            "last_checked": self.last_checked,
+            "last_changed": self.last_changed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PageFingerprint":
+        return cls(
+            url=data["url"],
+            content_hash=data.get("hash"),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+            products=[ProductInfo.from_dict(p) for p in data.get("products", [])],
+            next_links=list(data.get("next_links", [])),
+            checks=int(data.get("checks", 0)),
+            changes=int(data.get("changes", 0)),
+            interval=float(data.get("interval", 86400.0)),
+            last_checked=float(data.get("last_checked", 0.0)),
+            last_changed=float(data.get("last_changed", 0.0)),
+        )
+
+
+class RecrawlStore:
+    """
+    Per-URL fingerprints persisted between crawls.
+
+    Revisit intervals adapt to the observed change rate: a changed page comes back up to
+    twice as soon (the more often it changes, the sooner), an unchanged one backs off by up
+    to ``backoff`` (fully for pages that never change, barely for ones that usually do).
+    Intervals are clamped to ``[min_interval, max_interval]``.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        min_interval: float = 3600.0,
+        max_interval: float = 7 * 86400.0,
+        initial_interval: float = 86400.0,
+        backoff: float = 1.5,
+    ) -> None:
+        self.path = Path(path)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.backoff = backoff
+        self._pages: Dict[str, PageFingerprint] = {}
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    # ---- Persistence ----
+
+    def load(self) -> "RecrawlStore":
+        if not self.path.exists():
+            return self
+        opener = gzip.open if self.path.suffix == ".gz" else open
+        try:
+            with opener(self.path, "rt", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable recrawl state %s: %r", self.path, exc)
+            return self
+        for entry in raw.get("pages", []):
+            fp = PageFingerprint.from_dict(entry)
+            self._pages[fp.url] = fp
+        return self
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        opener = gzip.open if self.path.suffix == ".gz" else open
+        with opener(tmp, "wt", encoding="utf-8") as f:
+            json.dump(
+                {"version": STATE_VERSION, "pages": [fp.to_dict() for fp in self._pages.values()]},
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, self.path)
+
+    # ---- Scheduling ----
+
+    def get(self, url: str) -> Optional[PageFingerprint]:
+        return self._pages.get(url)
+
+    def is_due(self, fp: PageFingerprint, now: Optional[float] = None) -> bool:
+        return (now if now is not None else time.time()) >= fp.next_due
+
+    def conditional_headers(self, fp: Optional[PageFingerprint]) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if fp is None:
+            return headers
+        if fp.etag:
+            headers["If-None-Match"] = fp.etag
+        if fp.last_modified:
+            headers["If-Modified-Since"] = fp.last_modified
+        return headers
+
+    def record_unchanged(self, url: str, now: Optional[float] = None) -> None:
+        fp = self._pages.get(url)
+        if fp is None:
+            return
+        now = now if now is not None else time.time()
+        fp.checks += 1
+        fp.last_checked = now
+        factor = 1 + (self.backoff - 1) * (1 - fp.change_rate)
+        fp.interval = min(self.max_interval, fp.interval * factor)
+
+    def record(
+        self,
+        url: str,
+        parsed: ParseResult,
+        *,
+        body_hash: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Store a freshly parsed page and tighten its revisit interval."""
+        now = now if now is not None else time.time()
+        fp = self._pages.get(url)
+        known = fp is not None
+        if fp is None:
+            fp = PageFingerprint(url=url, interval=self.initial_interval)
+            self._pages[url] = fp
+        fp.checks += 1
+        fp.changes += 1
+        if known:
+            fp.interval = max(self.min_interval, fp.interval / (1 + fp.change_rate))
+        fp.last_checked = now
+        fp.last_changed = now
+        fp.content_hash = body_hash
+        fp.etag = etag
+        fp.last_modified = last_modified
+        fp.products = list(parsed.products) or [ProductInfo(url=u) for u in parsed.product_urls]
+        fp.next_links = list(parsed.next_links)
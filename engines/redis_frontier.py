@@ -0,0 +1,447 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+from ..utils.resp import LocalRespServer, RespClient, RespError, script_sha
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+# (priority, url, depth, keywords): the same entry shape checkpoints use.
+Entry = Tuple[float, str, int, Sequence[str]]
+
+# Enqueue unseen URLs. KEYS: seen set, queue; ARGV: (url, member, score) triples.
+ENQUEUE_SET = """
+local added = 0
+for i = 1, #ARGV, 3 do
+  if redis.call('SADD', KEYS[1], ARGV[i]) == 1 then
+    redis.call('ZADD', KEYS[2], ARGV[i + 2], ARGV[i + 1])
+    added = added + 1
+  end
+end
+return added
+"""
+
+# Bloom-filter variant. KEYS: bitmap, queue; ARGV: k, then (k bit offsets, member, score) groups.
+ENQUEUE_BLOOM = """
+local k = tonumber(ARGV[1])
+local added = 0
+local i = 2
+while i <= #ARGV do
+  local seen = true
+  for j = 0, k - 1 do
+    if redis.call('GETBIT', KEYS[1], ARGV[i + j]) == 0 then seen = false end
+  end
+  if not seen then
+    for j = 0, k - 1 do redis.call('SETBIT', KEYS[1], ARGV[i + j], 1) end
+    redis.call('ZADD', KEYS[2], ARGV[i + k + 1], ARGV[i + k])
+    added = added + 1
+  end
+  i = i + k + 2
+end
+return added
+"""
+
+# Re-queue expired leases, then lease up to N entries. KEYS: queue, leases, lease priorities;
+# ARGV: n, now, lease seconds. Returns {member, score, ...}, queued, leased, re-queued.
+CLAIM = """
+local now = tonumber(ARGV[2])
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now)
+for _, m in ipairs(expired) do
+  redis.call('ZADD', KEYS[1], redis.call('HGET', KEYS[3], m) or 0, m)
+  redis.call('ZREM', KEYS[2], m)
+  redis.call('HDEL', KEYS[3], m)
+end
+local items = redis.call('ZPOPMIN', KEYS[1], ARGV[1])
+local deadline = now + tonumber(ARGV[3])
+for i = 1, #items, 2 do
+  redis.call('ZADD', KEYS[2], deadline, items[i])
+  redis.call('HSET', KEYS[3], items[i], items[i + 1])
+end
+return {items, redis.call('ZCARD', KEYS[1]), redis.call('ZCARD', KEYS[2]), #expired}
+"""
+
+# Give leased entries back (graceful stop). KEYS: queue, leases, lease priorities; ARGV: members.
+RELEASE = """
+for _, m in ipairs(ARGV) do
+  if redis.call('ZREM', KEYS[2], m) == 1 then
+    redis.call('ZADD', KEYS[1], redis.call('HGET', KEYS[3], m) or 0, m)
+    redis.call('HDEL', KEYS[3], m)
+  end
+end
+return #ARGV
+"""
+
+# Drop the namespace once the crawl is done, so the next crawl doesn't inherit its seen set.
+# KEYS: queue, leases, lease priorities, seen. Returns 1 if the keys were deleted.
+FINISH = """
+if redis.call('ZCARD', KEYS[1]) == 0 and redis.call('ZCARD', KEYS[2]) == 0 then
+  redis.call('DEL', KEYS[1], KEYS[2], KEYS[3], KEYS[4])
+  return 1
+end
+return 0
+"""
+
+_SCRIPTS = {
+    "enqueue_set": ENQUEUE_SET,
+    "enqueue_bloom": ENQUEUE_BLOOM,
+    "claim": CLAIM,
+    "release": RELEASE,
+    "finish": FINISH,
+}
+_SHA = {name: script_sha(body) for name, body in _SCRIPTS.items()}
+# Connection trouble worth waiting out rather than failing the crawl.
+_TRANSIENT = (ConnectionError, OSError, asyncio.TimeoutError, RespError)
+
+
+class RedisFrontier(Generic[T]):
+    """
+    Crawl frontier shared by several crawler processes through a Redis-compatible server.
+
+    - Queue: a sorted set scored by priority (members are JSON ``[url, depth, keywords]``).
+    - Dedup: a URL enters the queue once per namespace, checked atomically with the enqueue
+      against a set (exact) or a Bloom filter in a bitmap (fixed memory, rare false positives).
+    - Lease/ack: claimed entries move to a lease set with a deadline that is renewed while the
+      page is processed. ``ack`` deletes the lease; a crashed process's leases expire and the
+      next claim by any process puts them back in the queue. ``release`` returns them at once.
+    - Batching: puts, acks and releases are buffered and sent as one pipeline, together with
+      the next claim; each claim leases ``batch_size`` entries. Scripts run via EVALSHA, and a
+      batch that fails on the wire is kept and re-sent (every command in it is idempotent).
+
+    It mirrors the parts of :class:`LocalFrontier` the engine uses (``put``/``get``/``ack``,
+    ``empty``/``qsize``), so switching is a config change. ``empty()`` only turns true when
+    no process holds a lease either, since leased pages may still add links.
+
+    ``close`` deletes the namespace's keys when nothing is queued or leased any more: a
+    finished crawl leaves nothing behind, while a stopped one keeps its state to resume from.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        make_item: Callable[[float, str, int, Tuple[str, ...]], T],
+        *,
+        namespace: str = "ecom_crawler",
+        dedup: str = "set",
+        bloom_bits: int = 1 << 27,
+        bloom_hashes: int = 7,
+        lease_seconds: float = 300.0,
+        batch_size: int = 32,
+        poll_interval: float = 0.2,
+        client: Optional[RespClient] = None,
+    ) -> None:
+        if dedup not in ("set", "bloom"):
+            raise ValueError("dedup must be 'set' or 'bloom'")
+        self.client = client or RespClient(url)
+        self.make_item = make_item
+        self.dedup = dedup
+        self.bloom_bits = bloom_bits
+        self.bloom_hashes = bloom_hashes
+        self.lease_seconds = lease_seconds
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        ns = namespace
+        self.keys = {
+            "queue": f"{ns}:queue",
+            "leases": f"{ns}:leases",
+            "lease_prio": f"{ns}:lease_prio",
+            "seen": f"{ns}:seen" if dedup == "set" else f"{ns}:bloom",
+        }
+        self._puts: List[Entry] = []
+        self._acks: List[str] = []
+        self._releases: List[str] = []
+        self._ready: List[Tuple[str, T]] = []  # claimed, not yet handed to a worker
+        self._held: Dict[int, str] = {}  # id(item) -> member, for items handed out
+        self._remote_queued = 0
+        self._remote_leased = 0
+        self._claim: Optional[asyncio.Task[None]] = None
+        self._renewer: Optional[asyncio.Task[None]] = None
+        self._scripts_loaded = False
+        self._next_claim = 0.0  # after an empty claim, wait poll_interval before asking again
+        self.stats: Dict[str, int] = {
+            "enqueued": 0,
+            "duplicates": 0,
+            "claimed": 0,
+            "requeued_expired": 0,
+        }
+
+    # ---- Encoding ----
+
+    @staticmethod
+    def _member(entry: Entry) -> str:
+        _, url, depth, keywords = entry
+        return json.dumps([url, depth, list(keywords)], ensure_ascii=False, separators=(",", ":"))
+
+    def _bloom_offsets(self, url: str) -> List[int]:
+        # Double hashing (Kirsch-Mitzenmacher): k offsets from one 128-bit digest.
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bloom_bits for i in range(self.bloom_hashes)]
+
+    # ---- Queue interface ----
+
+    async def put(self, item: Any) -> None:
+        self.put_nowait(item)
+        if len(self._puts) >= self.batch_size:
+            try:
+                await self._flush()
+            except _TRANSIENT as exc:
+                logger.warning("Frontier flush failed, will retry with the next batch: %r", exc)
+
+    def put_nowait(self, item: Any) -> None:
+        self._puts.append((item.priority, item.url, item.depth, tuple(item.keywords)))
+
+    async def get(self) -> T:
+        while not self._ready:
+            wait = self._next_claim - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            if self._claim is None or self._claim.done():
+                self._claim = asyncio.create_task(self._claim_batch())
+            try:
+                # Shielded: a worker timing out must not drop entries already leased to us.
+                await asyncio.shield(self._claim)
+            except _TRANSIENT as exc:
+                logger.warning("Frontier claim failed, retrying: %r", exc)
+                await asyncio.sleep(self.poll_interval * 5)
+                continue
+            if not self._ready:
+                self._next_claim = time.monotonic() + self.poll_interval
+        member, item = self._ready.pop(0)
+        self._held[id(item)] = member
+        return item
+
+    def ack(self, item: Any) -> None:
+        """The page is done: drop its lease (sent with the next batch)."""
+        member = self._held.pop(id(item), None)
+        if member is not None:
+            self._acks.append(member)
+
+    def release(self, item: Any) -> None:
+        """The page was not processed (shutdown): put it back in the shared queue."""
+        member = self._held.pop(id(item), None)
+        if member is not None:
+            self._releases.append(member)
+
+    def empty(self) -> bool:
+        return not (self._ready or self._puts or self._remote_queued or self._remote_leased)
+
+    def qsize(self) -> int:
+        return len(self._ready) + len(self._puts) + self._remote_queued
+
+    def snapshot(self) -> List[T]:
+        return [item for _, item in self._ready]
+
+    async def close(self) -> None:
+        """Return unprocessed leases, flush buffered commands, clear a finished crawl."""
+        for task in (self._claim, self._renewer):
+            if task is not None and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+        self._releases.extend(member for member, _ in self._ready)
+        self._ready.clear()
+        keys = self.keys
+        names = ("queue", "leases", "lease_prio", "seen")
+        finish = ("EVALSHA", _SHA["finish"], len(names), *(keys[n] for n in names))
+        try:
+            replies = await self._send([*self._pending_commands(), finish])
+            self.stats["cleared"] = int(replies[-1])
+        finally:
+            await self.client.close()
+
+    # ---- Wire ----
+
+    def _pending_commands(self) -> List[Tuple[Any, ...]]:
+        keys = self.keys
+        commands: List[Tuple[Any, ...]] = []
+        if self._puts:
+            if self.dedup == "set":
+                args: List[Any] = []
+                for entry in self._puts:
+                    args += [entry[1], self._member(entry), entry[0]]
+                commands.append(
+                    ("EVALSHA", _SHA["enqueue_set"], 2, keys["seen"], keys["queue"], *args)
+                )
+            else:
+                args = [self.bloom_hashes]
+                for entry in self._puts:
+                    args += [*self._bloom_offsets(entry[1]), self._member(entry), entry[0]]
+                commands.append(
+                    ("EVALSHA", _SHA["enqueue_bloom"], 2, keys["seen"], keys["queue"], *args)
+                )
+        # Puts go before acks: a crash between them can only re-crawl a page, never lose links.
+        if self._acks:
+            commands.append(("ZREM", keys["leases"], *self._acks))
+            commands.append(("HDEL", keys["lease_prio"], *self._acks))
+        if self._releases:
+            commands.append(
+                (
+                    "EVALSHA",
+                    _SHA["release"],
+                    3,
+                    keys["queue"],
+                    keys["leases"],
+                    keys["lease_prio"],
+                    *self._releases,
+                )
+            )
+        return commands
+
+    async def _load_scripts(self) -> None:
+        await self.client.pipeline([("SCRIPT", "LOAD", body) for body in _SCRIPTS.values()])
+        self._scripts_loaded = True
+
+    async def _send(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        puts, acks, releases = self._puts, self._acks, self._releases
+        self._puts, self._acks, self._releases = [], [], []
+        try:
+            if not self._scripts_loaded:
+                await self._load_scripts()
+            replies = await self.client.pipeline(commands, raise_on_error=False)
+            # The server may have restarted and lost its script cache: reload and retry those.
+            missing = [
+                i
+                for i, r in enumerate(replies)
+                if isinstance(r, RespError) and str(r).startswith("NOSCRIPT")
+            ]
+            if missing:
+                await self._load_scripts()
+                retried = await self.client.pipeline(
+                    [commands[i] for i in missing], raise_on_error=False
+                )
+                for i, reply in zip(missing, retried):
+                    replies[i] = reply
+            for reply in replies:
+                if isinstance(reply, RespError):
+                    raise reply
+        except BaseException:
+            self._puts[:0], self._acks[:0], self._releases[:0] = puts, acks, releases
+            raise
+        if puts:
+            added = int(replies[0])
+            self.stats["enqueued"] += added
+            self.stats["duplicates"] += len(puts) - added
+        return replies
+
+    async def _flush(self) -> None:
+        commands = self._pending_commands()
+        if commands:
+            await self._send(commands)
+
+    async def _claim_batch(self) -> None:
+        commands = self._pending_commands()
+        keys = self.keys
+        commands.append(
+            (
+                "EVALSHA", _SHA["claim"], 3, keys["queue"], keys["leases"], keys["lease_prio"],
+                self.batch_size, time.time(), self.lease_seconds,
+            )
+        )
+        replies = await self._send(commands)
+        items, queued, leased, expired = replies[-1]
+        self._remote_queued, self._remote_leased = int(queued), int(leased)
+        self.stats["requeued_expired"] += int(expired)
+        for i in range(0, len(items), 2):
+            member = items[i].decode("utf-8")
+            url, depth, keywords = json.loads(member)
+            self._ready.append(
+                (member, self.make_item(float(items[i + 1]), url, depth, tuple(keywords)))
+            )
+        self.stats["claimed"] += len(items) // 2
+        if self._renewer is None:
+            self._renewer = asyncio.create_task(self._renew_leases())
+
+    async def _renew_leases(self) -> None:
+        # Push deadlines of everything we hold forward, well before they can expire.
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            members = [m for m, _ in self._ready] + list(self._held.values())
+            if not members:
+                continue
+            args: List[Any] = []
+            deadline = time.time() + self.lease_seconds
+            for member in members:
+                args += [deadline, member]
+            try:
+                await self.client.execute("ZADD", self.keys["leases"], "XX", *args)
+            except Exception as exc:
+                logger.warning("Failed to renew %s frontier leases: %r", len(members), exc)
+
+
+# ---- Stand-in server equivalents of the scripts above ----
+
+
+def _enqueue_set(d: Any, keys: List[bytes], args: List[bytes]) -> int:
+    seen, queue = d.sets[keys[0]], d.zsets[keys[1]]
+    added = 0
+    for i in range(0, len(args), 3):
+        if args[i] not in seen:
+            seen.add(args[i])
+            queue.add(args[i + 1], float(args[i + 2]))
+            added += 1
+    return added
+
+
+def _enqueue_bloom(d: Any, keys: List[bytes], args: List[bytes]) -> int:
+    k = int(args[0])
+    added, i = 0, 1
+    while i < len(args):
+        offsets = [int(x) for x in args[i : i + k]]
+        if not all(d.getbit(keys[0], o) for o in offsets):
+            for o in offsets:
+                d.setbit(keys[0], o, 1)
+            d.zsets[keys[1]].add(args[i + k], float(args[i + k + 1]))
+            added += 1
+        i += k + 2
+    return added
+
+
+def _claim(d: Any, keys: List[bytes], args: List[bytes]) -> List[Any]:
+    queue, leases, prio = d.zsets[keys[0]], d.zsets[keys[1]], d.hashes[keys[2]]
+    now = float(args[1])
+    expired = [m for m, deadline in leases.ordered() if deadline <= now]
+    for m in expired:
+        queue.add(m, float(prio.pop(m, b"0")))
+        leases.remove(m)
+    items: List[Any] = []
+    deadline = now + float(args[2])
+    for _ in range(int(args[0])):
+        popped = queue.pop_min()
+        if popped is None:
+            break
+        member, score = popped
+        leases.add(member, deadline)
+        prio[member] = repr(score).encode()
+        items += [member, repr(score)]
+    return [items, len(queue.scores), len(leases.scores), len(expired)]
+
+
+def _release(d: Any, keys: List[bytes], args: List[bytes]) -> int:
+    queue, leases, prio = d.zsets[keys[0]], d.zsets[keys[1]], d.hashes[keys[2]]
+    for m in args:
+        if leases.remove(m):
+            queue.add(m, float(prio.pop(m, b"0")))
+    return len(args)
+
+
+def _finish(d: Any, keys: List[bytes], args: List[bytes]) -> int:
+    if d.zsets[keys[0]].scores or d.zsets[keys[1]].scores:
+        return 0
+    for key in keys:
+        d.delete(key)
+    return 1
+
+
+LocalRespServer.register_script(ENQUEUE_SET, _enqueue_set)
+LocalRespServer.register_script(ENQUEUE_BLOOM, _enqueue_bloom)
+LocalRespServer.register_script(CLAIM, _claim)
+LocalRespServer.register_script(RELEASE, _release)
+LocalRespServer.register_script(FINISH, _finish)
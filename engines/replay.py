@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import itertools
+import logging
+import os
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..adapters.base import ProductInfo
+from ..adapters.registry import AdapterRegistry
+from ..config import CrawlConfig
+from ..utils.loader import load_symbol
+from ..utils.normalize import normalize_products
+from .archive import ArchiveReader, IndexEntry
+from .base import CrawlEngine, CrawlReport
+from .simple_engine import dedupe_products, page_products
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 256  # records per task: big enough to amortize pickling, small enough to balance cores
+
+# Per-process state of replay workers (set by _init_worker).
+_worker: Dict[str, Any] = {}
+
+
+def _build_registry(config: CrawlConfig) -> AdapterRegistry:
+    registry = AdapterRegistry()
+    registry.discover_entry_points()
+    for dotted in config.extra_adapters:
+        try:
+            registry.register(load_symbol(dotted)())
+        except Exception as exc:
+            logger.warning("Failed to load adapter %s: %r", dotted, exc)
+    return registry
+
+
+def _init_worker(config: CrawlConfig) -> None:
+    _worker["config"] = config
+    _worker["registry"] = _build_registry(config)
+    _worker["reader"] = ArchiveReader(config.replay_archive or "")
+
+
+def _replay_chunk(
+    entries: List[IndexEntry],
+    config: Optional[CrawlConfig] = None,
+    registry: Optional[AdapterRegistry] = None,
+    reader: Optional[ArchiveReader] = None,
+) -> Tuple[Dict[str, List[ProductInfo]], int, int]:
+    """Parse a batch of archived pages; returns (products per domain, pages parsed, failures)."""
+    config = config or _worker["config"]
+    registry = registry or _worker["registry"]
+    reader = reader or _worker["reader"]
+    allowed = set(config.allowed_domains or [])
+    discovered: Dict[str, List[ProductInfo]] = defaultdict(list)
+    parsed_count = failed = 0
+    for entry in entries:
+        domain = urlparse(entry.url).netloc
+        if allowed and domain not in allowed:
+            continue
+        try:
+            page = reader.read(entry)
+            parsed = registry.match(page.url).parse(page.url, page.text)
+        except Exception as exc:
+            logger.debug("Replay failed for %s: %r", entry.url, exc)
+            failed += 1
+            continue
+        parsed_count += 1
+        products = page_products(parsed, page.keywords, config.keywords)
+        normalize_products(products, domain)
+        if products:
+            discovered[domain].extend(products)
+    return dict(discovered), parsed_count, failed
+
+
+def _chunks(entries: Iterator[IndexEntry], size: int) -> Iterator[List[IndexEntry]]:
+    while True:
+        chunk = list(itertools.islice(entries, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ReplayEngine(CrawlEngine):
+    """
+    Re-parses a page archive (``config.replay_archive``, written with ``archive_dir``) through
+    the current adapters instead of fetching: no network, robots.txt or throttling.
+
+    Only the newest copy of each URL is replayed (runs may share an archive directory), in
+    fetch order. Index entries are handed out in chunks to ``replay_workers`` processes
+    (default: one per core), each with its own registry built from the config (built-ins,
+    entry points and ``extra_adapters``); only a bounded number of chunks is in flight and
+    results are merged in chunk order. ``replay_workers=1`` parses in-process with the
+    ``registry`` passed in. Products are tagged, normalized and de-duplicated exactly like a
+    live crawl.
+    """
+
+    def __init__(
+        self, config: CrawlConfig, registry: AdapterRegistry | None = None, **_: Any
+    ) -> None:
+        self.config = config
+        self.registry = registry
+        self._stopping = False
+
+    def request_stop(self) -> None:
+        self._stopping = True
+
+    async def crawl(self) -> CrawlReport:
+        cfg = self.config
+        if not cfg.replay_archive:
+            raise ValueError("ReplayEngine needs config.replay_archive")
+        workers = cfg.replay_workers or os.cpu_count() or 1
+        reader = ArchiveReader(cfg.replay_archive)
+        # Only the newest copy of each URL, in fetch order, so results match the latest crawl.
+        entries = reader.latest_entries()
+        chunks = _chunks(iter(entries), _CHUNK)
+        discovered: Dict[str, List[ProductInfo]] = defaultdict(list)
+        stats = {"records": len(entries), "parsed": 0, "failed": 0, "workers": workers}
+
+        def collect(result: Tuple[Dict[str, List[ProductInfo]], int, int]) -> None:
+            found, parsed, failed = result
+            for domain, products in found.items():
+                discovered[domain].extend(products)
+            stats["parsed"] += parsed
+            stats["failed"] += failed
+
+        if workers == 1:
+            registry = self.registry or _build_registry(cfg)
+            for chunk in chunks:
+                if self._stopping:
+                    break
+                collect(_replay_chunk(chunk, cfg, registry, reader))
+                await asyncio.sleep(0)  # keep the loop (signals, progress) responsive
+        else:
+            loop = asyncio.get_running_loop()
+            pool = concurrent.futures.ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(cfg,)
+            )
+            with pool:
+                pending: Dict["asyncio.Future[Any]", int] = {}
+                # Results are merged in chunk order (not completion order), so de-duplication
+                # keeps the same record whatever the worker count.
+                finished: Dict[int, Tuple[Dict[str, List[ProductInfo]], int, int]] = {}
+                merged = 0
+                for seq, chunk in enumerate(itertools.chain(chunks, [None])):
+                    # Keep two chunks per worker queued.
+                    while pending and (
+                        chunk is None or len(pending) >= 2 * workers or self._stopping
+                    ):
+                        done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        for future in done:
+                            finished[pending.pop(future)] = future.result()
+                        while merged in finished:
+                            collect(finished.pop(merged))
+                            merged += 1
+                    if chunk is None or self._stopping:
+                        break
+                    pending[loop.run_in_executor(pool, _replay_chunk, chunk)] = seq
+        reader.close()
+
+        if self._stopping:
+            stats["interrupted"] = True
+        deduped = dedupe_products(discovered)
+        return CrawlReport(
+            discovered=deduped,
+            visited_count=stats["parsed"],
+            stats={"replay": stats},
+            stop_reason="stopped" if self._stopping else None,
+        )
@@ -1,26 +1,115 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import dataclasses
+import functools
+import hashlib
+import itertools
 import logging
+import os
+import time
 from collections import defaultdict
-from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple
-from urllib.parse import urlparse
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import quote_plus, urlparse, urlunparse
+
+from aiohttp import ClientSession
 
 from .base import CrawlEngine, CrawlReport
+from .archive import ArchiveWriter
+from .checkpoint import CrawlCheckpoint
+from .frontier import Frontier, LocalFrontier, SpillingFrontier
+from .middleware import MiddlewareChain, PageRequest, load_middlewares
+from .redis_frontier import RedisFrontier
+from .recrawl import PageFingerprint, RecrawlStore, content_hash
 from ..config import CrawlConfig
 from ..adapters.registry import AdapterRegistry
-from ..adapters.base import ProductInfo
-from ..utils.http import create_session, fetch_text
-from ..utils.parsing import normalize_url
+from ..adapters.base import ParseResult, ProductInfo, SiteAdapter
+from ..utils.http import FetchResult, create_session, fetch_page
+from ..utils.linkfilter import LinkFilter
+from ..utils.loader import load_symbol
+from ..utils.memory import ByteBudget, ProductSpool
+from ..utils.normalize import normalize_products
+from ..utils.neardup import DuplicateParamLearner, SimHashIndex, page_features, simhash
+from ..utils.parsing import is_product_like, normalize_url
+from ..utils.profiling import DEFAULT_FUNCTIONS, CrawlProfiler
+from ..utils.robots import RobotsManager
+from ..utils.sitemap import iter_sitemap
+from ..utils.throttling import AimdConcurrency, HostThrottle, ResizableSemaphore
+
+if TYPE_CHECKING:
+    from .batch import SharedResources
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+_SECONDS_PER_DAY = 86400.0
+# Returned for pages skipped as near-duplicates: nothing to record, nothing to expand.
+_SKIPPED = ParseResult(product_urls=[], next_links=[])
+
+
+def page_products(
+    parsed: ParseResult, keywords: Tuple[str, ...], filter_keywords: Optional[List[str]]
+) -> List[ProductInfo]:
+    """
+    Products of one parsed page (bare product links become URL-only records), tagged with
+    the fan-out ``keywords`` the page descends from, or else filtered by ``filter_keywords``.
+    """
+    products = list(parsed.products)
+    if not products and parsed.product_urls:
+        products = [ProductInfo(url=u) for u in parsed.product_urls]
+    if keywords:
+        # The shop's own search matched these; prefer the keywords visible in the product.
+        for p in products:
+            p.matched_keywords = p.matching_keywords(keywords) or list(keywords)
+    elif filter_keywords:
+        tagged = []
+        for p in products:
+            p.matched_keywords = p.matching_keywords(filter_keywords)
+            if p.matched_keywords:
+                tagged.append(p)
+        products = tagged
+    return products
+
+
+def dedupe_products(discovered: Dict[str, List[ProductInfo]]) -> Dict[str, List[ProductInfo]]:
+    """One record per product URL and domain: the first one found, with all matched keywords."""
+    deduped: Dict[str, List[ProductInfo]] = {}
+    for domain, products in discovered.items():
+        seen: Dict[str, ProductInfo] = {}
+        for product in products:
+            first = seen.setdefault(product.url, product)
+            if first is not product and product.matched_keywords:
+                merged = list(first.matched_keywords or [])
+                merged += [k for k in product.matched_keywords if k not in merged]
+                first.matched_keywords = merged
+        deduped[domain] = list(seen.values())
+    return deduped
+
+
+def _first_products(
+    discovered: Dict[str, List[ProductInfo]], limit: int
+) -> Dict[str, List[ProductInfo]]:
+    """Keep the first ``limit`` products, in domain then discovery order."""
+    kept: Dict[str, List[ProductInfo]] = {}
+    for domain, products in discovered.items():
+        if limit <= 0:
+            break
+        kept[domain] = products[:limit]
+        limit -= len(kept[domain])
+    return kept
+
+
+@dataclass(order=True)
 class _QueueItem:
-    url: str
-    depth: int
+    # Lower priority values are fetched first; ``seq`` keeps FIFO order among equals.
+    priority: float
+    seq: int
+    url: str = field(compare=False)
+    depth: int = field(compare=False)
+    # Search keywords this page descends from (keyword fan-out mode); inherited by its links.
+    keywords: Tuple[str, ...] = field(default=(), compare=False)
 
 
 class SimpleCrawlEngine(CrawlEngine):
@@ -28,112 +117,816 @@ class SimpleCrawlEngine(CrawlEngine):
     A pragmatic, upgrade-friendly async crawler.
     - Engine owns HTTP and queueing.
     - Adapters own page parsing.
-    - Concurrency capped by a semaphore.
+    - Concurrency capped by a semaphore, or adapted per host when ``adaptive_concurrency`` is on.
+    - Optional features are switched on by CrawlConfig fields (see the README).
     """
-    def __init__(self, config: CrawlConfig, registry: AdapterRegistry | None = None) -> None:
+    def __init__(
+        self,
+        config: CrawlConfig,
+        registry: AdapterRegistry | None = None,
+        middlewares: Optional[List[Any]] = None,
+        shared: Optional["SharedResources"] = None,
+    ) -> None:
         self.config = config
-        self.registry = registry or AdapterRegistry()
+        self.shared = shared
+        self.registry = registry or (shared.registry if shared is not None else AdapterRegistry())
         # Try entry-point discovery; silently ignore if none found.
         self.registry.discover_entry_points()
+        installed = [*load_middlewares(config.middlewares), *(middlewares or [])]
+        self.middleware: Optional[MiddlewareChain] = (
+            MiddlewareChain(installed) if installed else None
+        )
+        self.recrawl: Optional[RecrawlStore] = None
+        if config.recrawl_state_path:
+            self.recrawl = RecrawlStore(
+                config.recrawl_state_path,
+                min_interval=config.recrawl_min_interval,
+                max_interval=config.recrawl_max_interval,
+            ).load()
+        self._recrawl_stats: Dict[str, int] = defaultdict(int)
+        self._seq = itertools.count()
+        self._sitemap_seeded = 0
+        # Set once sitemap seeding has run to the end; checkpoints carry it so resumes skip it.
+        self._sitemaps_done = False
+        self._sitemap_skip: Set[str] = set()
+        self.throttle = (
+            shared.throttle
+            if shared is not None
+            else HostThrottle(max_delay=config.max_crawl_delay)
+        )
+        self.robots: Optional[RobotsManager] = None
+        self._robots_blocked = 0
+        self._api_stats: Dict[str, int] = {}
+        self._stopping = False
+        self._stop_reason: Optional[str] = None
+        self._started = 0.0
+        self._pages_fetched = 0
+        self._product_urls: Set[str] = set()  # only tracked with max_products
+        self._host_errors: Dict[str, int] = defaultdict(int)
+        self.html_budget = ByteBudget(config.max_pending_html_bytes)
+        self.product_spool = ProductSpool(config.max_buffered_products, config.spill_dir)
+        self.archive: Optional[ArchiveWriter] = None
+        self.profiler: Optional[CrawlProfiler] = None
+        if config.profile:
+            self.profiler = CrawlProfiler(
+                mode=config.profile_mode, functions=[*DEFAULT_FUNCTIONS, *config.profile_functions]
+            )
+        # Live crawl state, bound by crawl() so progress() can sample it from the loop thread.
+        self._live: Optional[
+            Tuple[
+                Frontier[_QueueItem], Set[str], Dict[str, List[ProductInfo]], Dict[int, _QueueItem]
+            ]
+        ] = None
+        self.near_duplicates: Optional[SimHashIndex] = None
+        self.param_learner: Optional[DuplicateParamLearner] = None
+        self._neardup_stats: Dict[str, int] = defaultdict(int)
+        if config.skip_near_duplicates:
+            self.near_duplicates = SimHashIndex(max_distance=config.near_duplicate_distance)
+            self.param_learner = DuplicateParamLearner()
+        self.concurrency: Optional[AimdConcurrency] = None
+        if config.adaptive_concurrency:
+            self.concurrency = AimdConcurrency(
+                config.max_concurrency,
+                min_limit=config.min_concurrency,
+                max_limit=config.adaptive_max_concurrency,
+                host_initial=config.per_host_concurrency,
+                host_max=config.max_per_host_concurrency,
+            )
+        self.link_filter = LinkFilter(
+            include=config.include_patterns,
+            exclude=config.exclude_patterns,
+            blocked_extensions=config.blocked_extensions,
+        )
+
+    def _item(
+        self, url: str, depth: int, priority: Optional[float] = None, keywords: Tuple[str, ...] = ()
+    ) -> _QueueItem:
+        # Breadth-first by default: shallower pages come out first.
+        return _QueueItem(
+            priority=float(depth) if priority is None else priority,
+            seq=next(self._seq),
+            url=url,
+            depth=depth,
+            keywords=keywords,
+        )
+
+    def _make_frontier(self) -> Frontier[_QueueItem]:
+        cfg = self.config
+        if not cfg.frontier_url:
+            if not cfg.max_queue_size:
+                return LocalFrontier()
+            return SpillingFrontier(
+                cfg.max_queue_size,
+                lambda item: [item.priority, item.seq, item.url, item.depth, list(item.keywords)],
+                lambda r: _QueueItem(r[0], r[1], r[2], r[3], tuple(r[4])),
+                spill_dir=cfg.spill_dir,
+            )
+        return RedisFrontier(
+            cfg.frontier_url,
+            lambda priority, url, depth, keywords: self._item(url, depth, priority, keywords),
+            namespace=cfg.frontier_namespace or self._frontier_namespace(),
+            dedup=cfg.frontier_dedup,
+            lease_seconds=cfg.frontier_lease_seconds,
+            batch_size=cfg.frontier_batch_size,
+        )
+
+    def _frontier_namespace(self) -> str:
+        # Processes started with the same seeds join one crawl; other crawls get their own keys.
+        digest = hashlib.sha1("\n".join(sorted(self._seed_urls())).encode("utf-8")).hexdigest()
+        return f"ecom_crawler:{digest[:12]}"
+
+    def _seed_urls(self) -> Dict[str, Tuple[str, ...]]:
+        """Start URLs plus one search URL per (template, keyword); tags merge on shared URLs."""
+        cfg = self.config
+        seeds: Dict[str, Tuple[str, ...]] = {normalize_url(u): () for u in cfg.start_urls}
+        for template in cfg.search_url_templates:
+            for keyword in cfg.keywords or []:
+                # Plain substitution: templates may contain other braces (JSON filters, etc.).
+                url = normalize_url(template.replace("{keyword}", quote_plus(keyword)))
+                if keyword not in seeds.get(url, ()):
+                    seeds[url] = seeds.get(url, ()) + (keyword,)
+        return seeds
+
+    def progress(self) -> Dict[str, Any]:
+        """
+        Cheap snapshot of a running crawl (call on the engine's event loop): pages visited,
+        frontier size, in-flight fetches, products so far and failed fetches per host.
+        """
+        if self._live is None:
+            return {"visited": 0, "queued": 0, "in_flight": 0, "products": 0, "host_errors": {}}
+        q, visited, discovered, in_flight = self._live
+        return {
+            "visited": len(visited),
+            "queued": q.qsize(),
+            "in_flight": len(in_flight),
+            "products": sum(len(p) for p in discovered.values()) + self.product_spool.spilled,
+            "host_errors": dict(self._host_errors),
+        }
+
+    def discovered_so_far(self) -> Dict[str, List[ProductInfo]]:
+        """Live per-domain product lists (append-only while crawling, not de-duplicated)."""
+        return self._live[2] if self._live is not None else {}
+
+    def request_stop(self) -> None:
+        """Stop taking new URLs; in-flight fetches get ``shutdown_grace`` seconds to finish."""
+        self._stop("stopped")
+
+    def _stop(self, reason: str) -> None:
+        if not self._stopping:
+            self._stopping = True
+            self._stop_reason = reason
+
+    def _budget_used(self) -> float:
+        """Fraction (0..1) of the deadline or page budget spent, whichever is further along."""
+        cfg = self.config
+        used = 0.0
+        if cfg.deadline_seconds:
+            used = (time.monotonic() - self._started) / cfg.deadline_seconds
+        if cfg.max_pages:
+            used = max(used, self._pages_fetched / cfg.max_pages)
+        return min(used, 1.0)
+
+    def _count_products(self, products: List[ProductInfo]) -> None:
+        cfg = self.config
+        if cfg.max_products:
+            self._product_urls.update(p.url for p in products)
+            if len(self._product_urls) >= cfg.max_products:
+                self._stop("max_products")
+
+    async def _stop_at_deadline(self) -> None:
+        # Stop early enough for in-flight fetches to drain before the deadline itself.
+        deadline = self.config.deadline_seconds
+        drain = min(self.config.shutdown_grace, deadline * 0.1)
+        await asyncio.sleep(max(0.0, self._started + deadline - drain - time.monotonic()))
+        self._stop("deadline")
 
     async def crawl(self) -> CrawlReport:
         cfg = self.config
+        self._started = time.monotonic()
         discovered: Dict[str, List[ProductInfo]] = defaultdict(list)
         visited: Set[str] = set()
+        seeds = self._seed_urls()
 
         # Allowed domains: if not set, restrict each start URL to its own domain.
         allowed_domains: Set[str] = set(cfg.allowed_domains or [])
         if not allowed_domains:
-            for u in cfg.start_urls:
+            for u in seeds:
                 allowed_domains.add(urlparse(u).netloc)
 
-        sem = asyncio.Semaphore(cfg.max_concurrency)
-        q: asyncio.Queue[_QueueItem] = asyncio.Queue()
-
-        for u in cfg.start_urls:
-            await q.put(_QueueItem(url=normalize_url(u), depth=0))
+        shared = self.shared
+        sem: Union[asyncio.Semaphore, ResizableSemaphore]
+        if shared is not None:
+            sem = shared.budget.join(self, cfg.max_concurrency)
+        else:
+            sem = asyncio.Semaphore(cfg.max_concurrency)
+        q = self._make_frontier()
+        # Dequeued but unfinished items; a checkpoint puts them back into the frontier.
+        in_flight: Dict[int, _QueueItem] = {}
+        self._live = (q, visited, discovered, in_flight)
 
-        session = create_session()
+        if shared is not None:
+            session = shared.session
+            self.robots = shared.robots_for(cfg)
+        else:
+            session = create_session()
+            self.robots = RobotsManager(
+                session,
+                user_agent=cfg.user_agent,
+                ttl=cfg.robots_cache_ttl,
+                timeout=cfg.request_timeout,
+                throttle=self.throttle if cfg.respect_robots else None,
+            )
+        seeding: Optional[asyncio.Task[None]] = None
+        api_task: Optional[asyncio.Task[None]] = None
+        checkpointing: Optional[asyncio.Task[None]] = None
+        deadline: Optional[asyncio.Task[None]] = None
+        if cfg.archive_dir:
+            self.archive = ArchiveWriter(
+                cfg.archive_dir,
+                compression=cfg.archive_compression,
+                segment_bytes=cfg.archive_segment_mb << 20,
+            )
         try:
+            if self.profiler is not None:
+                self.profiler.start(self.registry.adapters)
+            if self.middleware is not None:
+                await self.middleware.open(self)
+            if cfg.deadline_seconds:
+                deadline = asyncio.create_task(self._stop_at_deadline())
+            resumed = self._restore_checkpoint(q, visited, discovered)
+            for products in discovered.values():
+                self._count_products(products)
+            if cfg.api_sources and not resumed:
+                api_task = asyncio.create_task(self._query_api_sources(discovered))
+            if not resumed:
+                for u in await self._robots_filter(list(seeds)):
+                    await q.put(self._item(u, 0, keywords=seeds[u]))
+
+            if cfg.use_sitemaps and not self._sitemaps_done:
+                seeding = asyncio.create_task(
+                    self._seed_from_sitemaps(session, q, allowed_domains, visited)
+                )
+            if cfg.checkpoint_path and cfg.checkpoint_interval > 0:
+                checkpointing = asyncio.create_task(
+                    self._checkpoint_periodically(q, visited, discovered, in_flight)
+                )
+
             async def worker() -> None:
-                while True:
+                while not self._stopping:
                     try:
                         item = await asyncio.wait_for(q.get(), timeout=0.1)
                     except asyncio.TimeoutError:
                         # Periodically allow tasks to finish when queue is empty
-                        if q.empty():
+                        if q.empty() and (seeding is None or seeding.done()):
                             return
                         continue
 
-                    if item.url in visited:
-                        q.task_done()
-                        continue
-                    visited.add(item.url)
+                    unfinished = False
+                    try:
+                        if item.url in visited:
+                            continue
+                        visited.add(item.url)
+                        in_flight[item.seq] = item
 
-                    # Depth control
-                    if item.depth > cfg.max_depth:
-                        q.task_done()
-                        continue
+                        # Depth control
+                        if item.depth > cfg.max_depth:
+                            continue
 
-                    domain = urlparse(item.url).netloc
-                    if domain not in allowed_domains:
-                        q.task_done()
-                        continue
+                        domain = urlparse(item.url).netloc
+                        if domain not in allowed_domains:
+                            continue
 
-                    async with sem:
-                        html = await fetch_text(
-                            session,
-                            item.url,
-                            timeout=cfg.request_timeout,
-                            user_agent=cfg.user_agent,
-                            retries=cfg.retries,
+                        if cfg.max_pages and self._pages_fetched >= cfg.max_pages:
+                            # Budget spent: leave the page to a resumed run.
+                            self._stop("max_pages")
+                            unfinished = True
+                            break
+                        self._pages_fetched += 1
+
+                        adapter = self.registry.match(item.url)
+                        mw = self.middleware
+                        request = (
+                            PageRequest(item.url, item.depth, item.keywords)
+                            if mw is not None
+                            else None
                         )
+                        parsed = await self._fetch_and_parse(session, sem, item, adapter, request)
+                        if parsed is None:
+                            continue
+                        if mw is not None and request is not None and parsed is not _SKIPPED:
+                            parsed = await mw.parse(request, parsed)
+                            if parsed is None:
+                                continue
 
-                    if not html:
-                        q.task_done()
-                        continue
+                        # Record products per domain
+                        products = page_products(parsed, item.keywords, cfg.keywords)
+                        normalize_products(products, domain)
+                        if products and mw is not None and mw.has_product_hooks:
+                            products = await mw.products(request, products)
+                        if products:
+                            discovered[domain].extend(products)
+                            self.product_spool.added(discovered, len(products))
+                            self._count_products(products)
 
-                    adapter = self.registry.match(item.url)
-                    try:
-                        parsed = adapter.parse(item.url, html)
-                    except Exception as exc:
-                        logger.debug("Adapter %s failed on %s: %r", getattr(adapter, "name", adapter), item.url, exc)
-                        q.task_done()
-                        continue
+                        # Enqueue next links (pruned before they can take a queue slot)
+                        next_depth = item.depth + 1
+                        if next_depth <= cfg.max_depth:
+                            candidates = self._select_links(
+                                parsed.next_links, adapter, visited, allowed_domains
+                            )
+                            # As the deadline / page budget runs out, product pages overtake
+                            # listings.
+                            boost = 2 * self._budget_used() * (cfg.max_depth + 1)
+                            for link_norm in await self._robots_filter(candidates):
+                                priority = None
+                                if boost and self._is_product_url(link_norm):
+                                    priority = next_depth - boost
+                                await q.put(
+                                    self._item(
+                                        link_norm, next_depth, priority, keywords=item.keywords
+                                    )
+                                )
+                    except asyncio.CancelledError:
+                        # Cut off by the shutdown deadline: keep it in in_flight for the checkpoint.
+                        unfinished = True
+                        raise
+                    finally:
+                        if not unfinished:
+                            in_flight.pop(item.seq, None)
+                            q.ack(item)
+                        else:
+                            q.release(item)
+
+            # Adaptive mode needs enough workers to fill the highest limit it may reach.
+            worker_count = (
+                self.concurrency.max_limit if self.concurrency is not None else cfg.max_concurrency
+            )
+            workers = [asyncio.create_task(worker()) for _ in range(worker_count)]
+            await self._join_workers(workers)
+            if api_task is not None and not self._stopping:
+                await api_task
+        finally:
+            for task in (seeding, api_task, checkpointing, deadline):
+                if task is not None and not task.done():
+                    task.cancel()
+            if shared is not None:
+                shared.budget.leave(self)
+            else:
+                await session.close()
+            await q.close()
+            if self.middleware is not None:
+                await self.middleware.close()
+            if self.profiler is not None:
+                await self.profiler.stop()
+            if self.archive is not None:
+                await asyncio.to_thread(self.archive.close)
+
+        stats: Dict[str, Any] = {}
+        if cfg.use_sitemaps:
+            stats["sitemap_seeded"] = self._sitemap_seeded
+        if cfg.respect_robots:
+            stats["robots_blocked"] = self._robots_blocked
+        if self.concurrency is not None:
+            stats["concurrency"] = self.concurrency.snapshot()
+        if self._api_stats:
+            stats["api"] = dict(self._api_stats)
+        if isinstance(q, RedisFrontier):
+            stats["frontier"] = dict(q.stats)
+        if self.middleware is not None:
+            stats["middleware"] = [type(m).__name__ for m in self.middleware.middlewares]
+        if self.param_learner is not None:
+            stats["near_duplicates"] = dict(
+                self._neardup_stats,
+                learned_params={h: sorted(p) for h, p in self.param_learner.learned.items() if p},
+            )
+        if self.recrawl is not None:
+            self.recrawl.save()
+            stats["recrawl"] = dict(self._recrawl_stats, tracked=len(self.recrawl))
+        stats["memory"] = {
+            "html_bytes": self.html_budget.stats(),
+            "products": self.product_spool.stats(),
+        }
+        if isinstance(q, LocalFrontier):
+            stats["memory"]["queue"] = {
+                "limit": cfg.max_queue_size,
+                "peak": q.peak,
+                "spilled": q.spilled if isinstance(q, SpillingFrontier) else 0,
+            }
+        if self.archive is not None:
+            stats["archive"] = dict(self.archive.stats, directory=cfg.archive_dir)
+        if self.profiler is not None:
+            stats["profile"] = dict(
+                self.profiler.summary(), files=self.profiler.write(cfg.profile_output)
+            )
+            logger.info("Profile:\n%s", self.profiler.format_table())
+        if self._stopping:
+            stats["interrupted"] = True
+            stats["stop_reason"] = self._stop_reason
+        if cfg.checkpoint_path:
+            if self._stopping or not q.empty():
+                self._build_checkpoint(q, visited, discovered, in_flight).save(cfg.checkpoint_path)
+                stats["checkpoint"] = cfg.checkpoint_path
+            else:
+                # Finished cleanly: the next run starts from scratch.
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(cfg.checkpoint_path)
+
+        if self.product_spool.spilled:
+            # Exporters stream spilled products from disk; the next run gets a fresh spool.
+            deduped: Mapping[str, Sequence[ProductInfo]] = self.product_spool.products(
+                discovered, cfg.max_products
+            )
+            self.product_spool = ProductSpool(cfg.max_buffered_products, cfg.spill_dir)
+        else:
+            deduped = dedupe_products(discovered)
+            if cfg.max_products:
+                deduped = _first_products(deduped, cfg.max_products)
+        return CrawlReport(
+            discovered=deduped,
+            visited_count=len(visited),
+            stats=stats,
+            stop_reason=self._stop_reason,
+        )
+
+    async def _join_workers(self, workers: List["asyncio.Task[None]"]) -> None:
+        """
+        Wait for the workers; once a stop is requested, give them ``shutdown_grace`` seconds
+        (never past ``deadline_seconds``).
+        """
+        cfg = self.config
+        pending = set(workers)
+        while pending and not self._stopping:
+            _, pending = await asyncio.wait(pending, timeout=0.2)
+        if pending:
+            grace = cfg.shutdown_grace
+            if cfg.deadline_seconds:
+                grace = max(
+                    0.0, min(grace, self._started + cfg.deadline_seconds - time.monotonic())
+                )
+            _, pending = await asyncio.wait(pending, timeout=grace)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        for task in workers:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()  # type: ignore[misc]
+
+    # ---- Checkpoints ----
+
+    def _build_checkpoint(
+        self,
+        q: Frontier[_QueueItem],
+        visited: Set[str],
+        discovered: Dict[str, List[ProductInfo]],
+        in_flight: Dict[int, _QueueItem],
+    ) -> CrawlCheckpoint:
+        pending = list(in_flight.values()) + q.snapshot()
+        unfinished = {item.url for item in in_flight.values()}
+        return CrawlCheckpoint(
+            frontier=[
+                (item.priority, item.url, item.depth, list(item.keywords)) for item in pending
+            ],
+            visited=[u for u in visited if u not in unfinished],
+            products=self.product_spool.records(discovered),
+            counters={
+                "sitemap_seeded": self._sitemap_seeded,
+                "sitemaps_done": self._sitemaps_done,
+                "robots_blocked": self._robots_blocked,
+                "recrawl": dict(self._recrawl_stats),
+                "api": dict(self._api_stats),
+            },
+        )
+
+    def _restore_checkpoint(
+        self, q: Frontier[_QueueItem], visited: Set[str], discovered: Dict[str, List[ProductInfo]]
+    ) -> bool:
+        path = self.config.checkpoint_path
+        checkpoint = CrawlCheckpoint.load(path) if path else None
+        if checkpoint is None:
+            return False
+        visited.update(checkpoint.visited)
+        for domain, record in checkpoint.products:
+            discovered[domain].append(ProductInfo.from_dict(record))
+        for priority, url, depth, keywords in checkpoint.frontier:
+            q.put_nowait(self._item(url, depth, priority, keywords=tuple(keywords)))
+        counters = checkpoint.counters
+        self._sitemap_seeded = int(counters.get("sitemap_seeded", 0))
+        self._sitemaps_done = bool(counters.get("sitemaps_done", False))
+        if not self._sitemaps_done:
+            # Seeding was cut short: it runs again but must not re-queue what is pending.
+            self._sitemap_skip = {url for _, url, _, _ in checkpoint.frontier}
+        self._robots_blocked = int(counters.get("robots_blocked", 0))
+        self._recrawl_stats.update(counters.get("recrawl", {}))
+        self._api_stats.update(counters.get("api", {}))
+        logger.info(
+            "Resuming from checkpoint %s: %s pending, %s visited",
+            path,
+            len(checkpoint.frontier),
+            len(visited),
+        )
+        return True
+
+    async def _checkpoint_periodically(
+        self,
+        q: Frontier[_QueueItem],
+        visited: Set[str],
+        discovered: Dict[str, List[ProductInfo]],
+        in_flight: Dict[int, _QueueItem],
+    ) -> None:
+        path = self.config.checkpoint_path
+        assert path is not None
+        while True:
+            await asyncio.sleep(self.config.checkpoint_interval)
+            # Snapshot on the loop (consistent view), serialise and write off the loop.
+            checkpoint = self._build_checkpoint(q, visited, discovered, in_flight)
+            try:
+                await asyncio.to_thread(checkpoint.save, path)
+            except OSError as exc:
+                logger.warning("Failed to write checkpoint %s: %r", path, exc)
+
+    async def _seed_from_sitemaps(
+        self,
+        session: ClientSession,
+        q: Frontier[_QueueItem],
+        allowed_domains: Set[str],
+        visited: Set[str],
+    ) -> None:
+        """
+        Stream sitemaps (from config or robots.txt) and enqueue product-like URLs.
+        Seeds are fetched but not expanded (depth = max_depth); fresher ``lastmod`` sorts first.
+        URLs already visited or pending from a checkpoint are skipped.
+        """
+        cfg = self.config
+        sitemap_urls = list(cfg.sitemap_urls)
+        if not sitemap_urls:
+            roots = {f"{urlparse(u).scheme}://{urlparse(u).netloc}" for u in cfg.start_urls}
+            for root in sorted(roots):
+                found = await self.robots.sitemaps(root) if self.robots is not None else []
+                sitemap_urls.extend(found or [root + "/sitemap.xml"])
+
+        now = time.time()
+        for sitemap_url in sitemap_urls:
+            if self._sitemap_seeded >= cfg.sitemap_max_urls:
+                break
+            async for entry in iter_sitemap(session, sitemap_url, user_agent=cfg.user_agent):
+                if self._sitemap_seeded >= cfg.sitemap_max_urls:
+                    break
+                url = normalize_url(entry.loc)
+                if urlparse(url).netloc not in allowed_domains or not self._is_product_url(url):
+                    continue
+                if url in visited or url in self._sitemap_skip:
+                    continue
+                if not await self._robots_filter([url]):
+                    continue
+                # Priorities in [-1, 0): recently modified products first, undated ones last.
+                if entry.lastmod is not None:
+                    age_days = max(0.0, now - entry.lastmod) / _SECONDS_PER_DAY
+                    priority = -1.0 / (1.0 + age_days)
+                else:
+                    priority = -1e-9
+                await q.put(self._item(url, cfg.max_depth, priority))
+                self._sitemap_seeded += 1
+        self._sitemaps_done = True
+        self._sitemap_skip.clear()
 
-                    # Record products per domain
-                    products = list(parsed.products)
-                    if not products and parsed.product_urls:
-                        products = [ProductInfo(url=u) for u in parsed.product_urls]
+    async def _query_api_sources(self, discovered: Dict[str, List[ProductInfo]]) -> None:
+        """Run every configured API source for every keyword concurrently."""
+        cfg = self.config
+        if not cfg.keywords:
+            logger.warning("api_sources configured without keywords; nothing to search for")
+            return
+        sources: List[Any] = []
+        for dotted in cfg.api_sources:
+            try:
+                source_cls = load_symbol(dotted)
+                from_env = getattr(source_cls, "from_env", None)
+                sources.append(from_env() if from_env is not None else source_cls())
+            except Exception as exc:
+                logger.warning("Failed to load API source %s: %r", dotted, exc)
+
+        async def run(source: Any, keyword: str) -> None:
+            try:
+                products = await source.search(keyword, pages=cfg.api_pages)
+            except Exception as exc:
+                logger.warning("API source %s failed for %r: %r", source.name, keyword, exc)
+                return
+            # Sources may hand out cached objects; tag copies so keywords don't leak across
+            # searches.
+            products = [dataclasses.replace(p, matched_keywords=[keyword]) for p in products]
+            normalize_products(products, source.domain)
+            if self.middleware is not None and self.middleware.has_product_hooks:
+                products = await self.middleware.products(None, products)
+            discovered[source.domain].extend(products)
+            self.product_spool.added(discovered, len(products))
+            self._count_products(products)
+            self._api_stats[source.name] = self._api_stats.get(source.name, 0) + len(products)
+
+        try:
+            await asyncio.gather(*(run(source, kw) for source in sources for kw in cfg.keywords))
+        finally:
+            for source in sources:
+                await source.close()
 
-                    if cfg.keywords:
-                        products = [p for p in products if p.matches_keywords(cfg.keywords or [])]
+    def _select_links(
+        self, links: List[str], adapter: SiteAdapter, visited: Set[str], allowed_domains: Set[str]
+    ) -> List[str]:
+        """Normalize, de-duplicate and prune a page's links in one pass (one urlparse per link)."""
+        out: List[str] = []
+        batch: Set[str] = set()
+        learner = self.param_learner
+        for link in links:
+            parts = urlparse(link)
+            if parts.netloc not in allowed_domains:
+                continue
+            link_norm = urlunparse(parts._replace(fragment="")) if "#" in link else link
+            if learner is not None and parts.query:
+                canonical = learner.canonicalize(parts)
+                if canonical is not None:
+                    self._neardup_stats["rewritten_links"] += 1
+                    link_norm = canonical
+            if link_norm in visited or link_norm in batch:
+                continue
+            batch.add(link_norm)
+            out.append(link_norm)
+        out = self.link_filter.filter(out)
+        should_follow = getattr(adapter, "should_follow", None)
+        if should_follow is not None:
+            out = [u for u in out if should_follow(u)]
+        return out
 
-                    if products:
-                        discovered[domain].extend(products)
+    async def _robots_filter(self, urls: List[str]) -> List[str]:
+        if not self.config.respect_robots or self.robots is None or not urls:
+            return urls
+        allowed = await self.robots.filter(urls)
+        self._robots_blocked += len(urls) - len(allowed)
+        return allowed
 
-                    # Enqueue next links
-                    next_depth = item.depth + 1
-                    for link in parsed.next_links:
-                        link_norm = normalize_url(link)
-                        if link_norm not in visited:
-                            # Only queue if still within allowed domains
-                            if urlparse(link_norm).netloc in allowed_domains:
-                                await q.put(_QueueItem(url=link_norm, depth=next_depth))
+    def _is_product_url(self, url: str) -> bool:
+        # Adapters may expose an optional ``is_product_url`` hook; fall back to the URL heuristic.
+        hook = getattr(self.registry.match(url), "is_product_url", None)
+        if hook is not None:
+            return bool(hook(url))
+        return is_product_like(url)
 
-                    q.task_done()
+    def _is_near_duplicate(self, host: str, url: str, text: str) -> bool:
+        # Product pages share templates and differ in little text; only listings are compared.
+        assert self.near_duplicates is not None and self.param_learner is not None
+        if self._is_product_url(url):
+            return False
+        fingerprint = simhash(page_features(text))
+        original = self.near_duplicates.find(host, fingerprint)
+        if original is not None:
+            self.param_learner.record_duplicate(url, original)
+            self._neardup_stats["skipped"] += 1
+            return True
+        self.near_duplicates.add(host, fingerprint, url)
+        self.param_learner.record_distinct(url)
+        return False
 
-            workers = [asyncio.create_task(worker()) for _ in range(cfg.max_concurrency)]
-            await asyncio.gather(*workers)
+    async def _fetch_and_parse(
+        self,
+        session: ClientSession,
+        sem: Union[asyncio.Semaphore, ResizableSemaphore],
+        item: _QueueItem,
+        adapter: SiteAdapter,
+        request: Optional[PageRequest] = None,
+    ) -> Optional[ParseResult]:
+        """
+        Fetch one page and run its adapter, short-circuiting through the recrawl store.
+        ``request`` is only passed when middleware is installed; its request and response
+        hooks run around the fetch.
+        """
+        cfg = self.config
+        answered: Optional[FetchResult] = None
+        if request is not None and self.middleware is not None:
+            outcome = await self.middleware.request(request)
+            if outcome is None:
+                return None
+            if isinstance(outcome, FetchResult):
+                answered = outcome
+            else:
+                request = outcome
+        store = self.recrawl
+        fp = store.get(item.url) if store is not None else None
+        if store is not None and fp is not None and item.depth > 0 and not store.is_due(fp):
+            self._recrawl_stats["not_due"] += 1
+            return fp.as_parse_result()
+
+        host = urlparse(item.url).netloc
+        if answered is not None:
+            result: Optional[FetchResult] = answered
+        else:
+            headers = store.conditional_headers(fp) if store is not None else None
+            if request is not None and request.headers:
+                headers = {**request.headers, **(headers or {})}
+            await self.html_budget.wait_for_room()
+            if cfg.respect_robots:
+                await self.throttle.wait(host)
+            adaptive = self.concurrency
+            # In a batch, adaptive limits still draw on the crawl's share of the global budget.
+            budget = (
+                sem
+                if adaptive is not None and self.shared is not None
+                else contextlib.nullcontext()
+            )
+            async with (adaptive.slot(host) if adaptive is not None else sem), budget:
+                result = await fetch_page(
+                    session,
+                    request.url if request is not None else item.url,
+                    timeout=cfg.request_timeout,
+                    user_agent=cfg.user_agent,
+                    retries=cfg.retries,
+                    headers=headers,
+                    observer=(
+                        functools.partial(adaptive.observe, host) if adaptive is not None else None
+                    ),
+                )
+            if result is not None:
+                await self._archive_page(item, result.status, result.headers, result.text)
+
+        # Fetched HTML counts against max_pending_html_bytes until the adapter is done with it.
+        held = len(result.text) if result is not None and result.text else 0
+        self.html_budget.add(held)
+        try:
+            return await self._parse_fetched(item, adapter, request, result, fp, host)
         finally:
-            await session.close()
-
-        # De-duplicate product URLs per domain
-        deduped: Dict[str, List[ProductInfo]] = {}
-        for domain, products in discovered.items():
-            seen: Dict[str, ProductInfo] = {}
-            for product in products:
-                if product.url not in seen:
-                    seen[product.url] = product
-            deduped[domain] = list(seen.values())
-        return CrawlReport(discovered=deduped, visited_count=len(visited))
+            self.html_budget.remove(held)
+
+    async def _archive_page(
+        self, item: _QueueItem, status: int, headers: Dict[str, str], text: str
+    ) -> None:
+        if self.archive is None or not text:
+            return
+        page = (item.url, status, headers, text, item.depth, item.keywords)
+        # Never block the loop on a busy writer thread; wait for queue room off the loop instead.
+        if not self.archive.write(*page, block=False):
+            await asyncio.to_thread(self.archive.write, *page)
+
+    async def _parse_fetched(
+        self,
+        item: _QueueItem,
+        adapter: SiteAdapter,
+        request: Optional[PageRequest],
+        result: Optional[FetchResult],
+        fp: Optional[PageFingerprint],
+        host: str,
+    ) -> Optional[ParseResult]:
+        store = self.recrawl
+        if result is None:
+            self._host_errors[host] += 1
+            return None
+        if request is not None and self.middleware is not None:
+            result = await self.middleware.response(request, result)
+            if result is None:
+                return None
+        if result.not_modified and store is not None and fp is not None:
+            store.record_unchanged(item.url)
+            self._recrawl_stats["not_modified"] += 1
+            return fp.as_parse_result()
+        if not result.text:
+            return None
+
+        body_hash: Optional[str] = None
+        if store is not None:
+            body_hash = content_hash(result.text)
+            if fp is not None and fp.content_hash == body_hash:
+                store.record_unchanged(item.url)
+                self._recrawl_stats["unchanged"] += 1
+                return fp.as_parse_result()
+
+        if self.near_duplicates is not None and self._is_near_duplicate(
+            host, item.url, result.text
+        ):
+            return _SKIPPED
+
+        parsed = await self._parse_page(item, adapter, result.text, host)
+        if parsed is None:
+            return None
+
+        if store is not None and body_hash is not None:
+            store.record(
+                item.url,
+                parsed,
+                body_hash=body_hash,
+                etag=result.headers.get("etag"),
+                last_modified=result.headers.get("last-modified"),
+            )
+            self._recrawl_stats["changed" if fp is not None else "new"] += 1
+        return parsed
+
+    async def _parse_page(
+        self, item: _QueueItem, adapter: SiteAdapter, html: str, host: str
+    ) -> Optional[ParseResult]:
+        """Run the adapter on a page that passed the recrawl and near-duplicate checks."""
+        try:
+            if self.profiler is not None:
+                started = time.perf_counter()
+                parsed = adapter.parse(item.url, html)
+                self.profiler.record_parse(adapter, host, time.perf_counter() - started)
+                return parsed
+            return adapter.parse(item.url, html)
+        except Exception as exc:
+            logger.debug(
+                "Adapter %s failed on %s: %r", getattr(adapter, "name", adapter), item.url, exc
+            )
+            return None
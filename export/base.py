@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-from typing import Dict, List, Protocol
+from typing import Iterable, Mapping, Protocol
 
 from ..adapters.base import ProductInfo
 
 class Exporter(Protocol):
-    def export(self, data: Dict[str, List[ProductInfo]], path: str) -> None:
+    def export(self, data: Mapping[str, Iterable[ProductInfo]], path: str) -> None:
         ...
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import csv
-from typing import Dict, List
+from typing import Iterable, Mapping
 from pathlib import Path
 
 from .base import Exporter
@@ -24,9 +24,12 @@ class CSVExporter:
         "category",
         "type",
         "sales",
+        "price_value",
+        "sales_value",
+        "keywords",
     ]
 
-    def export(self, data: Dict[str, List[ProductInfo]], path: str) -> None:
+    def export(self, data: Mapping[str, Iterable[ProductInfo]], path: str) -> None:
         Path(path).parent.mkdir(parents=True, exist_ok=True)
         with open(path, "w", encoding="utf-8", newline="") as f:
             w = csv.writer(f)
@@ -45,5 +48,9 @@ class CSVExporter:
                             product.category or "",
                             product.item_type or "",
                             product.sales or "",
+                            # Numbers stay numbers (blank when unknown) so spreadsheets sort them.
+                            product.price_value if product.price_value is not None else "",
+                            product.sales_value if product.sales_value is not None else "",
+                            "|".join(product.matched_keywords or []),
                         ]
                     )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, List
+from typing import Iterable, Mapping
 from pathlib import Path
 
 from .base import Exporter
@@ -9,8 +9,18 @@ from ..adapters.base import ProductInfo
 
 
 class JSONExporter:
-    def export(self, data: Dict[str, List[ProductInfo]], path: str) -> None:
+    def export(self, data: Mapping[str, Iterable[ProductInfo]], path: str) -> None:
+        # Same layout as ``json.dump(..., indent=2)``, written one product at a time so spilled
+        # reports never have to be held in memory.
         Path(path).parent.mkdir(parents=True, exist_ok=True)
         with open(path, "w", encoding="utf-8") as f:
-            serializable = {domain: [p.to_dict() for p in products] for domain, products in data.items()}
-            json.dump(serializable, f, indent=2, ensure_ascii=False)
+            f.write("{")
+            for i, (domain, products) in enumerate(data.items()):
+                key = json.dumps(domain, ensure_ascii=False)
+                f.write(("," if i else "") + "\n  " + key + ": [")
+                count = 0
+                for count, product in enumerate(products, 1):
+                    body = json.dumps(product.to_dict(), indent=2, ensure_ascii=False)
+                    f.write(("," if count > 1 else "") + "\n    " + body.replace("\n", "\n    "))
+                f.write("\n  ]" if count else "]")
+            f.write("\n}" if data else "}")
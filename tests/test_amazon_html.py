@@ -0,0 +1,69 @@
+"""AmazonHtmlAdapter on the saved benchmark pages, and which links it follows."""
+
+from __future__ import annotations
+
+import pytest
+
+from ..adapters.amazon_html import AmazonHtmlAdapter
+from ..benchmarks.amazon_parse import DETAIL_URL, SEARCH_URL, load_pages
+
+PAGES = {name: html for name, _, html in load_pages([])}
+
+
+def test_search_fixture_cards() -> None:
+    parsed = AmazonHtmlAdapter().parse(SEARCH_URL, PAGES["amazon_search.html"])
+    assert len(parsed.products) == 55  # widgets with an empty data-asin are skipped
+    first = parsed.products[0]
+    assert first.url.startswith("https://www.amazon.com/dp/B0") and first.currency == "USD"
+    assert first.title and not first.title.startswith("Sponsored")
+    assert first.extra and first.extra["sponsored"] is True and first.extra["reviews"].isdigit()
+    assert all(p.price and p.extra and p.extra.get("rating") for p in parsed.products)
+    assert parsed.next_links == [SEARCH_URL + "&page=2&qid=1700000000&ref=sr_pg_1"]
+
+
+def test_detail_fixture() -> None:
+    (product,) = AmazonHtmlAdapter().parse(DETAIL_URL, PAGES["amazon_detail.html"]).products
+    assert (product.price, product.currency, product.seller, product.sales) == (
+        "59.99",
+        "USD",
+        "Acme Direct",
+        "2K+",
+    )
+    assert product.extra == {"asin": "B0ACME0001", "rating": "4.5", "reviews": "12345"}
+
+
+@pytest.mark.parametrize(
+    "url, follow",
+    [
+        ("https://www.amazon.com/s?k=headphones&page=2", True),
+        ("https://www.amazon.com/s/ref=nb_sb_noss?field-keywords=usb", True),
+        ("https://www.amazon.com/s?i=electronics&rh=n%3A172282", True),
+        ("https://www.amazon.com/s", False),
+        ("https://www.amazon.com/stores/Acme/page/1", False),
+        ("https://www.amazon.com/sp?seller=A1", False),
+        ("https://www.amazon.com/some-title/dp/B0ACME0001/ref=sr_1_1", True),
+        ("https://www.amazon.com/gp/help/customer/display.html", False),
+    ],
+)
+def test_should_follow(url: str, follow: bool) -> None:
+    assert AmazonHtmlAdapter().should_follow(url) is follow
+
+
+@pytest.mark.parametrize(
+    "host, raw, expected",
+    [
+        ("www.amazon.ca", "$59.99", ("59.99", "CAD")),
+        ("www.amazon.ca", "CDN$ 59.99", ("59.99", "CAD")),
+        ("www.amazon.ca", "US$59.99", ("59.99", "USD")),
+        ("www.amazon.com.au", "$59.99", ("59.99", "AUD")),
+        ("www.amazon.com.au", "A$59.99", ("59.99", "AUD")),
+        ("www.amazon.com.mx", "MX$1,299.00", ("1,299.00", "MXN")),
+        ("www.amazon.co.jp", "￥5,980", ("5,980", "JPY")),
+        ("www.amazon.cn", "¥5,980", ("5,980", "CNY")),
+        ("www.amazon.co.uk", "$59.99", ("59.99", "USD")),
+    ],
+)
+def test_price_currency_follows_marketplace(host: str, raw: str, expected: tuple) -> None:
+    html = PAGES["amazon_detail.html"].replace(">$59.99<", f">{raw}<", 1)
+    (product,) = AmazonHtmlAdapter().parse(f"https://{host}/dp/B0ACME0001", html).products
+    assert (product.price, product.currency) == expected
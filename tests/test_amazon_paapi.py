@@ -0,0 +1,147 @@
+"""AmazonPaapiAdapter paging, GetItems batching, ASIN cache and enrichment (StaticPaapiClient)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List
+
+from ..adapters.base import ProductInfo
+from ..apis.amazon_paapi import AmazonPaapiAdapter, StaticPaapiClient
+
+
+def _item(n: int) -> Dict[str, Any]:
+    asin = f"B0{n:08d}"
+    return {
+        "ASIN": asin,
+        "DetailPageURL": f"https://www.amazon.com/dp/{asin}?tag=partner-20",
+        "ItemInfo": {"Title": {"DisplayValue": f"Item {n}"}},
+        "Offers": {
+            "Listings": [
+                {
+                    "Price": {"Amount": 10.0 + n, "Currency": "USD"},
+                    "MerchantInfo": {"Name": "Acme"},
+                    "Availability": {"Message": "In Stock"},
+                }
+            ]
+        },
+        "CustomerReviews": {"StarRating": {"Value": 4.5}, "Count": 120},
+        "Images": {"Primary": {"Small": {"URL": f"https://m.media-amazon.com/{asin}.jpg"}}},
+        "BrowseNodeInfo": {"BrowseNodes": [{"DisplayName": "Headphones"}]},
+    }
+
+
+ITEMS = [_item(n) for n in range(150)]
+
+
+class SlowClient(StaticPaapiClient):
+    """Records how many blocking calls overlap."""
+
+    def __init__(self, items: List[Dict[str, Any]]) -> None:
+        super().__init__(items)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+
+    def search_items(self, **kwargs: Any) -> List[Dict[str, Any]]:
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.05)
+        with self._lock:
+            self.in_flight -= 1
+        return super().search_items(**kwargs)
+
+
+def _adapter(client: StaticPaapiClient, **kwargs: Any) -> AmazonPaapiAdapter:
+    return AmazonPaapiAdapter(client=client, tps=1000, **kwargs)
+
+
+def test_search_fetches_pages_1_to_10_concurrently() -> None:
+    client = SlowClient(ITEMS)
+    products = asyncio.run(_adapter(client).search("headphones", pages=15))
+    assert sorted(call[2] for call in client.calls) == list(range(1, 11))
+    assert client.peak > 1
+    assert len(products) == 100
+    assert {p.extra["asin"] for p in products} == {item["ASIN"] for item in ITEMS[:100]}
+
+
+def test_get_items_batches_ten_asins_and_caches_them() -> None:
+    client = StaticPaapiClient(ITEMS)
+    adapter = _adapter(client)
+    asins = [item["ASIN"] for item in ITEMS[:25]]
+    products = asyncio.run(adapter.get_items(asins + asins[:3]))
+    assert [p.extra["asin"] for p in products] == asins
+    assert sorted(len(call[1]) for call in client.calls) == [5, 10, 10]
+
+    client.calls.clear()
+    again = asyncio.run(adapter.get_items(asins[:12]))
+    assert client.calls == []  # served from the ASIN cache
+    assert [p.extra["asin"] for p in again] == asins[:12]
+
+
+def test_cached_asins_expire_after_the_ttl() -> None:
+    client = StaticPaapiClient(ITEMS)
+    adapter = _adapter(client, cache_ttl=0.05)
+    asins = [ITEMS[0]["ASIN"]]
+    asyncio.run(adapter.get_items(asins))
+    asyncio.run(adapter.get_items(asins))
+    assert len(client.calls) == 1
+    time.sleep(0.1)
+    asyncio.run(adapter.get_items(asins))
+    assert len(client.calls) == 2
+
+
+def test_item_maps_to_product_info() -> None:
+    product = _adapter(StaticPaapiClient([])).to_product(ITEMS[7])
+    assert product == ProductInfo(
+        url="https://www.amazon.com/dp/B000000007?tag=partner-20",
+        title="Item 7",
+        price="17.0",
+        currency="USD",
+        availability="In Stock",
+        seller="Acme",
+        category="Headphones",
+        item_type="product",
+        extra={
+            "asin": "B000000007",
+            "rating": 4.5,
+            "reviews": 120,
+            "image": "https://m.media-amazon.com/B000000007.jpg",
+        },
+        price_value=17.0,
+    )
+    bare = _adapter(StaticPaapiClient([])).to_product({"ASIN": "B0BARE0001"})
+    assert bare is not None and bare.url == "https://www.amazon.com/dp/B0BARE0001"
+    assert bare.price is None and bare.extra == {"asin": "B0BARE0001"}
+
+
+def test_enrich_merges_into_the_crawled_product() -> None:
+    crawled = ProductInfo(
+        url="https://www.amazon.com/some-title/dp/B000000003",
+        title="Some title",
+        price="$9.99",
+        sales="2K+",
+        extra={"asin": "B000000003", "sponsored": True},
+        price_value=9.99,
+        matched_keywords=["headphones"],
+    )
+    unknown = ProductInfo(url="https://www.amazon.com/dp/B0NOTFOUND", extra={"asin": "B0NOTFOUND"})
+    no_asin = ProductInfo(url="https://www.amazon.com/dp/x")
+    adapter = _adapter(StaticPaapiClient(ITEMS))
+    enriched, kept, untouched = asyncio.run(adapter.enrich([crawled, unknown, no_asin]))
+
+    assert enriched.url == crawled.url
+    assert (enriched.title, enriched.price, enriched.price_value, enriched.seller) == (
+        "Item 3",
+        "13.0",
+        13.0,
+        "Acme",
+    )
+    assert enriched.sales == "2K+" and enriched.matched_keywords == ["headphones"]
+    assert enriched.extra is not None
+    assert enriched.extra["sponsored"] is True and enriched.extra["rating"] == 4.5
+    assert crawled.title == "Some title"  # the input is not modified
+    assert adapter.cache.get("B000000003").url.endswith("?tag=partner-20")
+    assert kept is unknown and untouched is no_asin
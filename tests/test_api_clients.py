@@ -0,0 +1,150 @@
+"""The four signed marketplace clients against a local mock gateway that checks signatures."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+from typing import Any, Callable, Dict, List
+
+from aiohttp import web
+
+from ..apis.base import MarketplaceApiClient
+from ..apis.jd_union import JdUnionClient
+from ..apis.pdd_union import PddUnionClient
+from ..apis.taobao_top import TaobaoTopClient
+from ..apis.temu_partner import TemuPartnerClient
+
+SECRET = "s3cret"
+
+
+def _pairs(params: Dict[str, Any]) -> str:
+    return "".join(f"{k}{params[k]}" for k in sorted(params) if k != "sign")
+
+
+def expected_md5(params: Dict[str, Any]) -> str:
+    payload = SECRET + _pairs(params) + SECRET
+    return hashlib.md5(payload.encode("utf-8")).hexdigest().upper()
+
+
+def expected_hmac(params: Dict[str, Any]) -> str:
+    digest = hmac.new(SECRET.encode("utf-8"), _pairs(params).encode("utf-8"), "md5")
+    return digest.hexdigest().upper()
+
+
+def _compact(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+async def _with_gateway(
+    response: Dict[str, Any],
+    check: Callable[[Dict[str, Any]], str],
+    scenario: Callable[[str], Any],
+) -> List[Dict[str, Any]]:
+    """Serve ``response`` to signed calls, run ``scenario(url)``; returns the received params."""
+    received: List[Dict[str, Any]] = []
+
+    async def handle(request: web.Request) -> web.Response:
+        if request.content_type == "application/json":
+            params = {k: _compact(v) for k, v in (await request.json()).items()}
+        else:
+            params = dict(await request.post())
+        received.append(params)
+        if params.get("sign") != check(params):
+            return web.json_response({"error_response": {"code": 25, "msg": "bad sign"}})
+        return web.json_response(response)
+
+    app = web.Application()
+    app.router.add_post("/router", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        await scenario(f"http://127.0.0.1:{port}/router")
+    finally:
+        await runner.cleanup()
+    return received
+
+
+def _client(cls: type, gateway: str, **kwargs: Any) -> MarketplaceApiClient:
+    return cls(f"key-{cls.__name__}-{id(kwargs)}", SECRET, gateway_url=gateway, qps=1000, **kwargs)
+
+
+def test_jd_union_md5_signature_and_mapping() -> None:
+    result = {"code": 200, "data": [{"skuId": 1, "skuName": "Phone", "priceInfo": {"price": 99.0}}]}
+    response = {"jd_union_open_goods_query_responce": {"queryResult": json.dumps(result)}}
+    products: List[Any] = []
+
+    async def scenario(url: str) -> None:
+        client = _client(JdUnionClient, url)
+        products.extend(await client.search("phone"))
+        await client.close()
+
+    received = asyncio.run(_with_gateway(response, expected_md5, scenario))
+    assert received[0]["method"] == "jd.union.open.goods.query"
+    assert json.loads(received[0]["360buy_param_json"])["goodsReqDTO"]["keyword"] == "phone"
+    assert [(p.url, p.title, p.price) for p in products] == [
+        ("https://item.jd.com/1.html", "Phone", "99.0")
+    ]
+
+
+def test_taobao_top_md5_and_hmac_signatures() -> None:
+    items = [{"num_iid": 5, "title": "Tea", "zk_final_price": "12.50"}]
+    response = {"tbk_dg_material_optional_response": {"result_list": {"map_data": items}}}
+    for sign_method, check in (("md5", expected_md5), ("hmac", expected_hmac)):
+        products: List[Any] = []
+
+        async def scenario(url: str) -> None:
+            client = _client(TaobaoTopClient, url, sign_method=sign_method, adzone_id="42")
+            products.extend(await client.search("tea"))
+            await client.close()
+
+        received = asyncio.run(_with_gateway(response, check, scenario))
+        assert received[0]["sign_method"] == sign_method
+        assert received[0]["adzone_id"] == "42"
+        assert [(p.title, p.price) for p in products] == [("Tea", "12.50")]
+
+
+def test_pdd_union_md5_signature_with_json_list_param() -> None:
+    items = [{"goods_id": 7, "goods_name": "Mug", "min_group_price": 1990}]
+    response = {"goods_basic_detail_response": {"list": items}}
+    products: List[Any] = []
+
+    async def scenario(url: str) -> None:
+        client = _client(PddUnionClient, url, pid="p1")
+        products.extend(await client.get_items(["7", "8"]))
+        await client.close()
+
+    received = asyncio.run(_with_gateway(response, expected_md5, scenario))
+    assert received[0]["goods_id_list"] == "[7,8]"
+    assert [(p.title, p.price) for p in products] == [("Mug", "19.90")]
+
+
+def test_temu_json_signature_and_cached_list_params() -> None:
+    response = {"success": True, "result": {"goodsList": [{"goodsId": 9, "goodsName": "Lamp"}]}}
+    products: List[Any] = []
+
+    async def scenario(url: str) -> None:
+        client = _client(TemuPartnerClient, url, access_token="tok")
+        products.extend(await client.get_items(["9"]))
+        # Same lookup again: served from the response cache despite the list-valued param.
+        products.extend(await client.get_items(["9"]))
+        await client.close()
+
+    received = asyncio.run(_with_gateway(response, expected_md5, scenario))
+    assert len(received) == 1
+    assert received[0]["goodsIdList"] == '["9"]'
+    assert [p.title for p in products] == ["Lamp", "Lamp"]
+
+
+def test_instances_sharing_an_app_key_use_the_lowest_qps() -> None:
+    fast = JdUnionClient("shared-key", SECRET, qps=10)
+    slow = JdUnionClient("shared-key", SECRET, qps=2)
+    again = JdUnionClient("shared-key", SECRET, qps=5)
+    assert fast.quota is slow.quota is again.quota
+    assert fast.quota.rate == 2
@@ -0,0 +1,67 @@
+"""Archive segments shared by several runs replay the newest copy of each page."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from ..config import CrawlConfig
+from ..engines.archive import ArchiveReader, ArchiveWriter
+from ..engines.replay import ReplayEngine
+
+URL = "https://shop.test/p/1"
+
+
+def _page(price: str) -> str:
+    return (
+        '<html><script type="application/ld+json">'
+        f'{{"@type": "Product", "name": "Widget", "offers": {{"price": "{price}",'
+        ' "priceCurrency": "USD"}}</script></html>'
+    )
+
+
+def _archive(directory: Path, prices: list) -> None:
+    # One writer per crawl run, all sharing the directory.
+    for price in prices:
+        writer = ArchiveWriter(str(directory))
+        writer.write(URL, 200, {"content-type": "text/html"}, _page(price))
+        writer.close()
+
+
+def test_reader_returns_latest_copy(tmp_path: Path) -> None:
+    _archive(tmp_path, ["10.00", "11.00", "12.00"])
+    reader = ArchiveReader(str(tmp_path))
+    assert len(reader.segments()) == 3
+    assert [e.url for e in reader.latest_entries()] == [URL]
+    page = reader.get(URL)
+    assert page is not None and "12.00" in page.text
+    reader.close()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_replay_uses_newest_copy(tmp_path: Path, workers: int) -> None:
+    _archive(tmp_path, ["10.00", "12.00"])
+    cfg = CrawlConfig(replay_archive=str(tmp_path), replay_workers=workers)
+    report = asyncio.run(ReplayEngine(cfg).crawl())
+    assert [p.price for p in report.discovered["shop.test"]] == ["12.00"]
+    assert report.stats["replay"]["records"] == 1
+
+
+def test_non_blocking_write_reports_a_full_queue(tmp_path: Path) -> None:
+    writer = ArchiveWriter(str(tmp_path), max_pending=1)
+    release = threading.Event()
+    append = writer._append
+    writer._append = lambda page: (release.wait(), append(page))  # type: ignore[method-assign]
+    assert writer.write(URL, 200, {}, _page("1.00"), block=False)
+    while not writer._queue.empty():  # the writer thread picked it up and is now stuck
+        time.sleep(0.01)
+    assert writer.write(URL, 200, {}, _page("2.00"), block=False)
+    assert writer.write(URL, 200, {}, _page("3.00"), block=False) is False
+    assert writer.stats["queue_full"] == 1
+    release.set()
+    writer.close()
+    assert writer.stats["records"] == 2
@@ -0,0 +1,127 @@
+"""Two crawls in one batch against a local server: shared session, robots cache and budget."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+from ..config import CrawlConfig
+from ..engines import batch, simple_engine
+from ..export import json_exporter
+from ..utils.throttling import FairShareBudget
+
+PRODUCT = (
+    '<html><script type="application/ld+json">'
+    '{"@type": "Product", "name": "%s", "offers": {"price": "9.99"}}</script></html>'
+)
+
+
+class RecordingBudget(FairShareBudget):
+    """Keeps every share split the batch went through."""
+
+    history: List[Dict[str, int]] = []
+
+    def _rebalance(self) -> None:
+        super()._rebalance()
+        shares = self.shares().items()
+        self.history.append({Path(key.config.output_path).stem: n for key, n in shares})
+
+    @classmethod
+    def a_finished(cls) -> bool:
+        return any("a" in h for h in cls.history) and "a" not in cls.history[-1]
+
+
+async def _serve(routes: web.RouteTableDef) -> web.AppRunner:
+    app = web.Application()
+    app.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def test_two_crawls_share_session_robots_and_budget(tmp_path: Path, monkeypatch: Any) -> None:
+    hits: Dict[str, int] = {"robots": 0}
+    in_flight = {"b": 0}
+    peaks = {"b_with_a": 0, "b_alone": 0}
+    routes = web.RouteTableDef()
+
+    @routes.get("/robots.txt")
+    async def robots(request: web.Request) -> web.Response:
+        hits["robots"] += 1
+        return web.Response(text="User-agent: *\nDisallow: /private/\n")
+
+    @routes.get("/a/")
+    async def a_listing(request: web.Request) -> web.Response:
+        links = "".join(f'<a href="/a/p/{i}">{i}</a>' for i in range(3))
+        return web.Response(text=f'{links}<a href="/private/x">x</a>', content_type="text/html")
+
+    @routes.get("/b/")
+    async def b_listing(request: web.Request) -> web.Response:
+        links = "".join(f'<a href="/b/p/{i}">{i}</a>' for i in range(40))
+        return web.Response(text=links, content_type="text/html")
+
+    @routes.get("/{crawl}/p/{n}")
+    async def product(request: web.Request) -> web.Response:
+        crawl = request.match_info["crawl"]
+        if crawl == "b":
+            in_flight["b"] += 1
+            phase = "b_alone" if RecordingBudget.a_finished() else "b_with_a"
+            peaks[phase] = max(peaks[phase], in_flight["b"])
+            await asyncio.sleep(0.05)
+            in_flight["b"] -= 1
+        text = PRODUCT % f"{crawl}-{request.match_info['n']}"
+        return web.Response(text=text, content_type="text/html")
+
+    sessions: List[Any] = []
+    real_create_session = batch.create_session
+
+    def counting_create_session(**kwargs: Any) -> Any:
+        sessions.append(real_create_session(**kwargs))
+        return sessions[-1]
+
+    def no_own_session(**kwargs: Any) -> Any:
+        raise AssertionError("a batch crawl built its own session")
+
+    monkeypatch.setattr(batch, "create_session", counting_create_session)
+    monkeypatch.setattr(simple_engine, "create_session", no_own_session)
+    monkeypatch.setattr(batch, "FairShareBudget", RecordingBudget)
+    RecordingBudget.history = []
+
+    async def main() -> List[batch.BatchResult]:
+        runner = await _serve(routes)
+        port = runner.addresses[0][1]
+        configs = []
+        for name in ("a", "b"):
+            cfg = CrawlConfig(
+                start_urls=[f"http://127.0.0.1:{port}/{name}/"],
+                max_concurrency=6,
+                output_path=str(tmp_path / f"{name}.json"),
+                engine=f"{simple_engine.__name__}:SimpleCrawlEngine",
+                exporter=f"{json_exporter.__name__}:JSONExporter",
+            )
+            configs.append((name, cfg))
+        try:
+            return await batch.BatchRunner(configs, global_concurrency=6).run()
+        finally:
+            await runner.cleanup()
+
+    results = asyncio.run(main())
+    assert [(r.name, r.error, r.product_count) for r in results] == [
+        ("a", None, 3),
+        ("b", None, 40),
+    ]
+    assert len(sessions) == 1 and sessions[0].closed
+    assert hits["robots"] == 1  # one robots.txt cache for both crawls on the same host
+    (exported,) = json.loads((tmp_path / "b.json").read_text(encoding="utf-8")).values()
+    assert len(exported) == 40 and all("/b/p/" in p["url"] for p in exported)
+
+    # The budget is split while both run, and b gets a's slots once a finishes.
+    assert {"a": 3, "b": 3} in RecordingBudget.history
+    assert RecordingBudget.history[-2:] == [{"b": 6}, {}]
+    assert 1 <= peaks["b_with_a"] <= 3
+    assert peaks["b_alone"] > 3
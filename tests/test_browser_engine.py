@@ -0,0 +1,147 @@
+"""Hybrid browser escalation against a local static site (the browser is stubbed unless
+Playwright is installed)."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import pytest
+from aiohttp import web
+
+from ..config import CrawlConfig
+from ..engines import browser_engine
+from ..engines.archive import ArchiveReader
+from ..engines.browser_engine import BrowserCrawlEngine
+
+CRAWL_DELAY = 0.3
+PRODUCT = (
+    '<html><script type="application/ld+json">'
+    '{"@type": "Product", "name": "Widget", "offers": {"price": "9.99"}}</script></html>'
+)
+# The listing's links only exist after its script runs.
+SHELL = (
+    '<html><body><div id="app"></div><script>'
+    "document.getElementById('app').innerHTML = "
+    "'<a href=\"/p/1\">one</a><a href=\"/p/2\">two</a>';"
+    "</script></body></html>"
+)
+RENDERED = (
+    '<html><body><div id="app"><a href="/p/1">one</a><a href="/p/2">two</a></div></body></html>'
+)
+
+
+async def _serve(scenario: Callable[[str, List[float]], Awaitable[None]]) -> None:
+    hits: List[float] = []
+
+    async def handle(request: web.Request) -> web.Response:
+        hits.append(time.monotonic())
+        if request.path == "/robots.txt":
+            return web.Response(text=f"User-agent: *\nCrawl-delay: {CRAWL_DELAY}\n")
+        body = SHELL if request.path == "/" else PRODUCT
+        return web.Response(text=body, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        await scenario(f"http://127.0.0.1:{runner.addresses[0][1]}/", hits)
+    finally:
+        await runner.cleanup()
+
+
+class _FakePool:
+    """Stands in for BrowserPool: "renders" the listing shell and records when it was asked."""
+
+    renders: List[float] = []
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.blocked_requests = 0
+
+    async def start(self) -> "_FakePool":
+        return self
+
+    async def close(self) -> None:
+        return None
+
+    async def render(self, url: str, *, timeout: float = 15.0) -> Optional[str]:
+        type(self).renders.append(time.monotonic())
+        return RENDERED if url.endswith("/") else PRODUCT
+
+
+def _config(start: str, tmp_path: Path, **overrides: Any) -> CrawlConfig:
+    return CrawlConfig(
+        start_urls=[start],
+        max_depth=1,
+        archive_dir=str(tmp_path / "archive"),
+        max_pending_html_bytes=1 << 20,
+        **overrides,
+    )
+
+
+def _crawl(cfg: CrawlConfig) -> Any:
+    return BrowserCrawlEngine(cfg).crawl()
+
+
+@pytest.fixture
+def fake_pool(monkeypatch: pytest.MonkeyPatch) -> type:
+    _FakePool.renders = []
+    monkeypatch.setattr(browser_engine, "BrowserPool", _FakePool)
+    return _FakePool
+
+
+def test_hybrid_render_is_throttled_archived_and_budgeted(fake_pool: type, tmp_path: Path) -> None:
+    report: Dict[str, Any] = {}
+
+    async def scenario(start: str, hits: List[float]) -> None:
+        report["report"] = await _crawl(_config(start, tmp_path))
+        report["hits"] = list(hits)
+
+    asyncio.run(_serve(scenario))
+    crawl = report["report"]
+    assert crawl.stats["browser"]["escalated"] == 1 and len(fake_pool.renders) == 1
+    found = sorted(p.url.rsplit("/", 1)[1] for v in crawl.discovered.values() for p in v)
+    assert found == ["1", "2"]
+    # robots.txt is exempt; every page request and the render keep Crawl-delay apart.
+    requests = sorted(report["hits"][1:] + fake_pool.renders)
+    gaps = [b - a for a, b in zip(requests, requests[1:])]
+    assert len(requests) == 4 and min(gaps) >= CRAWL_DELAY - 0.05
+    # The rendered copy of the listing is archived after the HTTP one, so replays use it.
+    reader = ArchiveReader(str(tmp_path / "archive"))
+    listing = reader.get(next(e.url for e in reader.latest_entries() if e.url.endswith("/")))
+    assert listing is not None and listing.text == RENDERED
+    reader.close()
+    assert crawl.stats["memory"]["html_bytes"]["peak"] >= len(RENDERED)
+
+
+def test_recrawl_reuse_is_not_rendered_again(fake_pool: type, tmp_path: Path) -> None:
+    async def scenario(start: str, hits: List[float]) -> None:
+        cfg = _config(start, tmp_path, recrawl_state_path=str(tmp_path / "recrawl.json"))
+        first = await _crawl(cfg)
+        assert first.stats["browser"]["escalated"] == 1
+        second = await _crawl(cfg)
+        assert second.stats["browser"]["escalated"] == 0
+        assert second.stats["recrawl"]["unchanged"] == 1 and second.stats["recrawl"]["not_due"] == 2
+        assert sum(len(v) for v in second.discovered.values()) == 2
+
+    asyncio.run(_serve(scenario))
+    assert len(fake_pool.renders) == 1
+
+
+def test_real_browser_renders_the_listing(tmp_path: Path) -> None:
+    pytest.importorskip("playwright.async_api")
+
+    async def scenario(start: str, hits: List[float]) -> None:
+        try:
+            report = await _crawl(_config(start, tmp_path, respect_robots=False))
+        except Exception as exc:  # Playwright without a downloaded Chromium
+            pytest.skip(f"browser unavailable: {exc!r}")
+        assert report.stats["browser"]["rendered"] == 1
+        assert sum(len(v) for v in report.discovered.values()) == 2
+
+    asyncio.run(_serve(scenario))
@@ -0,0 +1,71 @@
+"""Crawl budgets stop an endless shop with partial results and the reason."""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import Any
+
+import pytest
+
+from ..config import CrawlConfig
+from ..engines import simple_engine
+from ..engines.base import CrawlReport
+from ..utils.http import FetchResult
+
+PRODUCT = (
+    '<html><script type="application/ld+json">'
+    '{"@type": "Product", "name": "Widget %s", "offers": {"price": "9.99"}}</script></html>'
+)
+
+
+async def endless_shop(session: Any, url: str, **kwargs: Any) -> FetchResult:
+    """Every listing links two products and the next listing, forever."""
+    await asyncio.sleep(0.01)
+    product = re.search(r"/p/(\d+-\d)$", url)
+    if product:
+        return FetchResult(url=url, status=200, text=PRODUCT % product.group(1))
+    n = int(url.rstrip("/").rpartition("/")[2] or 0) if "/list/" in url else 0
+    links = f'<a href="/p/{n}-1">a</a><a href="/p/{n}-2">b</a><a href="/list/{n + 1}">next</a>'
+    return FetchResult(url=url, status=200, text=f"<html><body>{links}</body></html>")
+
+
+def _crawl(monkeypatch: Any, **budget: Any) -> CrawlReport:
+    monkeypatch.setattr(simple_engine, "fetch_page", endless_shop)
+    cfg = CrawlConfig(
+        start_urls=["https://shop.test/"],
+        respect_robots=False,
+        max_concurrency=4,
+        max_depth=10_000,
+        shutdown_grace=1.0,
+        **budget,
+    )
+    return asyncio.run(simple_engine.SimpleCrawlEngine(cfg).crawl())
+
+
+def _products(report: CrawlReport) -> list:
+    return [p for products in report.discovered.values() for p in products]
+
+
+@pytest.mark.parametrize(
+    "budget, reason",
+    [
+        ({"deadline_seconds": 1.0}, "deadline"),
+        ({"max_pages": 12}, "max_pages"),
+        ({"max_products": 5}, "max_products"),
+    ],
+)
+def test_budget_stops_with_partial_results(monkeypatch: Any, budget: dict, reason: str) -> None:
+    started = time.monotonic()
+    report = _crawl(monkeypatch, **budget)
+    assert report.stop_reason == reason
+    assert report.stats["interrupted"] is True and report.stats["stop_reason"] == reason
+    products = _products(report)
+    assert products and all("/p/" in p.url for p in products)
+    if reason == "deadline":
+        assert time.monotonic() - started < 1.5
+    elif reason == "max_pages":
+        assert 12 <= report.visited_count <= 12 + 4  # plus at most the fetches in flight
+    else:
+        assert len(products) == 5
@@ -0,0 +1,45 @@
+"""Embedded-state decoding for the Chinese marketplace HTML adapters."""
+
+from __future__ import annotations
+
+from ..adapters.cn_sites_html import JDHtmlAdapter, find_embedded_json
+from ..apis.jd_union import JdUnionClient
+
+MARKER = "window.__INITIAL_STATE__"
+
+
+def test_relaxed_literal_keeps_string_contents() -> None:
+    html = (
+        "<script>window.__INITIAL_STATE__ = {list: [{skuId: 1, skuName: \"Phone, case: blue\","
+        " note: 'a, b: c', ok: !0, gone: undefined}]};</script>"
+    )
+    item = find_embedded_json(html, MARKER)["list"][0]
+    assert item["skuName"] == "Phone, case: blue" and item["note"] == "a, b: c"
+    assert item["ok"] is True and item["gone"] is None
+
+
+def test_json_parse_payload() -> None:
+    html = (
+        "<script>window.__INITIAL_STATE__ = JSON.parse('{\\\"list\\\":[{\\\"skuId\\\":2,"
+        "\\\"skuName\\\":\\\"it\\'s \\\\u624b\\\\u673a\\\","
+        "\\\"totalSales\\\":\\\"1.2\\u4e07\\\"}]}');"
+        "</script>"
+    )
+    assert find_embedded_json(html, MARKER) == {
+        "list": [{"skuId": 2, "skuName": "it's 手机", "totalSales": "1.2万"}]
+    }
+
+
+def test_jd_review_counts_are_not_sales() -> None:
+    html = (
+        '<script>window.__INITIAL_STATE__ = {"list": ['
+        '{"skuId": 1, "skuName": "A", "commentCount": 5000},'
+        '{"skuId": 2, "skuName": "B", "comments": 70, "totalSales": 12}]};</script>'
+    )
+    products = JDHtmlAdapter().parse("https://search.jd.com/Search?keyword=x", html).products
+    assert [(p.url, p.sales) for p in products] == [
+        ("https://item.jd.com/1.html", None),
+        ("https://item.jd.com/2.html", "12"),
+    ]
+    client = JdUnionClient("key", "secret")
+    assert client.to_product({"skuId": 3, "skuName": "C", "comments": 900}).sales is None
@@ -0,0 +1,56 @@
+"""Keyword files are merged by the loaders, not by validate(); search templates are literal."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from ..config import CrawlConfig
+from ..engines.simple_engine import SimpleCrawlEngine
+from ..ui.cli import _load_config, build_arg_parser
+
+
+def _keywords_file(tmp_path: Path) -> Path:
+    path = tmp_path / "keywords.txt"
+    path.write_text("usb hub\n# comment\nssd\n", encoding="utf-8")
+    return path
+
+
+def test_validate_does_not_touch_keywords(tmp_path: Path) -> None:
+    cfg = CrawlConfig(start_urls=["https://a.test/"], keywords_file=str(_keywords_file(tmp_path)))
+    cfg.validate()
+    assert cfg.keywords is None
+    cfg.load_keywords_file()
+    cfg.load_keywords_file()
+    assert cfg.keywords == ["usb hub", "ssd"]
+
+
+def test_loaders_merge_keywords_file(tmp_path: Path, monkeypatch: Any) -> None:
+    keywords = _keywords_file(tmp_path)
+    config = tmp_path / "crawl.json"
+    data = {"start_urls": ["https://a.test/"], "keywords_file": str(keywords)}
+    config.write_text(json.dumps(data), encoding="utf-8")
+    assert CrawlConfig.from_file(config).keywords == ["usb hub", "ssd"]
+    monkeypatch.setenv("CRAWLER_KEYWORDS_FILE", str(keywords))
+    assert CrawlConfig.from_env().keywords == ["usb hub", "ssd"]
+    args = build_arg_parser().parse_args(["--config", str(config), "--keywords", "cable,ssd"])
+    assert _load_config(args).keywords == ["cable", "ssd", "usb hub"]
+
+
+def test_search_template_with_other_braces() -> None:
+    template = 'https://s.test/search?q={keyword}&filter={"sort":"price"}'
+    cfg = CrawlConfig(search_url_templates=[template], keywords=["usb hub"])
+    cfg.validate()
+    (url,) = SimpleCrawlEngine(cfg)._seed_urls()
+    assert "q=usb+hub" in url and "sort" in url
+
+
+def test_env_patterns_are_one_regex_per_line(monkeypatch: Any) -> None:
+    monkeypatch.setenv("CRAWLER_START_URLS", "https://a.test/")
+    monkeypatch.setenv("CRAWLER_INCLUDE_PATTERNS", " /p/\\d{1,3}$ \n\n/item/[a-z]{2,},x\n")
+    monkeypatch.setenv("CRAWLER_EXCLUDE_PATTERNS", "")
+    cfg = CrawlConfig.from_env()
+    assert cfg.include_patterns == [r"/p/\d{1,3}$", "/item/[a-z]{2,},x"]
+    assert cfg.exclude_patterns is None
+    cfg.validate()
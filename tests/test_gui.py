@@ -0,0 +1,117 @@
+"""CrawlRunner row batching and a full run on its own thread, without a Tk window."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from ..adapters.base import ProductInfo
+from ..config import CrawlConfig
+from ..engines import simple_engine
+from ..utils.http import FetchResult
+
+pytest.importorskip("tkinter")
+from ..ui import gui  # noqa: E402  (needs tkinter importable, but no display)
+
+PRODUCT = (
+    '<html><script type="application/ld+json">'
+    '{"@type": "Product", "name": "%s", "offers": {"price": "9.99"}}</script></html>'
+)
+
+
+class FakeEngine:
+    def __init__(self) -> None:
+        self.discovered: Dict[str, List[ProductInfo]] = {}
+
+    def discovered_so_far(self) -> Dict[str, List[ProductInfo]]:
+        return self.discovered
+
+
+def _runner(max_rows_per_event: int = 5000) -> Tuple[gui.CrawlRunner, FakeEngine]:
+    runner = gui.CrawlRunner(CrawlConfig(), max_rows_per_event=max_rows_per_event)
+    runner.engine = FakeEngine()
+    return runner, runner.engine
+
+
+def test_rows_are_capped_per_event_and_the_rest_follow() -> None:
+    runner, engine = _runner(max_rows_per_event=3)
+    engine.discovered = {
+        "a.test": [ProductInfo(url=f"https://a.test/p/{i}") for i in range(4)],
+        "b.test": [ProductInfo(url=f"https://b.test/p/{i}") for i in range(2)],
+    }
+    cursors: Dict[str, int] = {}
+    seen: Dict[str, int] = {}
+    updates: List[Tuple[int, gui.Row]] = []
+    first = runner._new_rows(cursors, seen, updates)
+    assert [r[4] for r in first] == [f"https://a.test/p/{i}" for i in range(3)]
+    second = runner._new_rows(cursors, seen, updates)
+    assert [r[4] for r in second] == ["https://a.test/p/3", "https://b.test/p/0", "https://b.test/p/1"]
+    assert runner._new_rows(cursors, seen, updates) == [] and updates == []
+
+    engine.discovered["b.test"] += [ProductInfo(url=f"https://b.test/p/{i}") for i in range(2, 9)]
+    final = runner._new_rows(cursors, seen, updates, limit=None)  # the last event sends all
+    assert len(final) == 7 and runner._row_count == 13
+
+
+def test_richer_record_for_a_shown_url_becomes_an_update() -> None:
+    runner, engine = _runner()
+    bare = ProductInfo(url="https://a.test/p/1")
+    engine.discovered = {"a.test": [ProductInfo(url="https://a.test/p/0"), bare]}
+    cursors: Dict[str, int] = {}
+    seen: Dict[str, int] = {}
+    updates: List[Tuple[int, gui.Row]] = []
+    assert runner._new_rows(cursors, seen, updates) == [
+        ("a.test", "", "", "", "https://a.test/p/0"),
+        ("a.test", "", "", "", "https://a.test/p/1"),
+    ]
+    rich = ProductInfo(url="https://a.test/p/1", title="One", price="9.99", currency="USD")
+    engine.discovered["a.test"] += [rich, ProductInfo(url="https://a.test/p/0")]
+    assert runner._new_rows(cursors, seen, updates) == []
+    # The second bare copy of /p/0 adds nothing, so only the richer /p/1 goes out.
+    assert updates == [(1, ("a.test", "One", "9.99", "USD", "https://a.test/p/1"))]
+
+
+def test_cursor_restarts_after_the_engine_spills_a_list() -> None:
+    runner, engine = _runner()
+    engine.discovered = {"a.test": [ProductInfo(url=f"https://a.test/p/{i}") for i in range(5)]}
+    cursors: Dict[str, int] = {}
+    seen: Dict[str, int] = {}
+    updates: List[Tuple[int, gui.Row]] = []
+    assert len(runner._new_rows(cursors, seen, updates)) == 5
+    engine.discovered = {"a.test": [ProductInfo(url=f"https://a.test/p/{i}") for i in (5, 6)]}
+    rows = runner._new_rows(cursors, seen, updates)
+    assert [r[4] for r in rows] == ["https://a.test/p/5", "https://a.test/p/6"]
+    assert cursors == {"a.test": 2}
+
+
+def test_runner_crawls_on_its_thread_without_a_window(monkeypatch: Any) -> None:
+    pages = {
+        "https://shop.test/": "".join(f'<a href="/deal/{i}">{i}</a>' for i in range(3)),
+        **{f"https://shop.test/deal/{i}": PRODUCT % f"Deal {i}" for i in range(3)},
+    }
+
+    async def fake_fetch(session: Any, url: str, **kwargs: Any) -> FetchResult:
+        return FetchResult(url=url, status=200, text=pages[url])
+
+    monkeypatch.setattr(simple_engine, "fetch_page", fake_fetch)
+    cfg = CrawlConfig(
+        start_urls=["https://shop.test/"],
+        respect_robots=False,
+        engine=f"{simple_engine.__name__}:SimpleCrawlEngine",
+    )
+    runner = gui.CrawlRunner(cfg, refresh_hz=50.0)
+    runner.start()
+    events = []
+    while not (events and events[-1].finished):
+        events.append(runner.events.get(timeout=10))
+    runner._thread.join(timeout=10)
+    assert not runner.running
+
+    last = events[-1]
+    assert last.error is None and last.report is not None
+    rows = [row for event in events for row in event.rows]
+    titles = {index: row[1] for event in events for index, row in event.updates}
+    titles.update({i: row[1] for i, row in enumerate(rows) if row[1]})
+    assert sorted(titles.values()) == ["Deal 0", "Deal 1", "Deal 2"]
+    assert len(rows) == last.products == 3
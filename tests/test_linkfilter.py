@@ -0,0 +1,39 @@
+"""LinkFilter default excludes, include patterns and blocked extensions."""
+
+from __future__ import annotations
+
+import pytest
+
+from ..utils.linkfilter import LinkFilter
+
+
+@pytest.mark.parametrize(
+    "url, allowed",
+    [
+        # Account and cart sections are matched in the path...
+        ("https://shop.test/login", False),
+        ("https://shop.test/a/sign-in?next=%2Fp%2F1", False),
+        ("https://shop.test/account.html", False),
+        ("/checkout/step-1", False),
+        ("https://shop.test/cart", False),
+        ("HTTPS://shop.test/My-Account/", False),
+        ("https://shop.test/p?add-to-cart=5", False),
+        # ...but never in the host, the query or the fragment.
+        ("https://login.example.com/p/1", True),
+        ("//cart.shop.com/p/1", True),
+        ("https://auth.shop.test/", True),
+        ("https://shop.test/p/1?next=/login", True),
+        ("https://shop.test/p/1#/cart", True),
+        ("https://shop.test/accounting-books/1", True),
+        ("https://shop.test/img/p1.JPG?w=200", False),
+    ],
+)
+def test_default_rules(url: str, allowed: bool) -> None:
+    assert LinkFilter().allows(url) is allowed
+
+
+def test_include_and_custom_exclude() -> None:
+    link_filter = LinkFilter(include=[r"/p/\d{1,3}$"], exclude=[r"/p/9"], blocked_extensions=[])
+    assert link_filter.filter(
+        ["https://a.test/p/1", "https://a.test/p/1234", "https://a.test/p/99", "https://a.test/c/1"]
+    ) == ["https://a.test/p/1"]
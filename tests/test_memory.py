@@ -0,0 +1,131 @@
+"""Spilled products and frontier runs are streamed back from disk, not reloaded wholesale."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+from pathlib import Path
+
+from ..adapters.base import ProductInfo
+from ..engines.checkpoint import CrawlCheckpoint
+from ..engines.frontier import SpillingFrontier
+from ..engines.simple_engine import dedupe_products
+from ..export.json_exporter import JSONExporter
+from ..utils.memory import ProductSpool
+
+
+def _found() -> list:
+    # (domain, url, keyword) in discovery order, with repeats that add keywords.
+    return [
+        ("a.test", "https://a.test/1", "red"),
+        ("b.test", "https://b.test/1", "red"),
+        ("a.test", "https://a.test/2", "red"),
+        ("a.test", "https://a.test/1", "blue"),
+        ("b.test", "https://b.test/2", "blue"),
+        ("a.test", "https://a.test/3", "blue"),
+    ]
+
+
+def _spooled(tmp_path: Path, limit: int) -> tuple:
+    spool = ProductSpool(limit, str(tmp_path))
+    discovered: dict = {}
+    everything: dict = {}
+    for domain, url, keyword in _found():
+        for target in (discovered, everything):
+            target.setdefault(domain, []).append(ProductInfo(url=url, matched_keywords=[keyword]))
+        spool.added(discovered, 1)
+    return spool, discovered, everything
+
+
+def _rows(report) -> dict:
+    return {d: [(p.url, p.matched_keywords) for p in products] for d, products in report.items()}
+
+
+def test_spooled_products_match_in_memory_dedupe(tmp_path: Path) -> None:
+    spool, discovered, everything = _spooled(tmp_path, limit=3)
+    assert spool.spilled == 4
+    view = spool.products(discovered)
+    assert _rows(view) == _rows(dedupe_products(everything))
+    assert {d: len(products) for d, products in view.items()} == {"a.test": 3, "b.test": 2}
+    assert view["a.test"][0].matched_keywords == ["red", "blue"]
+    capped = spool.products(discovered, max_products=2)
+    assert _rows(capped) == {
+        "a.test": [("https://a.test/1", ["red", "blue"]), ("https://a.test/2", ["red"])]
+    }
+
+
+def test_json_export_streams_the_spool(tmp_path: Path) -> None:
+    spool, discovered, everything = _spooled(tmp_path, limit=3)
+    out = tmp_path / "out.json"
+    JSONExporter().export(spool.products(discovered), str(out))
+    expected = {d: [p.to_dict() for p in ps] for d, ps in dedupe_products(everything).items()}
+    assert out.read_text(encoding="utf-8") == json.dumps(expected, indent=2, ensure_ascii=False)
+
+
+def test_checkpoint_records_are_pinned_when_taken(tmp_path: Path) -> None:
+    spool, discovered, _ = _spooled(tmp_path, limit=3)
+    expected = list(spool.records(discovered))
+    checkpoint = CrawlCheckpoint(products=spool.records(discovered))
+    # Products found after the snapshot (here: another spill) are not part of it.
+    late = [ProductInfo(url=f"https://c.test/{i}") for i in range(3)]
+    discovered.setdefault("c.test", []).extend(late)
+    spool.added(discovered, 3)
+    path = tmp_path / "crawl.ckpt.json.gz"
+    checkpoint.save(path)
+    loaded = CrawlCheckpoint.load(path)
+    assert loaded is not None
+    assert loaded.products == expected
+    assert sorted(r["url"] for _, r in loaded.products) == sorted(u for _, u, _ in _found())
+
+
+def test_spilling_frontier_bounds_open_runs() -> None:
+    async def drain() -> list:
+        frontier: SpillingFrontier[int] = SpillingFrontier(
+            4, encode=lambda i: [i], decode=lambda r: r[0]
+        )
+        frontier.max_open_runs = 3
+        items = list(range(400))
+        random.Random(7).shuffle(items)
+        for item in items:
+            frontier.put_nowait(item)
+            assert len(frontier._runs) <= frontier.max_open_runs
+        assert frontier.qsize() == 400 and frontier.run_count > 3
+        assert frontier.snapshot() == list(range(400))
+        out = [frontier.get_nowait() for _ in range(400)]
+        await frontier.close()
+        return out
+
+    assert asyncio.run(drain()) == list(range(400))
+
+
+def test_engine_report_streams_spilled_products(tmp_path: Path, monkeypatch) -> None:
+    from ..config import CrawlConfig
+    from ..engines import simple_engine
+    from ..utils.http import FetchResult
+
+    product = (
+        '<script type="application/ld+json">'
+        '{"@type": "Product", "name": "Widget", "offers": {"price": "9.99"}}</script>'
+    )
+
+    async def fake_fetch(session, url: str, **kwargs) -> FetchResult:
+        links = "".join(f'<a href="/p/{i}">{i}</a>' for i in range(6))
+        body = links if url.endswith("/") else product
+        return FetchResult(url=url, status=200, text=f"<html>{body}</html>")
+
+    monkeypatch.setattr(simple_engine, "fetch_page", fake_fetch)
+    cfg = CrawlConfig(
+        start_urls=["https://shop.test/"],
+        respect_robots=False,
+        max_buffered_products=2,
+        spill_dir=str(tmp_path / "spill"),
+        max_products=4,
+    )
+    report = asyncio.run(simple_engine.SimpleCrawlEngine(cfg).crawl())
+    assert report.stats["memory"]["products"]["spilled"] >= 3
+    assert len(report.discovered["shop.test"]) == 4
+    assert len({p.url for p in report.discovered["shop.test"]}) == 4
+    out = tmp_path / "out.json"
+    JSONExporter().export(report.discovered, str(out))
+    assert len(json.loads(out.read_text(encoding="utf-8"))["shop.test"]) == 4
@@ -0,0 +1,148 @@
+"""Middleware hook order, dropping, loading by dotted path and the no-middleware fast path."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, List, Optional, Tuple
+
+from ..adapters.base import ParseResult, ProductInfo
+from ..config import CrawlConfig
+from ..engines import simple_engine
+from ..engines.middleware import Middleware, MiddlewareChain, PageRequest, load_middlewares
+from ..utils.http import FetchResult
+
+PRODUCT = (
+    '<html><script type="application/ld+json">'
+    '{"@type": "Product", "name": "%s", "offers": {"price": "9.99"}}</script></html>'
+)
+PAGES = {
+    "https://shop.test/": "".join(f'<a href="/deal/{n}">{n}</a>' for n in ("keep", "drop", "skip")),
+    "https://shop.test/deal/keep": PRODUCT % "Keep",
+    "https://shop.test/deal/drop": PRODUCT % "Drop",
+    "https://shop.test/deal/skip": PRODUCT % "Skip",
+}
+
+LOG: List[Tuple[str, str, str]] = []
+
+
+class Recorder(Middleware):
+    """Logs every hook it sees as (middleware, hook, url or title)."""
+
+    label = "recorder"
+
+    async def process_request(self, request: PageRequest) -> Optional[PageRequest]:
+        LOG.append((self.label, "request", request.url))
+        return request
+
+    async def process_response(
+        self, request: PageRequest, response: FetchResult
+    ) -> Optional[FetchResult]:
+        LOG.append((self.label, "response", request.url))
+        return response
+
+    async def process_parse(
+        self, request: PageRequest, parsed: ParseResult
+    ) -> Optional[ParseResult]:
+        LOG.append((self.label, "parse", request.url))
+        return parsed
+
+    async def process_product(
+        self, request: Optional[PageRequest], product: ProductInfo
+    ) -> Optional[ProductInfo]:
+        LOG.append((self.label, "product", product.title or product.url))
+        return product
+
+
+class Outer(Recorder):
+    label = "outer"
+
+
+class Inner(Recorder):
+    label = "inner"
+
+
+class Dropper(Middleware):
+    """Skips /deal/skip before it is fetched and drops the product titled "Drop"."""
+
+    async def process_request(self, request: PageRequest) -> Optional[PageRequest]:
+        return None if request.url.endswith("/skip") else request
+
+    async def process_product(
+        self, request: Optional[PageRequest], product: ProductInfo
+    ) -> Optional[ProductInfo]:
+        return None if product.title == "Drop" else product
+
+
+def _fetched(fetched: List[str]) -> Any:
+    async def fake_fetch(session: Any, url: str, **kwargs: Any) -> FetchResult:
+        fetched.append(url)
+        return FetchResult(url=url, status=200, text=PAGES[url])
+
+    return fake_fetch
+
+
+def _crawl(monkeypatch: Any, fetched: List[str], **kwargs: Any) -> Any:
+    monkeypatch.setattr(simple_engine, "fetch_page", _fetched(fetched))
+    cfg = CrawlConfig(
+        start_urls=["https://shop.test/"],
+        respect_robots=False,
+        max_concurrency=1,
+        middlewares=kwargs.pop("paths", []),
+    )
+    engine = simple_engine.SimpleCrawlEngine(cfg, **kwargs)
+    return engine, asyncio.run(engine.crawl())
+
+
+def test_hook_order_across_stages(monkeypatch: Any) -> None:
+    LOG.clear()
+    fetched: List[str] = []
+    _crawl(monkeypatch, fetched, middlewares=[Outer(), Inner()])
+    page = [entry for entry in LOG if entry[2] == "https://shop.test/deal/keep"]
+    assert page == [
+        ("outer", "request", "https://shop.test/deal/keep"),
+        ("inner", "request", "https://shop.test/deal/keep"),
+        ("inner", "response", "https://shop.test/deal/keep"),
+        ("outer", "response", "https://shop.test/deal/keep"),
+        ("inner", "parse", "https://shop.test/deal/keep"),
+        ("outer", "parse", "https://shop.test/deal/keep"),
+    ]
+    products = [entry[0] for entry in LOG if entry[1:] == ("product", "Keep")]
+    assert products == ["inner", "outer"]
+
+
+def test_middleware_drops_requests_and_products(monkeypatch: Any) -> None:
+    fetched: List[str] = []
+    _, report = _crawl(monkeypatch, fetched, middlewares=[Dropper()])
+    assert "https://shop.test/deal/skip" not in fetched
+    titles = {p.title for p in report.discovered["shop.test"] if p.title}
+    assert titles == {"Keep"}
+    assert report.stats["middleware"] == ["Dropper"]
+
+
+def test_load_by_dotted_path(monkeypatch: Any) -> None:
+    loaded = load_middlewares([f"{__name__}:Outer", f"{__name__}:Missing"], entry_point_group=None)
+    assert [type(m) for m in loaded] == [Outer]
+
+    LOG.clear()
+    fetched: List[str] = []
+    engine, report = _crawl(monkeypatch, fetched, paths=[f"{__name__}:Inner"])
+    assert report.stats["middleware"] == ["Inner"]
+    assert ("inner", "request", "https://shop.test/") in LOG
+
+
+def test_only_overridden_hooks_run() -> None:
+    chain = MiddlewareChain([Dropper(), Middleware()])
+    assert len(chain._request) == 1 and chain._response == [] and chain._parse == []
+    assert chain.has_product_hooks
+    assert not MiddlewareChain([Middleware()]).has_product_hooks
+
+
+def test_no_middleware_skips_the_pipeline(monkeypatch: Any) -> None:
+    def no_requests(*args: Any, **kwargs: Any) -> PageRequest:
+        raise AssertionError("PageRequest built without middleware")
+
+    monkeypatch.setattr(simple_engine, "PageRequest", no_requests)
+    fetched: List[str] = []
+    engine, report = _crawl(monkeypatch, fetched)
+    assert engine.middleware is None and "middleware" not in report.stats
+    assert len(fetched) == 4
@@ -0,0 +1,111 @@
+"""SimHash banding, mirror-parameter learning and near-duplicate skipping in a crawl."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any, List
+from urllib.parse import urlparse
+
+from ..config import CrawlConfig
+from ..engines import simple_engine
+from ..utils.http import FetchResult
+from ..utils.neardup import (
+    DuplicateParamLearner,
+    SimHashIndex,
+    hamming,
+    page_features,
+    simhash,
+)
+
+
+def _flip(fingerprint: int, bits: List[int]) -> int:
+    for bit in bits:
+        fingerprint ^= 1 << bit
+    return fingerprint
+
+
+def test_index_finds_pages_within_max_distance_only() -> None:
+    rng = random.Random(7)
+    index = SimHashIndex(max_distance=3)
+    for i in range(200):
+        index.add("a.test", rng.getrandbits(64), f"https://a.test/other/{i}")
+    fingerprint = rng.getrandbits(64)
+    index.add("a.test", fingerprint, "https://a.test/c")
+    for _ in range(50):
+        near = _flip(fingerprint, rng.sample(range(64), rng.randint(0, 3)))
+        assert index.find("a.test", near) == "https://a.test/c"
+        far = _flip(fingerprint, rng.sample(range(64), rng.randint(4, 12)))
+        assert index.find("a.test", far) != "https://a.test/c"
+    assert index.find("b.test", fingerprint) is None  # indexes are per host
+
+
+def test_simhash_ignores_markup_and_scripts() -> None:
+    words = " ".join(f"item{i} costs {i} dollars" for i in range(200))
+    page = f"<html><script>var x = 1;</script><body><p>{words}</p></body></html>"
+    mirror = page.replace("var x = 1", "var x = 2").replace("<p>", '<p class="sorted">')
+    other = page.replace("costs", "weighs").replace("dollars", "grams")
+    assert simhash(page_features(page)) == simhash(page_features(mirror))
+    assert hamming(simhash(page_features(page)), simhash(page_features(other))) > 3
+
+
+def test_param_is_learned_after_min_votes_and_unlearned_by_distinct_votes() -> None:
+    learner = DuplicateParamLearner(min_votes=3, max_distinct_ratio=0.25)
+    for i in range(3):
+        assert "sort" not in learner.learned["a.test"]
+        learner.record_duplicate(f"https://a.test/c?sort={i}", "https://a.test/c")
+    assert learner.learned["a.test"] == {"sort"}
+    learner.record_duplicate("https://a.test/other?sort=1", "https://a.test/c")  # other path
+    learner.record_duplicate("https://b.test/c?sort=1", "https://a.test/c")  # other host
+
+    learner.record_distinct("https://a.test/c?sort=price")
+    learner.record_distinct("https://a.test/c?sort=name")
+    assert learner.learned["a.test"] == {"sort"}  # 1 distinct of 4 votes is within the ratio
+    learner.record_distinct("https://a.test/c?sort=date")
+    assert learner.learned["a.test"] == set()
+
+
+def test_canonicalize_drops_only_learned_params() -> None:
+    learner = DuplicateParamLearner(min_votes=1)
+    learner.record_duplicate("https://a.test/c?sort=1&utm=x", "https://a.test/c")
+    assert learner.learned["a.test"] == {"sort", "utm"}
+
+    def canonical(url: str) -> Any:
+        return learner.canonicalize(urlparse(url))
+
+    assert canonical("https://a.test/c?page=2&sort=1&utm=y#top") == "https://a.test/c?page=2"
+    assert canonical("https://a.test/c?page=2") is None
+    assert canonical("https://a.test/c") is None
+    assert canonical("https://b.test/c?sort=1") is None
+
+
+def test_crawl_skips_near_duplicate_listings(monkeypatch: Any) -> None:
+    products = "".join(f'<a href="/p/{i}">Product {i} in the catalogue</a>' for i in range(10))
+    listing = f"<html><body><h1>Catalogue</h1>{products}</body></html>"
+    fetched: List[str] = []
+
+    async def fake_fetch(session: Any, url: str, **kwargs: Any) -> FetchResult:
+        fetched.append(url)
+        path = urlparse(url).path
+        if path == "/":
+            links = "".join(f'<a href="/c?sort={s}">{s}</a>' for s in ("a", "b", "c", "d"))
+            return FetchResult(url=url, status=200, text=f'<a href="/c">c</a>{links}')
+        if path == "/c":
+            return FetchResult(url=url, status=200, text=listing)
+        return FetchResult(url=url, status=200, text="<html>product</html>")
+
+    monkeypatch.setattr(simple_engine, "fetch_page", fake_fetch)
+    cfg = CrawlConfig(
+        start_urls=["https://shop.test/"],
+        respect_robots=False,
+        max_concurrency=1,
+        skip_near_duplicates=True,
+    )
+    report = asyncio.run(simple_engine.SimpleCrawlEngine(cfg).crawl())
+    stats = report.stats["near_duplicates"]
+    assert stats["skipped"] == 4
+    assert stats["learned_params"] == {"shop.test": ["sort"]}
+    assert fetched.count("https://shop.test/p/0") == 1
+    assert sorted(p.url for p in report.discovered["shop.test"]) == sorted(
+        f"https://shop.test/p/{i}" for i in range(10)
+    )
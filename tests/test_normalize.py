@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+from ..utils.normalize import currency_hint, parse_count, parse_price
+
+
+@pytest.mark.parametrize(
+    "text, hint, expected",
+    [
+        ("¥1,299.00", None, (1299.0, "CNY")),
+        ("1.299,00 €", None, (1299.0, "EUR")),
+        ("US$12.50", None, (12.5, "USD")),
+        ("12.50 EUR", None, (12.5, "EUR")),
+        ("2.5万", "CNY", (25000.0, "CNY")),
+        ("¥2.5w", None, (25000.0, "CNY")),
+        ("¥99-199", None, (99.0, "CNY")),
+        ("99-199元", None, (99.0, "CNY")),
+        ("$10 - $20", None, (10.0, "USD")),
+        ("¥3,980", "JPY", (3980.0, "JPY")),
+        ("1299", "CNY", (1299.0, "CNY")),
+        # Latin unit letters are not multipliers in prices.
+        ("$12.99 w/ coupon", None, (12.99, "USD")),
+        ("$5 M", None, (5.0, "USD")),
+        ("3 b", None, (3.0, None)),
+        # The amount next to the currency wins over savings and old prices.
+        ("Save 20% $9.99", None, (9.99, "USD")),
+        ("Was $20 now $15", None, (15.0, "USD")),
+        ("List Price: $30.00 $25.99", None, (25.99, "USD")),
+        ("原价¥199 现价¥99", None, (99.0, "CNY")),
+    ],
+)
+def test_parse_price(text: str, hint: str, expected: tuple) -> None:
+    assert parse_price(text, hint) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1,234", 1234),
+        ("1.2k", 1200),
+        ("10K+ sold", 10000),
+        ("1.2M", 1200000),
+        ("1.2w", 12000),
+        ("2万+", 20000),
+        ("已售3.5亿", 350000000),
+        ("3 b", 3),
+        ("4.5 out of 5 stars, 1,234", 1234),
+        ("4.8/5 (320)", 320),
+        ("98% positive (1,024)", 1024),
+        ("no sales yet", None),
+    ],
+)
+def test_parse_count(text: str, expected: int) -> None:
+    assert parse_count(text) == expected
+
+
+def test_currency_hint() -> None:
+    assert currency_hint("https://item.jd.com/1.html") == "CNY"
+    assert currency_hint("shop.example.co.uk") == "GBP"
+    assert currency_hint("https://shop.example.com/") is None
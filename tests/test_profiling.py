@@ -0,0 +1,97 @@
+"""Profiled crawls: parse timings per adapter and host, and patches undone afterwards."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from ..adapters.base import ParseResult, ProductInfo
+from ..adapters.registry import AdapterRegistry
+from ..config import CrawlConfig
+from ..engines import simple_engine
+from ..engines.middleware import Middleware
+from ..utils import parsing
+from ..utils.http import FetchResult
+from ..utils.profiling import CrawlProfiler
+
+PAGES = {
+    "https://a.test/": '<a href="/p/1">1</a><a href="https://b.test/">b</a>',
+    "https://a.test/p/1": "<html><h1>one</h1></html>",
+    "https://b.test/": "<html>b home</html>",
+}
+
+
+class ShopBAdapter:
+    name = "shop_b"
+    domains = ["b.test"]
+
+    def matches(self, url: str) -> bool:
+        return url.startswith("https://b.test/")
+
+    def parse(self, url: str, html: str) -> ParseResult:
+        return ParseResult(product_urls=[], next_links=[], products=self._extract_products(url))
+
+    def _extract_products(self, url: str) -> list:
+        return [ProductInfo(url=url + "p/9", title="Nine")]
+
+
+class FailsToOpen(Middleware):
+    async def open(self, engine: Any) -> None:
+        raise RuntimeError("boom")
+
+
+def _originals() -> Dict[str, Any]:
+    return {
+        "parsing.normalize_url": parsing.normalize_url,
+        "parsing.extract_links": parsing.extract_links,
+        "ShopBAdapter._extract_products": vars(ShopBAdapter)["_extract_products"],
+    }
+
+
+def _engine(tmp_path: Path, monkeypatch: Any, **kwargs: Any) -> simple_engine.SimpleCrawlEngine:
+    async def fake_fetch(session: Any, url: str, **kw: Any) -> FetchResult:
+        return FetchResult(url=url, status=200, text=PAGES[url])
+
+    monkeypatch.setattr(simple_engine, "fetch_page", fake_fetch)
+    registry = AdapterRegistry()
+    registry.register(ShopBAdapter())
+    cfg = CrawlConfig(
+        start_urls=["https://a.test/"],
+        allowed_domains=["a.test", "b.test"],
+        respect_robots=False,
+        profile=True,
+        profile_mode="timers",
+        profile_output=str(tmp_path / "profile"),
+    )
+    return simple_engine.SimpleCrawlEngine(cfg, registry=registry, **kwargs)
+
+
+def test_parse_time_by_adapter_and_host_and_patches_restored(
+    tmp_path: Path, monkeypatch: Any
+) -> None:
+    before = _originals()
+    report = asyncio.run(_engine(tmp_path, monkeypatch).crawl())
+    profile = report.stats["profile"]
+    pages = {(r["adapter"], r["host"]): r["pages"] for r in profile["parse"]}
+    assert pages == {("generic", "a.test"): 2, ("shop_b", "b.test"): 1}
+    timed = {r["function"].rpartition(":")[2] for r in profile["functions"]}
+    assert "extract_links" in timed
+    assert "ShopBAdapter._extract_products" in timed
+    table = (tmp_path / "profile.txt").read_text(encoding="utf-8")
+    assert "shop_b" in table and "b.test" in table and "a.test" in table
+
+    assert _originals() == before
+    assert simple_engine.normalize_url is parsing.normalize_url
+    assert not CrawlProfiler._instrumented
+
+
+def test_patches_restored_when_the_crawl_raises(tmp_path: Path, monkeypatch: Any) -> None:
+    before = _originals()
+    engine = _engine(tmp_path, monkeypatch, middlewares=[FailsToOpen()])
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(engine.crawl())
+    assert _originals() == before
+    assert not CrawlProfiler._instrumented
@@ -0,0 +1,50 @@
+"""Revisit scheduling in RecrawlStore."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from ..adapters.base import ParseResult
+from ..engines.recrawl import RecrawlStore
+
+PAGE = ParseResult(product_urls=[], next_links=[], products=[])
+
+
+def _store(tmp_path: Path) -> RecrawlStore:
+    return RecrawlStore(
+        tmp_path / "state.json",
+        min_interval=10.0,
+        max_interval=1e9,
+        initial_interval=1000.0,
+        backoff=2.0,
+    )
+
+
+def test_interval_follows_change_rate(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.record("https://a.test/volatile", PAGE, body_hash="a", now=0)
+    store.record("https://a.test/volatile", PAGE, body_hash="b", now=1)
+    # Changed on every visit so far: the interval halves.
+    assert store.get("https://a.test/volatile").interval == 500.0
+
+    store.record("https://a.test/stable", PAGE, body_hash="a", now=0)
+    for t in range(1, 4):
+        store.record_unchanged("https://a.test/stable", now=t)
+    stable = store.get("https://a.test/stable")
+    assert stable.change_rate == 0.25
+    # The backoff shrinks while the page still looks volatile, then approaches ``backoff``.
+    assert stable.interval == pytest.approx(1000.0 * 1.5 * (1 + 2 / 3) * 1.75)
+
+    store.record("https://a.test/stable", PAGE, body_hash="b", now=4)
+    # Changed on 2 of 5 visits: tightened by 1.4 rather than 2.
+    assert stable.interval == pytest.approx(1000.0 * 1.5 * (1 + 2 / 3) * 1.75 / 1.4)
+
+
+def test_interval_is_clamped(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.record("https://a.test/p", PAGE, body_hash="a", now=0)
+    for t in range(1, 20):
+        store.record("https://a.test/p", PAGE, body_hash=str(t), now=t)
+    assert store.get("https://a.test/p").interval == 10.0
@@ -0,0 +1,170 @@
+"""Shared frontier against the in-process stand-in, with the Python script twins and real Lua."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Tuple
+
+import pytest
+
+from ..engines.redis_frontier import RedisFrontier
+from ..utils.resp import LocalRespServer, RespClient
+
+
+@dataclass
+class Item:
+    priority: float
+    url: str
+    depth: int = 0
+    keywords: Tuple[str, ...] = ()
+
+
+def _make(priority: float, url: str, depth: int, keywords: Tuple[str, ...]) -> Item:
+    return Item(priority, url, depth, keywords)
+
+
+def _frontier(server: LocalRespServer, **kwargs: Any) -> RedisFrontier[Item]:
+    kwargs.setdefault("namespace", "test")
+    return RedisFrontier(server.url, _make, batch_size=4, poll_interval=0.01, **kwargs)
+
+
+@pytest.fixture(
+    params=[
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                importlib.util.find_spec("lupa") is None, reason="lupa not installed"
+            ),
+        ),
+    ],
+    ids=["python-scripts", "lua-scripts"],
+)
+def run(request: Any) -> Callable[[Callable[[LocalRespServer], Awaitable[None]]], None]:
+    def runner(scenario: Callable[[LocalRespServer], Awaitable[None]]) -> None:
+        async def main() -> None:
+            async with LocalRespServer(lua=request.param) as server:
+                assert server.runs_lua is request.param
+                await scenario(server)
+
+        asyncio.run(main())
+
+    return runner
+
+
+@pytest.mark.parametrize("dedup", ["set", "bloom"])
+def test_dedup(run: Any, dedup: str) -> None:
+    async def scenario(server: LocalRespServer) -> None:
+        q = _frontier(server, dedup=dedup, bloom_bits=1 << 16)
+        for url in ["https://a/1", "https://a/2", "https://a/1", "https://a/3", "https://a/2"]:
+            await q.put(Item(0.0, url))
+        got = [(await q.get()).url for _ in range(3)]
+        assert sorted(got) == ["https://a/1", "https://a/2", "https://a/3"]
+        assert q.stats["enqueued"] == 3 and q.stats["duplicates"] == 2
+        await q.put(Item(0.0, "https://a/3"))  # seen across batches too
+        for item in got:
+            q.ack(Item(0.0, item))
+        await q.close()
+        assert q.stats["duplicates"] == 3
+
+    run(scenario)
+
+
+def test_priority_order(run: Any) -> None:
+    async def scenario(server: LocalRespServer) -> None:
+        q = _frontier(server)
+        for priority, url in [(2.0, "https://a/deep"), (0.0, "https://a/"), (1.0, "https://a/list")]:
+            await q.put(Item(priority, url))
+        assert [(await q.get()).url for _ in range(3)] == ["https://a/", "https://a/list", "https://a/deep"]
+        await q.close()
+
+    run(scenario)
+
+
+def test_expired_lease_is_requeued(run: Any) -> None:
+    async def scenario(server: LocalRespServer) -> None:
+        crashed = _frontier(server, lease_seconds=0.2)
+        await crashed.put(Item(0.0, "https://a/1"))
+        assert (await crashed.get()).url == "https://a/1"
+        # Simulate a dead process: no ack, no release, no lease renewal.
+        assert crashed._renewer is not None
+        crashed._renewer.cancel()
+        await crashed.client.close()
+
+        other = _frontier(server, lease_seconds=0.2)
+        await asyncio.sleep(0.3)
+        item = await asyncio.wait_for(other.get(), 2)
+        assert item.url == "https://a/1"
+        assert other.stats["requeued_expired"] == 1
+        other.ack(item)
+        await other.close()
+
+    run(scenario)
+
+
+def test_release_returns_leases_at_once(run: Any) -> None:
+    async def scenario(server: LocalRespServer) -> None:
+        stopping = _frontier(server)
+        for i in range(3):
+            await stopping.put(Item(float(i), f"https://a/{i}"))
+        first = await stopping.get()
+        stopping.release(first)
+        await stopping.close()  # also gives back the two claimed but unused entries
+        assert stopping.stats["cleared"] == 0
+
+        resumed = _frontier(server)
+        urls = [(await asyncio.wait_for(resumed.get(), 2)).url for _ in range(3)]
+        assert urls == ["https://a/0", "https://a/1", "https://a/2"]
+        await resumed.close()
+
+    run(scenario)
+
+
+def test_finished_crawl_clears_namespace(run: Any) -> None:
+    async def scenario(server: LocalRespServer) -> None:
+        for _ in range(2):  # the second crawl must not inherit the first one's seen set
+            q = _frontier(server)
+            await q.put(Item(0.0, "https://a/"))
+            item = await asyncio.wait_for(q.get(), 2)
+            q.ack(item)
+            await q.close()
+            assert q.stats["enqueued"] == 1 and q.stats["cleared"] == 1
+        client = RespClient(server.url)
+        assert await client.execute("ZCARD", "test:queue") == 0
+        assert await client.execute("SCARD", "test:seen") == 0
+        await client.close()
+
+    run(scenario)
+
+
+def test_second_crawl_with_default_namespace_finds_products(monkeypatch: Any) -> None:
+    from ..config import CrawlConfig
+    from ..engines import simple_engine
+    from ..utils.http import FetchResult
+
+    product = (
+        '<script type="application/ld+json">'
+        '{"@type": "Product", "name": "Widget", "offers": {"price": "9.99"}}</script>'
+    )
+
+    async def fake_fetch(session: Any, url: str, **kwargs: Any) -> FetchResult:
+        body = '<a href="/p/1">one</a><a href="/p/2">two</a>' if url.endswith("/") else product
+        return FetchResult(url=url, status=200, text=f"<html>{body}</html>")
+
+    monkeypatch.setattr(simple_engine, "fetch_page", fake_fetch)
+
+    async def main() -> None:
+        async with LocalRespServer() as server:
+            for _ in range(2):
+                cfg = CrawlConfig(
+                    start_urls=["https://shop.test/"], respect_robots=False, frontier_url=server.url
+                )
+                report = await simple_engine.SimpleCrawlEngine(cfg).crawl()
+                assert sorted(p.url for p in report.discovered["shop.test"]) == [
+                    "https://shop.test/p/1",
+                    "https://shop.test/p/2",
+                ]
+
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""robots.txt group selection and fetch-failure handling (RFC 9309)."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, List
+
+from aiohttp import ClientSession, web
+
+from ..utils.robots import RobotsManager, RobotsRules
+
+UA = "ecom_crawler/1.0"
+
+
+def test_group_matches_product_token_case_insensitively() -> None:
+    text = "User-agent: ECOM_Crawler\nDisallow: /private\n\nUser-agent: *\nDisallow: /\n"
+    rules = RobotsRules.parse(text, UA)
+    assert rules.allowed("https://a.test/p/1")
+    assert not rules.allowed("https://a.test/private/x")
+
+
+def test_substrings_of_the_token_do_not_match() -> None:
+    text = "User-agent: crawler\nDisallow: /\n\nUser-agent: *\nDisallow: /cart\n"
+    rules = RobotsRules.parse(text, UA)
+    assert rules.allowed("https://a.test/p/1")
+    assert not rules.allowed("https://a.test/cart")
+
+
+def test_groups_naming_the_same_agent_are_combined() -> None:
+    text = "User-agent: ecom_crawler\nDisallow: /a\n\nUser-agent: ecom_crawler/2\nDisallow: /b\n"
+    rules = RobotsRules.parse(text, UA)
+    assert not rules.allowed("https://a.test/a") and not rules.allowed("https://a.test/b")
+
+
+async def _with_robots(
+    statuses: List[int], scenario: Callable[[str, RobotsManager], Awaitable[None]]
+) -> None:
+    """Answer robots.txt with each of ``statuses`` in turn (the last one repeats)."""
+
+    async def handle(request: web.Request) -> web.Response:
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        return web.Response(status=status, text="User-agent: *\nDisallow: /cart\n")
+
+    app = web.Application()
+    app.router.add_get("/robots.txt", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    try:
+        async with ClientSession() as session:
+            robots = RobotsManager(session, user_agent=UA, error_ttl=0.05)
+            await scenario(f"http://127.0.0.1:{runner.addresses[0][1]}", robots)
+    finally:
+        await runner.cleanup()
+
+
+def test_missing_robots_allows_everything() -> None:
+    async def scenario(origin: str, robots: RobotsManager) -> None:
+        assert await robots.allowed(origin + "/cart")
+
+    asyncio.run(_with_robots([404], scenario))
+
+
+def test_server_error_disallows_until_a_fetch_succeeds() -> None:
+    async def scenario(origin: str, robots: RobotsManager) -> None:
+        assert not await robots.allowed(origin + "/p/1")
+        await asyncio.sleep(0.1)
+        assert not await robots.allowed(origin + "/p/1")  # still 503
+        await asyncio.sleep(0.1)
+        assert await robots.allowed(origin + "/p/1")
+        assert not await robots.allowed(origin + "/cart")
+
+    asyncio.run(_with_robots([503, 500, 200], scenario))
+
+
+def test_server_error_keeps_the_last_good_rules() -> None:
+    async def scenario(origin: str, robots: RobotsManager) -> None:
+        robots.ttl = 0.05
+        assert await robots.allowed(origin + "/p/1")
+        await asyncio.sleep(0.1)
+        assert await robots.allowed(origin + "/p/1")  # 503 now, previous rules still apply
+        assert not await robots.allowed(origin + "/cart")
+
+    asyncio.run(_with_robots([200, 503], scenario))
+
+
+def test_unreachable_host_disallows() -> None:
+    async def main() -> Any:
+        async with ClientSession() as session:
+            robots = RobotsManager(session, user_agent=UA, timeout=2)
+            return await robots.allowed("http://127.0.0.1:9/p/1")
+
+    assert asyncio.run(main()) is False
@@ -0,0 +1,77 @@
+"""Signal handling and resuming a checkpointed crawl."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+from pathlib import Path
+from typing import Any, AsyncIterator, List
+
+import pytest
+
+from ..config import CrawlConfig
+from ..engines import simple_engine
+from ..engines.checkpoint import CrawlCheckpoint
+from ..utils.http import FetchResult
+from ..utils.signals import install_stop_handlers
+from ..utils.sitemap import SitemapEntry
+
+PRODUCT = (
+    '<script type="application/ld+json">'
+    '{"@type": "Product", "name": "Widget", "offers": {"price": "9.99"}}</script>'
+)
+
+
+def test_second_signal_force_quits() -> None:
+    stops: List[int] = []
+
+    async def main() -> None:
+        install_stop_handlers(lambda: stops.append(1))
+        os.kill(os.getpid(), signal.SIGINT)
+        await asyncio.sleep(0.05)
+        assert stops == [1]
+        os.kill(os.getpid(), signal.SIGINT)
+        await asyncio.sleep(1)
+
+    with pytest.raises(KeyboardInterrupt):
+        asyncio.run(main())
+    assert stops == [1]
+
+
+def test_resume_does_not_seed_sitemaps_again(tmp_path: Path, monkeypatch: Any) -> None:
+    sitemap_reads: List[str] = []
+
+    async def fake_sitemap(session: Any, url: str, **kwargs: Any) -> AsyncIterator[SitemapEntry]:
+        sitemap_reads.append(url)
+        for i in range(4):
+            yield SitemapEntry(loc=f"https://shop.test/p/{i}")
+
+    async def fake_fetch(session: Any, url: str, **kwargs: Any) -> FetchResult:
+        body = "" if url.endswith("/") else PRODUCT
+        return FetchResult(url=url, status=200, text=f"<html>{body}</html>")
+
+    monkeypatch.setattr(simple_engine, "iter_sitemap", fake_sitemap)
+    monkeypatch.setattr(simple_engine, "fetch_page", fake_fetch)
+    checkpoint = tmp_path / "crawl.ckpt.json"
+
+    def config(**overrides: Any) -> CrawlConfig:
+        return CrawlConfig(
+            start_urls=["https://shop.test/"],
+            respect_robots=False,
+            max_concurrency=1,
+            sitemap_urls=["https://shop.test/sitemap.xml"],
+            use_sitemaps=True,
+            checkpoint_path=str(checkpoint),
+            **overrides,
+        )
+
+    first = asyncio.run(simple_engine.SimpleCrawlEngine(config(max_pages=2)).crawl())
+    assert first.stop_reason == "max_pages"
+    saved = CrawlCheckpoint.load(checkpoint)
+    assert saved is not None and saved.counters["sitemaps_done"] is True
+    second = asyncio.run(simple_engine.SimpleCrawlEngine(config()).crawl())
+    assert sitemap_reads == ["https://shop.test/sitemap.xml"]
+    assert second.stop_reason is None and not checkpoint.exists()
+    urls = [p.url for products in second.discovered.values() for p in products]
+    assert sorted(urls) == [f"https://shop.test/p/{i}" for i in range(4)]
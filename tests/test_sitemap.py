@@ -0,0 +1,104 @@
+"""Streaming sitemap parsing and seeding a crawl from robots.txt sitemaps on a local server."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+from typing import Any, List
+
+from aiohttp import web
+
+from ..config import CrawlConfig
+from ..engines.simple_engine import SimpleCrawlEngine
+from ..utils.sitemap import SitemapStreamParser
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+PRODUCT = (
+    '<html><script type="application/ld+json">'
+    '{"@type": "Product", "name": "%s", "offers": {"price": "9.99"}}</script></html>'
+)
+
+
+def _urlset(urls: List[str], lastmod: str = "") -> bytes:
+    mod = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+    body = "".join(f"<url><loc>{u}</loc>{mod}</url>" for u in urls)
+    return f'<?xml version="1.0" encoding="UTF-8"?><urlset {NS}>{body}</urlset>'.encode()
+
+
+def test_parser_streams_plain_and_gzipped_sitemaps() -> None:
+    document = _urlset([f"https://a.test/p/{i}" for i in range(50)], "2024-01-31")
+    for data in (document, gzip.compress(document)):
+        parser = SitemapStreamParser()
+        batches = [parser.feed(data[i : i + 7]) for i in range(0, len(data), 7)]
+        batches.append(parser.close())
+        entries = [entry for batch in batches for entry in batch]
+        assert [e.loc for e in entries] == [f"https://a.test/p/{i}" for i in range(50)]
+        assert entries[0].lastmod == 1706659200.0
+    # Entries come out while the document is still arriving, not all at the end.
+    parser = SitemapStreamParser()
+    half = len(document) // 2
+    assert 10 < len(parser.feed(document[:half])) < 50
+
+
+def test_crawl_seeds_from_a_gzipped_sitemap_index(tmp_path: Any) -> None:
+    fetched: List[str] = []
+    routes = web.RouteTableDef()
+
+    @routes.get("/robots.txt")
+    async def robots(request: web.Request) -> web.Response:
+        return web.Response(text=f"User-agent: *\nSitemap: {base(request)}/sitemap_index.xml\n")
+
+    @routes.get("/sitemap_index.xml")
+    async def index(request: web.Request) -> web.Response:
+        children = "".join(
+            f"<sitemap><loc>{base(request)}/{name}</loc></sitemap>"
+            for name in ("sitemap-missing.xml", "sitemap-products.xml.gz")
+        )
+        return web.Response(body=f"<sitemapindex {NS}>{children}</sitemapindex>".encode())
+
+    @routes.get("/sitemap-products.xml.gz")
+    async def product_sitemap(request: web.Request) -> web.StreamResponse:
+        urls = [f"{base(request)}/p/{i}" for i in range(5)]
+        urls += [f"{base(request)}/about", "http://elsewhere.test/p/1"]
+        response = web.StreamResponse(headers={"Content-Type": "application/octet-stream"})
+        await response.prepare(request)
+        document = gzip.compress(_urlset(urls))
+        for i in range(0, len(document), 64):  # chunked, so the parser sees it in pieces
+            await response.write(document[i : i + 64])
+        await response.write_eof()
+        return response
+
+    @routes.get("/{path:.*}")
+    async def page(request: web.Request) -> web.Response:
+        if request.path.endswith(".xml"):
+            raise web.HTTPNotFound()  # a broken child sitemap must not stop the others
+        fetched.append(request.path)
+        if request.path.startswith("/p/"):
+            return web.Response(text=PRODUCT % request.path, content_type="text/html")
+        return web.Response(text="<html>home</html>", content_type="text/html")
+
+    def base(request: web.Request) -> str:
+        return f"http://{request.host}"
+
+    async def main() -> Any:
+        app = web.Application()
+        app.add_routes(routes)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        port = runner.addresses[0][1]
+        cfg = CrawlConfig(
+            start_urls=[f"http://127.0.0.1:{port}/"],
+            use_sitemaps=True,
+            output_path=str(tmp_path / "out.json"),
+        )
+        try:
+            return await SimpleCrawlEngine(cfg).crawl()
+        finally:
+            await runner.cleanup()
+
+    report = asyncio.run(main())
+    assert report.stats["sitemap_seeded"] == 5
+    assert sorted(fetched) == ["/", "/p/0", "/p/1", "/p/2", "/p/3", "/p/4"]
+    (products,) = report.discovered.values()
+    assert sorted(p.title for p in products) == [f"/p/{i}" for i in range(5)]
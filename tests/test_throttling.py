@@ -0,0 +1,81 @@
+"""AIMD adaptive concurrency: backoff, bounded additive increase and per-host limits."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+
+from ..utils.throttling import AimdConcurrency
+
+
+def test_429_halves_the_host_and_timeout_also_the_global_limit() -> None:
+    aimd = AimdConcurrency(16, host_initial=8, cooldown=0)
+    aimd.observe("a.test", 429, 0.1, None)
+    assert aimd.snapshot()["hosts"] == {"a.test": 4}
+    assert aimd.snapshot()["global"] == 16  # a throttled host says nothing about the others
+
+    aimd.observe("a.test", None, 30.0, asyncio.TimeoutError())
+    assert aimd.snapshot()["hosts"] == {"a.test": 2}
+    assert aimd.snapshot()["global"] == 8
+    assert aimd.decreases == 3
+
+
+def test_a_burst_of_failures_backs_off_once_per_cooldown() -> None:
+    aimd = AimdConcurrency(16, host_initial=8, cooldown=60)
+    for _ in range(5):
+        aimd.observe("a.test", 503, 0.1, None)
+    assert aimd.snapshot()["hosts"] == {"a.test": 4}
+
+
+def test_additive_increase_only_while_saturated_and_up_to_the_max() -> None:
+    async def main() -> None:
+        aimd = AimdConcurrency(2, max_limit=4, host_initial=2, host_max=3, cooldown=0)
+        for _ in range(20):
+            aimd.observe("a.test", 200, 0.1, None)
+        # Nothing in flight: the limits were never binding, so they did not grow.
+        assert aimd.snapshot()["hosts"] == {"a.test": 2} and aimd.snapshot()["global"] == 2
+
+        for _ in range(10):
+            async with contextlib.AsyncExitStack() as stack:
+                for _ in range(aimd.snapshot()["hosts"]["a.test"]):
+                    await stack.enter_async_context(aimd.slot("a.test"))
+                for _ in range(4):
+                    aimd.observe("a.test", 200, 0.1, None)
+        assert aimd.snapshot()["hosts"] == {"a.test": 3}  # host_max
+        assert aimd.snapshot()["global"] == 4  # max_limit
+        assert aimd.increases == 3
+
+    asyncio.run(main())
+
+
+def test_sustained_latency_inflation_backs_off() -> None:
+    aimd = AimdConcurrency(16, host_initial=8, cooldown=0)
+    for _ in range(20):
+        aimd.observe("a.test", 200, 0.1, None)
+    for _ in range(5):
+        aimd.observe("a.test", 200, 2.0, None)
+    assert aimd.snapshot()["hosts"]["a.test"] < 8
+
+
+def test_hosts_have_independent_limits() -> None:
+    async def main() -> None:
+        aimd = AimdConcurrency(8, host_initial=2, cooldown=0)
+        aimd.observe("slow.test", 429, 0.1, None)
+        aimd.observe("fast.test", 200, 0.1, None)
+        assert aimd.snapshot()["hosts"] == {"fast.test": 2, "slow.test": 1}
+
+        release = asyncio.Event()
+        running = {"slow.test": 0, "fast.test": 0}
+
+        async def fetch(host: str) -> None:
+            async with aimd.slot(host):
+                running[host] += 1
+                await release.wait()
+
+        tasks = [asyncio.create_task(fetch(h)) for h in ["slow.test"] * 3 + ["fast.test"] * 3]
+        await asyncio.sleep(0.05)
+        assert running == {"slow.test": 1, "fast.test": 2}
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
@@ -8,6 +8,7 @@ from typing import List
 from ..config import CrawlConfig
 from ..utils.logging import setup_logging
 from ..utils.loader import load_symbol
+from ..utils.signals import install_stop_handlers
 from ..adapters.registry import AdapterRegistry
 from ..engines.base import CrawlReport
 
@@ -24,17 +25,194 @@ def build_arg_parser() -> argparse.ArgumentParser:
     p.add_argument("--exporter", type=str, default=None, help="Exporter dotted path (module:ClassName)")
     p.add_argument("--extra-adapters", type=str, default=None,
                    help="Comma-separated dotted paths for additional adapters")
+    p.add_argument(
+        "--middleware",
+        action="append",
+        default=None,
+        help="Engine middleware dotted path (module:ClassName); repeatable, runs in order",
+    )
     p.add_argument("--output", type=str, default=None, help="Output file path")
     p.add_argument("--log-level", type=str, default=None, help="Log level (DEBUG, INFO, WARNING, ERROR)")
     p.add_argument("--keywords", type=str, default=None,
                    help="Comma-separated keywords to keep products relevant to your query (e.g. headphone,book)")
+    p.add_argument("--keywords-file", type=str, default=None,
+                   help="File with one keyword per line (merged with --keywords)")
+    p.add_argument(
+        "--search-template",
+        action="append",
+        default=None,
+        metavar="URL",
+        help="Shop search URL with a {keyword} placeholder; crawls one search page per keyword "
+        "and tags products with it (repeatable)",
+    )
+    p.add_argument(
+        "--recrawl-state",
+        type=str,
+        default=None,
+        help="Fingerprint store for incremental recrawls "
+        "(skips pages that are not due or unchanged)",
+    )
+    p.add_argument("--sitemaps", action="store_true",
+                   help="Seed product URLs from robots.txt-linked sitemaps before following links")
+    p.add_argument(
+        "--sitemap-urls",
+        type=str,
+        default=None,
+        help="Comma-separated sitemap URLs to use instead of robots.txt discovery "
+        "(implies --sitemaps)",
+    )
+    p.add_argument("--include", action="append", default=None, metavar="REGEX",
+                   help="Only follow links matching this regex (repeatable)")
+    p.add_argument(
+        "--exclude",
+        action="append",
+        default=None,
+        metavar="REGEX",
+        help="Never follow links matching this regex (repeatable; replaces the built-in defaults)",
+    )
+    p.add_argument(
+        "--browser",
+        choices=["hybrid", "always"],
+        default=None,
+        help="Use the headless browser engine (requires playwright); hybrid renders only "
+        "pages where plain HTTP found no products",
+    )
+    p.add_argument(
+        "--ignore-robots",
+        action="store_true",
+        help="Do not apply robots.txt rules or Crawl-delay "
+        "(only for sites you are allowed to crawl)",
+    )
+    p.add_argument(
+        "--api-sources",
+        type=str,
+        default=None,
+        help="Comma-separated marketplace API clients (module:ClassName) to query for --keywords",
+    )
+    p.add_argument(
+        "--api-pages",
+        type=int,
+        default=None,
+        help="Result pages to fetch per keyword from each API",
+    )
+    p.add_argument(
+        "--skip-near-duplicates",
+        action="store_true",
+        help="Skip listing pages that near-duplicate one already seen (SimHash) and learn the "
+        "query parameters that create such mirrors",
+    )
+    p.add_argument(
+        "--checkpoint",
+        type=str,
+        default=None,
+        help="Checkpoint file (.json or .json.gz): written periodically and on SIGTERM/SIGINT, "
+        "resumed on the next run",
+    )
+    p.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Stop after this much wall time and export what was found (product pages go first "
+        "as it nears)",
+    )
+    p.add_argument(
+        "--max-pages", type=int, default=None, help="Stop after fetching this many pages"
+    )
+    p.add_argument(
+        "--max-products",
+        type=int,
+        default=None,
+        help="Stop once this many unique products are found",
+    )
+    p.add_argument(
+        "--frontier",
+        type=str,
+        default=None,
+        help="Share the crawl frontier through a Redis-compatible server (redis://host:6379/0); "
+        "run the same command in several processes to split the work",
+    )
+    p.add_argument(
+        "--frontier-dedup",
+        choices=["set", "bloom"],
+        default=None,
+        help="Seen-URL tracking for --frontier: exact set (default) or fixed-size Bloom filter",
+    )
+    p.add_argument(
+        "--max-queue-size",
+        type=int,
+        default=None,
+        help="Frontier entries kept in memory; lower-priority ones spill to disk (0 = unbounded)",
+    )
+    p.add_argument(
+        "--max-pending-html",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help="Hold new fetches while this much fetched HTML awaits parsing (0 = unbounded)",
+    )
+    p.add_argument(
+        "--max-buffered-products",
+        type=int,
+        default=None,
+        help="Products kept in memory during the crawl; the rest spill to disk (0 = unbounded)",
+    )
+    p.add_argument(
+        "--spill-dir", type=str, default=None, help="Directory for frontier/product spill files"
+    )
+    p.add_argument(
+        "--archive",
+        type=str,
+        default=None,
+        metavar="DIR",
+        help="Keep every fetched page in compressed WARC segments under DIR (for --replay)",
+    )
+    p.add_argument("--archive-compression", choices=["gzip", "zstd"], default=None,
+                   help="Archive segment compression (zstd needs the zstandard package)")
+    p.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="ARCHIVE",
+        help="Re-parse an archive directory with the current adapters instead of crawling",
+    )
+    p.add_argument("--replay-workers", type=int, default=None,
+                   help="Processes for --replay (default: one per CPU core)")
+    p.add_argument(
+        "--profile",
+        nargs="?",
+        const="sample",
+        choices=["sample", "cprofile", "timers"],
+        default=None,
+        help="Profile the crawl: parse time per adapter/host, parsing helpers, event-loop lag, "
+        "plus a stack sampler (default, writes collapsed stacks) or cProfile",
+    )
+    p.add_argument("--profile-output", type=str, default=None, metavar="PREFIX",
+                   help="Where --profile writes PREFIX.txt and PREFIX.folded / PREFIX.pstats")
+    p.add_argument("--adaptive", action="store_true",
+                   help="Adapt global and per-host concurrency to latency, timeouts and 429s "
+                        "(--max-concurrency becomes the starting limit)")
+    p.add_argument(
+        "--batch",
+        nargs="+",
+        default=None,
+        metavar="CONFIG",
+        help="Run several config files (or directories of *.json configs) concurrently in one "
+        "process, sharing connections, DNS/robots caches and a global concurrency budget",
+    )
+    p.add_argument("--global-concurrency", type=int, default=100,
+                   help="Concurrent fetches shared fairly by all crawls of a --batch run")
+    p.add_argument("--max-parallel-crawls", type=int, default=None,
+                   help="Crawls of a --batch run that may run at once (default: all)")
+    p.add_argument("--gui", action="store_true",
+                   help="Open the desktop GUI (the other options pre-fill its settings)")
     p.add_argument("--serve", action="store_true", help="Run REST API server instead of CLI crawl")
     p.add_argument("--host", type=str, default="127.0.0.1", help="API host (when --serve)")
     p.add_argument("--port", type=int, default=8000, help="API port (when --serve)")
     return p
 
 
-def _load_config(args: argparse.Namespace) -> CrawlConfig:
+def _load_config(args: argparse.Namespace, validate: bool = True) -> CrawlConfig:
     if args.config:
         cfg = CrawlConfig.from_file(args.config)
     else:
@@ -54,12 +232,79 @@ def _load_config(args: argparse.Namespace) -> CrawlConfig:
         cfg.exporter = args.exporter
     if args.extra_adapters:
         cfg.extra_adapters = [a.strip() for a in args.extra_adapters.split(",") if a.strip()]
+    if args.middleware:
+        cfg.middlewares = list(args.middleware)
     if args.output:
         cfg.output_path = args.output
     if args.keywords:
         cfg.keywords = [k.strip() for k in args.keywords.split(",") if k.strip()] or None
+    if args.keywords_file:
+        cfg.keywords_file = args.keywords_file
+    if args.search_template:
+        cfg.search_url_templates = list(args.search_template)
+    if args.recrawl_state:
+        cfg.recrawl_state_path = args.recrawl_state
+    if args.sitemaps:
+        cfg.use_sitemaps = True
+    if args.sitemap_urls:
+        cfg.sitemap_urls = [u.strip() for u in args.sitemap_urls.split(",") if u.strip()]
+        cfg.use_sitemaps = True
+    if args.include:
+        cfg.include_patterns = list(args.include)
+    if args.exclude:
+        cfg.exclude_patterns = list(args.exclude)
+    if args.browser:
+        cfg.engine = "engines.browser_engine:BrowserCrawlEngine"
+        cfg.browser_mode = args.browser
+    if args.ignore_robots:
+        cfg.respect_robots = False
+    if args.skip_near_duplicates:
+        cfg.skip_near_duplicates = True
+    if args.checkpoint:
+        cfg.checkpoint_path = args.checkpoint
+    if args.deadline is not None:
+        cfg.deadline_seconds = args.deadline
+    if args.max_pages is not None:
+        cfg.max_pages = args.max_pages
+    if args.max_products is not None:
+        cfg.max_products = args.max_products
+    if args.frontier:
+        cfg.frontier_url = args.frontier
+    if args.frontier_dedup:
+        cfg.frontier_dedup = args.frontier_dedup
+    if args.max_queue_size is not None:
+        cfg.max_queue_size = args.max_queue_size
+    if args.max_pending_html is not None:
+        cfg.max_pending_html_bytes = args.max_pending_html
+    if args.max_buffered_products is not None:
+        cfg.max_buffered_products = args.max_buffered_products
+    if args.spill_dir:
+        cfg.spill_dir = args.spill_dir
+    if args.archive:
+        cfg.archive_dir = args.archive
+    if args.archive_compression:
+        cfg.archive_compression = args.archive_compression
+    if args.replay:
+        cfg.engine = "engines.replay:ReplayEngine"
+        cfg.replay_archive = args.replay
+    if args.replay_workers is not None:
+        cfg.replay_workers = args.replay_workers
+    if args.profile:
+        cfg.profile = True
+        cfg.profile_mode = args.profile
+    if args.profile_output:
+        cfg.profile_output = args.profile_output
+    if args.adaptive:
+        cfg.adaptive_concurrency = True
+    if args.api_sources:
+        cfg.api_sources = [a.strip() for a in args.api_sources.split(",") if a.strip()]
+    if args.api_pages is not None:
+        cfg.api_pages = args.api_pages
+    # --keywords replaces the list, so merge the (possibly overridden) keywords file again.
+    cfg.load_keywords_file()
 
-    cfg.validate()
+    if validate:
+        cfg.validate()
     return cfg
 
 
@@ -67,10 +312,36 @@ def run_server(host: str, port: int) -> None:
     try:
         import uvicorn  # type: ignore
     except Exception as exc:  # pragma: no cover - optional dep
-        raise SystemExit("To run the API, install dependencies: pip install fastapi uvicorn pydantic") from exc
+        raise SystemExit(
+            "To run the API, install dependencies: pip install fastapi uvicorn pydantic"
+        ) from exc
     uvicorn.run("apis.app:app", host=host, port=port, reload=True)
 
 
+def run_batch(paths: List[str], global_concurrency: int, max_parallel: int | None = None) -> int:
+    from ..engines.batch import BatchRunner
+
+    if global_concurrency <= 0:
+        raise SystemExit("--global-concurrency must be > 0")
+    runner = BatchRunner.from_paths(
+        paths, global_concurrency=global_concurrency, max_parallel=max_parallel
+    )
+    try:
+        results = asyncio.run(runner.run())
+    except KeyboardInterrupt:
+        logging.getLogger(__name__).warning("Interrupted again; quit without waiting for crawls")
+        return 130
+    failed = [r.name for r in results if r.error]
+    logging.getLogger(__name__).info(
+        "Batch: %s crawls, %s products, %s failed%s",
+        len(results),
+        sum(r.product_count for r in results),
+        len(failed),
+        f" ({', '.join(failed)})" if failed else "",
+    )
+    return 1 if failed else 0
+
+
 def run_cli(argv: List[str] | None = None) -> int:
     args = build_arg_parser().parse_args(argv)
     setup_logging(args.log_level)
@@ -79,6 +350,15 @@ def run_cli(argv: List[str] | None = None) -> int:
         run_server(args.host, args.port)
         return 0
 
+    if args.gui:
+        from .gui import run_gui
+
+        # The GUI validates once the user presses Start.
+        return run_gui(_load_config(args, validate=False))
+
+    if args.batch:
+        return run_batch(args.batch, args.global_concurrency, args.max_parallel_crawls)
+
     cfg = _load_config(args)
 
     # Dynamic engine + exporter loading so upgrades don't require code edits.
@@ -96,9 +376,16 @@ def run_cli(argv: List[str] | None = None) -> int:
 
     async def _run() -> CrawlReport:
         engine = engine_cls(cfg, registry=registry)
+        # SIGTERM/SIGINT: stop taking URLs, drain in-flight fetches, then export what we have.
+        # A second signal quits at once without exporting.
+        install_stop_handlers(engine.request_stop)
         return await engine.crawl()
 
-    report: CrawlReport = asyncio.run(_run())
+    try:
+        report: CrawlReport = asyncio.run(_run())
+    except KeyboardInterrupt:
+        logging.getLogger(__name__).warning("Interrupted again; quit without exporting")
+        return 130
 
     exporter = exporter_cls()
     exporter.export(report.discovered, cfg.output_path)
@@ -107,4 +394,6 @@ def run_cli(argv: List[str] | None = None) -> int:
                                      report.visited_count,
                                      sum(len(v) for v in report.discovered.values()),
                                      cfg.output_path)
+    if report.stats:
+        logging.getLogger(__name__).info("Stats: %s", report.stats)
     return 0
@@ -0,0 +1,443 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, ttk
+except Exception as exc:  # pragma: no cover - optional dependency
+    raise RuntimeError(
+        "Tkinter not available. Install your platform's python3-tk package or use the CLI."
+    ) from exc
+
+from ..adapters.registry import AdapterRegistry
+from ..config import CrawlConfig
+from ..engines.base import CrawlReport
+from ..export.csv_exporter import CSVExporter
+from ..utils.loader import load_symbol
+
+logger = logging.getLogger(__name__)
+
+Row = Tuple[str, str, str, str, str]  # domain, title, price, currency, url
+COLUMNS = ("domain", "title", "price", "currency", "url")
+
+
+@dataclass
+class ProgressEvent:
+    """One throttled progress sample sent from the crawl thread to the UI thread."""
+
+    elapsed: float
+    visited: int = 0
+    pages_per_sec: float = 0.0
+    queued: int = 0
+    in_flight: int = 0
+    products: int = 0
+    host_errors: List[Tuple[str, int]] = field(default_factory=list)
+    rows: List[Row] = field(default_factory=list)  # products first seen since the last event
+    updates: List[Tuple[int, Row]] = field(default_factory=list)  # (row index, richer row)
+    finished: bool = False
+    error: Optional[str] = None
+    report: Optional[CrawlReport] = None
+
+
+class CrawlRunner:
+    """
+    Runs one crawl on a private event loop in a daemon thread.
+
+    A sampler coroutine on that loop reads ``engine.progress()`` ``refresh_hz`` times a second
+    and puts one :class:`ProgressEvent` on ``events`` (a bounded, thread-safe queue). New
+    products travel as plain tuples, at most ``max_rows_per_event`` per sample; if the UI
+    falls behind, samples are skipped and their rows go out with the next one.
+    """
+
+    def __init__(
+        self,
+        config: CrawlConfig,
+        *,
+        registry: Optional[AdapterRegistry] = None,
+        refresh_hz: float = 4.0,
+        max_rows_per_event: int = 5000,
+    ) -> None:
+        self.config = config
+        self.registry = registry
+        self.refresh_hz = refresh_hz
+        self.max_rows_per_event = max_rows_per_event
+        self.events: "queue.Queue[ProgressEvent]" = queue.Queue(maxsize=32)
+        self.engine: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_requested = False
+        self._row_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="crawl-loop", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the engine to wind down (safe to call from the UI thread)."""
+        self._stop_requested = True
+        if self._loop is not None and self.engine is not None:
+            self._loop.call_soon_threadsafe(self.engine.request_stop)
+
+    def _run(self) -> None:
+        started = time.monotonic()
+        try:
+            asyncio.run(self._main(started))
+        except Exception as exc:
+            logger.exception("Crawl failed")
+            self.events.put(
+                ProgressEvent(elapsed=time.monotonic() - started, finished=True, error=repr(exc))
+            )
+
+    async def _main(self, started: float) -> None:
+        cfg = self.config
+        registry = self.registry or AdapterRegistry()
+        if self.registry is None:
+            for dotted in cfg.extra_adapters:
+                try:
+                    registry.register(load_symbol(dotted)())
+                except Exception as exc:
+                    logger.warning("Failed to load adapter %s: %r", dotted, exc)
+        self.engine = load_symbol(cfg.engine)(cfg, registry=registry)
+        self._loop = asyncio.get_running_loop()
+        if self._stop_requested:
+            self.engine.request_stop()
+
+        crawl = asyncio.create_task(self.engine.crawl())
+        cursors: Dict[str, int] = {}
+        seen: Dict[str, int] = {}  # url -> row index on the UI side
+        self._row_count = 0
+        last_time, last_visited = time.monotonic(), 0
+        while not crawl.done():
+            await asyncio.wait({crawl}, timeout=1.0 / self.refresh_hz)
+            if self.events.full():
+                continue  # UI is behind: skip this sample, keep the rows for the next one
+            now = time.monotonic()
+            progress = self.engine.progress()
+            rate = (progress["visited"] - last_visited) / max(now - last_time, 1e-6)
+            last_time, last_visited = now, progress["visited"]
+            updates: List[Tuple[int, Row]] = []
+            rows = self._new_rows(cursors, seen, updates)
+            errors = sorted(progress["host_errors"].items(), key=lambda kv: kv[1], reverse=True)[
+                :10
+            ]
+            self.events.put_nowait(
+                ProgressEvent(
+                    elapsed=now - started,
+                    visited=progress["visited"],
+                    pages_per_sec=rate,
+                    queued=progress["queued"],
+                    in_flight=progress["in_flight"],
+                    products=self._row_count,
+                    host_errors=errors,
+                    rows=rows,
+                    updates=updates,
+                )
+            )
+
+        report = crawl.result()
+        updates: List[Tuple[int, Row]] = []
+        rows = self._new_rows(cursors, seen, updates, limit=None)
+        self.events.put(
+            ProgressEvent(
+                elapsed=time.monotonic() - started,
+                visited=report.visited_count,
+                products=sum(len(v) for v in report.discovered.values()),
+                rows=rows,
+                updates=updates,
+                finished=True,
+                report=report,
+            )
+        )
+
+    def _new_rows(
+        self,
+        cursors: Dict[str, int],
+        seen: Dict[str, int],
+        updates: List[Tuple[int, Row]],
+        limit: Optional[int] = -1,
+    ) -> List[Row]:
+        """
+        Rows for products appended since the last call. A URL already shown (e.g. first seen
+        as a bare link on a listing page) is re-sent as an update when a richer record arrives.
+        """
+        budget = self.max_rows_per_event if limit == -1 else limit
+        rows: List[Row] = []
+        for domain, products in list(self.engine.discovered_so_far().items()):
+            start = cursors.get(domain, 0)
+            if start > len(products):
+                # The engine spilled this list to disk (max_buffered_products); it restarted empty.
+                start = 0
+            end = (
+                len(products) if budget is None else min(len(products), start + budget - len(rows))
+            )
+            for product in products[start:end]:
+                row = (
+                    domain,
+                    product.title or "",
+                    product.price or "",
+                    product.currency or "",
+                    product.url,
+                )
+                index = seen.get(product.url)
+                if index is None:
+                    seen[product.url] = self._row_count
+                    self._row_count += 1
+                    rows.append(row)
+                elif product.title or product.price:
+                    updates.append((index, row))
+            cursors[domain] = end
+            if budget is not None and len(rows) >= budget:
+                break
+        return rows
+
+
+class VirtualTable(ttk.Frame):
+    """
+    A Treeview that only ever holds ``height`` items. Rows live in a plain list and the
+    visible window is re-rendered on scroll, so millions of results cost no widgets.
+    While scrolled to the bottom the view follows new rows.
+    """
+
+    def __init__(self, master: Any, columns: Sequence[str], height: int = 25) -> None:
+        super().__init__(master)
+        self.columns = tuple(columns)
+        self.height = height
+        self.rows: List[Row] = []
+        self.offset = 0
+        self.follow = True
+        self.tree = ttk.Treeview(
+            self, columns=self.columns, show="headings", height=height, selectmode="browse"
+        )
+        for name in self.columns:
+            self.tree.heading(name, text=name.title())
+            self.tree.column(
+                name,
+                width=420 if name in ("title", "url") else 90,
+                stretch=name in ("title", "url"),
+            )
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(0, weight=1)
+        self._items = [self.tree.insert("", "end", values=()) for _ in range(height)]
+        self.tree.bind("<MouseWheel>", lambda e: self._scroll_by(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(1, "units"))
+        self.refresh()
+
+    def clear(self) -> None:
+        self.rows = []
+        self.offset = 0
+        self.follow = True
+        self.refresh()
+
+    def append(self, rows: List[Row]) -> None:
+        if not rows:
+            return
+        self.rows.extend(rows)
+        if self.follow:
+            self.offset = max(0, len(self.rows) - self.height)
+        self.refresh()
+
+    def update(self, changes: List[Tuple[int, Row]]) -> None:
+        for index, row in changes:
+            if index < len(self.rows):
+                self.rows[index] = row
+        if any(self.offset <= index < self.offset + self.height for index, _ in changes):
+            self.refresh()
+
+    def refresh(self) -> None:
+        empty = ("",) * len(self.columns)
+        for i, iid in enumerate(self._items):
+            index = self.offset + i
+            self.tree.item(iid, values=self.rows[index] if index < len(self.rows) else empty)
+        total = max(len(self.rows), 1)
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.height) / total))
+
+    def _max_offset(self) -> int:
+        return max(0, len(self.rows) - self.height)
+
+    def _move_to(self, offset: int) -> None:
+        self.offset = max(0, min(offset, self._max_offset()))
+        self.follow = self.offset >= self._max_offset()
+        self.refresh()
+
+    def _scroll_by(self, amount: int, what: str) -> None:
+        step = self.height if what.startswith("page") else 3
+        self._move_to(self.offset + amount * step)
+
+    def _on_scrollbar(self, action: str, *args: str) -> None:
+        if action == "moveto":
+            self._move_to(int(float(args[0]) * len(self.rows)))
+        elif action == "scroll":
+            self._scroll_by(int(args[0]), args[1])
+
+
+class CrawlerApp:
+    """Start/stop a crawl, watch live counters and per-host errors, browse and export results."""
+
+    POLL_MS = 100
+    MAX_EVENTS_PER_POLL = 20
+
+    def __init__(
+        self, root: "tk.Tk", config: Optional[CrawlConfig] = None, refresh_hz: float = 4.0
+    ) -> None:
+        self.root = root
+        self.base_config = config or CrawlConfig.from_env()
+        self.refresh_hz = refresh_hz
+        self.runner: Optional[CrawlRunner] = None
+        self.report: Optional[CrawlReport] = None
+        self.config: Optional[CrawlConfig] = None
+
+        root.title("ecom_crawler")
+        form = ttk.Frame(root, padding=6)
+        form.pack(fill="x")
+        self.urls = tk.StringVar(value=" ".join(self.base_config.start_urls))
+        self.keywords = tk.StringVar(value=",".join(self.base_config.keywords or []))
+        self.depth = tk.IntVar(value=self.base_config.max_depth)
+        self.concurrency = tk.IntVar(value=self.base_config.max_concurrency)
+        ttk.Label(form, text="Start URLs").grid(row=0, column=0, sticky="w")
+        ttk.Entry(form, textvariable=self.urls, width=80).grid(
+            row=0, column=1, columnspan=5, sticky="we"
+        )
+        ttk.Label(form, text="Keywords").grid(row=1, column=0, sticky="w")
+        ttk.Entry(form, textvariable=self.keywords, width=40).grid(row=1, column=1, sticky="we")
+        ttk.Label(form, text="Depth").grid(row=1, column=2, sticky="e")
+        ttk.Spinbox(form, from_=0, to=20, textvariable=self.depth, width=4).grid(
+            row=1, column=3, sticky="w"
+        )
+        ttk.Label(form, text="Concurrency").grid(row=1, column=4, sticky="e")
+        ttk.Spinbox(form, from_=1, to=500, textvariable=self.concurrency, width=5).grid(
+            row=1, column=5, sticky="w"
+        )
+        form.columnconfigure(1, weight=1)
+
+        buttons = ttk.Frame(root, padding=(6, 0))
+        buttons.pack(fill="x")
+        self.start_button = ttk.Button(buttons, text="Start", command=self.start)
+        self.stop_button = ttk.Button(buttons, text="Stop", command=self.stop, state="disabled")
+        self.export_button = ttk.Button(
+            buttons, text="Export…", command=self.export, state="disabled"
+        )
+        for button in (self.start_button, self.stop_button, self.export_button):
+            button.pack(side="left", padx=(0, 4))
+        self.status = tk.StringVar(value="Idle")
+        ttk.Label(buttons, textvariable=self.status).pack(side="left", padx=8)
+
+        body = ttk.Frame(root, padding=6)
+        body.pack(fill="both", expand=True)
+        self.table = VirtualTable(body, COLUMNS)
+        self.table.pack(side="left", fill="both", expand=True)
+        errors = ttk.LabelFrame(body, text="Errors by host", padding=4)
+        errors.pack(side="right", fill="y", padx=(6, 0))
+        self.errors = tk.Listbox(errors, width=32, height=10)
+        self.errors.pack(fill="y", expand=True)
+
+        root.protocol("WM_DELETE_WINDOW", self.close)
+        root.after(self.POLL_MS, self._poll)
+
+    def start(self) -> None:
+        cfg = dataclasses.replace(
+            self.base_config,
+            start_urls=self.urls.get().split(),
+            keywords=[k.strip() for k in self.keywords.get().split(",") if k.strip()] or None,
+            max_depth=int(self.depth.get()),
+            max_concurrency=int(self.concurrency.get()),
+        )
+        try:
+            cfg.load_keywords_file()
+            cfg.validate()
+        except (ValueError, OSError) as exc:
+            messagebox.showerror("Invalid settings", str(exc))
+            return
+        self.config = cfg
+        self.report = None
+        self.table.clear()
+        self.errors.delete(0, "end")
+        self.runner = CrawlRunner(cfg, refresh_hz=self.refresh_hz)
+        self.runner.start()
+        self.start_button.configure(state="disabled")
+        self.stop_button.configure(state="normal")
+        self.export_button.configure(state="disabled")
+        self.status.set("Starting…")
+
+    def stop(self) -> None:
+        if self.runner is not None:
+            self.runner.stop()
+            self.stop_button.configure(state="disabled")
+            self.status.set(self.status.get() + " | stopping…")
+
+    def export(self) -> None:
+        if self.report is None or self.config is None:
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json", filetypes=[("JSON", "*.json"), ("CSV", "*.csv")]
+        )
+        if not path:
+            return
+        exporter = CSVExporter() if path.endswith(".csv") else load_symbol(self.config.exporter)()
+        exporter.export(self.report.discovered, path)
+        self.status.set(f"Exported to {path}")
+
+    def close(self) -> None:
+        if self.runner is not None and self.runner.running:
+            self.runner.stop()
+        self.root.destroy()
+
+    def _poll(self) -> None:
+        # Bounded work per tick keeps the UI thread responsive whatever the crawl does.
+        if self.runner is not None:
+            latest: Optional[ProgressEvent] = None
+            for _ in range(self.MAX_EVENTS_PER_POLL):
+                try:
+                    event = self.runner.events.get_nowait()
+                except queue.Empty:
+                    break
+                self.table.append(event.rows)
+                self.table.update(event.updates)
+                latest = event
+                if event.finished:
+                    break
+            if latest is not None:
+                self._show(latest)
+        self.root.after(self.POLL_MS, self._poll)
+
+    def _show(self, event: ProgressEvent) -> None:
+        if event.finished:
+            self.report = event.report
+            self.start_button.configure(state="normal")
+            self.stop_button.configure(state="disabled")
+            self.export_button.configure(state="normal" if event.report is not None else "disabled")
+            outcome = f"Failed: {event.error}" if event.error else "Done"
+            self.status.set(
+                f"{outcome} in {event.elapsed:.0f}s | pages {event.visited} "
+                f"| products {event.products}"
+            )
+            return
+        self.status.set(
+            f"{event.elapsed:.0f}s | pages {event.visited} ({event.pages_per_sec:.1f}/s) | "
+            f"queue {event.queued} | in flight {event.in_flight} | products {event.products}"
+        )
+        self.errors.delete(0, "end")
+        for host, count in event.host_errors:
+            self.errors.insert("end", f"{host}: {count}")
+
+
+def run_gui(config: Optional[CrawlConfig] = None) -> int:
+    root = tk.Tk()
+    CrawlerApp(root, config)
+    root.mainloop()
+    return 0
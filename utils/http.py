@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Optional
+import codecs
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
 from aiohttp import ClientSession, ClientTimeout
 import aiohttp
 import logging
@@ -9,39 +13,129 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-async def fetch_text(
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9_\-]+)""", re.IGNORECASE)
+_HEADER_CHARSET = re.compile(r"charset\s*=\s*[\"']?([A-Za-z0-9_\-]+)", re.IGNORECASE)
+# GB2312 and GBK pages routinely contain characters only GB18030 (a strict superset) can decode.
+_CHARSET_ALIASES = {"gb2312": "gb18030", "gbk": "gb18030", "x-gbk": "gb18030", "cp936": "gb18030"}
+
+
+def _canonical_charset(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    name = _CHARSET_ALIASES.get(name.lower(), name.lower())
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def decode_body(body: bytes, content_type: Optional[str] = None) -> str:
+    """
+    Decode an HTML body: Content-Type charset, then ``<meta charset>`` in the first 4 KB,
+    then UTF-8, falling back to GB18030 (common on Chinese marketplaces that omit both).
+    """
+    header = _HEADER_CHARSET.search(content_type or "")
+    charset = _canonical_charset(header.group(1) if header else None)
+    if charset is None:
+        meta = _META_CHARSET.search(body, 0, 4096)
+        charset = _canonical_charset(meta.group(1).decode("ascii") if meta else None)
+    if charset is not None:
+        return body.decode(charset, errors="replace")
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError:
+        return body.decode("gb18030", errors="replace")
+
+
+@dataclass
+class FetchResult:
+    """Outcome of a single successful HTTP fetch (2xx or 304). Header names are lower-cased."""
+
+    url: str
+    status: int
+    text: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+async def fetch_page(
     session: ClientSession,
     url: str,
     *,
     timeout: float = 15.0,
     user_agent: Optional[str] = None,
     retries: int = 2,
-) -> Optional[str]:
+    headers: Optional[Dict[str, str]] = None,
+    observer: Optional[Callable[[Optional[int], float, Optional[BaseException]], None]] = None,
+) -> Optional[FetchResult]:
     """
-    Fetch a URL and return body text. Returns None on failure after retries.
+    Fetch a URL and return status, headers and body text. Returns None on failure after retries.
+    A 304 response (for conditional requests) is returned with ``text=None``.
+    ``observer(status, elapsed, error)`` is called once per attempt (status is None for
+    timeouts and connection errors), e.g. to drive adaptive concurrency.
     """
-    headers = {}
+    request_headers = dict(headers or {})
     if user_agent:
-        headers["User-Agent"] = user_agent
+        request_headers["User-Agent"] = user_agent
 
     last_exc: Optional[Exception] = None
     for attempt in range(retries + 1):
+        started = time.monotonic()
         try:
-            async with session.get(url, headers=headers, timeout=ClientTimeout(total=timeout)) as resp:
+            async with session.get(
+                url, headers=request_headers, timeout=ClientTimeout(total=timeout)
+            ) as resp:
                 resp.raise_for_status()
-                return await resp.text()
+                text = None
+                if resp.status != 304:
+                    text = decode_body(await resp.read(), resp.headers.get("Content-Type"))
+                result = FetchResult(
+                    url=url,
+                    status=resp.status,
+                    text=text,
+                    headers={k.lower(): v for k, v in resp.headers.items()},
+                    elapsed=time.monotonic() - started,
+                )
+                if observer is not None:
+                    observer(result.status, result.elapsed, None)
+                return result
         except Exception as exc:  # broad catch to keep crawler moving
             last_exc = exc
-            logger.debug("fetch_text attempt %s failed for %s: %r", attempt + 1, url, exc)
+            if observer is not None:
+                status = exc.status if isinstance(exc, aiohttp.ClientResponseError) else None
+                observer(status, time.monotonic() - started, exc)
+            logger.debug("fetch_page attempt %s failed for %s: %r", attempt + 1, url, exc)
             await asyncio.sleep(min(2 ** attempt, 5))
-    logger.warning("fetch_text failed for %s after %s attempts: %r", url, retries + 1, last_exc)
+    logger.warning("fetch_page failed for %s after %s attempts: %r", url, retries + 1, last_exc)
     return None
 
 
-def create_session() -> ClientSession:
+async def fetch_text(
+    session: ClientSession,
+    url: str,
+    *,
+    timeout: float = 15.0,
+    user_agent: Optional[str] = None,
+    retries: int = 2,
+) -> Optional[str]:
+    """
+    Fetch a URL and return body text. Returns None on failure after retries.
+    """
+    result = await fetch_page(session, url, timeout=timeout, user_agent=user_agent, retries=retries)
+    return result.text if result else None
+
+
+def create_session(dns_cache_ttl: Optional[int] = None) -> ClientSession:
     """
     Create a shared aiohttp ClientSession.
+    ``dns_cache_ttl`` keeps resolved hosts for that many seconds (aiohttp's default is 10).
     """
     # Note: caller is responsible for closing the session (await session.close()).
-    connector = aiohttp.TCPConnector(limit=0)  # unlimited; concurrency managed via semaphore
+    connector = aiohttp.TCPConnector(  # unlimited; concurrency managed via semaphore
+        limit=0, ttl_dns_cache=dns_cache_ttl if dns_cache_ttl is not None else 10
+    )
     return aiohttp.ClientSession(connector=connector)
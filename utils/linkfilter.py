@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, List, Optional, Pattern, Sequence
+
+# Skips the scheme and host, so a pattern written after it only matches a segment of the
+# path: "https://login.example.com/p/1" and "//cart.shop.com/p/1" are not account or cart pages.
+_PATH_PREFIX = r"^(?:(?:[a-z][a-z0-9+.\-]*:)?//[^/?#]*|(?![a-z][a-z0-9+.\-]*:|//))[^?#]*?"
+
+# Sections that never lead to product data but are linked from every page.
+DEFAULT_EXCLUDE_PATTERNS: List[str] = [
+    _PATH_PREFIX
+    + r"/(?:log-?in|log-?out|sign-?in|sign-?out|sign-?up|register|account|my-?account|auth)"
+    + r"(?:[/?#.]|$)",
+    _PATH_PREFIX + r"/(?:cart|basket|checkout|wishlist|compare)(?:[/?#.]|$)",
+    r"[?&](?:add-to-cart|add_to_cart|addtocart)=",
+]
+
+DEFAULT_BLOCKED_EXTENSIONS: List[str] = [
+    "jpg", "jpeg", "png", "gif", "webp", "avif", "svg", "ico", "bmp", "tif", "tiff",
+    "css", "js", "mjs", "map", "json",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp3", "mp4", "m4a", "avi", "mov", "webm", "ogg", "wav",
+    "pdf", "zip", "gz", "tgz", "rar", "7z", "tar", "exe", "dmg", "apk",
+]
+
+
+def _compile_any(patterns: Sequence[str]) -> Optional[Pattern[str]]:
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+class LinkFilter:
+    """
+    Compiled include/exclude rules applied to a page's links before they are queued.
+
+    All patterns of a kind are merged into a single alternation so each URL costs at most
+    three regex searches and no URL parsing. A URL passes when it matches at least one
+    include pattern (if any are configured), no exclude pattern, and its path does not
+    end in a blocked extension.
+    """
+
+    def __init__(
+        self,
+        include: Sequence[str] = (),
+        exclude: Optional[Sequence[str]] = None,
+        blocked_extensions: Optional[Sequence[str]] = None,
+    ) -> None:
+        self._include = _compile_any(list(include))
+        self._exclude = _compile_any(list(DEFAULT_EXCLUDE_PATTERNS if exclude is None else exclude))
+        extensions = (
+            DEFAULT_BLOCKED_EXTENSIONS if blocked_extensions is None else blocked_extensions
+        )
+        cleaned = sorted({e.lower().lstrip(".") for e in extensions if e})
+        self._extensions = (
+            re.compile(r"\.(?:%s)(?:[?#]|$)" % "|".join(map(re.escape, cleaned)), re.IGNORECASE)
+            if cleaned
+            else None
+        )
+
+    def allows(self, url: str) -> bool:
+        if self._include is not None and self._include.search(url) is None:
+            return False
+        if self._exclude is not None and self._exclude.search(url) is not None:
+            return False
+        if self._extensions is not None and self._extensions.search(url) is not None:
+            return False
+        return True
+
+    def filter(self, urls: Iterable[str]) -> List[str]:
+        allows = self.allows
+        return [u for u in urls if allows(u)]
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import weakref
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from ..adapters.base import ProductInfo
+
+
+class ByteBudget:
+    """
+    Backpressure on bytes held in memory (e.g. fetched pages waiting to be parsed).
+
+    Callers wait for room *before* taking on more work and then report what they hold, so
+    the budget can be overshot by what is already admitted but never deadlocks on a single
+    large item. ``limit=0`` only tracks the peak.
+    """
+
+    def __init__(self, limit: int = 0) -> None:
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self.waits = 0
+        self._room = asyncio.Event()
+
+    async def wait_for_room(self) -> None:
+        if not self.limit or self.in_use < self.limit:
+            return
+        self.waits += 1
+        while self.in_use >= self.limit:
+            self._room.clear()
+            await self._room.wait()
+
+    def add(self, size: int) -> None:
+        self.in_use += size
+        if self.in_use > self.peak:
+            self.peak = self.in_use
+
+    def remove(self, size: int) -> None:
+        self.in_use -= size
+        self._room.set()
+
+    def stats(self) -> Dict[str, int]:
+        return {"limit": self.limit, "peak": self.peak, "waits": self.waits}
+
+
+class ProductSpool:
+    """
+    Moves buffered products to disk once more than ``limit`` are held in memory.
+
+    The engine keeps appending to its per-domain lists; :meth:`maybe_spill` writes them out
+    (JSON lines of ``[domain, product.to_dict()]``) and empties them in place when the count
+    goes over the limit. :meth:`records` streams everything back, spilled products first, so
+    the order products were found in (which de-duplication relies on) is preserved, and
+    :meth:`products` wraps that stream as a read-only report without loading it.
+    """
+
+    def __init__(self, limit: int = 0, spill_dir: Optional[str] = None) -> None:
+        self.limit = limit
+        self.spill_dir = spill_dir
+        self.buffered = 0
+        self.peak = 0
+        self.spilled = 0
+        self._dir: Optional[str] = None
+        self._path: Optional[str] = None
+        self._cleanup: Optional[weakref.finalize] = None
+
+    def added(self, discovered: Dict[str, List[ProductInfo]], count: int) -> None:
+        self.buffered += count
+        if self.buffered > self.peak:
+            self.peak = self.buffered
+        if self.limit and self.buffered > self.limit:
+            self._spill(discovered)
+
+    def _spill(self, discovered: Dict[str, List[ProductInfo]]) -> None:
+        if self._path is None:
+            if self.spill_dir:
+                os.makedirs(self.spill_dir, exist_ok=True)
+            self._dir = tempfile.mkdtemp(prefix="products-", dir=self.spill_dir)
+            self._path = os.path.join(self._dir, "products.jsonl")
+            # The directory outlives the crawl while a report still streams from it.
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self._dir, True)
+        with open(self._path, "a", encoding="utf-8") as f:
+            for domain, products in discovered.items():
+                f.writelines(
+                    json.dumps([domain, p.to_dict()], ensure_ascii=False) + "\n" for p in products
+                )
+                self.spilled += len(products)
+                products.clear()
+        self.buffered = 0
+
+    def records(
+        self, discovered: Dict[str, List[ProductInfo]]
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        ``(domain, product.to_dict())`` pairs: the spill file line by line, then memory.
+
+        What is spilled and buffered is pinned when this is called, so the iterator can be
+        consumed on another thread while the crawl keeps adding products.
+        """
+        end = os.path.getsize(self._path) if self._path is not None else 0
+        buffered = [(d, p.to_dict()) for d, products in discovered.items() for p in products]
+        return self._records(self._path, end, buffered)
+
+    @staticmethod
+    def _records(
+        path: Optional[str], end: int, buffered: List[Tuple[str, Dict[str, Any]]]
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        if path is not None:
+            with open(path, "rb") as f:
+                read = 0
+                for line in f:
+                    read += len(line)
+                    if read > end:
+                        break
+                    domain, record = json.loads(line)
+                    yield domain, record
+        yield from buffered
+
+    def products(
+        self, discovered: Dict[str, List[ProductInfo]], max_products: int = 0
+    ) -> "SpooledProducts":
+        """
+        De-duplicated ``domain -> products`` view over the spill file and ``discovered``
+        (which must not change afterwards); the view keeps the spill file alive.
+        """
+        return SpooledProducts(self, discovered, max_products)
+
+    def stats(self) -> Dict[str, int]:
+        return {"limit": self.limit, "peak": self.peak, "spilled": self.spilled}
+
+    def close(self) -> None:
+        if self._cleanup is not None:
+            self._cleanup()
+        self._dir = self._path = self._cleanup = None
+
+
+class SpooledProducts(Mapping[str, Sequence[ProductInfo]]):
+    """
+    Report-shaped view of a :class:`ProductSpool`, with the same result as
+    ``dedupe_products`` (first record per URL, all matched keywords) and an optional cap on
+    the total like ``max_products``.
+
+    Only each domain's URLs and merged keywords are kept in memory; iterating a domain's
+    products reads the spill file again, so exporters write them one at a time.
+    """
+
+    def __init__(
+        self, spool: ProductSpool, discovered: Dict[str, List[ProductInfo]], max_products: int = 0
+    ) -> None:
+        self._spool = spool
+        self._discovered = discovered
+        self._keywords: Dict[str, Dict[str, List[str]]] = {}
+        for domain, record in spool.records(discovered):
+            merged = self._keywords.setdefault(domain, {}).setdefault(record["url"], [])
+            merged += [k for k in record.get("keywords") or [] if k not in merged]
+        self._counts: Dict[str, int] = {}
+        remaining = max_products or sum(len(urls) for urls in self._keywords.values())
+        for domain, urls in self._keywords.items():
+            if remaining <= 0:
+                break
+            self._counts[domain] = min(len(urls), remaining)
+            remaining -= self._counts[domain]
+
+    def __getitem__(self, domain: str) -> Sequence[ProductInfo]:
+        if domain not in self._counts:
+            raise KeyError(domain)
+        return _SpooledDomain(self, domain)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._counts)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def _iter_domain(self, domain: str) -> Iterator[ProductInfo]:
+        keywords = self._keywords[domain]
+        left = self._counts[domain]
+        emitted: Set[str] = set()
+        for record_domain, record in self._spool.records(self._discovered):
+            if left <= 0:
+                return
+            if record_domain != domain or record["url"] in emitted:
+                continue
+            emitted.add(record["url"])
+            product = ProductInfo.from_dict(record)
+            if keywords[product.url]:
+                product.matched_keywords = list(keywords[product.url])
+            left -= 1
+            yield product
+
+
+class _SpooledDomain(Sequence[ProductInfo]):
+    """One domain of a :class:`SpooledProducts`; iterating streams, indexing reads it all."""
+
+    def __init__(self, owner: SpooledProducts, domain: str) -> None:
+        self._owner = owner
+        self._domain = domain
+
+    def __len__(self) -> int:
+        return self._owner._counts[self._domain]
+
+    def __iter__(self) -> Iterator[ProductInfo]:
+        return self._owner._iter_domain(self._domain)
+
+    def __getitem__(self, index: Any) -> Any:
+        return list(self)[index]
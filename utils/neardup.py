@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter, defaultdict
+from typing import DefaultDict, Dict, List, Optional, Set, Tuple
+from urllib.parse import ParseResult, parse_qsl, urlencode, urlparse
+
+_BITS = 64
+_FIELD = 24  # bits per counter lane in the packed accumulator (room for 16M weighted features)
+_LANE_MASK = (1 << _FIELD) - 1
+_SCRIPTS = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>", re.S | re.I)
+_TAGS = re.compile(r"<[^>]+>")
+_WORDS = re.compile(r"\w+", re.U)
+
+
+def _spread_table() -> List[List[int]]:
+    # _SPREAD[j][b]: byte b at byte position j, each bit moved to its own _FIELD-wide lane.
+    table = []
+    for j in range(_BITS // 8):
+        row = []
+        for b in range(256):
+            value = 0
+            for i in range(8):
+                if b >> i & 1:
+                    value |= 1 << ((j * 8 + i) * _FIELD)
+            row.append(value)
+        table.append(row)
+    return table
+
+
+_SPREAD = _spread_table()
+
+
+def page_features(html: str) -> Counter:
+    """Word bigrams of the page's visible text (scripts, styles and markup removed)."""
+    text = _TAGS.sub(" ", _SCRIPTS.sub(" ", html)).lower()
+    words = _WORDS.findall(text)
+    if len(words) < 2:
+        return Counter(words)
+    return Counter(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+
+def simhash(features: Counter) -> int:
+    """
+    64-bit SimHash of weighted features.
+
+    Instead of 64 per-bit counters per feature, every feature hash is spread into one big
+    integer with a counter lane per bit (8 table lookups), so the whole page is summed with
+    plain integer additions and the lanes are read once at the end.
+    """
+    total = 0
+    weight_sum = 0
+    spread = _SPREAD
+    for feature, weight in features.items():
+        h = int.from_bytes(
+            hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little"
+        )
+        lanes = (
+            spread[0][h & 0xFF]
+            + spread[1][h >> 8 & 0xFF]
+            + spread[2][h >> 16 & 0xFF]
+            + spread[3][h >> 24 & 0xFF]
+            + spread[4][h >> 32 & 0xFF]
+            + spread[5][h >> 40 & 0xFF]
+            + spread[6][h >> 48 & 0xFF]
+            + spread[7][h >> 56]
+        )
+        total += lanes * weight
+        weight_sum += weight
+    fingerprint = 0
+    for i in range(_BITS):
+        # Bit i is set when more than half of the feature weight has it set.
+        if 2 * (total >> (i * _FIELD) & _LANE_MASK) > weight_sum:
+            fingerprint |= 1 << i
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """
+    Near-duplicate lookup per host. Fingerprints are split into ``max_distance + 1`` bands;
+    any two within ``max_distance`` bits share at least one band exactly (pigeonhole), so a
+    lookup only compares against fingerprints in the same buckets.
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        self._widths = [_BITS // bands + (1 if i < _BITS % bands else 0) for i in range(bands)]
+        self._buckets: Dict[Tuple[str, int, int], List[Tuple[int, str]]] = defaultdict(list)
+
+    def _bands(self, fingerprint: int) -> List[Tuple[int, int]]:
+        out = []
+        shift = 0
+        for i, width in enumerate(self._widths):
+            out.append((i, fingerprint >> shift & ((1 << width) - 1)))
+            shift += width
+        return out
+
+    def find(self, host: str, fingerprint: int) -> Optional[str]:
+        """URL of an indexed page on ``host`` within ``max_distance`` bits, if any."""
+        for band, value in self._bands(fingerprint):
+            for other, url in self._buckets.get((host, band, value), ()):
+                if hamming(fingerprint, other) <= self.max_distance:
+                    return url
+        return None
+
+    def add(self, host: str, fingerprint: int, url: str) -> None:
+        for band, value in self._bands(fingerprint):
+            self._buckets[(host, band, value)].append((fingerprint, url))
+
+
+class DuplicateParamLearner:
+    """
+    Learns which query parameters only produce mirror pages on a host (sort orders, tracking
+    ids, view modes). When a page duplicates another with the same path, every parameter that
+    differs gets a "duplicate" vote (none of them changed the content). When a page with new
+    content differs from the previous new page on that path in exactly one parameter, that
+    parameter gets a "distinct" vote. A parameter with ``min_votes`` duplicate votes and at
+    most ``max_distinct_ratio`` distinct votes is dropped from that host's links.
+    """
+
+    def __init__(self, min_votes: int = 3, max_distinct_ratio: float = 0.1) -> None:
+        self.min_votes = min_votes
+        self.max_distinct_ratio = max_distinct_ratio
+        self._duplicate: DefaultDict[str, Counter] = defaultdict(Counter)
+        self._distinct: DefaultDict[str, Counter] = defaultdict(Counter)
+        self._last_distinct: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self.learned: DefaultDict[str, Set[str]] = defaultdict(set)
+
+    @staticmethod
+    def _changed(a: Dict[str, str], b: Dict[str, str]) -> Set[str]:
+        return {name for name in set(a) | set(b) if a.get(name) != b.get(name)}
+
+    def record_duplicate(self, url: str, original: str) -> None:
+        a, b = urlparse(url), urlparse(original)
+        if a.netloc != b.netloc or a.path != b.path:
+            return
+        changed = self._changed(
+            dict(parse_qsl(a.query, keep_blank_values=True)),
+            dict(parse_qsl(b.query, keep_blank_values=True)),
+        )
+        for name in changed:
+            self._duplicate[a.netloc][name] += 1
+            self._update(a.netloc, name)
+
+    def record_distinct(self, url: str) -> None:
+        parts = urlparse(url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        previous = self._last_distinct.get((parts.netloc, parts.path))
+        self._last_distinct[(parts.netloc, parts.path)] = query
+        if previous is None:
+            return
+        changed = self._changed(query, previous)
+        if len(changed) == 1:
+            name = changed.pop()
+            self._distinct[parts.netloc][name] += 1
+            self._update(parts.netloc, name)
+
+    def _update(self, host: str, name: str) -> None:
+        dup = self._duplicate[host][name]
+        distinct = self._distinct[host][name]
+        if dup >= self.min_votes and distinct <= self.max_distinct_ratio * (dup + distinct):
+            self.learned[host].add(name)
+        else:
+            self.learned[host].discard(name)
+
+    def canonicalize(self, parts: ParseResult) -> Optional[str]:
+        """The URL without learned parameters, or None if nothing would change."""
+        drop = self.learned.get(parts.netloc)
+        if not drop or not parts.query:
+            return None
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        kept = [(k, v) for k, v in query if k not in drop]
+        if len(kept) == len(query):
+            return None
+        return parts._replace(query=urlencode(kept), fragment="").geturl()
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..adapters.base import ProductInfo
+
+# A number with optional grouping: "1,299.00", "1.299,00", "1'299", "1 299,00" (regular,
+# no-break or thin spaces count as grouping only before exactly three digits).
+_NUMBER = re.compile(r"\d+(?:(?:[.,'\u2019]|[ \u00a0\u2009\u202f](?=\d{3}(?!\d)))\d+)*")
+# Multipliers right after a number. CJK 万/亿/千 always count; the Latin shorthands (w for 万,
+# k/m/b) only when attached to the number and in a count or CJK context: "$12.99 w/ coupon",
+# "$5 M" and "3 b" are plain numbers.
+_CJK_UNIT = re.compile(r"\s*(万|萬|亿|億|千)")
+_LATIN_UNIT = re.compile(r"([kKmMbBwW])(?![A-Za-z/])")
+_UNITS = {
+    "千": 1e3, "k": 1e3,
+    "万": 1e4, "萬": 1e4, "w": 1e4,
+    "m": 1e6,
+    "亿": 1e8, "億": 1e8,
+    "b": 1e9,
+}
+_CJK_TEXT = re.compile(r"[\u00a5\u3000-\u30ff\u3400-\u9fff\uff00-\uffef]")
+# Text between the two ends of a range ("99-199", "¥99 ~ ¥199", "99至199").
+_RANGE_GAP = re.compile(r"\s*(?:[-\u2013\u2014~\uff5e至]|to)\s*\D{0,3}$", re.I)
+# Words marking an amount as the old price or a saving rather than the price ("Was $20").
+_NOT_PRICE = re.compile(
+    r"(?:\b(?:was|list|rrp|reg(?:ular)?|before|orig(?:inal(?:ly)?)?|save|off)\b(?:\s+price)?"
+    r"|原价|划线价|市场价)[\s:.\-]*\S{0,4}$",
+    re.I,
+)
+# Ratings ("4.5 out of 5 stars", "4.8/5", "4 stars") are not counts.
+_RATING = re.compile(
+    r"\d+(?:[.,]\d+)?\s*(?:(?:out of|/)\s*\d+(?:[.,]\d+)?(?:\s*stars?)?|stars?\b)", re.I
+)
+_GROUPING = str.maketrans("", "", "'\u2019 \u00a0\u2009\u202f")
+
+# Symbols and codes, longest first so "US$" wins over "$". None = ambiguous (needs a hint).
+_CURRENCY_TOKENS = [
+    ("US$", "USD"),
+    ("HK$", "HKD"),
+    ("NT$", "TWD"),
+    ("CA$", "CAD"),
+    ("AU$", "AUD"),
+    ("MX$", "MXN"),
+    ("CN¥", "CNY"),
+    ("JP¥", "JPY"),
+    ("RMB", "CNY"),
+    ("R$", "BRL"),
+    ("S$", "SGD"),
+    ("C$", "CAD"),
+    ("A$", "AUD"),
+    ("zł", "PLN"),
+    ("元", "CNY"),
+    ("円", "JPY"),
+    ("€", "EUR"),
+    ("£", "GBP"),
+    ("₹", "INR"),
+    ("₩", "KRW"),
+    ("₽", "RUB"),
+    ("₺", "TRY"),
+    ("฿", "THB"),
+    ("₫", "VND"),
+    ("₱", "PHP"),
+    ("￥", None),
+    ("¥", None),
+    ("$", None),
+]
+_CURRENCY = re.compile("|".join(re.escape(token) for token, _ in _CURRENCY_TOKENS))
+_CURRENCY_BY_TOKEN = dict(_CURRENCY_TOKENS)
+_ISO_CODE = re.compile(
+    r"\b(USD|EUR|GBP|CNY|JPY|KRW|INR|CAD|AUD|HKD|TWD|SGD|BRL|MXN|RUB|PLN|TRY|THB|VND|PHP|CHF|SEK|NOK|DKK)\b"
+)
+_DOLLARS = {"USD", "CAD", "AUD", "HKD", "TWD", "SGD", "MXN"}
+
+# Hosts whose prices usually carry no symbol (or an ambiguous one) and their currency.
+_HOST_CURRENCY = {
+    "jd.com": "CNY",
+    "taobao.com": "CNY",
+    "tmall.com": "CNY",
+    "yangkeduo.com": "CNY",
+    "pinduoduo.com": "CNY",
+}
+_TLD_CURRENCY = {
+    "cn": "CNY",
+    "jp": "JPY",
+    "kr": "KRW",
+    "in": "INR",
+    "uk": "GBP",
+    "ca": "CAD",
+    "au": "AUD",
+    "hk": "HKD",
+    "tw": "TWD",
+    "sg": "SGD",
+    "br": "BRL",
+    "mx": "MXN",
+    "ru": "RUB",
+    "pl": "PLN",
+    "tr": "TRY",
+    "ch": "CHF",
+    "de": "EUR",
+    "fr": "EUR",
+    "it": "EUR",
+    "es": "EUR",
+    "nl": "EUR",
+    "be": "EUR",
+    "at": "EUR",
+    "ie": "EUR",
+}
+
+
+def currency_hint(url_or_host: str) -> Optional[str]:
+    """Currency implied by a shop's host (CN marketplaces, country TLDs); None for .com etc."""
+    host = (
+        (urlparse(url_or_host).netloc if "//" in url_or_host else url_or_host).lower().split(":")[0]
+    )
+    for known, currency in _HOST_CURRENCY.items():
+        if host == known or host.endswith("." + known):
+            return currency
+    return _TLD_CURRENCY.get(host.rsplit(".", 1)[-1])
+
+
+def _number(raw: str) -> float:
+    """Parse one grouped number; the last of ``.``/``,`` is the decimal mark when both occur."""
+    digits = raw.translate(_GROUPING)
+    dot, comma = digits.rfind("."), digits.rfind(",")
+    if dot >= 0 and comma >= 0:
+        decimal = "." if dot > comma else ","
+    elif dot >= 0 or comma >= 0:
+        sep = "." if dot >= 0 else ","
+        # One separator: thousands if it repeats ("1,29,999") or groups exactly 3 digits after a
+        # valid leading group ("1,299"); "0.999" and "1234.567" stay decimals.
+        head = digits[: digits.find(sep)]
+        grouped = len(digits) - digits.rfind(sep) - 1 == 3 and 0 < len(head) <= 3 and head != "0"
+        decimal = None if digits.count(sep) > 1 or grouped else sep
+    else:
+        decimal = None
+    if decimal is None:
+        return float(digits.replace(".", "").replace(",", ""))
+    grouping = "," if decimal == "." else "."
+    return float(digits.replace(grouping, "").replace(decimal, "."))
+
+
+def _scaled(text: str, match: "re.Match[str]", latin_units: bool) -> float:
+    value = _number(match.group(0))
+    unit = _CJK_UNIT.match(text, match.end())
+    if unit is None and latin_units:
+        unit = _LATIN_UNIT.match(text, match.end())
+    if unit is not None:
+        value *= _UNITS[unit.group(1).lower()]
+    return value
+
+
+# (start, end, currency or None if ambiguous, token) of a currency symbol or ISO code.
+_Token = Tuple[int, int, Optional[str], str]
+
+
+def _currency_tokens(text: str) -> List[_Token]:
+    symbols = _CURRENCY.finditer(text)
+    found = [(m.start(), m.end(), _CURRENCY_BY_TOKEN[m.group(0)], m.group(0)) for m in symbols]
+    codes = _ISO_CODE.finditer(text.upper())
+    found += [(m.start(), m.end(), m.group(1), m.group(1)) for m in codes]
+    return sorted(found)
+
+
+def _price_number(
+    text: str, numbers: List["re.Match[str]"], tokens: List[_Token]
+) -> Tuple[Optional["re.Match[str]"], Optional[_Token]]:
+    """The number written next to a currency token, skipping old prices and savings."""
+    candidates = []
+    for token in tokens:
+        start, end = token[0], token[1]
+        after = (n for n in numbers if n.start() >= end and not text[end : n.start()].strip())
+        before = (
+            n for n in reversed(numbers) if n.end() <= start and not text[n.end() : start].strip()
+        )
+        number = next(after, None) or next(before, None)
+        if number is not None:
+            candidates.append((number, token))
+    if not candidates:
+        return (numbers[0] if numbers else None), (tokens[0] if tokens else None)
+    current = [c for c in candidates if not _NOT_PRICE.search(text, 0, min(c[0].start(), c[1][0]))]
+    number, token = (current or candidates[-1:])[0]
+    # A range gives its lower bound: step back over "99-" in "99-199元".
+    index = numbers.index(number)
+    while index > 0 and _RANGE_GAP.fullmatch(text, numbers[index - 1].end(), number.start()):
+        index -= 1
+        number = numbers[index]
+    return number, token
+
+
+@lru_cache(maxsize=65536)
+def parse_price(text: str, hint: Optional[str] = None) -> Tuple[Optional[float], Optional[str]]:
+    """
+    ``(amount, currency)`` from a display price such as "¥1,299.00", "1.299,00 €", "US$12.50",
+    "2.5万" or "¥99-199" (ranges give their lower bound). With several numbers, the one next
+    to a currency symbol or code wins, skipping old prices and savings ("Was $20 now $15",
+    "Save 20% $9.99"). ``hint`` (see :func:`currency_hint`) settles ambiguous "$"/"¥" and is
+    used when the text has no currency at all.
+    Results are cached: shops repeat the same few thousand price strings.
+    """
+    numbers = list(_NUMBER.finditer(text))
+    match, token = _price_number(text, numbers, _currency_tokens(text))
+    amount = _scaled(text, match, bool(_CJK_TEXT.search(text))) if match is not None else None
+    if token is None:
+        return amount, hint
+    currency = token[2]
+    if currency is None:
+        if token[3] == "$":
+            currency = hint if hint in _DOLLARS else "USD"
+        else:
+            currency = "JPY" if hint == "JPY" else "CNY"
+    return amount, currency
+
+
+@lru_cache(maxsize=65536)
+def parse_count(text: str) -> Optional[int]:
+    """
+    Integer count from "1,234", "1.2k", "10K+ sold", "2万+", "已售3.5亿" or "1.2M"; None if no
+    number. Ratings ("4.5 out of 5 stars") and percentages are skipped.
+    """
+    text = _RATING.sub(" ", text)
+    for match in _NUMBER.finditer(text):
+        if not text.startswith("%", match.end()):
+            return int(round(_scaled(text, match, True)))
+    return None
+
+
+def normalize_product(product: ProductInfo, hint: Optional[str] = None) -> ProductInfo:
+    """Fill ``price_value``, ``sales_value`` and a missing ``currency`` in place."""
+    if product.price and product.price_value is None:
+        amount, currency = parse_price(product.price, hint)
+        product.price_value = amount
+        if not product.currency and currency:
+            product.currency = currency
+    if product.sales and product.sales_value is None:
+        product.sales_value = parse_count(product.sales)
+    return product
+
+
+def normalize_products(products: Iterable[ProductInfo], url_or_host: str) -> None:
+    hint = currency_hint(url_or_host)
+    for product in products:
+        normalize_product(product, hint)
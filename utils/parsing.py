@@ -1,12 +1,30 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Set, Tuple, Any
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Any
 from urllib.parse import urljoin, urlparse, urlunparse
+import html as html_lib
+import re
 
 from bs4 import BeautifulSoup
 import json
 
+try:  # optional, several times faster than the stdlib decoder
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
 from ..adapters.base import ProductInfo
+from .cache import TTLCache
+
+_JSONLD_BLOCK = re.compile(
+    r"""<script\b[^>]*\btype\s*=\s*["']?application/ld\+json["']?[^>]*>(.*?)</script\s*>""",
+    re.S | re.I,
+)
+# Cheap pre-check on the raw block so breadcrumb/organization-only graphs are never decoded.
+_PRODUCT_TYPE = re.compile(r'"@type"\s*:\s*(?:\[[^\]]*?)?"(?:https?://schema\.org/|schema:)?Product"')
+_META_TAG = re.compile(r"<meta\b[^>]*>", re.I)
+_META_ATTR = re.compile(r"""(property|name|content)\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.I)
+_META_KEYS = ("og:title", "product:price:amount", "product:price:currency", "product:availability")
 
 
 def normalize_url(url: str) -> str:
@@ -42,8 +60,62 @@ def is_product_like(url: str) -> bool:
     return any(p in path for p in ("/product", "/products", "/p/", "/item", "/sku", "/shop/"))
 
 
-def extract_product_metadata(html: str, base_url: str) -> List[ProductInfo]:
-    """Extract structured product details from JSON-LD and microdata blocks."""
+def _loads(payload: str) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(payload)
+        except ValueError:
+            pass
+    # strict=False tolerates raw newlines/tabs inside strings, common in hand-written JSON-LD.
+    return json.loads(payload, strict=False)
+
+
+def extract_jsonld_products(html: str, base_url: str) -> List[ProductInfo]:
+    """Product-only JSON-LD fast path: regex-located blocks, decoded only if they name a Product."""
+    products: List[ProductInfo] = []
+    for match in _JSONLD_BLOCK.finditer(html):
+        payload = match.group(1)
+        if not _PRODUCT_TYPE.search(payload):
+            continue
+        try:
+            data = _loads(payload.strip())
+        except ValueError:
+            continue
+        for item in _iter_jsonld_items(data):
+            product = _product_from_jsonld(item, base_url)
+            if product:
+                products.append(product)
+    return products
+
+
+def extract_meta_products(html: str, base_url: str) -> List[ProductInfo]:
+    """OpenGraph/product meta tags, read with regexes (no DOM)."""
+    if "og:title" not in html:
+        return []
+    found: Dict[str, str] = {}
+    for tag in _META_TAG.finditer(html):
+        attrs = {
+            m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3)
+            for m in _META_ATTR.finditer(tag.group(0))
+        }
+        key = attrs.get("property") or attrs.get("name")
+        if key in _META_KEYS and key not in found and attrs.get("content") is not None:
+            found[key] = html_lib.unescape(attrs["content"])
+    if "og:title" not in found:
+        return []
+    return [
+        ProductInfo(
+            url=base_url,
+            title=found["og:title"],
+            price=found.get("product:price:amount"),
+            currency=found.get("product:price:currency"),
+            availability=found.get("product:availability"),
+        )
+    ]
+
+
+def _extract_with_soup(html: str, base_url: str) -> List[ProductInfo]:
+    """Original DOM-based extraction; catches markup the regex paths miss."""
 
     soup = BeautifulSoup(html, "html.parser")
     products: List[ProductInfo] = []
@@ -51,8 +123,8 @@ def extract_product_metadata(html: str, base_url: str) -> List[ProductInfo]:
     for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
         payload = script.string or ""
         try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
+            data = _loads(payload)
+        except ValueError:
             continue
 
         for item in _iter_jsonld_items(data):
@@ -82,6 +154,35 @@ def extract_product_metadata(html: str, base_url: str) -> List[ProductInfo]:
     return products
 
 
+# Domains whose pages a regex strategy ("jsonld" or "meta") has served; they skip the DOM
+# fallback. Bounded and expiring, so long crawls over many hosts don't grow it without limit.
+_DOMAIN_STRATEGY: TTLCache[str] = TTLCache(maxsize=10_000, ttl=3600.0)
+
+
+def extract_product_metadata(html: str, base_url: str) -> List[ProductInfo]:
+    """
+    Extract structured product details from JSON-LD and OpenGraph meta tags.
+
+    JSON-LD (regex fast path) is always tried first, then meta tags, then a full DOM parse.
+    A domain where a regex strategy has worked is remembered, and its pages without
+    structured data (listings) no longer pay for the DOM fallback.
+    """
+    domain = urlparse(base_url).netloc
+    products = extract_jsonld_products(html, base_url)
+    if products:
+        _DOMAIN_STRATEGY.set(domain, "jsonld")
+        return products
+    products = extract_meta_products(html, base_url)
+    known = _DOMAIN_STRATEGY.get(domain)
+    if products:
+        if known is None:
+            _DOMAIN_STRATEGY.set(domain, "meta")
+        return products
+    if known is not None:
+        return []
+    return _extract_with_soup(html, base_url)
+
+
 def _iter_jsonld_items(data: Any) -> Iterable[Any]:
     if isinstance(data, list):
         for item in data:
@@ -99,10 +200,10 @@ def _product_from_jsonld(item: Any, base_url: str) -> ProductInfo | None:
 
     type_field = item.get("@type")
     if isinstance(type_field, list):
-        is_product = any(t.lower() == "product" for t in type_field if isinstance(t, str))
+        is_product = any(_bare_type(t) == "product" for t in type_field if isinstance(t, str))
         primary_type = next((t for t in type_field if isinstance(t, str)), None)
     elif isinstance(type_field, str):
-        is_product = type_field.lower() == "product"
+        is_product = _bare_type(type_field) == "product"
         primary_type = type_field
     else:
         is_product = False
@@ -111,13 +212,11 @@ def _product_from_jsonld(item: Any, base_url: str) -> ProductInfo | None:
     if not is_product:
         return None
 
-    offers = item.get("offers", {}) if isinstance(item.get("offers"), dict) else {}
-    if isinstance(item.get("offers"), list) and item["offers"]:
-        offers = item["offers"][0]
+    offer, offer_extra = _best_offer(item.get("offers"))
 
     seller = None
-    if isinstance(offers, dict):
-        seller_info = offers.get("seller")
+    if offer is not None:
+        seller_info = offer.get("seller")
         if isinstance(seller_info, dict):
             seller = seller_info.get("name") or seller_info.get("@id")
 
@@ -130,16 +229,16 @@ def _product_from_jsonld(item: Any, base_url: str) -> ProductInfo | None:
     price = None
     currency = None
     availability = None
-    if isinstance(offers, dict):
-        price = offers.get("price") or offers.get("lowPrice")
-        currency = offers.get("priceCurrency")
-        availability = offers.get("availability")
+    if offer is not None:
+        price = _offer_price(offer)
+        currency = offer.get("priceCurrency") or _spec(offer).get("priceCurrency")
+        availability = offer.get("availability")
 
     category = item.get("category") or item.get("type")
     title = item.get("name")
     url = item.get("url") or base_url
 
-    extra: dict[str, Any] = {}
+    extra: dict[str, Any] = dict(offer_extra)
     for key in ("brand", "sku", "gtin13", "mpn"):
         if key in item:
             extra[key] = item[key]
@@ -157,3 +256,61 @@ def _product_from_jsonld(item: Any, base_url: str) -> ProductInfo | None:
         extra=extra or None,
     )
 
+
+def _bare_type(value: str) -> str:
+    # "Product", "https://schema.org/Product" and "schema:Product" are the same type.
+    return value.rsplit("/", 1)[-1].rsplit(":", 1)[-1].lower()
+
+
+def _spec(offer: Dict[str, Any]) -> Dict[str, Any]:
+    spec = offer.get("priceSpecification")
+    if isinstance(spec, list):
+        spec = spec[0] if spec else None
+    return spec if isinstance(spec, dict) else {}
+
+
+def _offer_price(offer: Dict[str, Any]) -> Any:
+    for key in ("price", "lowPrice"):
+        if offer.get(key) not in (None, ""):
+            return offer[key]
+    return _spec(offer).get("price")
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def _best_offer(offers: Any) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Pick the offer to report: an AggregateOffer's own low price (with high price and offer
+    count as extras), otherwise the cheapest priced offer of a list, preferring in-stock ones.
+    """
+    if isinstance(offers, dict):
+        kind = offers.get("@type")
+        if isinstance(kind, str) and _bare_type(kind) == "aggregateoffer":
+            extra = {
+                k: offers[k] for k in ("highPrice", "offerCount") if offers.get(k) not in (None, "")
+            }
+            if _offer_price(offers) is None and offers.get("offers"):
+                nested, _ = _best_offer(offers.get("offers"))
+                if nested is not None:
+                    return {**offers, **{k: v for k, v in nested.items() if k != "@type"}}, extra
+            return offers, extra
+        return offers, {}
+    if not isinstance(offers, list):
+        return None, {}
+    candidates = [o for o in offers if isinstance(o, dict)]
+    if not candidates:
+        return None, {}
+
+    def rank(offer: Dict[str, Any]) -> Tuple[int, float]:
+        in_stock = "instock" in str(offer.get("availability") or "").lower()
+        price = _as_float(_offer_price(offer))
+        return (0 if in_stock else 1, price if price is not None else float("inf"))
+
+    best = min(candidates, key=rank)
+    extra: Dict[str, Any] = {"offerCount": len(candidates)} if len(candidates) > 1 else {}
+    return best, extra
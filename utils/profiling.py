@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from .loader import load_symbol
+
+logger = logging.getLogger(__name__)
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Dotted paths below are relative to the crawler package, whatever name it is imported under.
+_PACKAGE = __name__.rpartition(".utils.")[0]
+
+# Parsing utilities timed by default; adapters' own ``_extract*`` / ``_parse*`` / ``_decode*``
+# helpers are added per registered adapter class.
+DEFAULT_FUNCTIONS = [
+    "utils.parsing:normalize_url",
+    "utils.parsing:extract_links",
+    "utils.parsing:is_product_like",
+    "utils.parsing:extract_product_metadata",
+    "utils.parsing:extract_jsonld_products",
+    "utils.parsing:extract_meta_products",
+    "utils.normalize:normalize_products",
+]
+_ADAPTER_HELPER_PREFIXES = ("_extract", "_parse", "_decode")
+
+
+@dataclass
+class Timing:
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.calls += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _load(dotted: str) -> Any:
+    if _PACKAGE and not dotted.startswith(_PACKAGE + "."):
+        try:
+            return load_symbol(f"{_PACKAGE}.{dotted}")
+        except ImportError:
+            pass
+    return load_symbol(dotted)
+
+
+def _frame_name(frame: Any) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack every ``interval`` seconds into collapsed stacks."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="crawl-stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names: List[str] = []
+            while frame is not None:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class CrawlProfiler:
+    """
+    CPU attribution for one crawl.
+
+    - Adapter ``parse`` time per (adapter, host), recorded by the engine.
+    - Inclusive timers around parsing utilities and adapter helpers (``functions``), installed
+      by patching the module attributes / class methods for the duration of the crawl.
+    - Event-loop lag: a task that sleeps ``lag_interval`` and records how late it wakes up.
+    - ``mode="sample"`` samples the loop thread's stack (``sample_interval``) into collapsed
+      stacks for flamegraph.pl / speedscope; ``mode="cprofile"`` runs cProfile instead and
+      writes a ``.pstats`` file; ``mode="timers"`` keeps just the timers and lag sampler.
+
+    Function timers are process-wide: in a batch only the first profiler installs them.
+    """
+
+    _instrumented = False
+
+    def __init__(
+        self,
+        *,
+        mode: str = "sample",
+        functions: Optional[Iterable[str]] = None,
+        sample_interval: float = 0.005,
+        lag_interval: float = 0.05,
+    ) -> None:
+        self.mode = mode
+        self.functions = list(DEFAULT_FUNCTIONS if functions is None else functions)
+        self.sample_interval = sample_interval
+        self.lag_interval = lag_interval
+        self.parse_times: Dict[Tuple[str, str], Timing] = {}
+        self.function_times: Dict[str, Timing] = {}
+        self.lag: Deque[float] = deque(maxlen=100_000)
+        self.wall = 0.0
+        self._started = 0.0
+        self._patches: List[Tuple[Any, str, Any]] = []
+        self._owns_patches = False
+        self._lag_task: Optional["asyncio.Task[None]"] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+
+    # ---- Recording ----
+
+    def record_parse(self, adapter: Any, host: str, elapsed: float) -> None:
+        key = (getattr(adapter, "name", type(adapter).__name__), host)
+        timing = self.parse_times.get(key)
+        if timing is None:
+            timing = self.parse_times[key] = Timing()
+        timing.add(elapsed)
+
+    def _timed(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        timing = self.function_times.setdefault(name, Timing())
+        clock = time.perf_counter
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timing.add(clock() - started)
+
+        return wrapper
+
+    # ---- Instrumentation ----
+
+    def instrument(self, adapters: Iterable[Any] = ()) -> None:
+        if CrawlProfiler._instrumented:
+            return
+        CrawlProfiler._instrumented = self._owns_patches = True
+        for dotted in self.functions:
+            module_name, _, attr = dotted.partition(":")
+            owner_name, _, method = attr.partition(".")
+            try:
+                if method:
+                    self._patch_method(_load(f"{module_name}:{owner_name}"), method)
+                else:
+                    self._patch_function(_load(dotted))
+            except Exception as exc:
+                logger.warning("Cannot profile %s: %r", dotted, exc)
+        for cls in {type(adapter) for adapter in adapters}:
+            for name in vars(cls):
+                if name.startswith(_ADAPTER_HELPER_PREFIXES) and callable(vars(cls)[name]):
+                    self._patch_method(cls, name)
+
+    def _patch_function(self, func: Callable[..., Any]) -> None:
+        # ``from x import f`` copies the reference, so patch every module of this package that
+        # holds it.
+        wrapper = self._timed(f"{func.__module__}:{func.__qualname__}", func)
+        for module in list(sys.modules.values()):
+            path = getattr(module, "__file__", None) or ""
+            if not path or not os.path.abspath(path).startswith(_PACKAGE_DIR):
+                continue
+            for attr, value in list(vars(module).items()):
+                if value is func:
+                    self._patches.append((module, attr, value))
+                    setattr(module, attr, wrapper)
+
+    def _patch_method(self, cls: type, name: str) -> None:
+        func = vars(cls).get(name)
+        if func is None or isinstance(func, (staticmethod, classmethod, property)):
+            return
+        self._patches.append((cls, name, func))
+        setattr(cls, name, self._timed(f"{cls.__module__}:{cls.__qualname__}.{name}", func))
+
+    def uninstrument(self) -> None:
+        for owner, attr, original in reversed(self._patches):
+            setattr(owner, attr, original)
+        self._patches.clear()
+        if self._owns_patches:
+            CrawlProfiler._instrumented = self._owns_patches = False
+
+    # ---- Lifecycle ----
+
+    def start(self, adapters: Iterable[Any] = ()) -> None:
+        """Call on the crawl's event loop."""
+        self.instrument(adapters)
+        self._started = time.perf_counter()
+        self._lag_task = asyncio.create_task(self._watch_lag())
+        if self.mode == "sample":
+            self._sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+            self._sampler.start()
+        elif self.mode == "cprofile":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    async def stop(self) -> None:
+        self.wall = time.perf_counter() - self._started
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            await asyncio.gather(self._lag_task, return_exceptions=True)
+        self.uninstrument()
+
+    async def _watch_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            self.lag.append(max(0.0, loop.time() - started - self.lag_interval))
+
+    # ---- Output ----
+
+    def summary(self, top: int = 20) -> Dict[str, Any]:
+        lag = sorted(self.lag)
+        parse = sorted(self.parse_times.items(), key=lambda kv: kv[1].total, reverse=True)
+        funcs = sorted(self.function_times.items(), key=lambda kv: kv[1].total, reverse=True)
+        return {
+            "wall_seconds": round(self.wall, 3),
+            "parse": [
+                {"adapter": a, "host": h, "pages": t.calls, "total_ms": round(t.total * 1e3, 1),
+                 "mean_ms": round(t.total * 1e3 / t.calls, 3), "max_ms": round(t.max * 1e3, 1)}
+                for (a, h), t in parse[:top]
+            ],
+            "functions": [
+                {"function": name, "calls": t.calls, "total_ms": round(t.total * 1e3, 1),
+                 "mean_us": round(t.total * 1e6 / t.calls, 1)}
+                for name, t in funcs[:top] if t.calls
+            ],
+            "loop_lag_ms": {
+                "samples": len(lag),
+                "p50": round(_percentile(lag, 0.5) * 1e3, 2),
+                "p95": round(_percentile(lag, 0.95) * 1e3, 2),
+                "p99": round(_percentile(lag, 0.99) * 1e3, 2),
+                "max": round(lag[-1] * 1e3, 2) if lag else 0.0,
+            },
+        }
+
+    def format_table(self, top: int = 20) -> str:
+        s = self.summary(top)
+        lines = [f"Crawl profile ({s['wall_seconds']}s wall)", "", "Adapter parse time by host"]
+        lines.append(
+            f"{'adapter':<16} {'host':<32} {'pages':>7} "
+            f"{'total ms':>10} {'mean ms':>9} {'max ms':>9}"
+        )
+        for r in s["parse"]:
+            lines.append(
+                f"{r['adapter']:<16} {r['host'][:32]:<32} {r['pages']:>7} {r['total_ms']:>10} "
+                f"{r['mean_ms']:>9} {r['max_ms']:>9}"
+            )
+        lines += ["", "Functions (inclusive time)"]
+        lines.append(f"{'function':<64} {'calls':>9} {'total ms':>10} {'mean us':>9}")
+        for r in s["functions"]:
+            lines.append(
+                f"{r['function'][-64:]:<64} {r['calls']:>9} {r['total_ms']:>10} {r['mean_us']:>9}"
+            )
+        lag = s["loop_lag_ms"]
+        lines += [
+            "",
+            f"Event loop lag (ms, {lag['samples']} samples): p50 {lag['p50']}  p95 {lag['p95']}  "
+            f"p99 {lag['p99']}  max {lag['max']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def write(self, prefix: str) -> List[str]:
+        """Write ``<prefix>.txt`` (tables) plus ``.folded`` (collapsed stacks) or ``.pstats``."""
+        parent = os.path.dirname(prefix)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        written = [prefix + ".txt"]
+        with open(written[0], "w", encoding="utf-8") as f:
+            f.write(self.format_table())
+        if self._sampler is not None:
+            written.append(prefix + ".folded")
+            with open(written[-1], "w", encoding="utf-8") as f:
+                for stack, count in self._sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        if self._cprofile is not None:
+            written.append(prefix + ".pstats")
+            self._cprofile.dump_stats(written[-1])
+        return written
@@ -0,0 +1,505 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import heapq
+import logging
+from collections import defaultdict
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+Reply = Union[None, int, bytes, List[Any], "RespError"]
+
+
+class RespError(RuntimeError):
+    """An error reply from a Redis-compatible server (or a protocol violation)."""
+
+
+def encode_command(args: Sequence[Any]) -> bytes:
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, float):
+            data = repr(arg).encode()
+        else:
+            data = str(arg).encode("utf-8")
+        out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(out)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Reply:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("connection closed by server")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest
+    if kind == b"-":
+        return RespError(rest.decode("utf-8", "replace"))
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        count = int(rest)
+        if count < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise RespError(f"unexpected reply type {kind!r}")
+
+
+class RespClient:
+    """
+    Minimal asyncio client for Redis-compatible servers (RESP2), enough for a shared frontier.
+
+    One connection, opened lazily from ``redis://[:password@]host:port/db``. :meth:`pipeline`
+    writes a batch of commands in one go and reads all replies back, so a batch costs one
+    round trip; :meth:`eval` runs server-side scripts via EVALSHA, loading them on NOSCRIPT.
+    """
+
+    def __init__(self, url: str = "redis://127.0.0.1:6379/0", *, timeout: float = 10.0) -> None:
+        parts = urlparse(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 6379
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.password = parts.password
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        setup: List[Tuple[Any, ...]] = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            for reply in await self._roundtrip(setup):
+                if isinstance(reply, RespError):
+                    raise reply
+
+    async def _roundtrip(self, commands: Sequence[Sequence[Any]]) -> List[Reply]:
+        assert self._reader is not None and self._writer is not None
+        self._writer.write(b"".join(encode_command(c) for c in commands))
+        await self._writer.drain()
+        return [await asyncio.wait_for(read_reply(self._reader), self.timeout) for _ in commands]
+
+    async def pipeline(
+        self, commands: Sequence[Sequence[Any]], *, raise_on_error: bool = True
+    ) -> List[Reply]:
+        """Send ``commands`` in one write and return their replies in order."""
+        if not commands:
+            return []
+        async with self._lock:
+            if self._writer is None:
+                await self._connect()
+            try:
+                replies = await self._roundtrip(commands)
+            except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                # The stream is out of sync now; reconnect on the next call.
+                await self._drop()
+                raise
+        if raise_on_error:
+            for reply in replies:
+                if isinstance(reply, RespError):
+                    raise reply
+        return replies
+
+    async def execute(self, *args: Any) -> Reply:
+        return (await self.pipeline([args]))[0]
+
+    async def eval(self, script: str, keys: Sequence[Any], args: Sequence[Any]) -> Reply:
+        sha = script_sha(script)
+        try:
+            return await self.execute("EVALSHA", sha, len(keys), *keys, *args)
+        except RespError as exc:
+            if not str(exc).startswith("NOSCRIPT"):
+                raise
+        return await self.execute("EVAL", script, len(keys), *keys, *args)
+
+    async def _drop(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._drop()
+
+
+def script_sha(script: str) -> str:
+    return hashlib.sha1(script.encode("utf-8")).hexdigest()
+
+
+# ---- In-process stand-in server ----
+
+ScriptHandler = Callable[["_Database", List[bytes], List[bytes]], Any]
+
+
+class _SortedSet:
+    """Score map plus a lazily cleaned heap, so ZPOPMIN stays O(log n)."""
+
+    def __init__(self) -> None:
+        self.scores: Dict[bytes, float] = {}
+        self._heap: List[Tuple[float, bytes]] = []
+
+    def add(self, member: bytes, score: float) -> None:
+        self.scores[member] = score
+        heapq.heappush(self._heap, (score, member))
+
+    def remove(self, member: bytes) -> bool:
+        return self.scores.pop(member, None) is not None
+
+    def pop_min(self) -> Optional[Tuple[bytes, float]]:
+        while self._heap:
+            score, member = heapq.heappop(self._heap)
+            if self.scores.get(member) == score:
+                del self.scores[member]
+                return member, score
+        return None
+
+    def ordered(self) -> List[Tuple[bytes, float]]:
+        return sorted(self.scores.items(), key=lambda kv: (kv[1], kv[0]))
+
+
+class _Database:
+    def __init__(self) -> None:
+        self.zsets: Dict[bytes, _SortedSet] = defaultdict(_SortedSet)
+        self.sets: Dict[bytes, Set[bytes]] = defaultdict(set)
+        self.hashes: Dict[bytes, Dict[bytes, bytes]] = defaultdict(dict)
+        self.bitmaps: Dict[bytes, bytearray] = defaultdict(bytearray)
+
+    def delete(self, key: bytes) -> int:
+        found = 0
+        for space in (self.zsets, self.sets, self.hashes, self.bitmaps):
+            if key in space:
+                del space[key]
+                found = 1
+        return found
+
+    def getbit(self, key: bytes, offset: int) -> int:
+        bits = self.bitmaps.get(key)
+        if bits is None or offset >> 3 >= len(bits):
+            return 0
+        return bits[offset >> 3] >> (7 - (offset & 7)) & 1
+
+    def setbit(self, key: bytes, offset: int, value: int) -> int:
+        bits = self.bitmaps[key]
+        if offset >> 3 >= len(bits):
+            bits.extend(bytes((offset >> 3) + 1 - len(bits)))
+        old = bits[offset >> 3] >> (7 - (offset & 7)) & 1
+        mask = 1 << (7 - (offset & 7))
+        bits[offset >> 3] = bits[offset >> 3] | mask if value else bits[offset >> 3] & ~mask
+        return old
+
+
+def _score(raw: bytes) -> float:
+    return float(raw.decode())
+
+
+def _lupa() -> Any:
+    try:
+        import lupa
+    except Exception as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError(
+            "lupa not installed. Install with `pip install lupa` to run Lua scripts."
+        ) from exc
+    return lupa
+
+
+class _LuaScripts:
+    """Runs script bodies with ``lupa``; ``redis.call`` goes to the stand-in's command dispatch."""
+
+    def __init__(self, dispatch: Callable[[_Database, bytes, List[bytes]], Any]) -> None:
+        self._lupa = _lupa()
+        self.runtime = self._lupa.LuaRuntime(encoding=None, unpack_returned_tuples=False)
+        self._dispatch = dispatch
+        self._compiled: Dict[str, Any] = {}
+
+    def run(self, d: _Database, script: str, keys: List[bytes], args: List[bytes]) -> Any:
+        sha = script_sha(script)
+        fn = self._compiled.get(sha)
+        if fn is None:
+            fn = self.runtime.eval(f"function(redis, KEYS, ARGV)\n{script}\nend")
+            self._compiled[sha] = fn
+
+        def call(name: Any, *rest: Any) -> Any:
+            reply = self._dispatch(d, self._arg(name).upper(), [self._arg(x) for x in rest])
+            return self._to_lua(reply)
+
+        redis = self.runtime.table_from({b"call": call})
+        table = self.runtime.table_from
+        return self._from_lua(fn(redis, table(keys), table(args)))
+
+    @staticmethod
+    def _arg(value: Any) -> bytes:
+        # Lua numbers become integers in Redis unless they have a fraction.
+        if isinstance(value, float):
+            return (b"%d" % value) if value.is_integer() else repr(value).encode()
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def _to_lua(self, reply: Any) -> Any:
+        if reply is None:
+            return False  # nil bulk replies are false in Redis Lua
+        if isinstance(reply, list):
+            return self.runtime.table_from([self._to_lua(r) for r in reply])
+        return reply
+
+    def _from_lua(self, value: Any) -> Any:
+        if self._lupa.lua_type(value) == "table":
+            out, i = [], 1
+            while value[i] is not None:
+                out.append(self._from_lua(value[i]))
+                i += 1
+            return out
+        if isinstance(value, bool):
+            return 1 if value else None
+        if isinstance(value, float):
+            return int(value)  # Redis truncates Lua numbers to integer replies
+        return value
+
+
+class LocalRespServer:
+    """
+    In-process stand-in for a Redis server, for local multi-process runs and tests.
+
+    It speaks RESP over TCP but implements only the commands the crawl frontier uses (sorted
+    sets, sets, hashes, bitmaps). Scripts run in a real Lua interpreter when ``lupa`` is
+    installed (``lua=None`` picks it automatically); otherwise it runs registered Python
+    equivalents of known scripts, matched by SHA1; see :meth:`register_script`.
+    """
+
+    scripts: ClassVar[Dict[str, ScriptHandler]] = {}
+    # SHA1 -> body of every registered script, so EVALSHA can run it in Lua too.
+    script_bodies: ClassVar[Dict[str, str]] = {}
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 0, *, lua: Optional[bool] = None
+    ) -> None:
+        self.host = host
+        self.port = port
+        self._dbs: Dict[int, _Database] = defaultdict(_Database)
+        self._lua: Optional[_LuaScripts] = None
+        if lua or lua is None:
+            try:
+                self._lua = _LuaScripts(self._dispatch)
+            except RuntimeError:
+                if lua:
+                    raise
+        self._loaded: Dict[str, str] = {}  # SCRIPT LOAD bodies, by SHA1
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._connections: Dict[asyncio.StreamWriter, "asyncio.Task[Any]"] = {}
+
+    @classmethod
+    def register_script(cls, script: str, handler: ScriptHandler) -> None:
+        cls.scripts[script_sha(script)] = handler
+        cls.script_bodies[script_sha(script)] = script
+
+    @property
+    def runs_lua(self) -> bool:
+        return self._lua is not None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self) -> "LocalRespServer":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*self._connections.values(), return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "LocalRespServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        db = 0
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections[writer] = task
+        try:
+            while True:
+                request = await read_reply(reader)
+                if not isinstance(request, list) or not request:
+                    break
+                name = request[0].upper()
+                if name == b"SELECT":
+                    db = int(request[1])
+                    reply: Any = b"OK"
+                else:
+                    try:
+                        reply = self._dispatch(self._dbs[db], name, request[1:])
+                    except RespError as exc:
+                        reply = exc
+                    except Exception as exc:
+                        reply = RespError(f"ERR {exc!r}")
+                writer.write(self._encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    def _encode(self, reply: Any) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, RespError):
+            return b"-%s\r\n" % str(reply).encode()
+        if isinstance(reply, bool):
+            reply = int(reply)
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, float):
+            reply = repr(reply).encode()
+        if isinstance(reply, str):
+            reply = reply.encode()
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        return b"*%d\r\n" % len(reply) + b"".join(self._encode(r) for r in reply)
+
+    def _dispatch(self, d: _Database, name: bytes, a: List[bytes]) -> Any:
+        if name in (b"PING", b"AUTH"):
+            return b"PONG" if name == b"PING" else b"OK"
+        if name == b"FLUSHDB":
+            d.__init__()  # type: ignore[misc]
+            return b"OK"
+        if name == b"DEL":
+            return sum(d.delete(k) for k in a)
+        if name == b"SCRIPT" and a[0].upper() == b"LOAD":
+            body = a[1].decode()
+            sha = script_sha(body)
+            if self._lua is None and sha not in self.scripts:
+                raise RespError("ERR unknown script (without lupa only registered scripts run)")
+            self._loaded[sha] = body
+            return sha.encode()
+        if name in (b"EVAL", b"EVALSHA"):
+            sha = script_sha(a[0].decode()) if name == b"EVAL" else a[0].decode()
+            body = a[0].decode() if name == b"EVAL" else self._loaded.get(sha)
+            body = body or self.script_bodies.get(sha)
+            nkeys = int(a[1])
+            keys, args = a[2 : 2 + nkeys], a[2 + nkeys :]
+            if self._lua is not None and body is not None:
+                try:
+                    return self._lua.run(d, body, keys, args)
+                except Exception as exc:
+                    raise RespError(f"ERR Error running script: {exc}") from exc
+            handler = self.scripts.get(sha)
+            if handler is None:
+                raise RespError(
+                    "NOSCRIPT No matching script." if name == b"EVALSHA" else "ERR unknown script"
+                )
+            return handler(d, keys, args)
+        if name == b"ZADD":
+            z, i, flags = d.zsets[a[0]], 1, set()
+            while a[i].upper() in (b"NX", b"XX"):
+                flags.add(a[i].upper())
+                i += 1
+            added = 0
+            for j in range(i, len(a), 2):
+                member, exists = a[j + 1], a[j + 1] in z.scores
+                if (b"NX" in flags and exists) or (b"XX" in flags and not exists):
+                    continue
+                z.add(member, _score(a[j]))
+                added += not exists
+            return added
+        if name == b"ZREM":
+            return sum(d.zsets[a[0]].remove(m) for m in a[1:])
+        if name == b"ZCARD":
+            return len(d.zsets[a[0]].scores)
+        if name == b"ZSCORE":
+            score = d.zsets[a[0]].scores.get(a[1])
+            return None if score is None else repr(score)
+        if name == b"ZPOPMIN":
+            out: List[Any] = []
+            for _ in range(int(a[1]) if len(a) > 1 else 1):
+                popped = d.zsets[a[0]].pop_min()
+                if popped is None:
+                    break
+                out += [popped[0], repr(popped[1])]
+            return out
+        if name == b"ZRANGE":
+            items = d.zsets[a[0]].ordered()
+            stop = int(a[2])
+            items = items[int(a[1]) : (stop + 1) or None]
+            if len(a) > 3 and a[3].upper() == b"WITHSCORES":
+                return [x for member, score in items for x in (member, repr(score))]
+            return [member for member, _ in items]
+        if name == b"ZRANGEBYSCORE":
+            low = float("-inf") if a[1] == b"-inf" else _score(a[1])
+            high = float("inf") if a[2] == b"+inf" else _score(a[2])
+            return [m for m, s in d.zsets[a[0]].ordered() if low <= s <= high]
+        if name == b"SADD":
+            s = d.sets[a[0]]
+            before = len(s)
+            s.update(a[1:])
+            return len(s) - before
+        if name == b"SREM":
+            s = d.sets[a[0]]
+            return sum(1 for m in a[1:] if m in s and not s.discard(m))
+        if name == b"SISMEMBER":
+            return int(a[1] in d.sets[a[0]])
+        if name == b"SCARD":
+            return len(d.sets[a[0]])
+        if name == b"HSET":
+            h = d.hashes[a[0]]
+            new = sum(1 for j in range(1, len(a), 2) if a[j] not in h)
+            h.update({a[j]: a[j + 1] for j in range(1, len(a), 2)})
+            return new
+        if name == b"HGET":
+            return d.hashes[a[0]].get(a[1])
+        if name == b"HDEL":
+            h = d.hashes[a[0]]
+            return sum(1 for f in a[1:] if h.pop(f, None) is not None)
+        if name == b"HLEN":
+            return len(d.hashes[a[0]])
+        if name == b"GETBIT":
+            return d.getbit(a[0], int(a[1]))
+        if name == b"SETBIT":
+            return d.setbit(a[0], int(a[1]), int(a[2]))
+        raise RespError(f"ERR unknown command '{name.decode()}' (stand-in server)")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    p = argparse.ArgumentParser(
+        description="Run the in-process Redis stand-in for a shared crawl frontier"
+    )
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=6379)
+    args = p.parse_args(argv)
+    # Register the frontier's scripts with the server.
+    from ..engines import redis_frontier  # noqa: F401
+
+    async def serve() -> None:
+        server = await LocalRespServer(args.host, args.port).start()
+        print(f"Redis stand-in listening on {server.url}", flush=True)
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+from urllib.parse import urljoin, urlparse
+
+from aiohttp import ClientSession, ClientTimeout
+
+from .throttling import HostThrottle
+
+logger = logging.getLogger(__name__)
+
+_MEMO_LIMIT = 4096
+
+
+@dataclass
+class _Rule:
+    allow: bool
+    length: int  # pattern length; longest match wins
+    prefix: Optional[str] = None  # literal patterns use str.startswith
+    regex: Optional[Pattern[str]] = None  # wildcard patterns
+
+    def matches(self, path: str) -> bool:
+        if self.prefix is not None:
+            return path.startswith(self.prefix)
+        return self.regex.match(path) is not None  # type: ignore[union-attr]
+
+
+def _compile_rule(pattern: str, allow: bool) -> _Rule:
+    if "*" not in pattern and not pattern.endswith("$"):
+        return _Rule(allow=allow, length=len(pattern), prefix=pattern)
+    anchored = pattern.endswith("$")
+    body = pattern[:-1] if anchored else pattern
+    regex = ".*".join(re.escape(part) for part in body.split("*"))
+    return _Rule(
+        allow=allow, length=len(pattern), regex=re.compile(regex + ("$" if anchored else ""))
+    )
+
+
+@dataclass
+class RobotsRules:
+    """
+    Compiled rules of the robots.txt group that applies to our user agent.
+    Matching follows RFC 9309: the group naming our product token (the user agent up to the
+    first "/", compared case-insensitively) applies, else the "*" group; within it the longest
+    matching pattern wins, ties go to Allow.
+    """
+
+    rules: List[_Rule] = field(default_factory=list)
+    crawl_delay: Optional[float] = None
+    sitemaps: List[str] = field(default_factory=list)
+    _memo: Dict[str, bool] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def allow_all(cls) -> "RobotsRules":
+        return cls()
+
+    @classmethod
+    def disallow_all(cls) -> "RobotsRules":
+        return cls(rules=[_Rule(allow=False, length=1, prefix="/")])
+
+    @classmethod
+    def parse(cls, text: str, user_agent: str, base_url: str = "") -> "RobotsRules":
+        token = user_agent.split("/", 1)[0].strip().lower()
+        groups: List[Tuple[List[str], List[Tuple[str, str]]]] = []
+        sitemaps: List[str] = []
+        agents: List[str] = []
+        lines: List[Tuple[str, str]] = []
+        in_rules = False
+
+        for raw in text.splitlines():
+            line = raw.split("#", 1)[0].strip()
+            if not line or ":" not in line:
+                continue
+            key, _, value = line.partition(":")
+            key = key.strip().lower()
+            value = value.strip()
+            if key == "sitemap":
+                if value:
+                    sitemaps.append(urljoin(base_url, value))
+                continue
+            if key == "user-agent":
+                if in_rules:
+                    groups.append((agents, lines))
+                    agents, lines, in_rules = [], [], False
+                agents.append(value.split("/", 1)[0].strip().lower())
+                continue
+            if agents:
+                in_rules = True
+                lines.append((key, value))
+        if agents:
+            groups.append((agents, lines))
+
+        # Our product token's groups win over "*"; groups naming the same agent are combined.
+        best: Optional[List[Tuple[str, str]]] = None
+        best_len = -1
+        for group_agents, group_lines in groups:
+            for agent in group_agents:
+                if agent == "*":
+                    score = 0
+                elif agent == token:
+                    score = 1
+                else:
+                    continue
+                if score > best_len:
+                    best, best_len = list(group_lines), score
+                elif score == best_len and best is not None:
+                    best.extend(group_lines)
+
+        rules: List[_Rule] = []
+        crawl_delay: Optional[float] = None
+        for key, value in best or []:
+            if key in ("allow", "disallow"):
+                if not value:
+                    continue  # empty Disallow means "allow everything"
+                rules.append(_compile_rule(value, key == "allow"))
+            elif key == "crawl-delay":
+                try:
+                    crawl_delay = float(value)
+                except ValueError:
+                    pass
+        rules.sort(key=lambda r: (-r.length, not r.allow))
+        return cls(rules=rules, crawl_delay=crawl_delay, sitemaps=sitemaps)
+
+    def allowed(self, url: str) -> bool:
+        if not self.rules:
+            return True
+        parsed = urlparse(url)
+        path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+        if path == "/robots.txt":
+            return True
+        hit = self._memo.get(path)
+        if hit is not None:
+            return hit
+        result = True
+        for rule in self.rules:
+            if rule.matches(path):
+                result = rule.allow
+                break
+        if len(self._memo) >= _MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[path] = result
+        return result
+
+
+class RobotsManager:
+    """
+    Per-host robots.txt cache shared by all workers.
+
+    Each origin's robots.txt is fetched at most once per ``ttl`` seconds; concurrent
+    callers for the same origin await the same in-flight fetch. ``Crawl-delay`` values
+    are pushed into the optional :class:`HostThrottle`. A missing robots.txt (4xx) allows
+    everything. Per RFC 9309 an unreachable one (5xx or a network error) disallows everything,
+    or keeps the last rules fetched for that origin, and is asked for again after
+    ``error_ttl`` seconds until a fetch succeeds.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        *,
+        user_agent: str,
+        ttl: float = 3600.0,
+        timeout: float = 10.0,
+        throttle: Optional[HostThrottle] = None,
+        error_ttl: float = 60.0,
+    ) -> None:
+        self.session = session
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self.throttle = throttle
+        self._cache: Dict[str, Tuple[float, RobotsRules]] = {}
+        self._inflight: Dict[str, "asyncio.Future[RobotsRules]"] = {}
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def cached(self, url: str) -> Optional[RobotsRules]:
+        entry = self._cache.get(self._origin(url))
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    async def rules_for(self, url: str) -> RobotsRules:
+        origin = self._origin(url)
+        entry = self._cache.get(origin)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        pending = self._inflight.get(origin)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: asyncio.Future[RobotsRules] = asyncio.get_running_loop().create_future()
+        self._inflight[origin] = future
+        try:
+            fetched = await self._fetch(origin)
+            ttl = self.ttl
+            if fetched is None:
+                previous = self._cache.get(origin)
+                rules = previous[1] if previous is not None else RobotsRules.disallow_all()
+                ttl = min(self.ttl, self.error_ttl)
+            else:
+                rules = fetched
+            self._cache[origin] = (time.monotonic() + ttl, rules)
+            if self.throttle is not None and rules.crawl_delay is not None:
+                self.throttle.set_delay(urlparse(origin).netloc, rules.crawl_delay)
+            future.set_result(rules)
+            return rules
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved; waiters re-raise via shield
+            raise
+        finally:
+            self._inflight.pop(origin, None)
+
+    async def _fetch(self, origin: str) -> Optional[RobotsRules]:
+        """Rules from ``origin``'s robots.txt, or None when it is unreachable."""
+        url = origin + "/robots.txt"
+        headers = {"User-Agent": self.user_agent}
+        timeout = ClientTimeout(total=self.timeout)
+        try:
+            async with self.session.get(url, headers=headers, timeout=timeout) as resp:
+                if resp.status >= 500:
+                    logger.debug("robots.txt for %s answered %s", origin, resp.status)
+                    return None
+                if resp.status >= 400:
+                    return RobotsRules.allow_all()
+                text = await resp.text(errors="replace")
+        except Exception as exc:
+            logger.debug("robots.txt fetch failed for %s: %r", origin, exc)
+            return None
+        return RobotsRules.parse(text, self.user_agent, base_url=origin + "/")
+
+    async def allowed(self, url: str) -> bool:
+        return (await self.rules_for(url)).allowed(url)
+
+    async def filter(self, urls: Iterable[str]) -> List[str]:
+        """Keep allowed URLs, fetching rules for all unseen origins concurrently."""
+        urls = list(urls)
+        missing = {self._origin(u) for u in urls if self.cached(u) is None}
+        if missing:
+            await asyncio.gather(*(self.rules_for(o) for o in missing), return_exceptions=True)
+        out: List[str] = []
+        for u in urls:
+            rules = self.cached(u)
+            if rules is None or rules.allowed(u):
+                out.append(u)
+        return out
+
+    async def sitemaps(self, url: str) -> List[str]:
+        return list((await self.rules_for(url)).sitemaps)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import signal
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+
+
+def install_stop_handlers(
+    stop: Callable[[], None], loop: Optional[asyncio.AbstractEventLoop] = None
+) -> None:
+    """
+    Call ``stop`` on the first SIGTERM/SIGINT, then give both signals back to their default
+    handlers so a second one force-quits (KeyboardInterrupt for Ctrl+C, exit for SIGTERM).
+    Does nothing where the loop can't install signal handlers (Windows, non-main threads).
+    """
+    loop = loop or asyncio.get_running_loop()
+
+    def first(sig: signal.Signals) -> None:
+        for s in _STOP_SIGNALS:
+            loop.remove_signal_handler(s)
+        logger.warning("%s: draining in-flight pages, send it again to quit now", sig.name)
+        stop()
+
+    for sig in _STOP_SIGNALS:
+        with contextlib.suppress(NotImplementedError, RuntimeError, AttributeError):
+            loop.add_signal_handler(sig, first, sig)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+from aiohttp import ClientSession, ClientTimeout
+
+logger = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class SitemapEntry:
+    loc: str
+    lastmod: Optional[float] = None  # POSIX timestamp
+    is_sitemap: bool = False  # True for <sitemap> entries of a sitemap index
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """Parse a W3C datetime (``2024-01-31`` or ``2024-01-31T10:00:00Z``) into a timestamp."""
+    if not value:
+        return None
+    text = value.strip()
+    if text.endswith("Z"):
+        text = text[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+class SitemapStreamParser:
+    """
+    Incremental parser for ``<urlset>`` and ``<sitemapindex>`` documents.
+
+    Feed raw (optionally gzipped) bytes as they arrive; completed entries are returned
+    from :meth:`feed` and their elements are discarded so memory stays flat regardless
+    of document size.
+    """
+
+    def __init__(self) -> None:
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._root: Optional[Element] = None
+        self._inflater: Optional["zlib._Decompress"] = None
+        self._sniffed = False
+
+    def feed(self, data: bytes) -> List[SitemapEntry]:
+        if not self._sniffed:
+            self._sniffed = True
+            if data[:2] == _GZIP_MAGIC:
+                self._inflater = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        if self._inflater is not None:
+            data = self._inflater.decompress(data)
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> List[SitemapEntry]:
+        if self._inflater is not None:
+            self._parser.feed(self._inflater.flush())
+        try:
+            self._parser.close()
+        except ParseError as exc:
+            logger.debug("Truncated sitemap document: %r", exc)
+        return self._drain()
+
+    def _drain(self) -> List[SitemapEntry]:
+        out: List[SitemapEntry] = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                continue
+            name = _local(elem.tag)
+            if name not in ("url", "sitemap"):
+                continue
+            loc = lastmod = None
+            for child in elem:
+                child_name = _local(child.tag)
+                if child_name == "loc":
+                    loc = (child.text or "").strip()
+                elif child_name == "lastmod":
+                    lastmod = child.text
+            if loc:
+                out.append(
+                    SitemapEntry(
+                        loc=loc, lastmod=parse_lastmod(lastmod), is_sitemap=name == "sitemap"
+                    )
+                )
+            if self._root is not None:
+                self._root.clear()
+        return out
+
+
+async def iter_sitemap(
+    session: ClientSession,
+    url: str,
+    *,
+    timeout: float = 60.0,
+    user_agent: Optional[str] = None,
+    max_index_depth: int = 3,
+) -> AsyncIterator[SitemapEntry]:
+    """
+    Stream page entries from a sitemap (or sitemap index, followed recursively).
+    Errors are logged and end the affected sitemap without raising.
+    """
+    headers = {"User-Agent": user_agent} if user_agent else {}
+    children: List[str] = []
+    parser = SitemapStreamParser()
+    try:
+        async with session.get(url, headers=headers, timeout=ClientTimeout(total=timeout)) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(_CHUNK_SIZE):
+                for entry in parser.feed(chunk):
+                    if entry.is_sitemap:
+                        children.append(entry.loc)
+                    else:
+                        yield entry
+        for entry in parser.close():
+            if entry.is_sitemap:
+                children.append(entry.loc)
+            else:
+                yield entry
+    except (ParseError, zlib.error) as exc:
+        logger.warning("Malformed sitemap %s: %r", url, exc)
+    except Exception as exc:  # network errors shouldn't abort discovery
+        logger.debug("Sitemap fetch failed for %s: %r", url, exc)
+
+    if max_index_depth <= 0:
+        return
+    for child in children:
+        async for entry in iter_sitemap(
+            session,
+            child,
+            timeout=timeout,
+            user_agent=user_agent,
+            max_index_depth=max_index_depth - 1,
+        ):
+            yield entry
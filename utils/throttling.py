@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+
+class HostThrottle:
+    """
+    Enforces a minimum interval between requests to the same host.
+
+    Delays come from robots.txt ``Crawl-delay`` (via :meth:`set_delay`) or ``default_delay``,
+    capped at ``max_delay`` so a hostile value can't park the crawl. Slots are reserved
+    synchronously, so concurrent workers queue up behind each other without locks.
+    """
+
+    def __init__(self, default_delay: float = 0.0, max_delay: float = 30.0) -> None:
+        self.default_delay = default_delay
+        self.max_delay = max_delay
+        self._delays: Dict[str, float] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    def set_delay(self, host: str, seconds: float) -> None:
+        self._delays[host] = max(0.0, min(seconds, self.max_delay))
+
+    def delay_for(self, host: str) -> float:
+        return self._delays.get(host, self.default_delay)
+
+    async def wait(self, host: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        delay = self.delay_for(host)
+        if delay <= 0:
+            return
+        now = (loop or asyncio.get_running_loop()).time()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + delay
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class RateLimiter:
+    """
+    Token bucket allowing ``rate`` acquisitions per second with bursts of up to ``burst``.
+
+    Callers reserve a token synchronously (the balance may go negative) and then sleep for
+    their share of the deficit, so waiters are served in arrival order without a lock.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._last: Optional[float] = None
+
+    async def acquire(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self._last is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class ResizableSemaphore:
+    """A semaphore whose capacity can be changed while tasks hold or wait for it (FIFO wake-up)."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_use = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    async def acquire(self) -> None:
+        if self.in_use < self.limit and not self._waiters:
+            self.in_use += 1
+            return
+        future: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future  # the slot is counted by _wake() before the future resolves
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(future)
+            raise
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    def resize(self, limit: int) -> None:
+        self.limit = limit
+        self._wake()
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self.release()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_use < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_use += 1
+                future.set_result(None)
+
+
+class FairShareBudget:
+    """
+    One global concurrency budget split between crawls running side by side (max-min fair):
+    every crawl gets an equal share, capped at what it asked for, and the slots capped crawls
+    leave unused are split among the others. Shares are recomputed whenever a crawl joins or
+    leaves, so slots of a finished crawl flow to the ones still running. Every crawl keeps at
+    least one slot, so the budget may be exceeded when crawls outnumber it.
+    """
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self._members: Dict[Any, Tuple[int, ResizableSemaphore]] = {}
+
+    def join(self, key: Any, demand: int) -> ResizableSemaphore:
+        sem = ResizableSemaphore(1)
+        self._members[key] = (max(1, demand), sem)
+        self._rebalance()
+        return sem
+
+    def leave(self, key: Any) -> None:
+        if self._members.pop(key, None) is not None:
+            self._rebalance()
+
+    def shares(self) -> Dict[Any, int]:
+        return {key: sem.limit for key, (_, sem) in self._members.items()}
+
+    def _rebalance(self) -> None:
+        remaining = self.total
+        members = sorted(self._members.values(), key=lambda m: m[0])
+        for i, (demand, sem) in enumerate(members):
+            share = max(1, min(demand, remaining // (len(members) - i)))
+            remaining -= share
+            if share != sem.limit:
+                sem.resize(share)
+
+
+class _AimdLimit:
+    """One AIMD-controlled limit plus the latency baseline it judges congestion against."""
+
+    def __init__(self, initial: int, floor: int, ceiling: int) -> None:
+        self.floor = floor
+        self.ceiling = ceiling
+        self.sem = ResizableSemaphore(max(floor, min(initial, ceiling)))
+        self.successes = 0
+        self.last_decrease = float("-inf")
+        self.fast_latency: Optional[float] = None
+        self.base_latency: Optional[float] = None
+
+    @property
+    def limit(self) -> int:
+        return self.sem.limit
+
+    def congested(self, latency: float, tolerance: float) -> bool:
+        # Short EWMA against a slow EWMA baseline: sustained latency inflation means queueing.
+        if self.fast_latency is None or self.base_latency is None:
+            self.fast_latency = self.base_latency = latency
+            return False
+        self.fast_latency += 0.3 * (latency - self.fast_latency)
+        self.base_latency += 0.02 * (
+            min(latency, self.base_latency * tolerance) - self.base_latency
+        )
+        return self.fast_latency > self.base_latency * tolerance
+
+    def increase(self) -> bool:
+        # Additive increase: +1 after a full window (``limit`` successes) while the limit is
+        # binding.
+        self.successes += 1
+        if (
+            self.successes < self.limit
+            or self.sem.in_use < self.limit - 1
+            or self.limit >= self.ceiling
+        ):
+            return False
+        self.successes = 0
+        self.sem.resize(self.limit + 1)
+        return True
+
+    def decrease(self, now: float, factor: float, cooldown: float) -> bool:
+        # Multiplicative decrease, at most once per cooldown so one burst of failures counts once.
+        self.successes = 0
+        if now - self.last_decrease < cooldown or self.limit <= self.floor:
+            return False
+        self.last_decrease = now
+        self.sem.resize(max(self.floor, int(self.limit * factor)))
+        return True
+
+
+class AimdConcurrency:
+    """
+    Adaptive global and per-host concurrency (additive increase, multiplicative decrease).
+
+    Every fetch attempt reports ``(status, elapsed, error)`` via :meth:`observe`. HTTP 429/503,
+    timeouts and sustained latency inflation shrink the host's limit; timeouts and connection
+    errors also shrink the global limit. Successes grow a limit by one per window, but only
+    while that limit is actually saturated. All limits stay within the configured bounds.
+
+    The global limit starts at ``initial`` and each host's at ``host_initial`` (the engine
+    passes ``per_host_concurrency``, 4 by default), growing from there towards ``host_max``.
+    """
+
+    _THROTTLED = frozenset({429, 503})
+
+    def __init__(
+        self,
+        initial: int,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        host_initial: int = 4,
+        host_max: int = 16,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 1.0,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.host_initial = host_initial
+        self.host_max = max(1, host_max)
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.global_limit = _AimdLimit(initial, self.min_limit, self.max_limit)
+        self._hosts: Dict[str, _AimdLimit] = {}
+        self.increases = 0
+        self.decreases = 0
+
+    def _host(self, host: str) -> _AimdLimit:
+        limit = self._hosts.get(host)
+        if limit is None:
+            limit = self._hosts[host] = _AimdLimit(self.host_initial, 1, self.host_max)
+        return limit
+
+    @contextlib.asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        # Host first: a slow host must not park global slots while its own queue drains.
+        host_limit = self._host(host)
+        await host_limit.sem.acquire()
+        try:
+            await self.global_limit.sem.acquire()
+            try:
+                yield
+            finally:
+                self.global_limit.sem.release()
+        finally:
+            host_limit.sem.release()
+
+    def observe(
+        self, host: str, status: Optional[int], elapsed: float, error: Optional[BaseException]
+    ) -> None:
+        now = time.monotonic()
+        host_limit = self._host(host)
+        transport_error = error is not None and status is None
+        throttled = status in self._THROTTLED
+        if transport_error or throttled or host_limit.congested(elapsed, self.latency_tolerance):
+            self.decreases += host_limit.decrease(now, self.backoff, self.cooldown)
+            if transport_error:
+                self.decreases += self.global_limit.decrease(now, self.backoff, self.cooldown)
+            return
+        if error is not None:
+            return  # other HTTP errors (404, 500...) say nothing about capacity
+        self.increases += host_limit.increase()
+        self.increases += self.global_limit.increase()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "global": self.global_limit.limit,
+            "hosts": {host: limit.limit for host, limit in sorted(self._hosts.items())},
+            "increases": self.increases,
+            "decreases": self.decreases,
+        }